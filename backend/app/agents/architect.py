@@ -134,7 +134,7 @@ class ArchitectAgent(Agent):
                 model="",  # Inherit from settings
                 temperature=0.5,  # Higher for exploring multiple design alternatives
                 system_prompt=prompt,
-                tools=["filesystem", "shell", "kiro"],
+                tools=["filesystem", "code_symbols", "shell", "kiro"],
             )
         )
 
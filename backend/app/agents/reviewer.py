@@ -127,7 +127,7 @@ class ReviewerAgent(Agent):
                 model="",  # Inherit from settings
                 temperature=0.35,  # Allow nuanced trade-off discussions
                 system_prompt=prompt,
-                tools=["filesystem", "shell", "kiro"],
+                tools=["filesystem", "code_symbols", "shell", "kiro"],
             )
         )
 
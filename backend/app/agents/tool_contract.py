@@ -56,6 +56,16 @@ You have access to tools that you MUST invoke using this exact format:
 <tool_call>{"tool": "web_fetch", "args": {"url": "https://example.com"}}</tool_call>
 ```
 
+**code_symbols** - Symbol lookup in a registered project (definitions, references, outlines)
+```
+<tool_call>{"tool": "code_symbols", "args": \
+{"action": "definition", "project": "myapp", "name": "AuthService.refresh"}}</tool_call>
+<tool_call>{"tool": "code_symbols", "args": \
+{"action": "references", "project": "myapp", "name": "authenticate"}}</tool_call>
+<tool_call>{"tool": "code_symbols", "args": \
+{"action": "outline", "project": "myapp", "path": "src/auth.py"}}</tool_call>
+```
+
 **create_handoff** - Handoff task to another agent
 ```
 <tool_call>{"tool": "create_handoff", "args": {"to_agent": "tester", "task_description": "Verify login fix", "files_modified": ["src/login.ts"]}}</tool_call>
@@ -65,25 +75,28 @@ You have access to tools that you MUST invoke using this exact format:
 # Tool policies by agent type
 TOOL_POLICIES = {
     "mo": {
-        "allowed": ["routing", "filesystem", "shell", "web_search", "web_fetch", "kiro", "sessions", "canvas", "create_handoff"],
+        "allowed": [
+            "routing", "filesystem", "code_symbols", "shell",
+            "web_search", "web_fetch", "kiro", "sessions", "canvas", "create_handoff",
+        ],
         "read_paths": ["*"],  # Can read anywhere
         "write_paths": ["/Projects", "~/maratos-workspace"],
         "notes": "Orchestrator - delegates heavy implementation to specialists"
     },
     "architect": {
-        "allowed": ["filesystem", "shell", "kiro"],
+        "allowed": ["filesystem", "code_symbols", "shell", "kiro"],
         "read_paths": ["*"],
         "write_paths": ["~/maratos-workspace"],
         "notes": "Plans and designs - spawns coders for implementation"
     },
     "coder": {
-        "allowed": ["filesystem", "shell", "kiro", "create_handoff"],
+        "allowed": ["filesystem", "code_symbols", "shell", "kiro", "create_handoff"],
         "read_paths": ["*"],
         "write_paths": ["/Projects", "~/maratos-workspace"],
         "notes": "Pure implementation - reads existing code, writes new code"
     },
     "reviewer": {
-        "allowed": ["filesystem", "shell", "kiro"],
+        "allowed": ["filesystem", "code_symbols", "shell", "kiro"],
         "read_paths": ["*"],
         "write_paths": [],  # Read-only for reviews
         "notes": "Code review - reads and analyzes, does not modify"
@@ -109,6 +122,26 @@ TOOL_POLICIES = {
 }
 
 
+# Side-effect contract: tool actions that only read state.
+# None means every action of the tool is read-only. Invocations matching this
+# table may be executed concurrently; anything else is treated as mutating.
+READ_ONLY_TOOL_ACTIONS: dict[str, frozenset[str] | None] = {
+    "filesystem": frozenset({"read", "list", "exists"}),
+    "web_search": None,
+    "web_fetch": None,
+    "sessions": frozenset({"list", "history", "search", "context"}),
+    "code_symbols": None,
+}
+
+
+def is_read_only_invocation(tool_id: str, args: dict) -> bool:
+    """Check whether a tool invocation is declared side-effect free."""
+    if tool_id not in READ_ONLY_TOOL_ACTIONS:
+        return False
+    actions = READ_ONLY_TOOL_ACTIONS[tool_id]
+    return actions is None or args.get("action") in actions
+
+
 def get_tool_policy_section(agent_type: str) -> str:
     """Generate the TOOL POLICY section for an agent's system prompt."""
     policy = TOOL_POLICIES.get(agent_type, TOOL_POLICIES["coder"])
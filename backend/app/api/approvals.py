@@ -25,6 +25,9 @@ from app.guardrails.diff_approval import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/approvals")
 
+# Seconds without approval events before a keep-alive comment is sent
+HEARTBEAT_INTERVAL = 15.0
+
 
 # =============================================================================
 # Pydantic Models
@@ -42,6 +45,8 @@ class ApprovalResponse(BaseModel):
     file_path: str | None
     diff: str | None
     content_hash: str | None
+    lines_added: int | None = None
+    lines_removed: int | None = None
     command: str | None
     workdir: str | None
     status: str
@@ -71,6 +76,8 @@ class ApprovalResponse(BaseModel):
             file_path=approval.file_path,
             diff=approval.diff,
             content_hash=approval.content_hash,
+            lines_added=approval.lines_added,
+            lines_removed=approval.lines_removed,
             command=approval.command,
             workdir=approval.workdir,
             status=approval.status.value,
@@ -130,12 +137,8 @@ async def list_approvals(
 
     Returns approvals sorted by created_at descending (newest first).
     """
-    # Get all approvals from manager
-    all_approvals = list(diff_approval_manager._pending.values())
-
-    # Filter by session
-    if session_id:
-        all_approvals = [a for a in all_approvals if a.session_id == session_id]
+    # Get all approvals from manager (filtered by session)
+    all_approvals = diff_approval_manager.get_all(session_id=session_id)
 
     # Filter by status
     if status:
@@ -149,8 +152,7 @@ async def list_approvals(
     all_approvals.sort(key=lambda a: a.created_at, reverse=True)
 
     # Count pending
-    pending_count = sum(1 for a in diff_approval_manager._pending.values()
-                        if a.status == ApprovalStatus.PENDING)
+    pending_count = len(diff_approval_manager.get_pending())
 
     # Limit
     limited = all_approvals[:limit]
@@ -279,12 +281,8 @@ async def cancel_approval(approval_id: str) -> dict[str, Any]:
     if not approval:
         raise HTTPException(status_code=404, detail=f"Approval {approval_id} not found")
 
-    if approval.status == ApprovalStatus.PENDING:
-        approval.status = ApprovalStatus.EXPIRED
-        # Signal waiting tasks
-        event = diff_approval_manager._approval_events.get(approval_id)
-        if event:
-            event.set()
+    # Expires the approval, wakes waiting tasks and notifies subscribers
+    diff_approval_manager.cancel(approval_id)
 
     return {"success": True, "message": "Approval cancelled"}
 
@@ -308,64 +306,33 @@ async def approval_events_stream(
     """
     async def event_generator():
         """Generate SSE events for approval changes."""
-        # Track known approvals to detect changes
-        known_approvals: dict[str, str] = {}  # id -> status
-
-        # Register callback for new approvals
-        new_approvals_queue: asyncio.Queue[PendingApproval] = asyncio.Queue()
-
-        async def on_new_approval(approval: PendingApproval):
-            if session_id is None or approval.session_id == session_id:
-                await new_approvals_queue.put(approval)
-
-        diff_approval_manager.register_approval_callback(on_new_approval)
-
-        try:
-            # Send initial pending approvals
-            pending = diff_approval_manager.get_pending(session_id=session_id)
-            for approval in pending:
-                known_approvals[approval.id] = approval.status.value
-                data = ApprovalResponse.from_pending(approval).model_dump_json()
-                yield f"event: approval_requested\ndata: {data}\n\n"
-
-            # Poll for changes
-            while True:
-                # Check for new approvals from callback
-                try:
-                    new_approval = await asyncio.wait_for(
-                        new_approvals_queue.get(),
-                        timeout=1.0
-                    )
-                    if new_approval.id not in known_approvals:
-                        known_approvals[new_approval.id] = new_approval.status.value
-                        data = ApprovalResponse.from_pending(new_approval).model_dump_json()
-                        yield f"event: approval_requested\ndata: {data}\n\n"
-                except asyncio.TimeoutError:
-                    pass
-
-                # Check for status changes
-                current = list(diff_approval_manager._pending.values())
-                if session_id:
-                    current = [a for a in current if a.session_id == session_id]
-
-                for approval in current:
-                    old_status = known_approvals.get(approval.id)
-                    new_status = approval.status.value
-
-                    if old_status and old_status != new_status:
-                        known_approvals[approval.id] = new_status
-                        data = ApprovalResponse.from_pending(approval).model_dump_json()
-                        yield f"event: approval_resolved\ndata: {data}\n\n"
-
-                # Send heartbeat
-                yield f": heartbeat\n\n"
-
-        except asyncio.CancelledError:
-            pass
-        finally:
-            # Unregister callback
-            if on_new_approval in diff_approval_manager._on_approval_requested:
-                diff_approval_manager._on_approval_requested.remove(on_new_approval)
+        # Subscribe before the snapshot so nothing created in between is missed
+        with diff_approval_manager.subscribe(session_id) as subscription:
+            try:
+                # Send initial pending approvals
+                sent: set[str] = set()
+                for approval in diff_approval_manager.get_pending(session_id=session_id):
+                    sent.add(approval.id)
+                    data = ApprovalResponse.from_pending(approval).model_dump_json()
+                    yield f"event: approval_requested\ndata: {data}\n\n"
+
+                # Push changes as the manager publishes them
+                while True:
+                    event = await subscription.get(timeout=HEARTBEAT_INTERVAL)
+                    if event is None:
+                        yield ": heartbeat\n\n"
+                        continue
+                    if event.type == "approval_requested":
+                        if event.approval.id in sent:
+                            continue
+                        sent.add(event.approval.id)
+                    else:
+                        sent.discard(event.approval.id)
+                    data = ApprovalResponse.from_pending(event.approval).model_dump_json()
+                    yield f"event: {event.type}\ndata: {data}\n\n"
+
+            except asyncio.CancelledError:
+                pass
 
     return StreamingResponse(
         event_generator(),
@@ -534,9 +501,9 @@ async def batch_deny_requests(
 
 @router.post("/cleanup")
 async def cleanup_expired() -> dict[str, Any]:
-    """Clean up expired approval requests.
+    """Expire approval requests past their deadline.
 
-    Call periodically to clean up old approvals.
+    Expiry is timer-driven once the app is running; this forces it.
     """
     count = diff_approval_manager.cleanup_expired()
     return {"cleaned_up": count}
@@ -2,11 +2,12 @@
 
 import asyncio
 import logging
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select
@@ -29,8 +30,10 @@ from app.config import settings
 from app.database import (
     AutonomousProject as DBProject,
     AutonomousTask as DBTask,
+    async_session_factory,
     get_db,
 )
+from app.utils.sse_replay import last_event_id, sse_streams, stream_response
 
 logger = logging.getLogger(__name__)
 
@@ -106,7 +109,11 @@ async def start_project(
     request: StartProjectRequest,
     db: AsyncSession = Depends(get_db),
 ) -> StreamingResponse:
-    """Start a new autonomous development project."""
+    """Start a new autonomous development project.
+
+    The project keeps running if the client disconnects; reattach with
+    GET /projects/{project_id}/events.
+    """
     # Determine workspace path
     if request.workspace_path:
         workspace = Path(request.workspace_path)
@@ -147,7 +154,7 @@ async def start_project(
     db.add(db_project)
     await db.commit()
 
-    async def generate():
+    async def respond(db: AsyncSession):
         """Generate SSE stream."""
         orchestrator = Orchestrator(project)
 
@@ -182,14 +189,33 @@ async def start_project(
 
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Project-ID": project.id,
-        },
+    async def generate():
+        """Run the project with its own database session.
+
+        The run outlives the request, so it must not keep writing through
+        the request-scoped ``db``.
+        """
+        async with async_session_factory() as run_db:
+            async with aclosing(respond(run_db)) as frames:
+                async for frame in frames:
+                    yield frame
+
+    log = sse_streams.open(f"autonomous:{project.id}", generate())
+    return stream_response(log, headers={"X-Project-ID": project.id})
+
+
+@router.get("/projects/{project_id}/events")
+async def stream_project_events(project_id: str, request: Request) -> StreamingResponse:
+    """Reattach to a project's event stream.
+
+    Replays events after Last-Event-ID (header or ``last_event_id`` query
+    param), then follows the stream until the project stops.
+    """
+    log = sse_streams.get(f"autonomous:{project_id}")
+    if not log:
+        raise HTTPException(status_code=404, detail="Stream not found")
+    return stream_response(
+        log, after=last_event_id(request) or 0, headers={"X-Project-ID": project_id}
     )
 
 
@@ -853,13 +879,20 @@ async def get_run_state(run_id: str) -> dict:
 
 
 @router.post("/runs/{run_id}/resume")
-async def resume_run(run_id: str) -> StreamingResponse:
+async def resume_run(run_id: str, request: Request) -> StreamingResponse:
     """Resume a paused orchestration run.
 
-    Loads state from database and continues execution.
+    Loads state from database and continues execution. Sent again with a
+    Last-Event-ID header, reattaches to the resumed run's stream instead.
     """
     from app.autonomous.persistent_engine import get_persistent_engine
 
+    resume_from = last_event_id(request)
+    log = sse_streams.get(f"run:{run_id}")
+    if resume_from is not None and log:
+        # Also after the run finished, so the client still gets the final events
+        return stream_response(log, after=resume_from, headers={"X-Run-ID": run_id})
+
     engine = get_persistent_engine()
     status = await engine.get_run_status(run_id)
 
@@ -877,15 +910,17 @@ async def resume_run(run_id: str) -> StreamingResponse:
             yield event.to_sse()
         yield "data: [DONE]\n\n"
 
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Run-ID": run_id,
-        },
-    )
+    log = sse_streams.open(f"run:{run_id}", generate())
+    return stream_response(log, headers={"X-Run-ID": run_id})
+
+
+@router.get("/runs/{run_id}/events")
+async def stream_run_events(run_id: str, request: Request) -> StreamingResponse:
+    """Reattach to a resumed run's event stream after Last-Event-ID."""
+    log = sse_streams.get(f"run:{run_id}")
+    if not log:
+        raise HTTPException(status_code=404, detail="Stream not found")
+    return stream_response(log, after=last_event_id(request) or 0, headers={"X-Run-ID": run_id})
 
 
 @router.post("/runs/{run_id}/pause")
@@ -5,6 +5,7 @@ import re
 import uuid
 import asyncio
 import logging
+from contextlib import aclosing
 from datetime import datetime
 from typing import Any
 
@@ -26,7 +27,7 @@ from app.agents.base import Message, convert_numbered_lines_to_codeblock
 from app.commands import command_registry
 from app.database import Message as DBMessage
 from app.database import Session as DBSession
-from app.database import get_db
+from app.database import async_session_factory, get_db
 from app.subagents.runner import subagent_runner
 from app.subagents.manager import subagent_manager, TaskStatus
 from app.audit import audit_logger
@@ -44,7 +45,7 @@ from app.workflows.delivery_loop import (
     UserDecisionType,
     UserDecisionResponse,
 )
-from app.utils.stream import keep_alive_generator
+from app.utils.sse_replay import last_event_id, sse_streams, stream_response
 from app.workflows.router import (
     classify_message_sync,
     handle_clarification_response,
@@ -624,7 +625,20 @@ async def chat(
     chat_request: ChatRequest,
     db: AsyncSession = Depends(get_db),
 ) -> StreamingResponse:
-    """Send a message and stream the response."""
+    """Send a message and stream the response.
+
+    A client that lost the stream can re-send the request with a
+    Last-Event-ID header to continue the session's current stream from that
+    event instead of running the message again.
+    """
+    resume_from = last_event_id(request)
+    if resume_from is not None:
+        session_id = chat_request.session_id
+        log = sse_streams.get(f"chat:{session_id}") if session_id else None
+        if not log:
+            raise HTTPException(status_code=404, detail="Stream not found")
+        return stream_response(log, after=resume_from, headers={"X-Session-ID": session_id})
+
     # Get agent (use specified or registry default)
     if chat_request.agent_id:
         agent = agent_registry.get(chat_request.agent_id)
@@ -814,7 +828,7 @@ async def chat(
         logger.error(f"Database error saving user message: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to save message")
 
-    async def generate():
+    async def respond(db: AsyncSession, session: DBSession):
         """Generate streaming response."""
         # Send initial ping to confirm stream start
         yield 'data: {"type": "ping"}\n\n'
@@ -1973,17 +1987,36 @@ async def chat(
 
         yield "data: [DONE]\n\n"
 
+    async def generate():
+        """Run the response in its own database session.
 
+        The run outlives the request, so it must not keep writing through
+        the request-scoped ``db``.
+        """
+        async with async_session_factory() as run_db:
+            async with run_db.begin():
+                run_session = await run_db.merge(session)
+            async with aclosing(respond(run_db, run_session)) as frames:
+                async for frame in frames:
+                    yield frame
 
-    return StreamingResponse(
-        keep_alive_generator(generate()),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Session-ID": session.id,
-            "X-Agent-ID": agent_id,
-        },
+    # The run outlives the connection; clients reconnect with Last-Event-ID
+    log = sse_streams.open(f"chat:{session.id}", generate())
+    return stream_response(log, headers={"X-Session-ID": session.id, "X-Agent-ID": agent_id})
+
+
+@router.get("/sessions/{session_id}/stream")
+async def stream_session(session_id: str, request: Request) -> StreamingResponse:
+    """Reattach to a session's current response stream.
+
+    Replays events after Last-Event-ID (header or ``last_event_id`` query
+    param), then follows the stream until it finishes.
+    """
+    log = sse_streams.get(f"chat:{session_id}")
+    if not log:
+        raise HTTPException(status_code=404, detail="Stream not found")
+    return stream_response(
+        log, after=last_event_id(request) or 0, headers={"X-Session-ID": session_id}
     )
 
 
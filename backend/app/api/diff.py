@@ -1,12 +1,13 @@
 """Diff API endpoints."""
 
-import difflib
 import logging
 from typing import Any
 
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from app.utils.diff_service import diff_service
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/diff", tags=["diff"])
@@ -30,26 +31,17 @@ class DiffResponse(BaseModel):
 @router.post("")
 async def generate_diff(request: DiffRequest) -> DiffResponse:
     """Generate a unified diff between two strings."""
-    original_lines = request.original.splitlines(keepends=True)
-    modified_lines = request.modified.splitlines(keepends=True)
-
-    diff = difflib.unified_diff(
-        original_lines,
-        modified_lines,
+    result = await diff_service.unified_diff(
+        request.original,
+        request.modified,
         fromfile="Original",
         tofile="Modified",
-        n=request.context_lines,
+        context=request.context_lines,
     )
-    
-    diff_text = "".join(diff)
-    
-    # Calculate stats
-    added = sum(1 for line in diff_text.splitlines() if line.startswith("+") and not line.startswith("+++"))
-    removed = sum(1 for line in diff_text.splitlines() if line.startswith("-") and not line.startswith("---"))
-    
+
     return DiffResponse(
-        diff_text=diff_text,
-        added_count=added,
-        removed_count=removed,
+        diff_text=result.text,
+        added_count=result.added,
+        removed_count=result.removed,
         is_identical=request.original == request.modified,
     )
@@ -22,6 +22,9 @@ from app.projects import (
     context_pack_exists,
     context_pack_is_stale,
     ContextPack,
+    search_index_manager,
+    symbol_index_manager,
+    UnsupportedQueryError,
 )
 
 logger = logging.getLogger(__name__)
@@ -352,6 +355,7 @@ class SearchResult(BaseModel):
     total_matches: int
     files_searched: int
     truncated: bool = False  # True if results were limited
+    engine: str = "ripgrep"  # "index" when served by the trigram index
 
 
 class SearchRequest(BaseModel):
@@ -363,6 +367,53 @@ class SearchRequest(BaseModel):
     case_sensitive: bool = Field(default=False, description="Case sensitive search")
 
 
+async def _run_index_search(
+    name: str,
+    query: str,
+    project_path: str,
+    file_pattern: str = "",
+    context_lines: int = 2,
+    max_results: int = 50,
+    case_sensitive: bool = False,
+) -> tuple[list[SearchMatch], int, bool] | None:
+    """Search using the project's trigram index.
+
+    Returns None if the project has not been indexed yet or the query
+    cannot be evaluated by the index, so the caller can fall back to ripgrep.
+    """
+    try:
+        result = await asyncio.to_thread(
+            search_index_manager.search,
+            name,
+            project_path,
+            query,
+            file_pattern,
+            context_lines,
+            max_results,
+            case_sensitive,
+        )
+    except UnsupportedQueryError:
+        return None
+    except Exception as e:
+        logger.warning(f"Index search failed for {name}, falling back to ripgrep: {e}")
+        return None
+
+    if result is None:
+        return None
+
+    matches = [
+        SearchMatch(
+            file=m.file,
+            line_number=m.line_number,
+            content=m.content,
+            context_before=m.context_before,
+            context_after=m.context_after,
+        )
+        for m in result.matches
+    ]
+    return matches, result.files_searched, result.truncated
+
+
 async def _run_ripgrep(
     query: str,
     project_path: str,
@@ -591,10 +642,11 @@ async def _run_grep_fallback(
 
 @router.post("/{name}/search", response_model=SearchResult)
 async def search_project(name: str, request: SearchRequest) -> SearchResult:
-    """Search for code in a project using ripgrep.
+    """Search for code in a project.
 
-    Performs fast regex search across project files.
-    Returns matches with context lines and file paths.
+    Uses the project's trigram index (built by ingest) to narrow candidate
+    files before regex verification, falling back to ripgrep for projects
+    that have not been indexed. Returns ranked matches with context lines.
 
     Example queries:
     - "def authenticate" - find function definitions
@@ -609,7 +661,8 @@ async def search_project(name: str, request: SearchRequest) -> SearchResult:
     if not project_path.exists():
         raise HTTPException(status_code=400, detail=f"Project path does not exist: {project.path}")
 
-    matches, files_searched, truncated = await _run_ripgrep(
+    engine = "index"
+    search_args = dict(
         query=request.query,
         project_path=str(project_path),
         file_pattern=request.file_pattern,
@@ -617,6 +670,12 @@ async def search_project(name: str, request: SearchRequest) -> SearchResult:
         max_results=request.max_results,
         case_sensitive=request.case_sensitive,
     )
+    indexed = await _run_index_search(name, **search_args)
+    if indexed is not None:
+        matches, files_searched, truncated = indexed
+    else:
+        engine = "ripgrep"
+        matches, files_searched, truncated = await _run_ripgrep(**search_args)
 
     return SearchResult(
         query=request.query,
@@ -626,6 +685,7 @@ async def search_project(name: str, request: SearchRequest) -> SearchResult:
         total_matches=len(matches),
         files_searched=files_searched,
         truncated=truncated,
+        engine=engine,
     )
 
 
@@ -687,6 +747,8 @@ class IngestResponse(BaseModel):
     module_count: int
     entrypoint_count: int
     was_regenerated: bool
+    indexed_files: int = 0  # Files in the trigram search index
+    indexed_symbols: int = 0  # Definitions in the symbol index
 
 
 @router.get("/{name}/context-pack", response_model=ContextPackResponse)
@@ -730,6 +792,8 @@ async def ingest_project(name: str, request: IngestRequest | None = None) -> Ing
     - MODULE_MAP.json (folder -> domain mapping)
     - ENTRYPOINTS.json (main files)
     - ARCHITECTURE.md (optional, requires LLM)
+    - search_index.json (trigram index, updated incrementally)
+    - symbol_index.json (definitions/imports/calls, updated incrementally)
     """
     request = request or IngestRequest()
 
@@ -755,6 +819,8 @@ async def ingest_project(name: str, request: IngestRequest | None = None) -> Ing
                     module_count=len(pack.module_map),
                     entrypoint_count=len(pack.entrypoints),
                     was_regenerated=False,
+                    indexed_files=await _update_search_index(name, project_path),
+                    indexed_symbols=await _update_symbol_index(name, project_path),
                 )
 
     # Generate new context pack
@@ -774,6 +840,82 @@ async def ingest_project(name: str, request: IngestRequest | None = None) -> Ing
         module_count=len(pack.module_map),
         entrypoint_count=len(pack.entrypoints),
         was_regenerated=was_regenerated,
+        indexed_files=await _update_search_index(name, project_path),
+        indexed_symbols=await _update_symbol_index(name, project_path),
+    )
+
+
+async def _update_search_index(name: str, project_path: Path) -> int:
+    """Build or incrementally update a project's search index.
+
+    Index failures are logged, not raised - search falls back to ripgrep.
+    Returns the number of indexed files.
+    """
+    try:
+        stats = await asyncio.to_thread(search_index_manager.build, name, str(project_path))
+        return stats["files"]
+    except Exception as e:
+        logger.warning(f"Failed to update search index for {name}: {e}")
+        return 0
+
+
+async def _update_symbol_index(name: str, project_path: Path) -> int:
+    """Build or incrementally update a project's symbol index.
+
+    Returns the number of indexed definitions (0 on failure).
+    """
+    try:
+        stats = await asyncio.to_thread(symbol_index_manager.build, name, str(project_path))
+        return stats["symbols"]
+    except Exception as e:
+        logger.warning(f"Failed to update symbol index for {name}: {e}")
+        return 0
+
+
+class SymbolLookupResponse(BaseModel):
+    """Symbol lookup results."""
+    project_name: str
+    query: str
+    definitions: list[dict] = Field(default_factory=list)
+    references: list[dict] = Field(default_factory=list)
+
+
+@router.get("/{name}/symbols", response_model=SymbolLookupResponse)
+async def lookup_symbols(
+    name: str,
+    q: str = Query(
+        ..., min_length=1, description="Symbol name (e.g. 'login' or 'AuthService.refresh')"
+    ),
+    kind: str = Query(default="", description="Filter definitions by kind"),
+    references: bool = Query(default=False, description="Include imports and call sites"),
+    fuzzy: bool = Query(default=False, description="Substring search instead of exact name"),
+    limit: int = Query(default=50, ge=1, le=500, description="Max results per list"),
+) -> SymbolLookupResponse:
+    """Look up symbol definitions (and optionally references) in a project.
+
+    Requires the project to have been ingested.
+    """
+    project = project_registry.get(name)
+    if not project:
+        raise HTTPException(status_code=404, detail=f"Project not found: {name}")
+
+    index = await asyncio.to_thread(symbol_index_manager.get_fresh, name, project.path)
+    if index is None:
+        raise HTTPException(
+            status_code=404, detail=f"No symbol index for project: {name}. Run ingest first."
+        )
+
+    if fuzzy:
+        definitions = index.search(q, kind=kind or None, limit=limit)
+    else:
+        definitions = index.find_definitions(q, kind=kind or None, limit=limit)
+    refs = index.find_references(q, limit=limit) if references else []
+
+    return SymbolLookupResponse(
+        project_name=name,
+        query=q,
+        definitions=[d.to_dict() for d in definitions],
+        references=[r.to_dict() for r in refs],
     )
 
 
@@ -1,6 +1,7 @@
 """Tools API endpoints."""
 
 import logging
+from datetime import timedelta
 from typing import Any
 
 from fastapi import APIRouter, Query
@@ -107,6 +108,19 @@ async def get_single_tool_metrics(tool_id: str) -> dict[str, Any]:
     return tool_executor.get_metrics(tool_id)
 
 
+@router.get("/{tool_id}/latency")
+async def get_tool_latency(
+    tool_id: str,
+    window_minutes: int | None = Query(default=None, ge=1),
+) -> dict[str, Any]:
+    """Get duration percentiles (ms) for a tool over a trailing window.
+
+    Omit window_minutes for all recorded history.
+    """
+    window = timedelta(minutes=window_minutes) if window_minutes else None
+    return tool_executor.get_latency(tool_id, window)
+
+
 @router.get("/{tool_id}/rate-limit")
 async def get_tool_rate_limit(tool_id: str) -> dict[str, Any]:
     """Get rate limit status for a specific tool."""
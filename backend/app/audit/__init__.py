@@ -11,6 +11,8 @@ Includes retention and performance features:
 - Configurable retention policies per table
 - Size limiting with truncation and hash preservation
 - Optional gzip compression for large diffs
+- Content-addressed, deduplicated blob store for large payloads
+- Size-rolled, compressed and indexed JSONL segments for the file backend
 - Compound indexes for common query patterns
 """
 
@@ -24,6 +26,8 @@ from app.audit.models import (
     FileAuditEvent,
 )
 from app.audit.logger import AuditLogger, audit_logger
+from app.audit.segments import SegmentStore
+from app.audit.blob_store import BlobStore, audit_blob_store
 from app.audit.retention import (
     RetentionConfig,
     TableRetentionPolicy,
@@ -38,6 +42,7 @@ from app.audit.retention import (
     truncate_error,
     truncate_params,
 )
+from app.audit.purge import PurgeProgress, RetentionPurger
 
 __all__ = [
     # Event models
@@ -51,6 +56,10 @@ __all__ = [
     # Logger
     "AuditLogger",
     "audit_logger",
+    "SegmentStore",
+    # Blob store
+    "BlobStore",
+    "audit_blob_store",
     # Retention
     "RetentionConfig",
     "TableRetentionPolicy",
@@ -59,6 +68,8 @@ __all__ = [
     "purge_old_records",
     "purge_all_tables",
     "get_table_stats",
+    "RetentionPurger",
+    "PurgeProgress",
     # Compression/truncation
     "compress_diff",
     "decompress_diff",
@@ -0,0 +1,471 @@
+"""Content-addressed blob store for audit payloads.
+
+Large audit payloads (file diffs, LLM prompt and response bodies) are
+stored once per distinct content in ``audit_blobs``, keyed by the SHA-256
+the audit rows already record (``diff_original_hash``, ``content_hash``).
+The row itself keeps a short ``BLOB:<sha256>`` reference instead of the
+inline text, so a system prompt repeated across thousands of exchanges
+costs one blob plus a refcount.
+
+Payloads are stored as raw compressed bytes (no base64):
+- zstd with a dictionary trained per payload kind when the optional
+  ``zstandard`` package is installed
+- zlib with a preset dictionary built from the same samples otherwise
+
+Dictionaries are persisted in ``audit_blob_dictionaries`` and referenced
+by id from each blob, so blobs stay readable after a retrain. Retention
+releases references for purged rows and garbage-collects blobs whose
+refcount drops to zero.
+"""
+
+import hashlib
+import logging
+import zlib
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AuditBlob, AuditBlobDictionary, async_session_factory
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+BLOB_PREFIX = "BLOB:"
+
+# Payload kinds (one dictionary each)
+BLOB_KIND_DIFF = "diff"
+BLOB_KIND_LLM_REQUEST = "llm_request"
+BLOB_KIND_LLM_RESPONSE = "llm_response"
+
+# Dictionary training
+DICT_TRAIN_SAMPLES = 200  # Distinct payloads collected before training
+DICT_SAMPLE_MAX_BYTES = 64 * 1024  # Per-sample cap when collecting
+ZSTD_DICT_SIZE = 112 * 1024
+ZLIB_DICT_SIZE = 32 * 1024  # zlib window size; larger preset dicts are ignored
+
+# Compression
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+MIN_COMPRESS_SIZE = 64  # Smaller payloads are stored raw
+
+
+def blob_ref(content_hash: str) -> str:
+    """Build the inline reference stored in an audit row."""
+    return f"{BLOB_PREFIX}{content_hash}"
+
+
+def parse_blob_ref(value: str | None) -> str | None:
+    """Return the blob hash if value is a blob reference, else None."""
+    if value and value.startswith(BLOB_PREFIX):
+        return value[len(BLOB_PREFIX):]
+    return None
+
+
+def _build_zlib_dictionary(samples: list[bytes], size: int = ZLIB_DICT_SIZE) -> bytes:
+    """Build a zlib preset dictionary from sample payloads.
+
+    Lines shared by several samples are the ones back-references can reuse.
+    zlib favours matches near the end of the dictionary, so the most common
+    lines go last.
+    """
+    counts: Counter[bytes] = Counter()
+    for sample in samples:
+        counts.update(set(sample.splitlines(keepends=True)))
+
+    common = [line for line, n in counts.most_common() if n > 1 and len(line) > 8]
+    parts: list[bytes] = []
+    total = 0
+    for line in common:
+        if total + len(line) > size:
+            break
+        parts.append(line)
+        total += len(line)
+    return b"".join(reversed(parts))
+
+
+@dataclass
+class _Dictionary:
+    """A loaded compression dictionary."""
+
+    id: int
+    kind: str
+    codec: str
+    data: bytes
+    _zstd: Any = None
+
+    def zstd_dict(self) -> Any:
+        if self._zstd is None:
+            self._zstd = zstandard.ZstdCompressionDict(self.data)
+        return self._zstd
+
+
+class BlobStore:
+    """Deduplicating, reference-counted store for audit payloads.
+
+    All methods accept an optional session. Writes made through a caller's
+    session are committed by the caller together with the referencing row.
+    """
+
+    def __init__(
+        self,
+        train_samples: int = DICT_TRAIN_SAMPLES,
+        use_zstd: bool | None = None,
+    ) -> None:
+        self.train_samples = train_samples
+        self.codec = "zstd" if (ZSTD_AVAILABLE if use_zstd is None else use_zstd) else "zlib"
+
+        self._dictionaries: dict[int, _Dictionary] = {}
+        self._active: dict[str, int | None] = {}  # kind -> dictionary id (loaded lazily)
+        self._samples: dict[str, list[bytes]] = defaultdict(list)
+
+        # Stats
+        self._puts = 0
+        self._dedup_hits = 0
+        self._bytes_in = 0
+        self._bytes_stored = 0
+
+    # =========================================================================
+    # Encoding
+    # =========================================================================
+
+    def _encode(self, raw: bytes, dictionary: _Dictionary | None) -> tuple[str, bytes]:
+        if len(raw) < MIN_COMPRESS_SIZE:
+            return "raw", raw
+
+        if self.codec == "zstd":
+            if dictionary:
+                compressor = zstandard.ZstdCompressor(
+                    level=ZSTD_LEVEL, dict_data=dictionary.zstd_dict()
+                )
+            else:
+                compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            data = compressor.compress(raw)
+        else:
+            if dictionary:
+                compressor = zlib.compressobj(ZLIB_LEVEL, zdict=dictionary.data)
+            else:
+                compressor = zlib.compressobj(ZLIB_LEVEL)
+            data = compressor.compress(raw) + compressor.flush()
+
+        if len(data) >= len(raw):
+            return "raw", raw
+        return self.codec, data
+
+    @staticmethod
+    def _decode(codec: str, data: bytes, dictionary: _Dictionary | None) -> bytes:
+        if codec == "raw":
+            return data
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd audit blobs")
+            if dictionary:
+                decompressor = zstandard.ZstdDecompressor(dict_data=dictionary.zstd_dict())
+            else:
+                decompressor = zstandard.ZstdDecompressor()
+            return decompressor.decompress(data)
+        if codec == "zlib":
+            if dictionary:
+                decompressor = zlib.decompressobj(zdict=dictionary.data)
+            else:
+                decompressor = zlib.decompressobj()
+            return decompressor.decompress(data) + decompressor.flush()
+        raise ValueError(f"Unknown blob codec: {codec}")
+
+    # =========================================================================
+    # Dictionaries
+    # =========================================================================
+
+    async def _active_dictionary(self, session: AsyncSession, kind: str) -> _Dictionary | None:
+        """Get the newest dictionary for kind usable with the current codec."""
+        if kind not in self._active:
+            result = await session.execute(
+                select(AuditBlobDictionary)
+                .where(AuditBlobDictionary.kind == kind, AuditBlobDictionary.codec == self.codec)
+                .order_by(AuditBlobDictionary.id.desc())
+                .limit(1)
+            )
+            row = result.scalar_one_or_none()
+            self._active[kind] = row.id if row else None
+            if row:
+                self._dictionaries[row.id] = _Dictionary(row.id, row.kind, row.codec, row.data)
+
+        dict_id = self._active[kind]
+        return self._dictionaries.get(dict_id) if dict_id is not None else None
+
+    async def _get_dictionary(
+        self, session: AsyncSession, dict_id: int | None
+    ) -> _Dictionary | None:
+        if dict_id is None:
+            return None
+        if dict_id not in self._dictionaries:
+            row = await session.get(AuditBlobDictionary, dict_id)
+            if row is None:
+                raise LookupError(f"Audit blob dictionary {dict_id} is missing")
+            self._dictionaries[dict_id] = _Dictionary(row.id, row.kind, row.codec, row.data)
+        return self._dictionaries[dict_id]
+
+    async def train_dictionary(self, kind: str, db: AsyncSession | None = None) -> int | None:
+        """Train a dictionary for kind from the collected samples.
+
+        Returns:
+            The new dictionary id, or None if there were too few samples
+        """
+        samples = self._samples.get(kind) or []
+        if len(samples) < 2:
+            return None
+
+        try:
+            if self.codec == "zstd":
+                data = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+            else:
+                data = _build_zlib_dictionary(samples)
+        except Exception as e:
+            logger.warning(f"Dictionary training for {kind} blobs failed: {e}")
+            self._samples.pop(kind, None)
+            return None
+
+        self._samples.pop(kind, None)
+        if not data:
+            return None
+
+        session_cm = async_session_factory() if db is None else nullcontext(db)
+        async with session_cm as session:
+            row = AuditBlobDictionary(
+                kind=kind, codec=self.codec, data=data, sample_count=len(samples)
+            )
+            session.add(row)
+            await session.flush()
+            if db is None:
+                await session.commit()
+
+        # Re-read on the next put rather than caching: if the caller's
+        # transaction rolls back, the row (and its id) never existed.
+        self._active.pop(kind, None)
+        logger.info(
+            f"Trained {self.codec} dictionary {row.id} for {kind} blobs ({len(data)} bytes)"
+        )
+        return row.id
+
+    def _collect_sample(self, kind: str, raw: bytes) -> bool:
+        """Keep raw as a training sample. Returns True when enough are collected."""
+        samples = self._samples[kind]
+        samples.append(raw[:DICT_SAMPLE_MAX_BYTES])
+        return len(samples) >= self.train_samples
+
+    # =========================================================================
+    # Blob operations
+    # =========================================================================
+
+    async def put(
+        self,
+        kind: str,
+        content: str,
+        content_hash: str | None = None,
+        db: AsyncSession | None = None,
+    ) -> str:
+        """Store content (or add a reference to an existing copy).
+
+        Args:
+            kind: Payload kind, used to pick the compression dictionary
+            content: Uncompressed payload
+            content_hash: SHA-256 of content if the caller already has it
+            db: Optional session; the caller commits
+
+        Returns:
+            The content hash
+        """
+        raw = content.encode("utf-8")
+        content_hash = content_hash or hashlib.sha256(raw).hexdigest()
+        self._puts += 1
+        self._bytes_in += len(raw)
+
+        session_cm = async_session_factory() if db is None else nullcontext(db)
+        async with session_cm as session:
+            # Fast path: already stored, only the refcount changes
+            result = await session.execute(
+                update(AuditBlob)
+                .where(AuditBlob.hash == content_hash)
+                .values(refcount=AuditBlob.refcount + 1)
+            )
+            if result.rowcount:
+                self._dedup_hits += 1
+            else:
+                dictionary = await self._active_dictionary(session, kind)
+                codec, data = self._encode(raw, dictionary)
+                dict_id = dictionary.id if dictionary and codec != "raw" else None
+
+                # A concurrent writer may insert the same hash first
+                stmt = sqlite_insert(AuditBlob).values(
+                    hash=content_hash,
+                    kind=kind,
+                    codec=codec,
+                    dictionary_id=dict_id,
+                    data=data,
+                    size=len(raw),
+                    stored_size=len(data),
+                    refcount=1,
+                ).on_conflict_do_update(
+                    index_elements=[AuditBlob.hash],
+                    set_={"refcount": AuditBlob.refcount + 1},
+                )
+                await session.execute(stmt)
+                self._bytes_stored += len(data)
+
+                if dictionary is None and self._collect_sample(kind, raw):
+                    await self.train_dictionary(kind, db=session)
+
+            if db is None:
+                await session.commit()
+
+        return content_hash
+
+    async def get_many(
+        self,
+        hashes: Iterable[str],
+        db: AsyncSession | None = None,
+    ) -> dict[str, str]:
+        """Load and decompress several blobs. Missing hashes are omitted."""
+        wanted = list(set(hashes))
+        if not wanted:
+            return {}
+
+        contents: dict[str, str] = {}
+        session_cm = async_session_factory() if db is None else nullcontext(db)
+        async with session_cm as session:
+            result = await session.execute(
+                select(
+                    AuditBlob.hash, AuditBlob.codec, AuditBlob.dictionary_id, AuditBlob.data
+                ).where(AuditBlob.hash.in_(wanted))
+            )
+            for content_hash, codec, dict_id, data in result.all():
+                try:
+                    dictionary = await self._get_dictionary(session, dict_id)
+                    contents[content_hash] = self._decode(codec, data, dictionary).decode("utf-8")
+                except Exception as e:
+                    logger.warning(f"Failed to decode audit blob {content_hash[:16]}: {e}")
+        return contents
+
+    async def get(self, content_hash: str, db: AsyncSession | None = None) -> str | None:
+        """Load and decompress one blob."""
+        return (await self.get_many([content_hash], db=db)).get(content_hash)
+
+    async def release(self, hashes: Iterable[str], db: AsyncSession | None = None) -> int:
+        """Drop one reference per occurrence of each hash.
+
+        Returns:
+            Number of references released
+        """
+        counts = Counter(hashes)
+        if not counts:
+            return 0
+
+        # One UPDATE per distinct decrement amount
+        by_amount: dict[int, list[str]] = defaultdict(list)
+        for content_hash, n in counts.items():
+            by_amount[n].append(content_hash)
+
+        session_cm = async_session_factory() if db is None else nullcontext(db)
+        async with session_cm as session:
+            for amount, group in by_amount.items():
+                await session.execute(
+                    update(AuditBlob)
+                    .where(AuditBlob.hash.in_(group))
+                    .values(refcount=AuditBlob.refcount - amount)
+                )
+            if db is None:
+                await session.commit()
+
+        return sum(counts.values())
+
+    async def gc(
+        self,
+        db: AsyncSession | None = None,
+        hashes: Iterable[str] | None = None,
+    ) -> int:
+        """Delete blobs that are no longer referenced.
+
+        Args:
+            db: Optional session; the caller commits
+            hashes: Only consider these blobs (e.g. those just released)
+
+        Returns:
+            Number of blobs deleted
+        """
+        stmt = delete(AuditBlob).where(AuditBlob.refcount <= 0)
+        if hashes is not None:
+            stmt = stmt.where(AuditBlob.hash.in_(set(hashes)))
+
+        session_cm = async_session_factory() if db is None else nullcontext(db)
+        async with session_cm as session:
+            result = await session.execute(stmt)
+            if db is None:
+                await session.commit()
+
+        deleted = result.rowcount or 0
+        if deleted:
+            logger.info(f"Garbage-collected {deleted} unreferenced audit blobs")
+        return deleted
+
+    async def resolve(self, value: str | None, db: AsyncSession | None = None) -> str | None:
+        """Expand a stored audit payload (blob reference or GZIP diff)."""
+        content_hash = parse_blob_ref(value)
+        if content_hash is None:
+            from app.audit.retention import decompress_diff
+
+            return decompress_diff(value)
+        content = await self.get(content_hash, db=db)
+        return content if content is not None else value
+
+    # =========================================================================
+    # Stats
+    # =========================================================================
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get in-process write statistics."""
+        return {
+            "codec": self.codec,
+            "puts": self._puts,
+            "dedup_hits": self._dedup_hits,
+            "bytes_in": self._bytes_in,
+            "bytes_stored": self._bytes_stored,
+            "dictionaries": {k: v for k, v in self._active.items() if v is not None},
+        }
+
+    async def get_storage_stats(self, db: AsyncSession | None = None) -> dict[str, Any]:
+        """Get blob counts and sizes per kind from the database."""
+        session_cm = async_session_factory() if db is None else nullcontext(db)
+        async with session_cm as session:
+            result = await session.execute(
+                select(
+                    AuditBlob.kind,
+                    func.count(AuditBlob.hash),
+                    func.sum(AuditBlob.size),
+                    func.sum(AuditBlob.stored_size),
+                    func.sum(AuditBlob.refcount),
+                ).group_by(AuditBlob.kind)
+            )
+            return {
+                kind: {
+                    "blobs": count,
+                    "size": size or 0,
+                    "stored_size": stored or 0,
+                    "references": refs or 0,
+                }
+                for kind, count, size, stored, refs in result.all()
+            }
+
+
+# Global blob store
+audit_blob_store = BlobStore()
@@ -1,22 +1,23 @@
 """Audit logger with file and database backends."""
 
 import asyncio
-import json
 import logging
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from app.audit.models import (
-    AuditEvent,
+    AgentAuditEvent,
     AuditCategory,
+    AuditEvent,
     AuditSeverity,
     ChatAuditEvent,
-    AgentAuditEvent,
-    ToolAuditEvent,
     FileAuditEvent,
+    ToolAuditEvent,
 )
+from app.audit.segments import DEFAULT_MAX_SEGMENT_BYTES, SegmentStore
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +26,10 @@ class AuditLogger:
     """Centralized audit logging with multiple backends.
 
     Supports:
-    - File-based logging (JSON lines format)
+    - File-based logging (size-rolled, compressed, indexed JSONL segments)
     - In-memory buffer for recent events
     - Database persistence (optional)
-    - Async write to avoid blocking
+    - Writes on a dedicated background thread to avoid blocking
     """
 
     def __init__(
@@ -36,9 +37,13 @@ class AuditLogger:
         log_dir: Path | None = None,
         buffer_size: int = 1000,
         flush_interval: float = 5.0,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
     ):
         self._log_dir = log_dir or Path.home() / ".maratos" / "audit"
         self._log_dir.mkdir(parents=True, exist_ok=True)
+        self._segments = SegmentStore(self._log_dir, max_segment_bytes=max_segment_bytes)
+        # One writer thread keeps appends, rolls and compression ordered
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-writer")
 
         self._buffer: deque[AuditEvent] = deque(maxlen=buffer_size)
         self._write_buffer: list[AuditEvent] = []
@@ -52,6 +57,9 @@ class AuditLogger:
         if self._started:
             return
         self._started = True
+        # Loading indexes (and compressing legacy files) is file I/O: keep it
+        # off the event loop, on the writer thread that owns the segments
+        await asyncio.get_running_loop().run_in_executor(self._writer, self._segments.open)
         self._flush_task = asyncio.create_task(self._flush_loop())
         logger.info(f"Audit logger started, writing to {self._log_dir}")
 
@@ -67,6 +75,7 @@ class AuditLogger:
             except asyncio.CancelledError:
                 pass
         await self._flush_to_file()
+        await asyncio.get_running_loop().run_in_executor(self._writer, self._segments.close)
         logger.info("Audit logger stopped")
 
     async def _flush_loop(self) -> None:
@@ -89,19 +98,15 @@ class AuditLogger:
             events = self._write_buffer.copy()
             self._write_buffer.clear()
 
-        # Write to daily log file
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        log_file = self._log_dir / f"audit-{today}.jsonl"
-
         try:
-            with open(log_file, "a") as f:
-                for event in events:
-                    f.write(event.to_json() + "\n")
+            await asyncio.get_running_loop().run_in_executor(
+                self._writer, self._segments.append, events
+            )
         except Exception as e:
             logger.error(f"Failed to write audit log: {e}")
             # Re-add events to buffer
             async with self._lock:
-                self._write_buffer.extend(events)
+                self._write_buffer[:0] = events
 
     def log(self, event: AuditEvent) -> None:
         """Log an audit event (synchronous, non-blocking)."""
@@ -335,47 +340,30 @@ class AuditLogger:
         session_id: str | None = None,
         limit: int = 1000,
     ) -> list[dict[str, Any]]:
-        """Query events from log files."""
-        events = []
+        """Query events from log files.
 
+        Dates match at day granularity. The segment indexes narrow the
+        search to segments in range and to records for the requested
+        category/session, so only those records are read and parsed.
+        """
         # Determine date range
         if not start_date:
             start_date = datetime.utcnow().replace(hour=0, minute=0, second=0)
         if not end_date:
             end_date = datetime.utcnow()
 
-        # Find relevant log files
-        current = start_date
-        while current <= end_date:
-            date_str = current.strftime("%Y-%m-%d")
-            log_file = self._log_dir / f"audit-{date_str}.jsonl"
-
-            if log_file.exists():
-                try:
-                    with open(log_file, "r") as f:
-                        for line in f:
-                            try:
-                                event = json.loads(line)
-
-                                # Filter
-                                if category and event.get("category") != category.value:
-                                    continue
-                                if session_id and event.get("session_id") != session_id:
-                                    continue
-
-                                events.append(event)
-
-                                if len(events) >= limit:
-                                    return events
-                            except json.JSONDecodeError:
-                                continue
-                except Exception as e:
-                    logger.error(f"Error reading audit log {log_file}: {e}")
-
-            from datetime import timedelta
-            current += timedelta(days=1)
-
-        return events
+        return await asyncio.to_thread(
+            self._segments.query,
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d"),
+            category=category.value if category else None,
+            session_id=session_id,
+            limit=limit,
+        )
+
+    async def get_storage_stats(self) -> dict[str, Any]:
+        """Get segment counts and on-disk sizes for the file backend."""
+        return await asyncio.to_thread(self._segments.get_stats)
 
 
 # Global audit logger instance
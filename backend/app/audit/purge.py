@@ -0,0 +1,333 @@
+"""Chunked, throttled retention purge for audit tables.
+
+A single ``DELETE ... WHERE created_at < cutoff`` holds SQLite's write lock
+for the whole delete and stalls every other writer. The purger instead:
+- deletes in rowid-ordered batches, one short transaction each
+- yields to other writers between batches (``pause_seconds``)
+- stops cleanly once ``time_budget_seconds`` is spent
+- checkpoints the cutoff and rowid cursor per table so the next run
+  resumes where this one stopped
+- reports progress after every batch
+- optionally runs ``PRAGMA incremental_vacuum`` in small steps afterwards
+
+Blob references held by purged rows are released batch by batch.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import delete, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.audit.blob_store import audit_blob_store, parse_blob_ref
+from app.audit.retention import (
+    AUDIT_TABLES,
+    BLOB_REF_COLUMNS,
+    CleanupResult,
+    FullCleanupResult,
+    RetentionConfig,
+    get_retention_config,
+)
+from app.database import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_PAUSE_SECONDS = 0.05
+VACUUM_PAGES_PER_STEP = 1000
+
+_ROWID = literal_column("rowid")
+
+
+@dataclass
+class PurgeProgress:
+    """Progress of one table's purge (also the checkpoint record)."""
+
+    table_name: str
+    retention_days: int
+    cutoff: str  # ISO timestamp, fixed for the whole purge
+    cursor: int = 0  # Last rowid deleted
+    deleted: int = 0
+    batches: int = 0
+    blobs_freed: int = 0
+    completed: bool = False
+    elapsed_seconds: float = 0.0
+
+    @property
+    def cutoff_date(self) -> datetime:
+        return datetime.fromisoformat(self.cutoff)
+
+    def to_result(self, error: str | None = None) -> CleanupResult:
+        return CleanupResult(
+            table_name=self.table_name,
+            deleted_count=self.deleted,
+            cutoff_date=self.cutoff_date,
+            error=error,
+            blobs_freed=self.blobs_freed,
+            batches=self.batches,
+            completed=self.completed,
+        )
+
+
+ProgressCallback = Callable[[PurgeProgress], None]
+
+
+class RetentionPurger:
+    """Batched retention purge with a time budget and resumable checkpoints."""
+
+    def __init__(
+        self,
+        config: RetentionConfig | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+        time_budget_seconds: float | None = None,
+        state_path: Path | None = None,
+        resume: bool = True,
+        on_progress: ProgressCallback | None = None,
+    ):
+        self.config = config or get_retention_config()
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.time_budget_seconds = time_budget_seconds
+        self.state_path = state_path
+        self.on_progress = on_progress
+
+        self._deadline: float | None = None
+        self._state: dict[str, PurgeProgress] = {}
+        if state_path and resume:
+            self._load_state()
+
+    # =========================================================================
+    # Checkpoints
+    # =========================================================================
+
+    def _load_state(self) -> None:
+        try:
+            data = json.loads(self.state_path.read_text())
+            self._state = {
+                name: PurgeProgress(**progress) for name, progress in data.get("tables", {}).items()
+            }
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable purge checkpoint {self.state_path}: {e}")
+            return
+        if self._state:
+            logger.info(f"Resuming audit purge from checkpoint {self.state_path}")
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(
+                {"tables": {name: asdict(p) for name, p in self._state.items()}}, indent=2
+            ))
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            logger.warning(f"Failed to save purge checkpoint: {e}")
+
+    def _clear_state(self) -> None:
+        self._state.clear()
+        if self.state_path:
+            self.state_path.unlink(missing_ok=True)
+
+    def _progress_for(self, table_name: str, retention_days: int) -> PurgeProgress:
+        progress = self._state.get(table_name)
+        if progress is None or progress.retention_days != retention_days:
+            cutoff = datetime.utcnow() - timedelta(days=retention_days)
+            progress = PurgeProgress(table_name, retention_days, cutoff.isoformat())
+            self._state[table_name] = progress
+        return progress
+
+    # =========================================================================
+    # Budget
+    # =========================================================================
+
+    def _start_clock(self) -> None:
+        if self.time_budget_seconds is not None and self._deadline is None:
+            self._deadline = time.monotonic() + self.time_budget_seconds
+
+    def _out_of_time(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    # =========================================================================
+    # Purge
+    # =========================================================================
+
+    async def purge_table(
+        self,
+        table_name: str,
+        retention_days: int,
+        db: AsyncSession | None = None,
+    ) -> CleanupResult:
+        """Purge one table in batches.
+
+        With db, every batch runs in the caller's transaction and the caller
+        commits; otherwise each batch commits on its own.
+        """
+        table_class = AUDIT_TABLES.get(table_name)
+        if table_class is None:
+            return CleanupResult(
+                table_name=table_name,
+                deleted_count=0,
+                cutoff_date=datetime.utcnow() - timedelta(days=retention_days),
+                error=f"Unknown table: {table_name}",
+            )
+
+        self._start_clock()
+        progress = self._progress_for(table_name, retention_days)
+        if progress.completed:
+            return progress.to_result()
+
+        table = table_class.__table__
+        ref_name = BLOB_REF_COLUMNS.get(table_name)
+        columns = [_ROWID] + ([table.c[ref_name]] if ref_name else [])
+        cutoff = progress.cutoff_date
+        started = time.monotonic()
+
+        try:
+            while not self._out_of_time():
+                session_cm = async_session_factory() if db is None else nullcontext(db)
+                async with session_cm as session:
+                    rows = (await session.execute(
+                        select(*columns)
+                        .select_from(table)
+                        .where(table.c.created_at < cutoff, _ROWID > progress.cursor)
+                        .order_by(_ROWID)
+                        .limit(self.batch_size)
+                    )).all()
+                    if not rows:
+                        progress.completed = True
+                        break
+
+                    rowids = [row[0] for row in rows]
+                    await session.execute(delete(table).where(_ROWID.in_(rowids)))
+
+                    blobs_freed = 0
+                    if ref_name:
+                        refs = [h for h in (parse_blob_ref(row[1]) for row in rows) if h]
+                        if refs:
+                            await audit_blob_store.release(refs, db=session)
+                            blobs_freed = await audit_blob_store.gc(db=session, hashes=refs)
+
+                    if db is None:
+                        await session.commit()
+
+                progress.cursor = rowids[-1]
+                progress.deleted += len(rowids)
+                progress.batches += 1
+                progress.blobs_freed += blobs_freed
+                progress.elapsed_seconds += time.monotonic() - started
+                started = time.monotonic()
+                self._save_state()
+                if self.on_progress:
+                    self.on_progress(progress)
+
+                if len(rowids) < self.batch_size:
+                    progress.completed = True
+                    break
+
+                # Yield point: let chat and agent writes take the lock
+                await asyncio.sleep(self.pause_seconds)
+        except Exception as e:
+            logger.error(f"Error purging {table_name}: {e}")
+            self._save_state()
+            return progress.to_result(error=str(e))
+
+        progress.elapsed_seconds += time.monotonic() - started
+        self._save_state()
+        if progress.completed:
+            logger.info(
+                f"Purged {progress.deleted} records from {table_name} "
+                f"older than {retention_days} days in {progress.batches} batches"
+            )
+        else:
+            logger.info(
+                f"Purge of {table_name} paused after {progress.deleted} records "
+                f"(time budget spent)"
+            )
+        return progress.to_result()
+
+    async def run(self) -> FullCleanupResult:
+        """Purge every table in the retention config.
+
+        The checkpoint is removed once all tables complete.
+        """
+        self._start_clock()
+        started = time.monotonic()
+        results = []
+        for table_name, policy in self.config.policies.items():
+            results.append(await self.purge_table(table_name, policy.retention_days))
+
+        completed = all(r.completed and not r.error for r in results)
+        if completed:
+            self._clear_state()
+
+        return FullCleanupResult(
+            results=results,
+            total_deleted=sum(r.deleted_count for r in results),
+            vacuum_run=False,
+            analyze_run=False,
+            completed=completed,
+            elapsed_seconds=time.monotonic() - started,
+        )
+
+    async def incremental_vacuum(self, max_pages: int | None = None) -> int | None:
+        """Return free pages to the OS in small steps.
+
+        Requires ``auto_vacuum = INCREMENTAL`` (see enable_incremental_vacuum).
+
+        Returns:
+            Pages freed, or None when incremental vacuum is unavailable
+        """
+        async with async_session_factory() as session:
+            mode = (await session.execute(text("PRAGMA auto_vacuum"))).scalar()
+            if mode != 2:
+                logger.info("Skipping incremental vacuum: auto_vacuum is not INCREMENTAL")
+                return None
+            free_pages = (await session.execute(text("PRAGMA freelist_count"))).scalar() or 0
+
+        target = free_pages if max_pages is None else min(free_pages, max_pages)
+        requested = 0
+        while requested < target and not self._out_of_time():
+            step = min(VACUUM_PAGES_PER_STEP, target - requested)
+            async with async_session_factory() as session:
+                result = await session.execute(text(f"PRAGMA incremental_vacuum({step})"))
+                if result.returns_rows:
+                    result.fetchall()  # The pragma frees pages as it is stepped
+                await session.commit()
+            requested += step
+            await asyncio.sleep(self.pause_seconds)
+
+        async with async_session_factory() as session:
+            remaining = (await session.execute(text("PRAGMA freelist_count"))).scalar() or 0
+        freed = free_pages - remaining
+        logger.info(f"Incremental vacuum freed {freed} pages")
+        return freed
+
+
+async def enable_incremental_vacuum() -> bool:
+    """Switch the database to auto_vacuum = INCREMENTAL.
+
+    Takes effect through a one-time full VACUUM, which rewrites the file;
+    run it during a maintenance window.
+    """
+    async with async_session_factory() as session:
+        mode = (await session.execute(text("PRAGMA auto_vacuum"))).scalar()
+        if mode == 2:
+            return False
+        await session.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        await session.execute(text("VACUUM"))
+        await session.commit()
+    logger.info("Enabled incremental auto_vacuum")
+    return True
@@ -4,19 +4,19 @@ Provides:
 - Configurable retention policies per table
 - Size limiting with truncation and hash preservation
 - Optional gzip compression for large diffs
-- Cleanup utilities for expired records
+- Cleanup utilities for expired records (batched, see app.audit.purge)
 """
 
 import base64
 import gzip
 import hashlib
 import logging
-from contextlib import nullcontext
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
 
-from sqlalchemy import delete, text, func, select
+from sqlalchemy import text, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import (
@@ -30,6 +30,21 @@ from app.database import (
 
 logger = logging.getLogger(__name__)
 
+# Audit tables subject to retention
+AUDIT_TABLES = {
+    "audit_logs": AuditLog,
+    "tool_audit_logs": ToolAuditLog,
+    "llm_exchange_logs": LLMExchangeLog,
+    "file_change_logs": FileChangeLog,
+    "budget_logs": BudgetLog,
+}
+
+# Columns that may hold a "BLOB:<hash>" reference into audit_blobs
+BLOB_REF_COLUMNS = {
+    "llm_exchange_logs": "content_redacted",
+    "file_change_logs": "diff",
+}
+
 
 # =============================================================================
 # Retention Configuration
@@ -65,6 +80,15 @@ class RetentionConfig:
     compress_diffs: bool = True
     compression_threshold: int = 1_000  # Compress diffs > 1KB
 
+    # Content-addressed blob store for diffs (and LLM bodies, see below) above the threshold
+    blob_store_payloads: bool = True
+    max_blob_size: int = 5_000_000  # Larger payloads fall back to inline compression
+
+    # LLM bodies logged with include_content are cut to llm_content_preview_chars.
+    # Full bodies are retained (in the blob store) only when this is enabled.
+    retain_full_llm_content: bool = False
+    llm_content_preview_chars: int = 1_000
+
     @classmethod
     def default(cls) -> "RetentionConfig":
         """Create default retention configuration."""
@@ -311,6 +335,9 @@ class CleanupResult:
     deleted_count: int
     cutoff_date: datetime
     error: str | None = None
+    blobs_freed: int = 0
+    batches: int = 0
+    completed: bool = True  # False when the time budget ran out first
 
 
 @dataclass
@@ -321,6 +348,9 @@ class FullCleanupResult:
     total_deleted: int
     vacuum_run: bool
     analyze_run: bool
+    completed: bool = True
+    elapsed_seconds: float = 0.0
+    incremental_vacuum_pages: int | None = None
 
 
 async def purge_old_records(
@@ -330,78 +360,32 @@ async def purge_old_records(
 ) -> CleanupResult:
     """Purge records older than retention_days from a specific table.
 
+    Deletes in bounded batches (see app.audit.purge) so other writers are
+    not blocked for the duration of the purge.
+
     Args:
         table_name: Name of the table to clean
         retention_days: Delete records older than this many days
-        db: Optional database session (creates one if not provided)
+        db: Optional database session (creates one per batch if not provided)
 
     Returns:
         CleanupResult with count of deleted records
     """
-    cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
-
-    table_map = {
-        "audit_logs": AuditLog,
-        "tool_audit_logs": ToolAuditLog,
-        "llm_exchange_logs": LLMExchangeLog,
-        "file_change_logs": FileChangeLog,
-        "budget_logs": BudgetLog,
-    }
-
-    table_class = table_map.get(table_name)
-    if not table_class:
-        return CleanupResult(
-            table_name=table_name,
-            deleted_count=0,
-            cutoff_date=cutoff_date,
-            error=f"Unknown table: {table_name}",
-        )
-
-    try:
-        if db:
-            session = db
-            should_commit = False
-        else:
-            session = async_session_factory()
-            should_commit = True
+    from app.audit.purge import RetentionPurger
 
-        async with session if should_commit else nullcontext(session):
-            # Delete old records
-            stmt = delete(table_class).where(table_class.created_at < cutoff_date)
-            result = await session.execute(stmt)
-            deleted_count = result.rowcount
-
-            if should_commit:
-                await session.commit()
-
-            logger.info(
-                f"Purged {deleted_count} records from {table_name} "
-                f"older than {retention_days} days"
-            )
-
-            return CleanupResult(
-                table_name=table_name,
-                deleted_count=deleted_count,
-                cutoff_date=cutoff_date,
-            )
-
-    except Exception as e:
-        logger.error(f"Error purging {table_name}: {e}")
-        return CleanupResult(
-            table_name=table_name,
-            deleted_count=0,
-            cutoff_date=cutoff_date,
-            error=str(e),
-        )
-
-
-# Note: nullcontext imported at top of file
+    return await RetentionPurger(resume=False).purge_table(table_name, retention_days, db=db)
 
 
 async def purge_all_tables(
     config: RetentionConfig | None = None,
     run_vacuum: bool = True,
     run_analyze: bool = True,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+    time_budget_seconds: float | None = None,
+    state_path: Path | None = None,
+    on_progress: Callable[[Any], None] | None = None,
+    incremental_vacuum: bool = False,
 ) -> FullCleanupResult:
     """Purge old records from all audit tables based on retention policy.
 
@@ -409,36 +393,49 @@ async def purge_all_tables(
         config: Retention configuration (uses default if not provided)
         run_vacuum: Whether to run VACUUM after deletion (SQLite)
         run_analyze: Whether to run ANALYZE after deletion
+        batch_size: Rows deleted per transaction
+        pause_seconds: Pause between batches so other writers can proceed
+        time_budget_seconds: Stop (resumably) after this long
+        state_path: Checkpoint file; a later run resumes from it
+        on_progress: Called with a PurgeProgress after every batch
+        incremental_vacuum: Run PRAGMA incremental_vacuum instead of VACUUM
 
     Returns:
         FullCleanupResult with per-table results
     """
-    config = config or get_retention_config()
-    results = []
-    total_deleted = 0
+    from app.audit.purge import DEFAULT_BATCH_SIZE, DEFAULT_PAUSE_SECONDS, RetentionPurger
+
+    purger = RetentionPurger(
+        config or get_retention_config(),
+        batch_size=batch_size or DEFAULT_BATCH_SIZE,
+        pause_seconds=DEFAULT_PAUSE_SECONDS if pause_seconds is None else pause_seconds,
+        time_budget_seconds=time_budget_seconds,
+        state_path=state_path,
+        on_progress=on_progress,
+    )
+    result = await purger.run()
 
-    # Process each table
-    for table_name, policy in config.policies.items():
-        result = await purge_old_records(table_name, policy.retention_days)
-        results.append(result)
-        total_deleted += result.deleted_count
+    if incremental_vacuum:
+        result.incremental_vacuum_pages = await purger.incremental_vacuum()
+        run_vacuum = False
 
-    # Run VACUUM and ANALYZE if requested (for SQLite)
-    vacuum_success = False
-    analyze_success = False
+    # A full VACUUM rewrites the whole file; only worth it once the purge is done
+    if not result.completed:
+        return result
 
+    # Run VACUUM and ANALYZE if requested (for SQLite)
     if run_vacuum or run_analyze:
         try:
             async with async_session_factory() as session:
                 if run_vacuum:
                     # VACUUM requires autocommit mode in SQLite
                     await session.execute(text("VACUUM"))
-                    vacuum_success = True
+                    result.vacuum_run = True
                     logger.info("VACUUM completed successfully")
 
                 if run_analyze:
                     await session.execute(text("ANALYZE"))
-                    analyze_success = True
+                    result.analyze_run = True
                     logger.info("ANALYZE completed successfully")
 
                 await session.commit()
@@ -446,12 +443,7 @@ async def purge_all_tables(
         except Exception as e:
             logger.warning(f"Post-cleanup optimization failed: {e}")
 
-    return FullCleanupResult(
-        results=results,
-        total_deleted=total_deleted,
-        vacuum_run=vacuum_success,
-        analyze_run=analyze_success,
-    )
+    return result
 
 
 async def get_table_stats() -> dict[str, dict[str, Any]]:
@@ -462,16 +454,8 @@ async def get_table_stats() -> dict[str, dict[str, Any]]:
     """
     stats = {}
 
-    table_map = {
-        "audit_logs": AuditLog,
-        "tool_audit_logs": ToolAuditLog,
-        "llm_exchange_logs": LLMExchangeLog,
-        "file_change_logs": FileChangeLog,
-        "budget_logs": BudgetLog,
-    }
-
     async with async_session_factory() as session:
-        for table_name, table_class in table_map.items():
+        for table_name, table_class in AUDIT_TABLES.items():
             try:
                 # Get count
                 count_result = await session.execute(
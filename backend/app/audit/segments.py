@@ -0,0 +1,569 @@
+"""Segmented, indexed storage for the JSONL audit trail.
+
+Events are appended to an active segment ``audit-YYYY-MM-DD-NNNN.jsonl``
+that rolls over when it reaches ``max_segment_bytes`` or the day changes.
+Closed segments are sealed:
+- compressed to ``.jsonl.gz`` as a series of independently gzipped blocks
+  (a valid multi-member gzip file), so a reader can decompress only the
+  blocks it needs
+- described by a sidecar ``.idx.json`` holding the record count, the
+  first/last timestamp, and session_id/category -> record offsets
+
+Only a summary of each sealed segment (name, counts, time range) stays in
+memory. Queries skip segments outside the requested date range, load the
+sidecar indexes of the rest (through a small LRU cache) and read only the
+records the index points at. Legacy daily files (``audit-YYYY-MM-DD.jsonl``)
+are sealed the first time the store is opened.
+
+All writes happen on one thread (see ``AuditLogger``); queries may run on
+any thread concurrently.
+"""
+
+import bisect
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.audit.models import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_BLOCK_SIZE = 256 * 1024  # Uncompressed bytes per gzip member
+DEFAULT_INDEX_CACHE_SIZE = 16  # Sealed segment indexes kept loaded
+INDEX_VERSION = 1
+
+_SEGMENT_RE = re.compile(r"^audit-(\d{4}-\d{2}-\d{2})(?:-(\d{4}))?$")
+
+
+@dataclass
+class SegmentIndex:
+    """Sidecar index for one segment.
+
+    Offsets are byte offsets into the uncompressed segment. For sealed
+    segments, ``blocks`` maps them to gzip members as
+    ``[uncompressed_start, compressed_offset, compressed_length]``.
+    """
+
+    name: str
+    count: int = 0
+    size: int = 0
+    start: str | None = None
+    end: str | None = None
+    sessions: dict[str, list[int]] = field(default_factory=dict)
+    categories: dict[str, list[int]] = field(default_factory=dict)
+    blocks: list[list[int]] = field(default_factory=list)
+    sealed: bool = False
+    compressed_size: int = 0
+
+    @property
+    def day(self) -> str:
+        return self.name[len("audit-"):len("audit-") + 10]
+
+    def add(self, offset: int, length: int, record: dict[str, Any]) -> None:
+        """Index one record written at offset."""
+        self.count += 1
+        self.size = offset + length
+
+        timestamp = record.get("timestamp")
+        if timestamp:
+            if self.start is None or timestamp < self.start:
+                self.start = timestamp
+            if self.end is None or timestamp > self.end:
+                self.end = timestamp
+
+        session_id = record.get("session_id")
+        if session_id:
+            self.sessions.setdefault(session_id, []).append(offset)
+        category = record.get("category")
+        if category:
+            self.categories.setdefault(category, []).append(offset)
+
+    def overlaps(self, start_day: str, end_day: str) -> bool:
+        """Whether any record may fall within [start_day, end_day]."""
+        if self.count == 0:
+            return False
+        first = (self.start or self.day)[:10]
+        last = (self.end or self.day)[:10]
+        return first <= end_day and last >= start_day
+
+    def lookup(self, category: str | None, session_id: str | None) -> list[int] | None:
+        """Offsets of candidate records, or None when every record matches."""
+        candidates: list[int] | None = None
+        if session_id is not None:
+            candidates = list(self.sessions.get(session_id, ()))
+        if category is not None:
+            by_category = self.categories.get(category, ())
+            if candidates is None:
+                candidates = list(by_category)
+            else:
+                wanted = set(by_category)
+                candidates = [o for o in candidates if o in wanted]
+        return candidates
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "name": self.name,
+            "count": self.count,
+            "size": self.size,
+            "start": self.start,
+            "end": self.end,
+            "blocks": self.blocks,
+            "sessions": self.sessions,
+            "categories": self.categories,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SegmentIndex":
+        blocks = data.get("blocks", [])
+        return cls(
+            name=data["name"],
+            count=data.get("count", 0),
+            size=data.get("size", 0),
+            start=data.get("start"),
+            end=data.get("end"),
+            sessions=data.get("sessions", {}),
+            categories=data.get("categories", {}),
+            blocks=blocks,
+            sealed=True,
+            compressed_size=sum(block[2] for block in blocks),
+        )
+
+    def summary(self) -> "SegmentIndex":
+        """Copy without per-record offsets or blocks, kept resident per segment."""
+        return SegmentIndex(
+            name=self.name,
+            count=self.count,
+            size=self.size,
+            start=self.start,
+            end=self.end,
+            sealed=self.sealed,
+            compressed_size=self.compressed_size,
+        )
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SegmentStore:
+    """Rolling, compressed, indexed JSONL segments in one directory."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        compress: bool = True,
+        index_cache_size: int = DEFAULT_INDEX_CACHE_SIZE,
+    ):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.block_size = block_size
+        self.compress = compress
+        self.index_cache_size = index_cache_size
+
+        self._lock = threading.Lock()  # Guards segment lists and the active index
+        self._open_lock = threading.Lock()
+        self._opened = False
+
+        self._sealed: list[SegmentIndex] = []  # Summaries only
+        self._index_cache: OrderedDict[str, SegmentIndex] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.index_loads = 0
+        self._active: SegmentIndex | None = None
+        self._active_file = None
+        self._next_seq: dict[str, int] = {}
+
+    # =========================================================================
+    # Paths
+    # =========================================================================
+
+    def _plain_path(self, name: str) -> Path:
+        return self.directory / f"{name}.jsonl"
+
+    def _gz_path(self, name: str) -> Path:
+        return self.directory / f"{name}.jsonl.gz"
+
+    def _index_path(self, name: str) -> Path:
+        return self.directory / f"{name}.idx.json"
+
+    # =========================================================================
+    # Recovery
+    # =========================================================================
+
+    def open(self) -> None:
+        """Load sealed indexes and seal plain files left from earlier runs."""
+        with self._open_lock:
+            if self._opened:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            indexes: dict[str, SegmentIndex] = {}
+            for index_path in self.directory.glob("audit-*.idx.json"):
+                try:
+                    index = SegmentIndex.from_dict(json.loads(index_path.read_text()))
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Ignoring unreadable audit index {index_path.name}: {e}")
+                    continue
+                indexes[index.name] = index
+
+            sealed = []
+            for name, index in indexes.items():
+                plain = self._plain_path(name)
+                if index.blocks:
+                    valid = self._gz_path(name).exists() and not plain.exists()
+                else:
+                    valid = plain.exists() and plain.stat().st_size == index.size
+                if valid:
+                    sealed.append(index.summary())
+
+            # Other plain files are legacy daily logs or an active segment
+            # from a run that did not shut down cleanly
+            sealed_names = {index.name for index in sealed}
+            for plain in self.directory.glob("audit-*.jsonl"):
+                name = plain.name[: -len(".jsonl")]
+                if not _SEGMENT_RE.match(name) or name in sealed_names:
+                    continue
+                try:
+                    sealed.append(self._seal_file(name, self._scan(name)).summary())
+                except OSError as e:
+                    logger.error(f"Failed to seal audit segment {plain.name}: {e}")
+
+            for index in sealed:
+                match = _SEGMENT_RE.match(index.name)
+                if match and match.group(2):
+                    day, seq = match.group(1), int(match.group(2))
+                    self._next_seq[day] = max(self._next_seq.get(day, 0), seq + 1)
+
+            with self._lock:
+                self._sealed = sorted(sealed, key=lambda s: (s.start or s.day, s.name))
+            self._opened = True
+
+    def _scan(self, name: str) -> SegmentIndex:
+        """Build an index by reading a plain segment."""
+        index = SegmentIndex(name=name)
+        offset = 0
+        with open(self._plain_path(name), "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict) and line.endswith(b"\n"):
+                    index.add(offset, len(line), record)
+                offset += len(line)
+        index.size = offset
+        return index
+
+    # =========================================================================
+    # Writing (single writer thread)
+    # =========================================================================
+
+    def append(self, events: list[AuditEvent]) -> None:
+        """Append events, rolling segments by day and size."""
+        self.open()
+        pending: list[tuple[bytes, dict[str, Any]]] = []
+        pending_bytes = 0
+
+        for event in events:
+            day = event.timestamp.strftime("%Y-%m-%d")
+            active = self._active
+            if active is not None and (
+                active.day != day or active.size + pending_bytes >= self.max_segment_bytes
+            ):
+                self._write_pending(pending)
+                pending, pending_bytes = [], 0
+                self._seal_active()
+            if self._active is None:
+                self._open_segment(day)
+
+            record = event.to_dict()
+            line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+            pending.append((line, record))
+            pending_bytes += len(line)
+
+        self._write_pending(pending)
+
+    def _write_pending(self, pending: list[tuple[bytes, dict[str, Any]]]) -> None:
+        if not pending:
+            return
+        active = self._active
+        self._active_file.write(b"".join(line for line, _ in pending))
+        self._active_file.flush()
+
+        # Publish offsets only once the bytes are readable
+        with self._lock:
+            offset = active.size
+            for line, record in pending:
+                active.add(offset, len(line), record)
+                offset += len(line)
+
+    def _open_segment(self, day: str) -> None:
+        seq = self._next_seq.get(day, 1)
+        self._next_seq[day] = seq + 1
+        name = f"audit-{day}-{seq:04d}"
+        self._active_file = open(self._plain_path(name), "ab")
+        with self._lock:
+            self._active = SegmentIndex(name=name)
+
+    def _seal_active(self) -> None:
+        if self._active is None:
+            return
+        self._active_file.close()
+        self._active_file = None
+        active = self._active
+        sealed = self._seal_file(active.name, active)
+        self._cache_index(sealed)
+        with self._lock:
+            self._sealed.append(sealed.summary())
+            self._active = None
+
+    def close(self) -> None:
+        """Seal the active segment (called on shutdown)."""
+        if self._active is not None:
+            self._seal_active()
+
+    def _seal_file(self, name: str, index: SegmentIndex) -> SegmentIndex:
+        """Compress a plain segment into gzip blocks and write its index."""
+        plain = self._plain_path(name)
+        sealed = SegmentIndex(
+            name=name,
+            count=index.count,
+            size=index.size,
+            start=index.start,
+            end=index.end,
+            sessions=index.sessions,
+            categories=index.categories,
+            sealed=True,
+        )
+        if index.count == 0:
+            plain.unlink(missing_ok=True)
+            return sealed
+
+        if self.compress:
+            blocks: list[list[int]] = []
+            gz_path = self._gz_path(name)
+            tmp = gz_path.with_suffix(".gz.tmp")
+            with open(plain, "rb") as src, open(tmp, "wb") as dst:
+                for start, chunk in self._read_blocks(src, index.size):
+                    member = gzip.compress(chunk, compresslevel=6)
+                    blocks.append([start, dst.tell(), len(member)])
+                    dst.write(member)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp, gz_path)
+            sealed.blocks = blocks
+            sealed.compressed_size = sum(block[2] for block in blocks)
+
+        _write_atomic(self._index_path(name), json.dumps(sealed.to_dict()).encode("utf-8"))
+        if self.compress:
+            plain.unlink(missing_ok=True)
+        return sealed
+
+    def _read_blocks(self, src, size: int) -> Iterator[tuple[int, bytes]]:
+        """Yield (uncompressed_start, chunk) split on line boundaries."""
+        start = 0
+        buffer = b""
+        remaining = size
+        while remaining > 0 or buffer:
+            if remaining > 0:
+                data = src.read(min(self.block_size, remaining))
+                remaining = remaining - len(data) if data else 0
+                buffer += data
+                if remaining > 0 and len(buffer) < self.block_size:
+                    continue
+
+            cut = buffer.rfind(b"\n") + 1 if remaining > 0 else len(buffer)
+            if cut == 0:
+                continue  # A single line longer than a block; keep reading
+            yield start, buffer[:cut]
+            start += cut
+            buffer = buffer[cut:]
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+
+    def query(
+        self,
+        start_day: str,
+        end_day: str,
+        category: str | None = None,
+        session_id: str | None = None,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Return records in [start_day, end_day] matching the filters.
+
+        Days are ``YYYY-MM-DD`` strings and match at day granularity.
+        """
+        self.open()
+        with self._lock:
+            candidates = [s for s in self._sealed if s.overlaps(start_day, end_day)]
+            active = self._active
+            active_plan = None
+            if active is not None and active.overlaps(start_day, end_day):
+                active_plan = (active, active.lookup(category, session_id), active.size)
+
+        plans = []
+        for summary in candidates:
+            try:
+                index = self._load_index(summary.name)
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Error reading audit index {summary.name}: {e}")
+                continue
+            plans.append((index, index.lookup(category, session_id), index.size))
+        if active_plan is not None:
+            plans.append(active_plan)
+
+        events: list[dict[str, Any]] = []
+
+        def collect(segment: SegmentIndex, offsets: list[int] | None, size: int) -> bool:
+            """Add matching records of one segment; True once the limit is hit."""
+            # Segments entirely inside the range need no per-record date check
+            whole = (
+                segment.start is not None
+                and start_day <= segment.start[:10]
+                and (segment.end or "")[:10] <= end_day
+            )
+            for record in self._read_records(segment, offsets, size):
+                if category and record.get("category") != category:
+                    continue
+                if session_id and record.get("session_id") != session_id:
+                    continue
+                day = str(record.get("timestamp", ""))[:10]
+                if not whole and not start_day <= day <= end_day:
+                    continue
+                events.append(record)
+                if len(events) >= limit:
+                    return True
+            return False
+
+        for segment, offsets, size in plans:
+            if offsets is not None and not offsets:
+                continue
+            mark = len(events)
+            try:
+                if collect(segment, offsets, size):
+                    return events
+                continue
+            except OSError as e:
+                if segment.sealed:
+                    logger.error(f"Error reading audit segment {segment.name}: {e}")
+                    continue
+                read_error = e
+
+            # The active segment was sealed (and its plain file removed) while
+            # we read it: read the compressed copy instead
+            del events[mark:]
+            try:
+                sealed = self._load_index(segment.name)
+                if collect(sealed, sealed.lookup(category, session_id), sealed.size):
+                    return events
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Error reading audit segment {segment.name}: {read_error}; {e}")
+        return events
+
+    def _cache_index(self, index: SegmentIndex) -> None:
+        with self._cache_lock:
+            self._index_cache[index.name] = index
+            self._index_cache.move_to_end(index.name)
+            while len(self._index_cache) > self.index_cache_size:
+                self._index_cache.popitem(last=False)
+
+    def _load_index(self, name: str) -> SegmentIndex:
+        """Full sidecar index of a sealed segment (LRU cached)."""
+        with self._cache_lock:
+            index = self._index_cache.get(name)
+            if index is not None:
+                self._index_cache.move_to_end(name)
+                return index
+        index = SegmentIndex.from_dict(json.loads(self._index_path(name).read_text()))
+        self.index_loads += 1
+        self._cache_index(index)
+        return index
+
+    def _read_records(
+        self,
+        segment: SegmentIndex,
+        offsets: list[int] | None,
+        size: int,
+    ) -> Iterator[dict[str, Any]]:
+        if segment.blocks:
+            lines = self._read_gz_lines(segment, offsets)
+        else:
+            lines = self._read_plain_lines(self._plain_path(segment.name), offsets, size)
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+    @staticmethod
+    def _read_plain_lines(path: Path, offsets: list[int] | None, size: int) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            if offsets is None:
+                remaining = size
+                for line in f:
+                    if remaining <= 0:
+                        break
+                    remaining -= len(line)
+                    yield line
+                return
+            for offset in offsets:
+                f.seek(offset)
+                yield f.readline()
+
+    def _read_gz_lines(self, segment: SegmentIndex, offsets: list[int] | None) -> Iterator[bytes]:
+        starts = [block[0] for block in segment.blocks]
+        with open(self._gz_path(segment.name), "rb") as f:
+            if offsets is None:
+                for _, position, length in segment.blocks:
+                    f.seek(position)
+                    yield from gzip.decompress(f.read(length)).splitlines()
+                return
+
+            current = -1
+            data = b""
+            for offset in offsets:
+                block_no = bisect.bisect_right(starts, offset) - 1
+                if block_no != current:
+                    _, position, length = segment.blocks[block_no]
+                    f.seek(position)
+                    data = gzip.decompress(f.read(length))
+                    current = block_no
+                local = offset - segment.blocks[block_no][0]
+                end = data.find(b"\n", local)
+                yield data[local:] if end == -1 else data[local:end]
+
+    def get_stats(self) -> dict[str, Any]:
+        """Segment counts and sizes."""
+        self.open()
+        with self._lock:
+            segments = list(self._sealed)
+            active = self._active
+        compressed = sum(segment.compressed_size for segment in segments)
+        return {
+            "segments": len(segments) + (1 if active else 0),
+            "records": sum(s.count for s in segments) + (active.count if active else 0),
+            "uncompressed_bytes": sum(s.size for s in segments) + (active.size if active else 0),
+            "compressed_bytes": compressed,
+            "active_segment": active.name if active else None,
+            "cached_indexes": len(self._index_cache),
+            "index_loads": self.index_loads,
+        }
@@ -31,6 +31,7 @@ from app.autonomous.planner_schema import (
     TaskOutput,
 )
 from app.autonomous.task_graph import TaskGraph, TaskNode, TaskNodeStatus
+from app.utils.sse import format_event
 
 logger = logging.getLogger(__name__)
 
@@ -143,17 +144,8 @@ class EngineEvent:
             "timestamp": self.timestamp.isoformat(),
             **self.data,
         }
-        
-        def _encoder(obj):
-            if hasattr(obj, "model_dump"):
-                return obj.model_dump()
-            if hasattr(obj, "dict"):
-                return obj.dict()
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-        return f"data: {json.dumps(payload, default=_encoder)}\n\n"
+
+        return format_event(payload)
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -205,7 +197,7 @@ class RunContext:
     original_prompt: str = ""
     workspace_path: str | None = None
     session_id: str | None = None  # For inline mode
-    
+
     # Generic context data (e.g. brainstorm outputs)
     context_data: dict[str, Any] = field(default_factory=dict)
 
@@ -410,10 +402,10 @@ class OrchestrationEngine:
         # BRAINSTORM
         if ctx.state == RunState.BRAINSTORM:
             yield self._emit(ctx, EngineEventType.RUN_STATE, state="brainstorm")
-            
+
             try:
                 from app.autonomous.squads import SquadFactory, BrainstormingSession
-                
+
                 # Check directly if we should brainstorm
                 if SquadFactory.analyze_task_complexity(ctx.original_prompt):
                     session = BrainstormingSession(
@@ -421,15 +413,15 @@ class OrchestrationEngine:
                         prompt=ctx.original_prompt,
                         workspace_path=ctx.workspace_path
                     )
-                    
+
                     async for event in session.run():
                         yield event
                         if event.type == EngineEventType.BRAINSTORMING_COMPLETED:
                             # Store RFCs for the Planner to see
                             ctx.context_data["brainstorm_rfcs"] = event.data.get("rfcs", [])
-                
+
                 ctx.transition_to(RunState.PLAN)
-                
+
             except Exception as e:
                 logger.error(f"Brainstorming failed: {e}")
                 # Don't fail the run, just proceed to planning without RFCs
@@ -467,7 +459,7 @@ class OrchestrationEngine:
                     EngineEventType.PLAN_APPROVAL_REQUESTED,
                     plan=ctx.plan.model_dump()
                 )
-                
+
                 if ctx.config.auto_approve:
                     # Auto-proceed to task graph
                     logger.info("Auto-approving plan based on config.")
@@ -647,9 +639,9 @@ class OrchestrationEngine:
             # Wait for event or task completion
             get_event_task = asyncio.create_task(queue.get())
             wait_set = set(running.values()) | {get_event_task}
-            
+
             done, _ = await asyncio.wait(wait_set, return_when=asyncio.FIRST_COMPLETED)
-            
+
             # Handle event
             if get_event_task in done:
                 event = get_event_task.result()
@@ -839,15 +831,15 @@ class OrchestrationEngine:
         """Check a single acceptance criterion."""
         if criterion.verification_type == "human_approval":
             key = f"{node.task_id}:{criterion.id}"
-            
+
             # Check if already decided
             if key in ctx.approval_decisions:
                 return ctx.approval_decisions[key]
-                
+
             # Create event
             event = asyncio.Event()
             ctx.approval_events[key] = event
-            
+
             # Emit request
             await queue.put(
                 self._emit(
@@ -858,10 +850,10 @@ class OrchestrationEngine:
                     description=criterion.description,
                 )
             )
-            
+
             # Wait for approval
             await event.wait()
-            
+
             # Return decision
             return ctx.approval_decisions.get(key, False)
 
@@ -915,7 +907,7 @@ Check specifically for: {criterion.description}
 
                 # Check decision
                 approved = "Review Decision: APPROVED" in response_text or "Review Decision: APPROVED_WITH_SUGGESTIONS" in response_text
-                
+
                 # Emit completion
                 await queue.put(
                     self._emit(
@@ -926,7 +918,7 @@ Check specifically for: {criterion.description}
                         artifacts={},
                     )
                 )
-                
+
                 if not approved:
                      node.log(f"Review rejected: {response_text[-100:]}")
                      # Append feedback to the task for next retry if applicable
@@ -992,7 +984,7 @@ Check specifically for: {criterion.description}
         ctx = self._active_runs.get(run_id)
         if not ctx:
             return False
-            
+
         key = f"{task_id}:{criterion_id}"
         if key in ctx.approval_events:
             ctx.approval_decisions[key] = approved
@@ -1107,7 +1099,7 @@ class DefaultPlanner(PlannerProtocol):
 
         # Define strategies: Try with RFCs first, fallback to simpler prompt if failed
         attempts = []
-        
+
         # Attempt 1: Full Context with RFCs
         rfcs_text = ""
         if ctx.context_data.get("brainstorm_rfcs"):
@@ -1116,9 +1108,9 @@ class DefaultPlanner(PlannerProtocol):
             rfcs_text += "The Council of Specialists has already brainstormed this approach. Use these architecture decisions as your primary guide:\n\n"
             for rfc in rfcs:
                 rfcs_text += f"### {rfc['role'].upper()} RFC\n{rfc['content']}\n\n"
-        
+
         attempts.append({"use_rfcs": True, "rfcs_text": rfcs_text})
-        
+
         # Attempt 2: Fallback without RFCs (if we had them)
         if rfcs_text:
              attempts.append({"use_rfcs": False, "rfcs_text": ""})
@@ -1128,9 +1120,9 @@ class DefaultPlanner(PlannerProtocol):
         for i, attempt in enumerate(attempts):
             if i > 0:
                 logger.warning(f"Retrying planning without brainstorming context (Attempt {i+1})")
-                
+
             rfcs_content = attempt["rfcs_text"]
-            
+
             # Build planning prompt
             planning_prompt = f"""Analyze this request and create a detailed execution plan.
 
@@ -1175,14 +1167,14 @@ Output ONLY the JSON, no other text.
                     )
 
                 logger.info(f"Planner response length (Attempt {i+1}): {len(response_text)}")
-                
+
                 if not response_text.strip():
                     raise ValueError("Empty response from Planner Agent")
 
                 # Parse JSON
                 json_str = response_text
                 plan_data = None
-                
+
                 # Method 1: Markdown blocks (most reliable if present)
                 if "```json" in json_str:
                     try:
@@ -1206,7 +1198,7 @@ Output ONLY the JSON, no other text.
                         next_brace = json_str.find('{', idx)
                         if next_brace == -1:
                             break
-                        
+
                         try:
                             plan_data, end_idx = decoder.raw_decode(json_str[next_brace:])
                             # Verify it looks like a plan (has 'tasks' or 'summary') to avoid capturing trivial objects
@@ -1219,7 +1211,7 @@ Output ONLY the JSON, no other text.
                         except ValueError:
                             # Not valid JSON starting here
                             idx = next_brace + 1
-                
+
                 if not plan_data:
                     # Final desperate fallback: Regex extraction for messy cases
                     # (This helps if raw_decode failed due to minor syntax error usually caught by stricter parsers, 
@@ -1343,11 +1335,11 @@ Refine your implementation to specifically address these failures.
             # Matches ```python:src/main.py or ```:src/main.py
             code_block_pattern = r"```(?:\w+)?[:](.+?)\n"
             found_files = re.findall(code_block_pattern, response_text)
-            
+
             for fpath in found_files:
                 clean_path = fpath.strip()
                 node.artifacts[clean_path] = "File"
-            
+
             # Also support "Files changed:" listing if code blocks miss some
             # This is a fallback heuristic
             if "Files changed:" in response_text:
@@ -7,8 +7,46 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from app.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerError,
+    circuit_breaker_registry,
+)
+
 logger = logging.getLogger(__name__)
 
+# Remote operations (push, gh) share one breaker. Only transport-level
+# errors count as failures; rejected pushes or PR validation errors do not.
+GIT_REMOTE_CIRCUIT_NAME = "git-remote"
+GIT_REMOTE_CIRCUIT_CONFIG = CircuitBreakerConfig(
+    failure_threshold=3,
+    timeout_seconds=60.0,
+    half_open_max_calls=1,
+    success_threshold=1,
+    window_seconds=300.0,
+    excluded_exceptions=(FileNotFoundError,),  # gh not installed
+)
+
+_REMOTE_UNAVAILABLE = re.compile(
+    r"could not resolve host|connection (?:timed out|refused|reset)|operation timed out"
+    r"|unable to access|could not read from remote repository|failed to connect"
+    r"|HTTP 5\d\d|returned error: 5\d\d|error connecting to",
+    re.IGNORECASE,
+)
+
+
+def git_remote_circuit_breaker() -> CircuitBreaker:
+    """Get the circuit breaker guarding git/gh network operations."""
+    return circuit_breaker_registry.get_or_create(
+        GIT_REMOTE_CIRCUIT_NAME, GIT_REMOTE_CIRCUIT_CONFIG
+    )
+
+
+def is_remote_unavailable(stderr: str) -> bool:
+    """Whether git/gh stderr indicates the remote could not be reached."""
+    return bool(_REMOTE_UNAVAILABLE.search(stderr))
+
 
 @dataclass
 class GitResult:
@@ -35,22 +73,37 @@ class GitOperations:
                 stderr=asyncio.subprocess.PIPE,
             )
             stdout, stderr = await proc.communicate()
-
-            if proc.returncode == 0:
-                return GitResult(
-                    success=True,
-                    output=stdout.decode().strip(),
-                )
-            else:
-                return GitResult(
-                    success=False,
-                    output=stdout.decode().strip(),
-                    error=stderr.decode().strip(),
-                )
+            return self._to_result(proc.returncode, stdout, stderr)
         except Exception as e:
             logger.error(f"Git command failed: {e}")
             return GitResult(success=False, output="", error=str(e))
 
+    async def _run_remote_command(self, *args: str) -> GitResult:
+        """Run a git command that talks to a remote, through the remote breaker."""
+        try:
+            guard = git_remote_circuit_breaker().protect()
+        except CircuitBreakerError as e:
+            return GitResult(success=False, output="", error=f"Git remote unavailable: {e}")
+
+        with guard:
+            result = await self._run_command(*args)
+            if not result.success and is_remote_unavailable(result.error or ""):
+                guard.fail()
+        return result
+
+    @staticmethod
+    def _to_result(returncode: int | None, stdout: bytes, stderr: bytes) -> GitResult:
+        if returncode == 0:
+            return GitResult(
+                success=True,
+                output=stdout.decode().strip(),
+            )
+        return GitResult(
+            success=False,
+            output=stdout.decode().strip(),
+            error=stderr.decode().strip(),
+        )
+
     async def is_git_repo(self) -> bool:
         """Check if the workdir is a git repository."""
         result = await self._run_command("rev-parse", "--git-dir")
@@ -151,7 +204,7 @@ class GitOperations:
             args.append(remote)
             if branch:
                 args.append(branch)
-        return await self._run_command(*args)
+        return await self._run_remote_command(*args)
 
     async def has_remote(self, remote: str = "origin") -> bool:
         """Check if remote exists."""
@@ -174,25 +227,33 @@ class GitOperations:
         if head is None:
             head = await self.get_current_branch()
 
+        try:
+            guard = git_remote_circuit_breaker().protect()
+        except CircuitBreakerError as e:
+            return {"success": False, "error": f"Git remote unavailable: {e}"}
+
         # Use gh CLI to create PR
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "gh",
-                "pr",
-                "create",
-                "--title",
-                title,
-                "--body",
-                body,
-                "--base",
-                base,
-                "--head",
-                head or "",
-                cwd=self.workdir,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
+            with guard:
+                proc = await asyncio.create_subprocess_exec(
+                    "gh",
+                    "pr",
+                    "create",
+                    "--title",
+                    title,
+                    "--body",
+                    body,
+                    "--base",
+                    base,
+                    "--head",
+                    head or "",
+                    cwd=self.workdir,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout, stderr = await proc.communicate()
+                if proc.returncode != 0 and is_remote_unavailable(stderr.decode()):
+                    guard.fail()
 
             if proc.returncode == 0:
                 pr_url = stdout.decode().strip()
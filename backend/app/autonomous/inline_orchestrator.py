@@ -6,7 +6,6 @@ engine events to chat-compatible SSE events.
 """
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -22,6 +21,9 @@ from app.autonomous.engine import (
     get_engine,
 )
 from app.autonomous.planner_schema import ExecutionPlan
+from app.config import settings
+from app.utils.sse import format_event
+from app.utils.state_store import state_stores
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +38,7 @@ class InlineEvent:
     def to_sse(self) -> str:
         """Convert to SSE format compatible with chat API."""
         payload = {"type": self.type, **self.data}
-        return f"data: {json.dumps(payload)}\n\n"
+        return format_event(payload)
 
 
 class InlineOrchestrator:
@@ -497,8 +499,16 @@ class InlineOrchestrator:
 # Session Registry
 # =============================================================================
 
-# Active inline orchestrators by session
-_orchestrators: dict[str, InlineOrchestrator] = {}
+# Idle orchestrators without an active run are dropped after this long
+ORCHESTRATOR_IDLE_SECONDS = 6 * 3600
+
+# Inline orchestrators by session; ones with an active run are never evicted
+_orchestrators = state_stores.create(
+    "inline_orchestrators",
+    max_entries=settings.session_state_max_entries,
+    ttl_seconds=ORCHESTRATOR_IDLE_SECONDS,
+    can_evict=lambda orchestrator: not orchestrator.is_active,
+)
 
 
 def get_inline_orchestrator(
@@ -507,12 +517,13 @@ def get_inline_orchestrator(
     create: bool = True,
 ) -> InlineOrchestrator | None:
     """Get or create an inline orchestrator for a session."""
-    if session_id in _orchestrators:
-        return _orchestrators[session_id]
+    orchestrator = _orchestrators.get(session_id)
+    if orchestrator is not None:
+        return orchestrator
 
     if create:
         orchestrator = InlineOrchestrator(session_id, workspace_path)
-        _orchestrators[session_id] = orchestrator
+        _orchestrators.set(session_id, orchestrator)
         return orchestrator
 
     return None
@@ -520,7 +531,7 @@ def get_inline_orchestrator(
 
 def remove_inline_orchestrator(session_id: str) -> None:
     """Remove an inline orchestrator from the registry."""
-    _orchestrators.pop(session_id, None)
+    _orchestrators.pop(session_id)
 
 
 # =============================================================================
@@ -4,6 +4,7 @@ Selects the most appropriate model based on:
 - Agent type (architect, coder, reviewer, tester, docs, devops)
 - Task complexity (inferred from description or explicit)
 - Quality gate requirements
+- Recent task history (failure rate and p50/p95 durations per agent)
 
 Models are dynamically discovered from kiro-cli to ensure compatibility.
 """
@@ -12,6 +13,7 @@ import logging
 import re
 import subprocess
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
@@ -166,6 +168,13 @@ AGENT_DEFAULT_TIERS = {
 }
 
 
+# Recent history used to adjust tiers: an agent failing at least half of
+# its tasks on the fast tier is moved up to the balanced tier.
+PERFORMANCE_WINDOW = timedelta(hours=24)
+PERFORMANCE_MIN_TASKS = 5
+PERFORMANCE_MIN_SUCCESS_RATE = 0.5
+
+
 # Keywords that indicate task complexity
 COMPLEXITY_KEYWORDS = {
     "high": [
@@ -253,8 +262,35 @@ class ModelSelector:
                 if tier == ModelTier.TIER_3_FAST:
                     tier = ModelTier.TIER_2_BALANCED
 
+        # Upgrade the fast tier for agents that have been failing recently
+        if tier == ModelTier.TIER_3_FAST:
+            performance = self.get_agent_performance(agent_type)
+            if (
+                performance["total_tasks"] >= PERFORMANCE_MIN_TASKS
+                and performance["success_rate"] < PERFORMANCE_MIN_SUCCESS_RATE
+            ):
+                tier = ModelTier.TIER_2_BALANCED
+
         return self.models[tier]
 
+    def get_agent_performance(
+        self,
+        agent_type: str,
+        window: timedelta = PERFORMANCE_WINDOW,
+    ) -> dict[str, Any]:
+        """Get recent task counts, success rate and p50/p95 durations for an agent.
+
+        Args:
+            agent_type: The type of agent
+            window: Trailing window to aggregate over
+
+        Returns:
+            AgentMetrics dictionary from the subagent metrics store
+        """
+        from app.subagents.metrics import task_metrics
+
+        return task_metrics.get_agent_metrics(agent_type, since=datetime.now() - window).to_dict()
+
     def _analyze_complexity(self, description: str) -> str:
         """Analyze task description to determine complexity.
 
@@ -32,6 +32,7 @@ from app.autonomous.repositories import (
     LogRepository,
     ArtifactRepository,
 )
+from app.utils.sse import format_event
 
 logger = logging.getLogger(__name__)
 
@@ -81,7 +82,7 @@ class OrchestratorEvent:
 
     def to_sse(self) -> str:
         """Format as Server-Sent Event."""
-        return f"data: {json.dumps(self.to_dict())}\n\n"
+        return format_event(self.to_dict())
 
 
 class Orchestrator:
@@ -13,7 +13,9 @@ from app.channels.session_resolver import (
     session_resolver,
 )
 from app.channels.redaction import (
+    RedactionEngine,
     RedactionPattern,
+    RedactionStream,
     apply_redaction_hooks,
     apply_post_hooks,
     register_pattern,
@@ -21,6 +23,8 @@ from app.channels.redaction import (
     register_post_hook,
     enable_pattern,
     disable_pattern,
+    get_redaction_stats,
+    redact_stream,
 )
 from app.channels.telegram import TelegramChannel
 from app.channels.imessage import IMessageChannel
@@ -41,7 +45,9 @@ __all__ = [
     "SessionResolver",
     "session_resolver",
     # Redaction
+    "RedactionEngine",
     "RedactionPattern",
+    "RedactionStream",
     "apply_redaction_hooks",
     "apply_post_hooks",
     "register_pattern",
@@ -49,6 +55,8 @@ __all__ = [
     "register_post_hook",
     "enable_pattern",
     "disable_pattern",
+    "get_redaction_stats",
+    "redact_stream",
     # Channel implementations
     "TelegramChannel",
     "IMessageChannel",
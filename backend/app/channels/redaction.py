@@ -2,12 +2,32 @@
 
 Provides configurable redaction patterns for PII, credentials, and other
 sensitive data before message persistence.
+
+Enabled patterns are compiled into a single alternation with one named group
+per pattern, so the text is scanned once however many patterns are enabled.
+Where matches overlap, the union is redacted: after each match only its own
+inside is searched again, for matches that start there and run past its
+end, so a short match can never shield the rest of a longer one. A merged
+span takes the replacement of its leftmost match, and ties at the same
+position go to the pattern registered first. Replacement text is never
+rescanned. Patterns with their own capture groups are scanned separately
+(group numbers would shift inside the alternation) and merged into the same
+pass.
+
+Python's regex engine only skips ahead quickly when a pattern starts with a
+known character, which an alternation of \b-anchored patterns never does.
+Patterns can therefore declare the characters their matches start with
+(``first_chars``); when all of them do, the alternation is prefixed with a
+lookahead on the union.
+
+Long inputs can be redacted incrementally with RedactionStream.
 """
 
 import logging
 import re
+from collections import Counter
 from dataclasses import dataclass
-from typing import Callable
+from typing import Callable, Iterable, Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +40,9 @@ class RedactionPattern:
     pattern: re.Pattern
     replacement: str
     enabled: bool = True
+    # Character class body ("\\d", "A-Z") that every match starts with; lets
+    # the combined scan skip ahead quickly. None means any character.
+    first_chars: str | None = None
 
 
 # Default redaction patterns
@@ -29,18 +52,21 @@ DEFAULT_PATTERNS: list[RedactionPattern] = [
         name="credit_card",
         pattern=re.compile(r"\b(?:\d{4}[-\s]?){3}\d{4}\b"),
         replacement="[REDACTED-CC]",
+        first_chars=r"\d",
     ),
     # Social Security Numbers
     RedactionPattern(
         name="ssn",
         pattern=re.compile(r"\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b"),
         replacement="[REDACTED-SSN]",
+        first_chars=r"\d",
     ),
     # Email addresses (optional, disabled by default)
     RedactionPattern(
         name="email",
         pattern=re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
         replacement="[REDACTED-EMAIL]",
+        first_chars=r"A-Za-z0-9._%+\-",
         enabled=False,  # Disabled by default as emails are often needed
     ),
     # API keys (common patterns)
@@ -51,34 +77,299 @@ DEFAULT_PATTERNS: list[RedactionPattern] = [
             re.IGNORECASE,
         ),
         replacement="[REDACTED-KEY]",
+        first_chars="AaKkPpSsTt",
     ),
     # Bearer tokens
     RedactionPattern(
         name="bearer_token",
         pattern=re.compile(r"Bearer\s+[A-Za-z0-9\-_=]+\.?[A-Za-z0-9\-_=]*\.?[A-Za-z0-9\-_=]*"),
         replacement="Bearer [REDACTED-TOKEN]",
+        first_chars="B",
     ),
     # AWS keys
     RedactionPattern(
         name="aws_key",
         pattern=re.compile(r"(?:AKIA|ASIA)[A-Z0-9]{16}"),
         replacement="[REDACTED-AWS-KEY]",
+        first_chars="A",
     ),
     # Private keys (PEM format)
     RedactionPattern(
         name="private_key",
         pattern=re.compile(
-            r"-----BEGIN (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----[\s\S]*?-----END (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----"
+            r"-----BEGIN (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----[\s\S]*?"
+            r"-----END (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----"
         ),
         replacement="[REDACTED-PRIVATE-KEY]",
+        first_chars=r"\-",
     ),
 ]
 
+# Characters held back by a stream in case a match continues in the next chunk.
+# Matches longer than this (e.g. a PEM key over 8 KiB) may be missed by a stream.
+DEFAULT_STREAM_OVERLAP = 8192
+
+# Characters kept before the scan position so \b and lookbehinds see real context
+_STREAM_CONTEXT = 256
+
+# Inline flags that can be scoped to one alternative: (?i:...), (?s:...), ...
+_SCOPED_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.ASCII: "a"}
+
+
+
+class RedactionEngine:
+    """Single-pass redactor over a fixed set of patterns.
+
+    Usage:
+        engine = RedactionEngine(patterns)
+        text, was_redacted = engine.redact(text)
+
+        stream = engine.stream()
+        for chunk in chunks:
+            out.write(stream.feed(chunk))
+        out.write(stream.flush())
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[RedactionPattern],
+        hits: Counter | None = None,
+    ):
+        self.patterns = [p for p in patterns if p.enabled]
+        self.hits: Counter = hits if hits is not None else Counter()
+
+        # (name, replacement, is_template) per named group of the alternation
+        self._groups: dict[str, tuple[str, str, bool]] = {}
+        self._separate: list[RedactionPattern] = []
+        alternatives = []
+        for i, p in enumerate(self.patterns):
+            prefix = self._scoped_prefix(p.pattern)
+            if p.pattern.groups or prefix is None:
+                self._separate.append(p)
+                continue
+            group = f"p{i}"
+            self._groups[group] = (p.name, p.replacement, "\\" in p.replacement)
+            alternatives.append(f"(?P<{group}>{prefix}{p.pattern.pattern}))")
+
+        self._combined: re.Pattern | None = None
+        if alternatives:
+            combined = [p for p in self.patterns if p not in self._separate]
+            try:
+                prefilter = self._prefilter(combined)
+                self._combined = re.compile(f"{prefilter}(?:{'|'.join(alternatives)})")
+            except re.error as e:
+                logger.warning(f"Cannot combine redaction patterns, scanning separately: {e}")
+                self._separate = list(self.patterns)
+                self._groups.clear()
+
+        self._scanners: list[tuple[re.Pattern, RedactionPattern | None]] = []
+        if self._combined is not None:
+            self._scanners.append((self._combined, None))
+        self._scanners.extend((p.pattern, p) for p in self._separate)
+
+    @staticmethod
+    def _prefilter(patterns: list[RedactionPattern]) -> str:
+        """Lookahead on the first characters of all patterns, if all declare them."""
+        if not patterns or any(p.first_chars is None for p in patterns):
+            return ""
+        prefilter = f"(?=[{''.join(p.first_chars for p in patterns)}])"
+        try:
+            re.compile(prefilter)
+        except re.error as e:
+            logger.warning(f"Ignoring invalid redaction first_chars: {e}")
+            return ""
+        return prefilter
+
+    @staticmethod
+    def _scoped_prefix(pattern: re.Pattern) -> str | None:
+        """Opening of a group that applies the pattern's flags, or None."""
+        if not isinstance(pattern.pattern, str):
+            return None
+        flags = pattern.flags & ~re.UNICODE
+        letters = ""
+        for flag, letter in _SCOPED_FLAGS.items():
+            if flags & flag:
+                letters += letter
+                flags &= ~flag
+        if flags:
+            return None  # e.g. VERBOSE, where a trailing comment would eat our ")"
+        return f"(?{letters}:" if letters else "(?:"
+
+    # =========================================================================
+    # Matching
+    # =========================================================================
+
+    def _replacement(self, match: re.Match, pattern: RedactionPattern | None) -> tuple[str, str]:
+        """Return (pattern name, replacement text) for a match."""
+        if pattern is None:
+            name, replacement, is_template = self._groups[match.lastgroup]
+        else:
+            name, replacement, is_template = pattern.name, pattern.replacement, True
+        return name, match.expand(replacement) if is_template else replacement
+
+    def _spans(self, text: str, pos: int = 0) -> Iterator[tuple[int, int, str, list[str]]]:
+        """Yield (start, end, replacement, pattern names) for each redacted span.
+
+        The text is scanned once, left to right. Only the inside of a match
+        is looked at again, for matches that start there and run past its
+        end; those are merged into the span, so the union is redacted. The
+        span takes the replacement of its leftmost match. Zero-width matches
+        are skipped; they can never hide anything.
+        """
+        scanners = self._scanners
+        pending: list[re.Match | None] = [None] * len(scanners)
+        searched = [-1] * len(scanners)  # Position each pending match was searched from
+
+        def leftmost(start: int) -> tuple[re.Match, RedactionPattern | None] | None:
+            best = None
+            for i, (regex, _) in enumerate(scanners):
+                match = pending[i]
+                if searched[i] < 0 or (match is not None and match.start() < start):
+                    match = regex.search(text, start)
+                    while match is not None and match.end() == match.start():
+                        match = regex.search(text, match.start() + 1)
+                    pending[i] = match
+                    searched[i] = start
+                if match is not None and (best is None or match.start() < pending[best].start()):
+                    best = i
+            return None if best is None else (pending[best], scanners[best][1])
+
+        found = leftmost(pos)
+        while found is not None:
+            match, pattern = found
+            start, end = match.span()
+            name, replacement = self._replacement(match, pattern)
+            names = [name]
+
+            found = leftmost(start + 1)
+            while found is not None and found[0].start() < end:
+                inner, inner_pattern = found
+                end = max(end, inner.end())
+                names.append(self._replacement(inner, inner_pattern)[0])
+                found = leftmost(inner.start() + 1)
+            yield start, end, replacement, names
+
+    # =========================================================================
+    # Redaction
+    # =========================================================================
+
+    def redact(self, text: str) -> tuple[str, bool]:
+        """Redact text in one pass.
+
+        Returns:
+            Tuple of (redacted_text, was_redacted)
+        """
+        if not self.patterns or not text:
+            return text, False
+
+        parts: list[str] = []
+        pos = 0
+        for start, end, replacement, names in self._spans(text):
+            parts.append(text[pos:start])
+            parts.append(replacement)
+            pos = end
+            self.hits.update(names)
+
+        if not parts:
+            return text, False
+        parts.append(text[pos:])
+        return "".join(parts), True
+
+    def stream(self, overlap: int = DEFAULT_STREAM_OVERLAP) -> "RedactionStream":
+        """Create a stream that redacts text fed to it in chunks."""
+        return RedactionStream(self, overlap)
+
+
+class RedactionStream:
+    """Incremental redaction of text that arrives in chunks.
+
+    Output is identical to redacting the concatenated input in one call,
+    as long as no single match is longer than ``overlap`` characters. Up to
+    ``overlap`` characters (plus any match still in progress) are held back
+    until the next feed() or flush().
+    """
+
+    def __init__(self, engine: RedactionEngine, overlap: int = DEFAULT_STREAM_OVERLAP):
+        self.engine = engine
+        self.overlap = overlap
+        self.was_redacted = False
+        self._buffer = ""
+        self._start = 0  # Scan position; text before it is context only
+
+    def _drain(self, final: bool) -> str:
+        buffer = self._buffer
+        safe = len(buffer) if final else len(buffer) - self.overlap
+        if safe <= self._start:
+            return ""
+
+        parts: list[str] = []
+        pos = self._start
+        cut = safe
+        if self.engine.patterns:
+            for start, end, replacement, names in self.engine._spans(buffer, self._start):
+                if end > safe:
+                    cut = min(safe, start)  # May still grow: keep it
+                    break
+                parts.append(buffer[pos:start])
+                parts.append(replacement)
+                pos = end
+                self.engine.hits.update(names)
+                self.was_redacted = True
+        cut = max(cut, pos)
+        parts.append(buffer[pos:cut])
+
+        context = max(0, cut - _STREAM_CONTEXT)
+        self._buffer = buffer[context:]
+        self._start = cut - context
+        return "".join(parts)
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk and return the redacted text that is now final."""
+        self._buffer += chunk
+        return self._drain(final=False)
+
+    def flush(self) -> str:
+        """Return the remaining redacted text."""
+        output = self._drain(final=True)
+        self._buffer = ""
+        self._start = 0
+        return output
+
+
 # Global pattern registry
 _patterns: list[RedactionPattern] = DEFAULT_PATTERNS.copy()
 _pre_hooks: list[Callable[[str], tuple[str, bool]]] = []
 _post_hooks: list[Callable[[str], str]] = []
 
+# Compiled engine for the enabled patterns, rebuilt when they change
+_engine: RedactionEngine | None = None
+_engine_key: tuple = ()
+_hits: Counter = Counter()
+
+
+def get_redaction_engine() -> RedactionEngine:
+    """Get the engine for the currently enabled patterns.
+
+    The key is recomputed on every call so that patterns toggled directly
+    (``pattern.enabled = False``) are picked up too.
+    """
+    global _engine, _engine_key
+    key = tuple((p.name, p.pattern, p.replacement) for p in _patterns if p.enabled)
+    if _engine is None or key != _engine_key:
+        _engine = RedactionEngine(_patterns, hits=_hits)
+        _engine_key = key
+    return _engine
+
+
+def get_redaction_stats() -> dict[str, int]:
+    """Get the number of redactions applied per pattern name."""
+    return dict(_hits)
+
+
+def reset_redaction_stats() -> None:
+    """Reset per-pattern redaction counters."""
+    _hits.clear()
+
 
 def register_pattern(pattern: RedactionPattern) -> None:
     """Register a new redaction pattern.
@@ -154,18 +445,29 @@ def apply_patterns(text: str) -> tuple[str, bool]:
     Returns:
         Tuple of (redacted_text, was_redacted)
     """
-    was_redacted = False
+    return get_redaction_engine().redact(text)
 
-    for pattern in _patterns:
-        if not pattern.enabled:
-            continue
 
-        if pattern.pattern.search(text):
-            text = pattern.pattern.sub(pattern.replacement, text)
-            was_redacted = True
-            logger.debug(f"Applied redaction pattern: {pattern.name}")
+def redact_stream(chunks: Iterable[str], overlap: int = DEFAULT_STREAM_OVERLAP) -> Iterator[str]:
+    """Apply all enabled redaction patterns to text arriving in chunks.
 
-    return text, was_redacted
+    Pre-hooks are not applied; they operate on whole messages.
+
+    Args:
+        chunks: Input text in pieces (e.g. lines of a large log)
+        overlap: Longest match guaranteed to be caught across chunk boundaries
+
+    Yields:
+        Redacted text, in order; empty pieces are skipped
+    """
+    stream = get_redaction_engine().stream(overlap)
+    for chunk in chunks:
+        output = stream.feed(chunk)
+        if output:
+            yield output
+    output = stream.flush()
+    if output:
+        yield output
 
 
 def apply_redaction_hooks(text: str) -> tuple[str, bool]:
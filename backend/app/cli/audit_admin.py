@@ -2,14 +2,16 @@
 """Admin CLI commands for audit log maintenance.
 
 Commands:
-    purge_old_audit --days N    Delete records older than N days
+    purge_old_audit --days N    Delete records older than N days (in batches)
     audit_stats                 Show table statistics
     audit_vacuum                Run VACUUM and ANALYZE on audit tables
 
 Usage:
     python -m app.cli.audit_admin purge_old_audit --days 30
+    python -m app.cli.audit_admin purge_old_audit --days 30 --time-budget 600
     python -m app.cli.audit_admin audit_stats
     python -m app.cli.audit_admin audit_vacuum
+    python -m app.cli.audit_admin audit_vacuum --enable-incremental
 """
 
 import argparse
@@ -23,13 +25,20 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from app.audit.purge import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_PAUSE_SECONDS,
+    PurgeProgress,
+    RetentionPurger,
+    enable_incremental_vacuum,
+)
 from app.audit.retention import (
     RetentionConfig,
     TableRetentionPolicy,
-    purge_old_records,
-    purge_all_tables,
     get_table_stats,
+    purge_all_tables,
 )
+from app.config import settings
 from app.database import init_db
 
 logging.basicConfig(
@@ -38,22 +47,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Checkpoint used to resume a purge that ran out of time budget
+PURGE_STATE_PATH = settings.data_dir / "audit_purge_state.json"
+
+
+def _log_progress(progress: PurgeProgress) -> None:
+    """Log purge progress every few batches."""
+    if progress.batches % 20 == 0:
+        logger.info(
+            f"{progress.table_name}: {progress.deleted} deleted "
+            f"in {progress.batches} batches"
+        )
+
 
 async def cmd_purge_old_audit(args: argparse.Namespace) -> int:
     """Purge audit records older than specified days."""
     await init_db()
 
+    if args.no_resume:
+        PURGE_STATE_PATH.unlink(missing_ok=True)
+
     if args.table:
         # Purge specific table
         logger.info(f"Purging records older than {args.days} days from {args.table}...")
-        result = await purge_old_records(args.table, args.days)
+        purger = RetentionPurger(
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            time_budget_seconds=args.time_budget,
+            on_progress=_log_progress,
+        )
+        result = await purger.purge_table(args.table, args.days)
 
         if result.error:
             logger.error(f"Error: {result.error}")
             return 1
 
-        logger.info(f"Deleted {result.deleted_count} records from {result.table_name}")
+        logger.info(
+            f"Deleted {result.deleted_count} records from {result.table_name} "
+            f"in {result.batches} batches"
+        )
         logger.info(f"Cutoff date: {result.cutoff_date.isoformat()}")
+        if not result.completed:
+            logger.info("Time budget spent before the purge finished")
     else:
         # Purge all tables with custom retention
         config = RetentionConfig(
@@ -71,6 +106,12 @@ async def cmd_purge_old_audit(args: argparse.Namespace) -> int:
             config,
             run_vacuum=not args.no_vacuum,
             run_analyze=not args.no_analyze,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            time_budget_seconds=args.time_budget,
+            state_path=PURGE_STATE_PATH,
+            on_progress=_log_progress,
+            incremental_vacuum=args.incremental_vacuum,
         )
 
         print("\n" + "=" * 60)
@@ -78,13 +119,22 @@ async def cmd_purge_old_audit(args: argparse.Namespace) -> int:
         print("=" * 60)
 
         for table_result in result.results:
-            status = "OK" if not table_result.error else f"ERROR: {table_result.error}"
+            if table_result.error:
+                status = f"ERROR: {table_result.error}"
+            elif not table_result.completed:
+                status = "PAUSED"
+            else:
+                status = "OK"
             print(f"  {table_result.table_name:25} {table_result.deleted_count:8} deleted  [{status}]")
 
         print("-" * 60)
-        print(f"  {'TOTAL':25} {result.total_deleted:8} deleted")
+        print(f"  {'TOTAL':25} {result.total_deleted:8} deleted  ({result.elapsed_seconds:.1f}s)")
+        if not result.completed:
+            print("  Time budget spent; run again to resume from the checkpoint")
         print()
         print(f"  VACUUM:  {'completed' if result.vacuum_run else 'skipped'}")
+        if result.incremental_vacuum_pages is not None:
+            print(f"  INCREMENTAL VACUUM: {result.incremental_vacuum_pages} pages freed")
         print(f"  ANALYZE: {'completed' if result.analyze_run else 'skipped'}")
         print("=" * 60)
 
@@ -127,11 +177,27 @@ async def cmd_audit_vacuum(args: argparse.Namespace) -> int:
     await init_db()
 
     from sqlalchemy import text
+
     from app.database import async_session_factory
 
     logger.info("Running database maintenance...")
 
     try:
+        if args.enable_incremental:
+            logger.info("Switching to auto_vacuum=INCREMENTAL (runs a full VACUUM once)...")
+            if await enable_incremental_vacuum():
+                logger.info("Incremental vacuum enabled")
+            else:
+                logger.info("Incremental vacuum was already enabled")
+
+        if args.incremental:
+            pages = await RetentionPurger().incremental_vacuum()
+            if pages is None:
+                logger.error("auto_vacuum is not INCREMENTAL; use --enable-incremental first")
+                return 1
+            logger.info(f"Incremental vacuum freed {pages} pages")
+            args.no_vacuum = True
+
         async with async_session_factory() as session:
             if not args.no_vacuum:
                 logger.info("Running VACUUM...")
@@ -194,6 +260,33 @@ def main() -> int:
         action="store_true",
         help="Skip ANALYZE after purge",
     )
+    purge_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Rows deleted per transaction",
+    )
+    purge_parser.add_argument(
+        "--pause",
+        type=float,
+        default=DEFAULT_PAUSE_SECONDS,
+        help="Seconds to pause between batches",
+    )
+    purge_parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="Stop after this many seconds (all-table purges resume on the next run)",
+    )
+    purge_parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore the checkpoint of an earlier, unfinished purge",
+    )
+    purge_parser.add_argument(
+        "--incremental-vacuum",
+        action="store_true",
+        help="Run PRAGMA incremental_vacuum instead of VACUUM after purge",
+    )
 
     # audit_stats command
     stats_parser = subparsers.add_parser(
@@ -216,6 +309,16 @@ def main() -> int:
         action="store_true",
         help="Skip ANALYZE",
     )
+    vacuum_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Run PRAGMA incremental_vacuum instead of VACUUM",
+    )
+    vacuum_parser.add_argument(
+        "--enable-incremental",
+        action="store_true",
+        help="Switch the database to auto_vacuum=INCREMENTAL (one-time full VACUUM)",
+    )
 
     args = parser.parse_args()
 
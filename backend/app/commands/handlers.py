@@ -1,11 +1,14 @@
 """Default command handlers."""
 
+import logging
 from typing import Any
 from pathlib import Path
 
 from app.commands.registry import Command, command_registry
 from app.projects import project_registry
 
+logger = logging.getLogger(__name__)
+
 
 def handle_review(args: str, context: dict[str, Any]) -> dict[str, Any]:
     """Handle /review <file> command."""
@@ -216,6 +219,8 @@ def _handle_project_ingest(project_name: str) -> dict[str, Any]:
         save_context_pack,
         load_context_pack,
         context_pack_is_stale,
+        search_index_manager,
+        symbol_index_manager,
     )
 
     project = project_registry.get(project_name.lower())
@@ -243,6 +248,18 @@ def _handle_project_ingest(project_name: str) -> dict[str, Any]:
             pack.generated_at,
         )
 
+        # Build or refresh the trigram search index
+        try:
+            index_stats = search_index_manager.build(project.name, str(project_path))
+        except Exception as e:
+            index_stats = None
+            logger.warning(f"Failed to update search index for {project.name}: {e}")
+        try:
+            symbol_stats = symbol_index_manager.build(project.name, str(project_path))
+        except Exception as e:
+            symbol_stats = None
+            logger.warning(f"Failed to update symbol index for {project.name}: {e}")
+
         # Build summary
         lines = [
             f"**Context pack generated for: {project.name}**\n",
@@ -261,6 +278,10 @@ def _handle_project_ingest(project_name: str) -> dict[str, Any]:
         lines.append(f"**Modules detected:** {len(pack.module_map)}")
         lines.append(f"**Entry points:** {len(pack.entrypoints)}")
         lines.append(f"**Dependencies:** {len(pack.manifest.dependencies)}")
+        if index_stats:
+            lines.append(f"**Files indexed for search:** {index_stats['files']}")
+        if symbol_stats:
+            lines.append(f"**Symbols indexed:** {symbol_stats['symbols']}")
         lines.append("")
         lines.append(f"Pack saved to: `{pack_path}`")
         lines.append("\nUse `/project search {project.name} <query>` to search code.")
@@ -271,6 +292,45 @@ def _handle_project_ingest(project_name: str) -> dict[str, Any]:
         return {"error": f"Failed to generate context pack: {str(e)}"}
 
 
+def _search_project_index(project_name: str, project_path: Path, query: str) -> dict[str, Any] | None:
+    """Search a project's trigram index, formatted like ripgrep output.
+
+    Returns None if the project has no index or the query is not supported.
+    """
+    from app.projects import UnsupportedQueryError, search_index_manager
+
+    try:
+        result = search_index_manager.search(
+            project_name, project_path, query, context_lines=2, max_results=15
+        )
+    except UnsupportedQueryError:
+        return None
+    except Exception as e:
+        logger.warning(f"Index search failed for {project_name}: {e}")
+        return None
+    if result is None:
+        return None
+
+    if not result.matches:
+        return {"message": f"**No matches found** for `{query}` in {project_name}"}
+
+    lines = [f"**Search results for `{query}` in {project_name}:**\n", "```"]
+    for match in result.matches:
+        start = match.line_number - len(match.context_before)
+        for offset, text in enumerate(match.context_before):
+            lines.append(f"{match.file}-{start + offset}-{text}")
+        lines.append(f"{match.file}:{match.line_number}:{match.content}")
+        for offset, text in enumerate(match.context_after, start=1):
+            lines.append(f"{match.file}-{match.line_number + offset}-{text}")
+        lines.append("--")
+    lines.append("```")
+
+    if result.truncated:
+        lines.append("\n*Results truncated. Use the API for full search.*")
+
+    return {"message": "\n".join(lines)}
+
+
 def _handle_project_search(project_name: str, query: str) -> dict[str, Any]:
     """Handle /project search <name> <query> - search project code."""
     import asyncio
@@ -289,7 +349,11 @@ def _handle_project_search(project_name: str, query: str) -> dict[str, Any]:
     if not project_path.exists():
         return {"error": f"Project path does not exist: {project.path}"}
 
-    # Run ripgrep search
+    indexed = _search_project_index(project.name, project_path, query)
+    if indexed is not None:
+        return indexed
+
+    # Not indexed yet - run ripgrep search
     cmd = [
         "rg", "-n", "-i", "-C", "2",
         "--glob", "!node_modules/**",
@@ -70,6 +70,11 @@ class Settings(BaseSettings):
     max_history_messages: int = 50  # Max messages to load from history
     summarize_after_messages: int = 30  # Summarize older messages after this threshold
 
+    # In-process session state (workflow router, inline projects)
+    session_state_max_entries: int = 10000  # Per store; least recently used evicted first
+    session_state_spill: bool = False  # Spill evicted state to data_dir/session_state.db
+    approvals_persist: bool = False  # Record pending approvals in data_dir/approvals.db
+
     # Rate limiting
     rate_limit_enabled: bool = True
     rate_limit_chat: str = "20/minute"  # Chat endpoint limit
@@ -4,7 +4,21 @@ import logging
 from datetime import datetime
 from typing import AsyncGenerator
 
-from sqlalchemy import Boolean, Float, JSON, DateTime, Index, Integer, String, Text, UniqueConstraint, func, select, text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    select,
+    text,
+)
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -13,7 +27,9 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 # Current schema version - increment when making schema changes
-SCHEMA_VERSION = 5  # v1 = original, v2 = orchestration tables, v3 = channel unification, v4 = audit logs, v5 = audit performance indexes
+# v1 = original, v2 = orchestration tables, v3 = channel unification, v4 = audit logs,
+# v5 = audit performance indexes, v6 = audit blob store, v7 = stream event replay
+SCHEMA_VERSION = 7
 
 
 class Base(DeclarativeBase):
@@ -494,7 +510,8 @@ class LLMExchangeLog(Base):
     # Content (configurable: hash-only or full)
     content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     content_length: Mapped[int] = mapped_column(Integer, default=0)
-    content_redacted: Mapped[str | None] = mapped_column(Text, nullable=True)  # Optional redacted content
+    # Optional content or "BLOB:<hash>"
+    content_redacted: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Token usage
     tokens_in: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -542,6 +559,7 @@ class FileChangeLog(Base):
     file_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     # Diff (optional, for writes) - may be gzip compressed (prefixed with "GZIP:")
+    # or a reference into audit_blobs (prefixed with "BLOB:")
     diff: Mapped[str | None] = mapped_column(Text, nullable=True)
     diff_lines_added: Mapped[int | None] = mapped_column(Integer, nullable=True)
     diff_lines_removed: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -571,6 +589,44 @@ class FileChangeLog(Base):
     )
 
 
+class AuditBlob(Base):
+    """Content-addressed payload shared by audit log rows.
+
+    Keyed by the SHA-256 of the uncompressed content. Rows reference a
+    blob as "BLOB:<hash>"; refcount tracks how many rows do so.
+    """
+
+    __tablename__ = "audit_blobs"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(20), index=True)  # diff, llm_request, llm_response
+
+    # Encoding
+    codec: Mapped[str] = mapped_column(String(10))  # raw, zlib, zstd
+    dictionary_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+
+    # Sizes in bytes
+    size: Mapped[int] = mapped_column(Integer, default=0)
+    stored_size: Mapped[int] = mapped_column(Integer, default=0)
+
+    refcount: Mapped[int] = mapped_column(Integer, default=1, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
+class AuditBlobDictionary(Base):
+    """Compression dictionary trained on samples of one payload kind."""
+
+    __tablename__ = "audit_blob_dictionaries"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(20), index=True)
+    codec: Mapped[str] = mapped_column(String(10))
+    data: Mapped[bytes] = mapped_column(LargeBinary)
+    sample_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
 class BudgetLog(Base):
     """Audit log for budget tracking and enforcement.
 
@@ -605,6 +661,27 @@ class BudgetLog(Base):
     )
 
 
+class StreamEvent(Base):
+    """SSE frame evicted from a stream's in-memory replay buffer.
+
+    Lets a client that reconnects with an old Last-Event-ID catch up on
+    events the replay ring no longer holds. stream_id is the id of one
+    EventLog (see app.utils.sse_replay); rows are deleted with the log.
+    """
+
+    __tablename__ = "stream_events"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    stream_id: Mapped[str] = mapped_column(String(36), index=True)
+    event_id: Mapped[int] = mapped_column(Integer)
+    frame: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("stream_id", "event_id", name="uq_stream_event"),
+    )
+
+
 # Engine and session factory
 engine = create_async_engine(settings.database_url, echo=settings.debug)
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
@@ -17,6 +17,11 @@ from app.guardrails.policies import (
     AGENT_POLICIES,
     get_agent_policy,
 )
+from app.guardrails.compiled import (
+    CompiledPolicy,
+    PolicyCompiler,
+    policy_compiler,
+)
 from app.guardrails.budgets import (
     BudgetTracker,
     BudgetExceededError,
@@ -26,6 +31,8 @@ from app.guardrails.diff_approval import (
     DiffApprovalManager,
     PendingApproval,
     ApprovalStatus,
+    ApprovalEvent,
+    ApprovalSubscription,
     diff_approval_manager,
 )
 from app.guardrails.audit_repository import AuditRepository
@@ -63,6 +70,10 @@ __all__ = [
     "DiffApprovalPolicy",
     "AGENT_POLICIES",
     "get_agent_policy",
+    # Compiled policies
+    "CompiledPolicy",
+    "PolicyCompiler",
+    "policy_compiler",
     # Budgets
     "BudgetTracker",
     "BudgetExceededError",
@@ -71,6 +82,8 @@ __all__ = [
     "DiffApprovalManager",
     "PendingApproval",
     "ApprovalStatus",
+    "ApprovalEvent",
+    "ApprovalSubscription",
     "diff_approval_manager",
     # Audit
     "AuditRepository",
@@ -143,6 +143,9 @@ class ApprovalExecutor:
                 await AuditRepository.log_file_operation(
                     file_path=str(file_path),
                     operation="write",
+                    diff=approval.diff,
+                    diff_lines_added=approval.lines_added,
+                    diff_lines_removed=approval.lines_removed,
                     success=True,
                     approval_id=approval.id,
                     session_id=approval.session_id,
@@ -8,6 +8,7 @@ import hashlib
 import json
 import logging
 import uuid
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Any
 
@@ -22,6 +23,14 @@ from app.database import (
     FileChangeLog,
     BudgetLog,
 )
+from app.audit.blob_store import (
+    BLOB_KIND_DIFF,
+    BLOB_KIND_LLM_REQUEST,
+    BLOB_KIND_LLM_RESPONSE,
+    blob_ref,
+    audit_blob_store,
+    parse_blob_ref,
+)
 from app.audit.retention import (
     truncate_error,
     truncate_params,
@@ -29,6 +38,7 @@ from app.audit.retention import (
     decompress_diff,
     get_retention_config,
 )
+from app.utils.diff_service import count_changes
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +77,32 @@ def _redact_params(params: dict[str, Any]) -> dict[str, Any]:
     return truncate_params(redacted, config.max_params_size) or redacted
 
 
+def _use_blob_store(content: str, config) -> bool:
+    """Whether a payload goes to the shared blob store instead of the row."""
+    return (
+        config.blob_store_payloads
+        and config.compression_threshold < len(content) <= config.max_blob_size
+    )
+
+
+async def _llm_content(
+    session: AsyncSession,
+    kind: str,
+    content: str,
+    content_hash: str,
+    include_content: bool,
+) -> str | None:
+    """Build the content_redacted value for an LLM exchange row."""
+    if not include_content:
+        return None
+    config = get_retention_config()
+    if config.retain_full_llm_content and _use_blob_store(content, config):
+        await audit_blob_store.put(kind, content, content_hash=content_hash, db=session)
+        return blob_ref(content_hash)
+    limit = config.llm_content_preview_chars
+    return content[:limit] + "..." if len(content) > limit else content
+
+
 class AuditRepository:
     """Repository for audit log persistence."""
 
@@ -201,24 +237,30 @@ class AuditRepository:
         include_content: bool = False,
         db: AsyncSession | None = None,
     ) -> LLMExchangeLog:
-        """Log an LLM request."""
-        log_entry = LLMExchangeLog(
-            id=str(uuid.uuid4()),
-            session_id=session_id,
-            task_id=task_id,
-            agent_id=agent_id,
-            exchange_type="request",
-            model=model,
-            content_hash=_hash_content(content),
-            content_length=len(content),
-            content_redacted=content[:1000] + "..." if include_content and len(content) > 1000 else (content if include_content else None),
-        )
+        """Log an LLM request.
 
-        if db:
-            db.add(log_entry)
-        else:
-            async with async_session_factory() as session:
-                session.add(log_entry)
+        With include_content, the body is kept truncated to a preview; with
+        retain_full_llm_content enabled, bodies above the compression
+        threshold are stored in full, once, in the audit blob store.
+        """
+        content_hash = _hash_content(content)
+
+        async with nullcontext(db) if db else async_session_factory() as session:
+            log_entry = LLMExchangeLog(
+                id=str(uuid.uuid4()),
+                session_id=session_id,
+                task_id=task_id,
+                agent_id=agent_id,
+                exchange_type="request",
+                model=model,
+                content_hash=content_hash,
+                content_length=len(content),
+                content_redacted=await _llm_content(
+                    session, BLOB_KIND_LLM_REQUEST, content, content_hash, include_content
+                ),
+            )
+            session.add(log_entry)
+            if not db:
                 await session.commit()
 
         return log_entry
@@ -239,28 +281,29 @@ class AuditRepository:
         db: AsyncSession | None = None,
     ) -> LLMExchangeLog:
         """Log an LLM response."""
-        log_entry = LLMExchangeLog(
-            id=str(uuid.uuid4()),
-            session_id=session_id,
-            task_id=task_id,
-            agent_id=agent_id,
-            exchange_type="response",
-            model=model,
-            content_hash=_hash_content(content),
-            content_length=len(content),
-            content_redacted=content[:1000] + "..." if include_content and len(content) > 1000 else (content if include_content else None),
-            tokens_in=tokens_in,
-            tokens_out=tokens_out,
-            duration_ms=duration_ms,
-            success=success,
-            error=error,
-        )
-
-        if db:
-            db.add(log_entry)
-        else:
-            async with async_session_factory() as session:
-                session.add(log_entry)
+        content_hash = _hash_content(content)
+
+        async with nullcontext(db) if db else async_session_factory() as session:
+            log_entry = LLMExchangeLog(
+                id=str(uuid.uuid4()),
+                session_id=session_id,
+                task_id=task_id,
+                agent_id=agent_id,
+                exchange_type="response",
+                model=model,
+                content_hash=content_hash,
+                content_length=len(content),
+                content_redacted=await _llm_content(
+                    session, BLOB_KIND_LLM_RESPONSE, content, content_hash, include_content
+                ),
+                tokens_in=tokens_in,
+                tokens_out=tokens_out,
+                duration_ms=duration_ms,
+                success=success,
+                error=error,
+            )
+            session.add(log_entry)
+            if not db:
                 await session.commit()
 
         return log_entry
@@ -276,6 +319,8 @@ class AuditRepository:
         before_content: str | None = None,
         after_content: str | None = None,
         diff: str | None = None,
+        diff_lines_added: int | None = None,
+        diff_lines_removed: int | None = None,
         in_workspace: bool = True,
         blocked: bool = False,
         requires_approval: bool = False,
@@ -287,22 +332,32 @@ class AuditRepository:
         agent_id: str | None = None,
         db: AsyncSession | None = None,
     ) -> FileChangeLog:
-        """Log a file operation with optional diff compression."""
+        """Log a file operation with optional diff compression.
+
+        Large diffs go to the audit blob store keyed by diff_original_hash,
+        so identical diffs are stored once; otherwise they are gzipped inline.
+        Pass diff_lines_added/removed when known (e.g. from DiffResult) to
+        skip re-counting them from the diff text.
+        """
         config = get_retention_config()
 
-        # Calculate diff stats if diff provided (before compression)
-        diff_lines_added = None
-        diff_lines_removed = None
         diff_original_size = None
         diff_original_hash = None
         processed_diff = diff
+        blob_diff = False
 
         if diff:
-            diff_lines_added = sum(1 for line in diff.split("\n") if line.startswith("+") and not line.startswith("+++"))
-            diff_lines_removed = sum(1 for line in diff.split("\n") if line.startswith("-") and not line.startswith("---"))
-
+            # Calculate diff stats if not provided (before compression)
+            if diff_lines_added is None or diff_lines_removed is None:
+                diff_lines_added, diff_lines_removed = count_changes(diff)
+
+            if _use_blob_store(diff, config):
+                blob_diff = True
+                diff_original_hash = _hash_content(diff)
+                diff_original_size = len(diff)
+                processed_diff = blob_ref(diff_original_hash)
             # Compress diff if configured
-            if config.compress_diffs:
+            elif config.compress_diffs:
                 compressed = compress_diff(
                     diff,
                     threshold=config.compression_threshold,
@@ -339,11 +394,13 @@ class AuditRepository:
             error=processed_error,
         )
 
-        if db:
-            db.add(log_entry)
-        else:
-            async with async_session_factory() as session:
-                session.add(log_entry)
+        async with nullcontext(db) if db else async_session_factory() as session:
+            if blob_diff:
+                await audit_blob_store.put(
+                    BLOB_KIND_DIFF, diff, content_hash=diff_original_hash, db=session
+                )
+            session.add(log_entry)
+            if not db:
                 await session.commit()
 
         return log_entry
@@ -466,8 +523,13 @@ class AuditRepository:
 
             # Decompress diffs if requested
             if decompress:
+                blob_hashes = [h for h in (parse_blob_ref(log.diff) for log in logs) if h]
+                blobs = await audit_blob_store.get_many(blob_hashes, db=session)
                 for log in logs:
-                    if log.diff and log.diff.startswith("GZIP:"):
+                    blob_hash = parse_blob_ref(log.diff)
+                    if blob_hash:
+                        log.diff = blobs.get(blob_hash, log.diff)
+                    elif log.diff and log.diff.startswith("GZIP:"):
                         log.diff = decompress_diff(log.diff)
 
             return logs
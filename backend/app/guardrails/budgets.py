@@ -220,6 +220,19 @@ class BudgetTracker:
         self.usage.tool_calls_session += 1
         self.usage.total_output_bytes += output_size
 
+    def reserve_tool_call(self) -> None:
+        """Count a tool call up front, before it runs.
+
+        Used when several calls are dispatched concurrently so that later
+        budget checks see the in-flight calls. Pair with record_output_size().
+        """
+        self.usage.tool_calls_message += 1
+        self.usage.tool_calls_session += 1
+
+    def record_output_size(self, output_size: int) -> None:
+        """Record output size for a tool call counted via reserve_tool_call()."""
+        self.usage.total_output_bytes += output_size
+
     def record_spawn(self, depth: int = 0) -> None:
         """Record a task spawn."""
         self.usage.spawned_tasks += 1
@@ -0,0 +1,328 @@
+"""Compiled guardrail policies.
+
+Policies are declared as plain dataclasses (see policies.py), which are
+convenient to edit but expensive to evaluate: every check used to realpath
+each allowed root and re-run uncompiled regexes. The compiler turns a policy
+into a decision object once:
+- allowed roots are expanded and resolved up front, so a check resolves only
+  the target path and compares strings
+- shell patterns are compiled into one combined matcher per list
+- protected-path globs are compiled into one regex
+
+Compiled policies are cached per (agent, workspace) and keyed by a signature
+of the policy's fields, so editing a policy (or the home directory changing)
+transparently recompiles it. ``policy_compiler.invalidate()`` drops everything,
+e.g. after a configuration reload.
+
+Target paths are never cached: a symlink swapped between two checks must not
+let a write escape the jail.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from app.guardrails.policies import (
+    AgentPolicy,
+    DiffApprovalPolicy,
+    FilesystemPolicy,
+    ShellPolicy,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def _resolve(path: str) -> str:
+    """Expand and resolve a path (same result as Path.expanduser().resolve())."""
+    return os.path.realpath(os.path.expanduser(path))
+
+
+def _is_within(target: str, root: str) -> bool:
+    """Check whether a resolved path equals or lies under a resolved root."""
+    if target == root:
+        return True
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    return target.startswith(prefix)
+
+
+class PatternSet:
+    """A list of regexes evaluated as a single compiled alternation.
+
+    Patterns that contain groups could have their backreferences renumbered
+    by the combination, so such lists fall back to per-pattern matching.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.patterns = list(patterns)
+        self._each = [re.compile(p) for p in self.patterns]
+        self._combined: re.Pattern | None = None
+        if self._each and not any(p.groups for p in self._each):
+            try:
+                self._combined = re.compile("|".join(f"(?:{p})" for p in self.patterns))
+            except re.error:
+                # e.g. inline global flags that are only valid at the start
+                self._combined = None
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def search(self, text: str) -> str | None:
+        """Return the first pattern (in list order) found anywhere in text."""
+        if self._combined is not None and not self._combined.search(text):
+            return None
+        for pattern, compiled in zip(self.patterns, self._each):
+            if compiled.search(text):
+                return pattern
+        return None
+
+    def match(self, text: str) -> bool:
+        """Check whether any pattern matches at the start of text."""
+        if self._combined is not None:
+            return self._combined.match(text) is not None
+        return any(compiled.match(text) for compiled in self._each)
+
+
+class CompiledFilesystemPolicy:
+    """FilesystemPolicy with allowed roots resolved once."""
+
+    def __init__(self, policy: FilesystemPolicy):
+        self.read_allowed = policy.read_allowed
+        self.write_allowed = policy.write_allowed and bool(policy.write_paths)
+        self.workspace_only = policy.workspace_only
+        self.workspace_path = policy.workspace_path
+        self.workspace_root = _resolve(policy.workspace_path)
+
+        self.read_any = "*" in policy.read_paths
+        self.read_roots = tuple(_resolve(p) for p in policy.read_paths if p != "*")
+        self.write_any = "*" in policy.write_paths
+        self.write_roots = tuple(_resolve(p) for p in policy.write_paths if p != "*")
+
+    def can_read(self, path: str) -> bool:
+        """Check if reading a path is allowed."""
+        if not self.read_allowed:
+            return False
+        if self.read_any:
+            return True
+        target = _resolve(path)
+        return any(_is_within(target, root) for root in self.read_roots)
+
+    def can_write(self, path: str) -> bool:
+        """Check if writing to a path is allowed."""
+        if not self.write_allowed:
+            return False
+        if self.write_any:
+            return True
+        target = _resolve(path)
+        if self.workspace_only and _is_within(target, self.workspace_root):
+            return True
+        return any(_is_within(target, root) for root in self.write_roots)
+
+    def is_in_workspace(self, path: str) -> bool:
+        """Check if path is within the workspace."""
+        if not path:
+            return False
+        return _is_within(_resolve(path), self.workspace_root)
+
+
+class CompiledShellPolicy:
+    """ShellPolicy with its banned and allowed patterns precompiled."""
+
+    def __init__(self, policy: ShellPolicy):
+        self.workdir_only = policy.workdir_only
+        self.banned = PatternSet(policy.banned_patterns)
+        self.allowed = PatternSet(policy.allowed_commands)
+
+    def is_command_allowed(self, command: str) -> tuple[bool, str | None]:
+        """Check if command is allowed."""
+        banned = self.banned.search(command)
+        if banned is not None:
+            return False, f"Command matches banned pattern: {banned}"
+        if self.allowed and not self.allowed.match(command):
+            return False, "Command does not match any allowed patterns"
+        return True, None
+
+
+class CompiledDiffApprovalPolicy:
+    """DiffApprovalPolicy with protected-path globs compiled into one regex."""
+
+    def __init__(self, policy: DiffApprovalPolicy):
+        self.policy = policy
+        self._protected: re.Pattern | None = None
+        if policy.protected_paths:
+            self._protected = re.compile("|".join(
+                f"(?:{fnmatch.translate(os.path.normcase(p))})" for p in policy.protected_paths
+            ))
+
+    def is_protected_path(self, path: str) -> bool:
+        """Check if path matches protected patterns."""
+        if self._protected is None:
+            return False
+        return self._protected.match(os.path.normcase(Path(path).name)) is not None
+
+    def requires_approval(self, action: str, path: str | None = None) -> bool:
+        """Check if an action requires approval."""
+        policy = self.policy
+        if not policy.enabled:
+            return False
+        if action == "write" and policy.require_approval_for_writes:
+            return bool(path) and self.is_protected_path(path)
+        if action == "delete" and policy.require_approval_for_deletes:
+            return True
+        if action == "shell" and policy.require_approval_for_shell:
+            return True
+        return False
+
+
+class CompiledPolicy:
+    """Decision object for one agent policy."""
+
+    def __init__(
+        self,
+        policy: AgentPolicy,
+        filesystem: CompiledFilesystemPolicy,
+        shell: CompiledShellPolicy,
+        diff_approval: CompiledDiffApprovalPolicy,
+    ):
+        self.agent_id = policy.agent_id
+        self.allowed_tools = frozenset(policy.allowed_tools)
+        self.filesystem = filesystem
+        self.shell = shell
+        self.diff_approval = diff_approval
+
+    def is_tool_allowed(self, tool_id: str) -> bool:
+        """Check if a tool is allowed for this agent."""
+        return tool_id in self.allowed_tools
+
+
+def _filesystem_signature(policy: FilesystemPolicy) -> tuple:
+    # The home directory is part of the key because "~" roots depend on it
+    return (
+        tuple(policy.read_paths),
+        policy.read_allowed,
+        tuple(policy.write_paths),
+        policy.write_allowed,
+        policy.workspace_only,
+        policy.workspace_path,
+        os.path.expanduser("~"),
+    )
+
+
+def _shell_signature(policy: ShellPolicy) -> tuple:
+    return (tuple(policy.allowed_commands), tuple(policy.banned_patterns), policy.workdir_only)
+
+
+def _diff_signature(policy: DiffApprovalPolicy) -> tuple:
+    return (
+        policy.enabled,
+        policy.require_approval_for_writes,
+        policy.require_approval_for_deletes,
+        policy.require_approval_for_shell,
+        tuple(policy.protected_paths),
+        policy.approval_timeout_seconds,
+    )
+
+
+class PolicyCompiler:
+    """Compiles policies into decision objects and caches them.
+
+    Lookups recompute a cheap signature of the policy's fields and recompile
+    only when it changed, so in-place edits to AGENT_POLICIES take effect on
+    the next check.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._policies: OrderedDict[tuple[str, str], tuple[tuple, CompiledPolicy]] = OrderedDict()
+        self._filesystem: OrderedDict[tuple, CompiledFilesystemPolicy] = OrderedDict()
+        self._shell: OrderedDict[tuple, CompiledShellPolicy] = OrderedDict()
+        self._diff: OrderedDict[tuple, CompiledDiffApprovalPolicy] = OrderedDict()
+        self._hits = 0
+        self._compiles = 0
+        self._invalidations = 0
+
+    def _cached(self, cache: OrderedDict, key: tuple, build) -> Any:
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            cache[key] = value
+            if len(cache) > self.max_entries:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return value
+
+    def filesystem(self, policy: FilesystemPolicy) -> CompiledFilesystemPolicy:
+        """Get the compiled form of a filesystem policy."""
+        return self._cached(
+            self._filesystem, _filesystem_signature(policy),
+            lambda: CompiledFilesystemPolicy(policy),
+        )
+
+    def shell(self, policy: ShellPolicy) -> CompiledShellPolicy:
+        """Get the compiled form of a shell policy."""
+        return self._cached(
+            self._shell, _shell_signature(policy), lambda: CompiledShellPolicy(policy),
+        )
+
+    def diff_approval(self, policy: DiffApprovalPolicy) -> CompiledDiffApprovalPolicy:
+        """Get the compiled form of a diff approval policy."""
+        return self._cached(
+            self._diff, _diff_signature(policy), lambda: CompiledDiffApprovalPolicy(policy),
+        )
+
+    def compile(self, policy: AgentPolicy) -> CompiledPolicy:
+        """Get the decision object for an agent policy."""
+        key = (policy.agent_id, policy.filesystem.workspace_path)
+        signature = (
+            tuple(policy.allowed_tools),
+            _filesystem_signature(policy.filesystem),
+            _shell_signature(policy.shell),
+            _diff_signature(policy.diff_approval),
+        )
+
+        entry = self._policies.get(key)
+        if entry is not None and entry[0] == signature:
+            self._policies.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+        compiled = CompiledPolicy(
+            policy,
+            filesystem=self.filesystem(policy.filesystem),
+            shell=self.shell(policy.shell),
+            diff_approval=self.diff_approval(policy.diff_approval),
+        )
+        self._compiles += 1
+        self._policies[key] = (signature, compiled)
+        self._policies.move_to_end(key)
+        if len(self._policies) > self.max_entries:
+            self._policies.popitem(last=False)
+        return compiled
+
+    def invalidate(self) -> None:
+        """Drop all compiled policies (e.g. after a configuration reload)."""
+        self._policies.clear()
+        self._filesystem.clear()
+        self._shell.clear()
+        self._diff.clear()
+        self._invalidations += 1
+        logger.debug("Compiled guardrail policies invalidated")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "policies": len(self._policies),
+            "hits": self._hits,
+            "compiles": self._compiles,
+            "invalidations": self._invalidations,
+        }
+
+
+# Global compiler instance
+policy_compiler = PolicyCompiler()
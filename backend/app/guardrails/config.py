@@ -320,6 +320,10 @@ def reset_guardrails_settings() -> None:
     global _settings
     _settings = None
 
+    # Compiled policies may reflect the old configuration
+    from app.guardrails.compiled import policy_compiler
+    policy_compiler.invalidate()
+
 
 def _log_active_settings(settings: GuardrailsSettings) -> None:
     """Log active guardrails settings for debugging."""
@@ -480,7 +484,7 @@ def get_agent_tool_allowlist(agent_id: str) -> list[str] | None:
 
     # In readonly mode, remove write-capable tools
     if settings.readonly_mode:
-        readonly_tools = ["filesystem", "web_search", "web_fetch", "sessions"]
+        readonly_tools = ["filesystem", "code_symbols", "web_search", "web_fetch", "sessions"]
         return readonly_tools
 
     # In sandbox mode, no shell access
@@ -2,21 +2,43 @@
 
 Intercepts write/delete/shell operations, generates diffs or previews,
 and queues them for user approval before execution.
+
+The manager acts as an event-driven approval broker:
+- blocked tasks wait on a per-approval event that is set the moment a
+  decision is made, so they resume immediately
+- expirations are kept in a min-heap of deadlines and fired by a single
+  timer task (or lazily on access), instead of sweeping every approval
+- state changes are published to per-session subscriptions, which back the
+  approvals SSE stream
+- pending approvals can optionally be written through to SQLite (diff and
+  content hash only, never the file contents). The requesting task does not
+  survive a restart, so restored approvals come back as orphaned: listed for
+  the record, but no longer decidable
 """
 
 import asyncio
-import difflib
 import hashlib
+import heapq
 import logging
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, Awaitable
+from typing import Any, Awaitable, Callable
+
+from app.utils.diff_service import DiffResult, diff_service
 
 logger = logging.getLogger(__name__)
 
+# Resolved approvals stay visible (API listing, late waiters) for this long
+RESOLVED_RETENTION_SECONDS = 3600.0
+
+# Events buffered per subscription before the oldest are dropped
+SUBSCRIPTION_MAX_QUEUED = 1000
+
+PERSIST_NAMESPACE = "approvals"
+
 
 class ApprovalStatus(str, Enum):
     """Status of a pending approval."""
@@ -26,6 +48,7 @@ class ApprovalStatus(str, Enum):
     REJECTED = "rejected"
     EXPIRED = "expired"
     AUTO_APPROVED = "auto_approved"
+    ORPHANED = "orphaned"  # Restored after a restart; nothing is waiting on it
 
 
 @dataclass
@@ -44,6 +67,8 @@ class PendingApproval:
     new_content: str | None = None
     diff: str | None = None
     content_hash: str | None = None
+    lines_added: int | None = None
+    lines_removed: int | None = None
 
     # For shell operations
     command: str | None = None
@@ -66,6 +91,8 @@ class PendingApproval:
             "file_path": self.file_path,
             "diff": self.diff,
             "content_hash": self.content_hash,
+            "lines_added": self.lines_added,
+            "lines_removed": self.lines_removed,
             "command": self.command,
             "workdir": self.workdir,
             "status": self.status.value,
@@ -75,6 +102,93 @@ class PendingApproval:
             "approval_note": self.approval_note,
         }
 
+    @classmethod
+    def from_record(cls, data: dict[str, Any]) -> "PendingApproval":
+        expires_at = data.get("expires_at")
+        return cls(
+            id=data["id"],
+            action_type=data["action_type"],
+            session_id=data["session_id"],
+            agent_id=data["agent_id"],
+            task_id=data.get("task_id"),
+            file_path=data.get("file_path"),
+            diff=data.get("diff"),
+            content_hash=data.get("content_hash"),
+            lines_added=data.get("lines_added"),
+            lines_removed=data.get("lines_removed"),
+            command=data.get("command"),
+            workdir=data.get("workdir"),
+            status=ApprovalStatus(data.get("status", ApprovalStatus.PENDING.value)),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            expires_at=datetime.fromisoformat(expires_at) if expires_at else None,
+            approved_by=data.get("approved_by"),
+            approval_note=data.get("approval_note"),
+        )
+
+
+@dataclass
+class ApprovalEvent:
+    """A state change published to approval subscriptions."""
+
+    type: str  # approval_requested, approval_resolved
+    approval: PendingApproval
+
+
+class ApprovalSubscription:
+    """Queue of approval events for one subscriber.
+
+    Usage:
+        with diff_approval_manager.subscribe(session_id) as subscription:
+            async for event in subscription:
+                ...
+    """
+
+    def __init__(
+        self,
+        manager: "DiffApprovalManager",
+        session_id: str | None,
+        max_queued: int = SUBSCRIPTION_MAX_QUEUED,
+    ):
+        self.session_id = session_id
+        self.dropped = 0
+        self._manager = manager
+        self._queue: asyncio.Queue[ApprovalEvent] = asyncio.Queue(maxsize=max_queued)
+
+    def _put(self, event: ApprovalEvent) -> None:
+        if self._queue.full():
+            # A stalled consumer loses its oldest events rather than growing memory
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> ApprovalEvent | None:
+        """Wait for the next event; returns None if the timeout elapses first."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self._manager._unsubscribe(self)
+
+    def __enter__(self) -> "ApprovalSubscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __aiter__(self) -> "ApprovalSubscription":
+        return self
+
+    async def __anext__(self) -> ApprovalEvent:
+        return await self._queue.get()
+
+
+def _epoch(value: datetime) -> float:
+    """Wall-clock seconds for a naive UTC datetime."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
 
 class DiffApprovalManager:
     """Manages diff-first approval workflow for high-impact actions.
@@ -103,6 +217,150 @@ class DiffApprovalManager:
         self._approval_events: dict[str, asyncio.Event] = {}
         self._on_approval_requested: list[Callable[[PendingApproval], Awaitable[None]]] = []
 
+        # (deadline, approval_id, action): "expire" a pending approval or
+        # "retire" a resolved one. Stale entries are skipped when popped.
+        self._timers: list[tuple[datetime, str, str]] = []
+        self._subscribers: dict[str | None, set[ApprovalSubscription]] = {}
+
+        self._store = None  # SQLiteStateSpill when persistence is enabled
+        self._store_tail: asyncio.Task | None = None  # Last queued store write
+        self._timer_task: asyncio.Task | None = None
+        self._timer_wakeup: asyncio.Event | None = None
+
+        self._expired = 0
+        self._retired = 0
+        self._restored = 0
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    async def start(self, persist_path: Path | None = None) -> None:
+        """Restore persisted approvals and start the expiry timer."""
+        if persist_path is not None and self._store is None:
+            from app.utils.state_store import SQLiteStateSpill
+
+            self._store = await asyncio.to_thread(SQLiteStateSpill, persist_path)
+            await asyncio.to_thread(self._store.purge_expired)
+            self._restore(await asyncio.to_thread(self._store.load_all, PERSIST_NAMESPACE))
+
+        if self._timer_task is None:
+            self._timer_wakeup = asyncio.Event()
+            self._timer_task = asyncio.create_task(self._run_timer())
+
+    async def stop(self) -> None:
+        """Stop the expiry timer; pending approvals stay persisted."""
+        if self._timer_task is not None:
+            self._timer_task.cancel()
+            try:
+                await self._timer_task
+            except asyncio.CancelledError:
+                pass
+            self._timer_task = None
+            self._timer_wakeup = None
+
+        if self._store is not None:
+            if self._store_tail is not None:
+                await asyncio.wait([self._store_tail])
+                self._store_tail = None
+            self._store.close()
+            self._store = None
+
+    def _restore(self, rows: list[tuple[str, dict, float | None]]) -> None:
+        now = datetime.utcnow()
+        for approval_id, payload, _ in rows:
+            self._store_write(self._store.delete, PERSIST_NAMESPACE, [approval_id])
+            try:
+                approval = PendingApproval.from_record(payload)
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Dropping unreadable persisted approval {approval_id}: {e}")
+                continue
+            if approval.status != ApprovalStatus.PENDING or approval_id in self._pending:
+                continue
+            if approval.expires_at and approval.expires_at <= now:
+                continue
+
+            # The requesting task did not survive the restart, so approving would
+            # run nothing. Keep it listed as orphaned until it retires.
+            approval.approval_note = "Requesting task was lost in a restart"
+            self._pending[approval_id] = approval
+            self._settle(approval, ApprovalStatus.ORPHANED)
+            self._restored += 1
+
+        if self._restored:
+            logger.info(f"Restored {self._restored} approvals as orphaned")
+
+    def _store_write(self, fn: Callable[..., None], *args: Any) -> asyncio.Task | None:
+        """Run a blocking store write in a thread, after the previous one.
+
+        Writes are chained so a delete can never overtake the save it undoes.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            fn(*args)  # No loop to keep responsive (e.g. called from a thread)
+            return None
+
+        previous = self._store_tail
+
+        async def write() -> None:
+            if previous is not None:
+                await asyncio.wait([previous])
+            try:
+                await asyncio.to_thread(fn, *args)
+            except Exception as e:
+                logger.warning(f"Persisting approval state failed: {e}")
+
+        self._store_tail = asyncio.create_task(write())
+        return self._store_tail
+
+    async def _run_timer(self) -> None:
+        """Sleep until the earliest deadline (or an earlier one is added)."""
+        while True:
+            self._timer_wakeup.clear()
+            self.expire_due()
+            timeout = None
+            if self._timers:
+                timeout = max(0.0, (self._timers[0][0] - datetime.utcnow()).total_seconds())
+            try:
+                await asyncio.wait_for(self._timer_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _schedule(self, deadline: datetime, approval_id: str, action: str) -> None:
+        earliest = self._timers[0][0] if self._timers else None
+        heapq.heappush(self._timers, (deadline, approval_id, action))
+        if self._timer_wakeup is not None and (earliest is None or deadline < earliest):
+            self._timer_wakeup.set()
+
+    def expire_due(self) -> int:
+        """Fire all deadlines that have passed. Returns how many approvals expired.
+
+        Cost is proportional to the number of due deadlines, not to the
+        number of approvals.
+        """
+        now = datetime.utcnow()
+        expired = 0
+        while self._timers and self._timers[0][0] <= now:
+            _, approval_id, action = heapq.heappop(self._timers)
+            approval = self._pending.get(approval_id)
+            if approval is None:
+                continue
+            pending = approval.status == ApprovalStatus.PENDING
+            if action == "expire" and pending:
+                self._settle(approval, ApprovalStatus.EXPIRED)
+                expired += 1
+            elif action == "retire" and not pending:
+                self._pending.pop(approval_id, None)
+                self._approval_events.pop(approval_id, None)
+                self._retired += 1
+        self._expired += expired
+        return expired
+
+    # =========================================================================
+    # Subscriptions
+    # =========================================================================
+
     def register_approval_callback(
         self,
         callback: Callable[[PendingApproval], Awaitable[None]],
@@ -110,6 +368,56 @@ class DiffApprovalManager:
         """Register a callback for when approval is requested."""
         self._on_approval_requested.append(callback)
 
+    def subscribe(self, session_id: str | None = None) -> ApprovalSubscription:
+        """Subscribe to approval state changes for a session (None = all)."""
+        subscription = ApprovalSubscription(self, session_id)
+        self._subscribers.setdefault(session_id, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: ApprovalSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.session_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.session_id]
+
+    def _publish(self, event_type: str, approval: PendingApproval) -> None:
+        event = ApprovalEvent(type=event_type, approval=approval)
+        for key in (approval.session_id, None):
+            for subscription in self._subscribers.get(key, ()):
+                subscription._put(event)
+
+    # =========================================================================
+    # Requests
+    # =========================================================================
+
+    async def _register(self, approval: PendingApproval) -> PendingApproval:
+        self._pending[approval.id] = approval
+        self._approval_events[approval.id] = asyncio.Event()
+        if approval.expires_at:
+            self._schedule(approval.expires_at, approval.id, "expire")
+        if self._store is not None:
+            expires = _epoch(approval.expires_at) if approval.expires_at else None
+            write = self._store_write(
+                self._store.save_many,
+                PERSIST_NAMESPACE,
+                [(approval.id, approval.to_dict(), expires)],
+            )
+            if write is not None:
+                await write
+
+        self._publish("approval_requested", approval)
+
+        # Notify callbacks
+        for callback in self._on_approval_requested:
+            try:
+                await callback(approval)
+            except Exception as e:
+                logger.error(f"Error in approval callback: {e}")
+
+        return approval
+
     async def create_write_approval(
         self,
         session_id: str,
@@ -123,8 +431,8 @@ class DiffApprovalManager:
         """Create an approval request for a file write operation."""
         approval_id = str(uuid.uuid4())
 
-        # Generate diff
-        diff = self._generate_diff(
+        # Generate diff (off the event loop for large files)
+        diff = await self._generate_diff(
             file_path,
             original_content or "",
             new_content,
@@ -142,27 +450,19 @@ class DiffApprovalManager:
             file_path=file_path,
             original_content=original_content,
             new_content=new_content,
-            diff=diff,
+            diff=diff.text,
             content_hash=content_hash,
+            lines_added=diff.added,
+            lines_removed=diff.removed,
             expires_at=datetime.utcnow() + timedelta(seconds=timeout_seconds),
         )
 
-        self._pending[approval_id] = approval
-        self._approval_events[approval_id] = asyncio.Event()
-
         logger.info(
             f"Created write approval request {approval_id} for {file_path} "
             f"(session={session_id}, agent={agent_id})"
         )
 
-        # Notify callbacks
-        for callback in self._on_approval_requested:
-            try:
-                await callback(approval)
-            except Exception as e:
-                logger.error(f"Error in approval callback: {e}")
-
-        return approval
+        return await self._register(approval)
 
     async def create_delete_approval(
         self,
@@ -187,20 +487,11 @@ class DiffApprovalManager:
             expires_at=datetime.utcnow() + timedelta(seconds=timeout_seconds),
         )
 
-        self._pending[approval_id] = approval
-        self._approval_events[approval_id] = asyncio.Event()
-
         logger.info(
             f"Created delete approval request {approval_id} for {file_path}"
         )
 
-        for callback in self._on_approval_requested:
-            try:
-                await callback(approval)
-            except Exception as e:
-                logger.error(f"Error in approval callback: {e}")
-
-        return approval
+        return await self._register(approval)
 
     async def create_shell_approval(
         self,
@@ -225,20 +516,33 @@ class DiffApprovalManager:
             expires_at=datetime.utcnow() + timedelta(seconds=timeout_seconds),
         )
 
-        self._pending[approval_id] = approval
-        self._approval_events[approval_id] = asyncio.Event()
-
         logger.info(
             f"Created shell approval request {approval_id} for: {command[:50]}..."
         )
 
-        for callback in self._on_approval_requested:
-            try:
-                await callback(approval)
-            except Exception as e:
-                logger.error(f"Error in approval callback: {e}")
+        return await self._register(approval)
 
-        return approval
+    # =========================================================================
+    # Decisions
+    # =========================================================================
+
+    def _settle(self, approval: PendingApproval, status: ApprovalStatus) -> None:
+        """Record a final status, wake waiters and notify subscribers."""
+        approval.status = status
+
+        # Signal waiting tasks
+        event = self._approval_events.get(approval.id)
+        if event:
+            event.set()
+
+        if self._store is not None and status != ApprovalStatus.ORPHANED:
+            self._store_write(self._store.delete, PERSIST_NAMESPACE, [approval.id])
+        self._schedule(
+            datetime.utcnow() + timedelta(seconds=RESOLVED_RETENTION_SECONDS),
+            approval.id,
+            "retire",
+        )
+        self._publish("approval_resolved", approval)
 
     def approve(
         self,
@@ -256,14 +560,9 @@ class DiffApprovalManager:
             logger.warning(f"Approval {approval_id} is not pending: {approval.status}")
             return False
 
-        approval.status = ApprovalStatus.APPROVED
         approval.approved_by = approved_by
         approval.approval_note = note
-
-        # Signal waiting tasks
-        event = self._approval_events.get(approval_id)
-        if event:
-            event.set()
+        self._settle(approval, ApprovalStatus.APPROVED)
 
         logger.info(f"Approved {approval_id} by {approved_by}")
         return True
@@ -282,18 +581,23 @@ class DiffApprovalManager:
         if approval.status != ApprovalStatus.PENDING:
             return False
 
-        approval.status = ApprovalStatus.REJECTED
         approval.approved_by = rejected_by
         approval.approval_note = reason
-
-        # Signal waiting tasks
-        event = self._approval_events.get(approval_id)
-        if event:
-            event.set()
+        self._settle(approval, ApprovalStatus.REJECTED)
 
         logger.info(f"Rejected {approval_id} by {rejected_by}: {reason}")
         return True
 
+    def cancel(self, approval_id: str) -> bool:
+        """Expire a pending request that is no longer needed."""
+        approval = self._pending.get(approval_id)
+        if not approval or approval.status != ApprovalStatus.PENDING:
+            return False
+
+        self._settle(approval, ApprovalStatus.EXPIRED)
+        logger.info(f"Cancelled {approval_id}")
+        return True
+
     async def wait_for_approval(
         self,
         approval_id: str,
@@ -327,13 +631,20 @@ class DiffApprovalManager:
         try:
             await asyncio.wait_for(event.wait(), timeout=timeout)
         except asyncio.TimeoutError:
-            approval.status = ApprovalStatus.EXPIRED
+            if approval.status == ApprovalStatus.PENDING:
+                self._settle(approval, ApprovalStatus.EXPIRED)
+                self._expired += 1
             raise
 
         return approval.status
 
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
     def get_pending(self, session_id: str | None = None) -> list[PendingApproval]:
         """Get pending approval requests."""
+        self.expire_due()
         approvals = list(self._pending.values())
 
         if session_id:
@@ -341,47 +652,54 @@ class DiffApprovalManager:
 
         return [a for a in approvals if a.status == ApprovalStatus.PENDING]
 
+    def get_all(self, session_id: str | None = None) -> list[PendingApproval]:
+        """Get pending and recently resolved approval requests."""
+        self.expire_due()
+        approvals = list(self._pending.values())
+        if session_id:
+            approvals = [a for a in approvals if a.session_id == session_id]
+        return approvals
+
     def get_approval(self, approval_id: str) -> PendingApproval | None:
         """Get an approval by ID."""
+        self.expire_due()
         return self._pending.get(approval_id)
 
     def cleanup_expired(self) -> int:
-        """Clean up expired approvals. Returns count of cleaned up."""
-        now = datetime.utcnow()
-        expired = [
-            aid for aid, approval in self._pending.items()
-            if approval.expires_at and approval.expires_at < now
-            and approval.status == ApprovalStatus.PENDING
-        ]
-
-        for aid in expired:
-            approval = self._pending[aid]
-            approval.status = ApprovalStatus.EXPIRED
-            event = self._approval_events.get(aid)
-            if event:
-                event.set()
-
-        return len(expired)
-
-    def _generate_diff(
+        """Expire approvals past their deadline. Returns count of expired.
+
+        Kept for callers that still trigger expiry manually; the timer task
+        does this on its own once the manager is started.
+        """
+        return self.expire_due()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get broker statistics."""
+        return {
+            "tracked": len(self._pending),
+            "pending": sum(1 for a in self._pending.values() if a.status == ApprovalStatus.PENDING),
+            "timers": len(self._timers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "expired": self._expired,
+            "retired": self._retired,
+            "restored": self._restored,
+            "persistent": self._store is not None,
+        }
+
+    async def _generate_diff(
         self,
         file_path: str,
         original: str,
         new: str,
-    ) -> str:
-        """Generate a unified diff."""
-        original_lines = original.splitlines(keepends=True)
-        new_lines = new.splitlines(keepends=True)
-
-        diff_lines = difflib.unified_diff(
-            original_lines,
-            new_lines,
+    ) -> DiffResult:
+        """Generate a unified diff with its added/removed line counts."""
+        return await diff_service.unified_diff(
+            original,
+            new,
             fromfile=f"a/{file_path}",
             tofile=f"b/{file_path}",
         )
 
-        return "".join(diff_lines)
-
 
 # Global manager instance
 diff_approval_manager = DiffApprovalManager()
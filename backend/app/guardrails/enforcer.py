@@ -31,6 +31,7 @@ from pathlib import Path
 from typing import Any
 
 from app.guardrails.policies import AgentPolicy, get_agent_policy, AGENT_POLICIES
+from app.guardrails.compiled import CompiledPolicy, policy_compiler
 from app.guardrails.budgets import BudgetTracker, BudgetExceededError, BudgetType
 from app.guardrails.diff_approval import diff_approval_manager, ApprovalStatus
 from app.guardrails.audit_repository import AuditRepository
@@ -241,7 +242,7 @@ class GuardrailsEnforcer:
             EnforcementResult with allowed=True if execution can proceed,
             or allowed=False with error message if blocked.
         """
-        policy = self.context.agent_policy or _DEFAULT_RESTRICTIVE_POLICY
+        policy = self._compiled_policy()
         result = EnforcementResult(allowed=True)
 
         # 1. Check tool allowlist
@@ -270,21 +271,21 @@ class GuardrailsEnforcer:
 
         # 3. Check filesystem jail for write operations
         if tool_id == "filesystem":
-            jail_result = self._check_filesystem_jail(args)
+            jail_result = self._check_filesystem_jail(args, policy)
             if not jail_result.allowed:
                 await self._log_blocked_tool(tool_id, args, jail_result)
                 return jail_result
         
         # 4. Check shell sandbox
         if tool_id == "shell":
-            shell_result = self._check_shell_jail(args)
+            shell_result = self._check_shell_jail(args, policy)
             if not shell_result.allowed:
                 await self._log_blocked_tool(tool_id, args, shell_result)
                 return shell_result
 
         # 5. Check diff-first approval for high-impact actions
         if self.context.enable_diff_approval:
-            approval_result = await self._check_diff_approval(tool_id, args)
+            approval_result = await self._check_diff_approval(tool_id, args, policy)
             if not approval_result.allowed:
                 return approval_result
             if approval_result.requires_approval:
@@ -375,9 +376,17 @@ class GuardrailsEnforcer:
     # Filesystem Jail Enforcement
     # =========================================================================
 
-    def _check_filesystem_jail(self, args: dict[str, Any]) -> EnforcementResult:
+    def _compiled_policy(self) -> CompiledPolicy:
+        """Get the compiled decision object for this enforcer's policy."""
+        return policy_compiler.compile(self.context.agent_policy or _DEFAULT_RESTRICTIVE_POLICY)
+
+    def _check_filesystem_jail(
+        self,
+        args: dict[str, Any],
+        policy: CompiledPolicy | None = None,
+    ) -> EnforcementResult:
         """Check filesystem operations against jail policy."""
-        policy = self.context.agent_policy or _DEFAULT_RESTRICTIVE_POLICY
+        policy = policy or self._compiled_policy()
         action = args.get("action", "")
         path = args.get("path", "")
         dest = args.get("dest", "")
@@ -407,9 +416,13 @@ class GuardrailsEnforcer:
 
         return result
 
-    def _check_shell_jail(self, args: dict[str, Any]) -> EnforcementResult:
+    def _check_shell_jail(
+        self,
+        args: dict[str, Any],
+        policy: CompiledPolicy | None = None,
+    ) -> EnforcementResult:
         """Check shell execution against jail policy."""
-        policy = self.context.agent_policy or _DEFAULT_RESTRICTIVE_POLICY
+        policy = policy or self._compiled_policy()
         shell_policy = policy.shell
         command = args.get("command", "")
         workdir = args.get("workdir")
@@ -428,7 +441,7 @@ class GuardrailsEnforcer:
         # Check workdir constraint
         if shell_policy.workdir_only and workdir:
             # Must be within workspace
-            if not self._is_in_workspace(workdir):
+            if not policy.filesystem.is_in_workspace(workdir):
                 result.allowed = False
                 result.sandbox_violation = True
                 result.error = f"Shell execution only allowed in workspace: {workdir}"
@@ -438,19 +451,7 @@ class GuardrailsEnforcer:
 
     def _is_in_workspace(self, path: str) -> bool:
         """Check if path is within the workspace."""
-        if not path:
-            return False
-
-        policy = self.context.agent_policy or _DEFAULT_RESTRICTIVE_POLICY
-        workspace = policy.filesystem.workspace_path
-
-        try:
-            expanded_path = Path(path).expanduser().resolve()
-            workspace_expanded = Path(workspace).expanduser().resolve()
-            expanded_path.relative_to(workspace_expanded)
-            return True
-        except ValueError:
-            return False
+        return self._compiled_policy().filesystem.is_in_workspace(path)
 
     # =========================================================================
     # Diff-First Approval
@@ -460,13 +461,17 @@ class GuardrailsEnforcer:
         self,
         tool_id: str,
         args: dict[str, Any],
+        policy: CompiledPolicy | None = None,
     ) -> EnforcementResult:
         """Check if diff-first approval is required."""
-        policy = self.context.agent_policy
-        if not policy or not policy.diff_approval.enabled:
+        if not self.context.agent_policy:
+            return EnforcementResult(allowed=True)
+        policy = policy or self._compiled_policy()
+        if not policy.diff_approval.policy.enabled:
             return EnforcementResult(allowed=True)
 
-        diff_policy = policy.diff_approval
+        compiled_diff = policy.diff_approval
+        diff_policy = compiled_diff.policy
         result = EnforcementResult(allowed=True)
 
         # Check filesystem operations
@@ -475,7 +480,7 @@ class GuardrailsEnforcer:
             file_path = args.get("path", "")
 
             if action == "write" and diff_policy.require_approval_for_writes:
-                if diff_policy.requires_approval("write", file_path):
+                if compiled_diff.requires_approval("write", file_path):
                     result.requires_approval = True
 
             elif action == "delete" and diff_policy.require_approval_for_deletes:
@@ -8,7 +8,6 @@ Defines per-agent policies for:
 """
 
 from dataclasses import dataclass, field
-from pathlib import Path
 from typing import Any
 
 
@@ -56,49 +55,13 @@ class FilesystemPolicy:
 
     def can_read(self, path: str) -> bool:
         """Check if reading a path is allowed."""
-        if not self.read_allowed:
-            return False
-        if "*" in self.read_paths:
-            return True
-        return self._path_matches(path, self.read_paths)
+        from app.guardrails.compiled import policy_compiler
+        return policy_compiler.filesystem(self).can_read(path)
 
     def can_write(self, path: str) -> bool:
         """Check if writing to a path is allowed."""
-        if not self.write_allowed:
-            return False
-        if not self.write_paths:
-            return False
-
-        # Expand workspace path
-        expanded_path = Path(path).expanduser().resolve()
-        workspace_expanded = Path(self.workspace_path).expanduser().resolve()
-
-        # Check workspace enforcement
-        if self.workspace_only:
-            try:
-                expanded_path.relative_to(workspace_expanded)
-                return True
-            except ValueError:
-                pass
-
-        return self._path_matches(path, self.write_paths)
-
-    def _path_matches(self, path: str, allowed_paths: list[str]) -> bool:
-        """Check if path matches any of the allowed paths."""
-        expanded = Path(path).expanduser().resolve()
-
-        for allowed in allowed_paths:
-            if allowed == "*":
-                return True
-
-            allowed_expanded = Path(allowed).expanduser().resolve()
-            try:
-                expanded.relative_to(allowed_expanded)
-                return True
-            except ValueError:
-                continue
-
-        return False
+        from app.guardrails.compiled import policy_compiler
+        return policy_compiler.filesystem(self).can_write(path)
 
 
 @dataclass
@@ -119,24 +82,10 @@ class ShellPolicy:
     
     def is_command_allowed(self, command: str) -> tuple[bool, str | None]:
         """Check if command is allowed."""
-        import re
-        
-        # Check banned patterns first
-        for pattern in self.banned_patterns:
-            if re.search(pattern, command):
-                return False, f"Command matches banned pattern: {pattern}"
-                
-        # If allowlist is populated, command must match at least one
-        if self.allowed_commands:
-            matched = False
-            for pattern in self.allowed_commands:
-                if re.match(pattern, command):
-                    matched = True
-                    break
-            if not matched:
-                return False, "Command does not match any allowed patterns"
-                
-        return True, None
+        from app.guardrails.compiled import policy_compiler
+        return policy_compiler.shell(self).is_command_allowed(command)
+
+
 @dataclass
 class DiffApprovalPolicy:
     """Policy for diff-first mode approval requirements."""
@@ -163,28 +112,8 @@ class DiffApprovalPolicy:
 
     def requires_approval(self, action: str, path: str | None = None) -> bool:
         """Check if an action requires approval."""
-        if not self.enabled:
-            return False
-
-        if action == "write" and self.require_approval_for_writes:
-            if path and self._is_protected_path(path):
-                return True
-        elif action == "delete" and self.require_approval_for_deletes:
-            return True
-        elif action == "shell" and self.require_approval_for_shell:
-            return True
-
-        return False
-
-    def _is_protected_path(self, path: str) -> bool:
-        """Check if path matches protected patterns."""
-        from fnmatch import fnmatch
-        filename = Path(path).name
-
-        for pattern in self.protected_paths:
-            if fnmatch(filename, pattern):
-                return True
-        return False
+        from app.guardrails.compiled import policy_compiler
+        return policy_compiler.diff_approval(self).requires_approval(action, path)
 
 
 @dataclass
@@ -264,7 +193,10 @@ AGENT_POLICIES: dict[str, AgentPolicy] = {
     "mo": AgentPolicy(
         agent_id="mo",
         description="Primary orchestrator - delegates to specialists",
-        allowed_tools=["routing", "filesystem", "shell", "web_search", "web_fetch", "kiro", "sessions", "canvas"],
+        allowed_tools=[
+            "routing", "filesystem", "code_symbols", "shell",
+            "web_search", "web_fetch", "kiro", "sessions", "canvas",
+        ],
         filesystem=FilesystemPolicy(
             read_paths=["*"],
             write_paths=["/Projects", "~/maratos-workspace"],
@@ -279,7 +211,7 @@ AGENT_POLICIES: dict[str, AgentPolicy] = {
     "architect": AgentPolicy(
         agent_id="architect",
         description="Plans and designs - spawns coders for implementation",
-        allowed_tools=["filesystem", "shell", "kiro"],
+        allowed_tools=["filesystem", "code_symbols", "shell", "kiro"],
         filesystem=FilesystemPolicy(
             read_paths=["*"],
             write_paths=["~/maratos-workspace"],
@@ -294,7 +226,7 @@ AGENT_POLICIES: dict[str, AgentPolicy] = {
     "coder": AgentPolicy(
         agent_id="coder",
         description="Pure implementation - reads existing code, writes new code",
-        allowed_tools=["filesystem", "shell", "kiro"],
+        allowed_tools=["filesystem", "code_symbols", "shell", "kiro"],
         filesystem=FilesystemPolicy(
             read_paths=["*"],
             write_paths=["/Projects", "~/maratos-workspace"],
@@ -309,7 +241,7 @@ AGENT_POLICIES: dict[str, AgentPolicy] = {
     "reviewer": AgentPolicy(
         agent_id="reviewer",
         description="Code review - reads and analyzes, does not modify",
-        allowed_tools=["filesystem", "shell", "kiro"],
+        allowed_tools=["filesystem", "code_symbols", "shell", "kiro"],
         filesystem=FilesystemPolicy(
             read_paths=["*"],
             write_paths=[],  # READ-ONLY
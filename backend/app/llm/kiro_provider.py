@@ -11,8 +11,32 @@ import re
 from dataclasses import dataclass
 from typing import Any, AsyncIterator
 
+from app.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerError,
+    circuit_breaker_registry,
+)
+
 logger = logging.getLogger(__name__)
 
+# Shared by the LLM provider and the kiro tool: timeouts, spawn errors and
+# non-zero exits count as failures, so an outage fails fast instead of every
+# request waiting out its timeout.
+KIRO_CIRCUIT_NAME = "kiro-cli"
+KIRO_CIRCUIT_CONFIG = CircuitBreakerConfig(
+    failure_threshold=3,
+    timeout_seconds=60.0,
+    half_open_max_calls=1,
+    success_threshold=1,
+    window_seconds=300.0,
+)
+
+
+def kiro_circuit_breaker() -> CircuitBreaker:
+    """Get the circuit breaker guarding kiro-cli invocations."""
+    return circuit_breaker_registry.get_or_create(KIRO_CIRCUIT_NAME, KIRO_CIRCUIT_CONFIG)
+
 
 @dataclass
 class KiroConfig:
@@ -413,28 +437,47 @@ class KiroProvider:
         logger.debug(f"Prompt length: {len(prompt)} chars")
 
         try:
-            # Create subprocess with pipes
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=config.workdir,
-                env={**os.environ},
+            guard = kiro_circuit_breaker().protect()
+        except CircuitBreakerError as e:
+            logger.warning(f"Skipping kiro-cli call: {e}")
+            yield (
+                "Error: kiro-cli is unavailable after repeated failures, "
+                f"retry in {e.retry_after:.0f}s"
             )
+            return
 
-            # Send prompt to stdin and close
-            process.stdin.write(prompt.encode("utf-8"))
-            await process.stdin.drain()
-            process.stdin.close()
+        try:
+            timed_out = False
+            with guard:
+                # Create subprocess with pipes
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=config.workdir,
+                    env={**os.environ},
+                )
+
+                # Send prompt to stdin and close
+                process.stdin.write(prompt.encode("utf-8"))
+                await process.stdin.drain()
+                process.stdin.close()
+
+                # Collect all output (kiro-cli doesn't truly stream)
+                try:
+                    async with asyncio.timeout(config.timeout):
+                        stdout, stderr = await process.communicate()
+                except asyncio.TimeoutError:
+                    process.kill()
+                    timed_out = True
+                    guard.fail()
+                else:
+                    if process.returncode != 0:
+                        guard.fail()
 
-            # Collect all output (kiro-cli doesn't truly stream)
-            try:
-                async with asyncio.timeout(config.timeout):
-                    stdout, stderr = await process.communicate()
-            except asyncio.TimeoutError:
+            if timed_out:
                 logger.error(f"Kiro CLI timed out after {config.timeout}s with model {config.model}")
-                process.kill()
                 yield f"Error: Request timed out after {config.timeout} seconds"
                 return
 
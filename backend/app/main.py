@@ -15,13 +15,13 @@ from slowapi.util import get_remote_address
 
 from app.api import api_router
 from app.api.channels import router as channels_router
-from app.config import settings, get_channel_config
-from app.database import init_db
-from app.channels.manager import channel_manager, init_channels
-from app.skills.loader import load_skills_from_dir
 from app.api.models import HealthResponse
-from app.logging_config import setup_logging
 from app.audit import audit_logger
+from app.channels.manager import channel_manager, init_channels
+from app.config import get_channel_config, settings
+from app.database import init_db
+from app.logging_config import setup_logging
+from app.skills.loader import load_skills_from_dir
 
 # Configure logging early
 setup_logging(debug=settings.debug, json_logs=not settings.debug)
@@ -50,6 +50,26 @@ async def lifespan(app: FastAPI):
     await audit_logger.start()
     logger.info("Audit logger started")
 
+    # Restore persisted tool/subagent metrics and snapshot them periodically
+    from app.utils.metrics_store import metrics_store
+    await metrics_store.start()
+
+    # Sweep idle session state; optionally spill it to SQLite across restarts
+    from app.utils.state_store import state_stores
+    await state_stores.start(
+        spill_path=settings.data_dir / "session_state.db" if settings.session_state_spill else None
+    )
+
+    # Restore pending approvals and start their expiry timer
+    from app.guardrails.diff_approval import diff_approval_manager
+    await diff_approval_manager.start(
+        persist_path=settings.data_dir / "approvals.db" if settings.approvals_persist else None
+    )
+
+    # Sweep resumable SSE streams (cancels runs nobody reconnects to)
+    from app.utils.sse_replay import sse_streams
+    await sse_streams.start()
+
     # Load skills
     skills_dir = Path(__file__).parent.parent / "skills"
     if skills_dir.exists():
@@ -96,6 +116,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error cancelling subagent tasks: {e}")
 
+    # Cancel streamed runs still in flight
+    try:
+        from app.utils.sse_replay import sse_streams
+        await sse_streams.stop()
+    except Exception as e:
+        logger.error(f"Error stopping SSE streams: {e}")
+
     # Stop channels
     try:
         await channel_manager.stop_all()
@@ -103,6 +130,40 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping channels: {e}")
 
+    # Close pooled HTTP connections
+    try:
+        from app.utils.http_client import http_client_manager
+        await http_client_manager.aclose()
+    except Exception as e:
+        logger.error(f"Error closing HTTP clients: {e}")
+
+    # Write a final metrics snapshot and flush buffered thinking metrics
+    try:
+        from app.thinking.metrics import flush_metrics
+        from app.utils.metrics_store import metrics_store
+        await metrics_store.stop()
+        flush_metrics()
+    except Exception as e:
+        logger.error(f"Error writing metrics snapshot: {e}")
+
+    # Stop the state sweeper and spill live session state
+    try:
+        from app.utils.state_store import state_stores
+        await state_stores.stop()
+    except Exception as e:
+        logger.error(f"Error stopping state stores: {e}")
+
+    # Stop the approval expiry timer (pending approvals stay persisted)
+    try:
+        from app.guardrails.diff_approval import diff_approval_manager
+        await diff_approval_manager.stop()
+    except Exception as e:
+        logger.error(f"Error stopping approval manager: {e}")
+
+    # Stop diff worker pools
+    from app.utils.diff_service import diff_service
+    diff_service.shutdown()
+
     # Stop audit logger (flush remaining events)
     try:
         await audit_logger.stop()
@@ -228,8 +289,8 @@ app.include_router(channels_router, prefix="/api", tags=["channels"])
 
 async def _get_health_response() -> HealthResponse:
     """Get health check data."""
-    from app.skills.base import skill_registry
     from app.memory.manager import memory_manager
+    from app.skills.base import skill_registry
     from app.subagents.manager import subagent_manager
 
     return HealthResponse(
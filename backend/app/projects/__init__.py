@@ -15,6 +15,19 @@ from app.projects.context_pack import (
     extract_readme_summary,
     generate_file_tree,
 )
+from app.projects.search_index import (
+    SearchIndexManager,
+    TrigramIndex,
+    UnsupportedQueryError,
+    search_index_manager,
+)
+from app.projects.symbol_index import (
+    SymbolDef,
+    SymbolIndex,
+    SymbolIndexManager,
+    SymbolRef,
+    symbol_index_manager,
+)
 from app.projects.docs_store import (
     ProjectDoc,
     create_doc,
@@ -47,6 +60,17 @@ __all__ = [
     "context_pack_is_stale",
     "extract_readme_summary",
     "generate_file_tree",
+    # Search Index
+    "SearchIndexManager",
+    "TrigramIndex",
+    "UnsupportedQueryError",
+    "search_index_manager",
+    # Symbol Index
+    "SymbolDef",
+    "SymbolIndex",
+    "SymbolIndexManager",
+    "SymbolRef",
+    "symbol_index_manager",
     # Docs Store
     "ProjectDoc",
     "create_doc",
@@ -18,6 +18,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from app.utils.config_cache import config_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -1103,6 +1105,7 @@ def save_context_pack(pack: ContextPack, project_name: str) -> Path:
     pack_path = pack_dir / "context_pack.json"
     with open(pack_path, "w") as f:
         json.dump(pack.to_dict(), f, indent=2)
+    config_cache.invalidate(pack_path)
 
     logger.info(f"Saved context pack for {project_name} to {pack_dir}")
     return pack_dir
@@ -0,0 +1,151 @@
+"""Ignore rules for project file walks.
+
+Mirrors what ``rg`` skips by default so indexes built from a tree walk never
+surface files a ripgrep search would not: hidden files and directories, and
+paths matched by ``.gitignore``, ``.ignore`` and ``.rgignore`` files (plus
+``.git/info/exclude`` at the root).
+
+Patterns follow gitignore syntax: ``#`` comments, ``!`` negation, a
+trailing ``/`` for directories only, patterns containing a ``/`` anchored to
+the ignore file's directory, and ``*``, ``?``, ``[...]`` and ``**``
+wildcards. The last matching rule wins.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Read in this order per directory, so later files take precedence (as in rg)
+IGNORE_FILENAMES = (".gitignore", ".ignore", ".rgignore")
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """One pattern from an ignore file."""
+
+    base: str  # Directory of the ignore file, relative to the root ("" for root)
+    regex: re.Pattern[str]
+    negate: bool
+    dir_only: bool
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob to a regex fragment."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_rule(line: str, base: str = "") -> IgnoreRule | None:
+    """Parse one ignore-file line (None for blanks and comments)."""
+    line = line.rstrip("\n\r")
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]  # "\#" and "\!" escape a leading character
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    if "/" in line:
+        body = _translate(line.lstrip("/"))  # Anchored to the ignore file's directory
+    else:
+        body = "(?:.*/)?" + _translate(line)  # Matches at any depth
+    try:
+        regex = re.compile(f"{body}$", re.DOTALL)
+    except re.error:
+        logger.debug(f"Skipping invalid ignore pattern: {line!r}")
+        return None
+    return IgnoreRule(base=base, regex=regex, negate=negate, dir_only=dir_only)
+
+
+def read_rules(
+    directory: str,
+    base: str = "",
+    names: tuple[str, ...] = IGNORE_FILENAMES,
+) -> list[IgnoreRule]:
+    """Read the ignore files in one directory."""
+    rules: list[IgnoreRule] = []
+    for name in names:
+        try:
+            with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+                lines = f.readlines()
+        except OSError:
+            continue
+        for line in lines:
+            rule = parse_rule(line, base)
+            if rule is not None:
+                rules.append(rule)
+    return rules
+
+
+def is_ignored(rules: list[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Check a root-relative "/"-separated path against rules (last match wins)."""
+    for rule in reversed(rules):
+        if rule.matches(rel_path, is_dir):
+            return not rule.negate
+    return False
+
+
+def is_hidden(name: str) -> bool:
+    return name.startswith(".")
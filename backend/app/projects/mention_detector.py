@@ -22,6 +22,52 @@ class MentionResult:
     multiple_detected: bool  # True if more than one project was mentioned
 
 
+# Characters that may surround a project name (besides start/end of text)
+_LEFT_DELIMITERS = r"""\s'"`({\["""
+_RIGHT_DELIMITERS = r"""\s'"`)}\].,!?"""
+
+
+class MentionMatcher:
+    """Single-pass matcher for a fixed set of project names.
+
+    All names are compiled into one case-insensitive alternation, longest
+    first, guarded by delimiter lookarounds. At each position the regex
+    engine takes the longest name that is followed by a delimiter, and
+    finditer never returns overlapping matches - so one scan gives
+    leftmost-longest, non-overlapping resolution.
+    """
+
+    def __init__(self, names: tuple[str, ...]) -> None:
+        self.names = names
+        self._canonical = {name.lower(): name for name in names}
+        alternation = "|".join(
+            re.escape(name) for name in sorted(names, key=lambda n: (-len(n), n))
+        )
+        self._pattern = re.compile(
+            rf"(?<![^{_LEFT_DELIMITERS}])(?:{alternation})(?![^{_RIGHT_DELIMITERS}])",
+            re.IGNORECASE,
+        )
+
+    def find(self, message: str) -> list[tuple[str, int, int]]:
+        """Find mentions as (project name, start, end), in message order."""
+        return [
+            (self._canonical[m.group(0).lower()], m.start(), m.end())
+            for m in self._pattern.finditer(message)
+        ]
+
+
+# Matcher for the current registry contents, rebuilt when the set of names changes
+_matcher: MentionMatcher | None = None
+
+
+def _get_matcher(names: tuple[str, ...]) -> MentionMatcher:
+    global _matcher
+    if _matcher is None or _matcher.names != names:
+        _matcher = MentionMatcher(names)
+        logger.debug(f"Built project mention matcher for {len(names)} projects")
+    return _matcher
+
+
 def detect_project_mentions(message: str) -> MentionResult:
     """Detect project names mentioned in a message.
 
@@ -34,8 +80,8 @@ def detect_project_mentions(message: str) -> MentionResult:
     Returns:
         MentionResult with detected projects and primary selection
     """
-    projects = project_registry.list_all()
-    if not projects:
+    names = tuple(p.name for p in project_registry.list_all())
+    if not names:
         return MentionResult(
             detected=False,
             project_names=[],
@@ -43,41 +89,12 @@ def detect_project_mentions(message: str) -> MentionResult:
             multiple_detected=False,
         )
 
-    # Build list of (name, pattern) sorted by name length descending
-    # Longer names first to prefer "my-app-api" over "my-app"
-    project_patterns = []
-    for p in projects:
-        # Escape special regex chars in project name
-        escaped_name = re.escape(p.name)
-        # Build word-boundary pattern
-        # Allow common delimiters: word boundary, quotes, backticks
-        pattern = re.compile(
-            rf'(?:^|[\s\'""`({{\[])({escaped_name})(?:[\s\'""`)}}\].,!?]|$)',
-            re.IGNORECASE
-        )
-        project_patterns.append((p.name, len(p.name), pattern))
-
-    # Sort by name length descending (prefer longer matches)
-    project_patterns.sort(key=lambda x: -x[1])
-
-    detected_names = []
-    detected_positions = []  # Track positions to avoid overlapping matches
-
-    for name, name_len, pattern in project_patterns:
-        for match in pattern.finditer(message):
-            start, end = match.span(1)  # Position of the captured group
-
-            # Check if this position overlaps with an already detected project
-            overlaps = False
-            for pos_start, pos_end in detected_positions:
-                if not (end <= pos_start or start >= pos_end):
-                    overlaps = True
-                    break
-
-            if not overlaps:
-                detected_names.append(name)
-                detected_positions.append((start, end))
-                logger.debug(f"Detected project mention: '{name}' at position {start}-{end}")
+    # Matches come back in message order; keep the first mention of each project
+    detected_names: list[str] = []
+    for name, start, end in _get_matcher(names).find(message):
+        if name not in detected_names:
+            detected_names.append(name)
+            logger.debug(f"Detected project mention: '{name}' at position {start}-{end}")
 
     if not detected_names:
         return MentionResult(
@@ -87,24 +104,11 @@ def detect_project_mentions(message: str) -> MentionResult:
             multiple_detected=False,
         )
 
-    # Primary project is the first detected (which is the longest due to sorting)
-    # Actually, let's prefer the first mentioned in the message
-    # Sort detected by position
-    if len(detected_names) > 1:
-        # Re-sort by position in message
-        position_order = sorted(
-            range(len(detected_names)),
-            key=lambda i: detected_positions[i][0]
-        )
-        detected_names_ordered = [detected_names[i] for i in position_order]
-    else:
-        detected_names_ordered = detected_names
-
     return MentionResult(
         detected=True,
-        project_names=detected_names_ordered,
-        primary_project=detected_names_ordered[0],
-        multiple_detected=len(detected_names_ordered) > 1,
+        project_names=detected_names,
+        primary_project=detected_names[0],
+        multiple_detected=len(detected_names) > 1,
     )
 
 
@@ -8,8 +8,26 @@ from typing import Any
 
 import yaml
 
+from app.utils.config_cache import config_cache
+
 logger = logging.getLogger(__name__)
 
+PROJECT_FILE_PATTERNS = ("*.yaml", "*.yml")
+
+
+def _render_pack_context(project_name: str) -> str | None:
+    """Load a context pack and render its compact prompt context."""
+    from app.projects.context_pack import load_context_pack
+
+    pack = load_context_pack(project_name)
+    return pack.get_compact_context() if pack else None
+
+
+def _load_project_data(file_path: Path) -> dict[str, Any] | None:
+    """Parse a project YAML file (cached by config_cache)."""
+    with open(file_path) as f:
+        return yaml.safe_load(f)
+
 
 @dataclass
 class Project:
@@ -35,13 +53,20 @@ class Project:
         If a context pack exists, uses the compact context from it.
         Otherwise, falls back to basic project info.
         """
-        # Try to use context pack if available
+        # Try to use context pack if available (rendered once per pack change)
         if self.context_pack_hash:
             try:
-                from app.projects.context_pack import load_context_pack
-                pack = load_context_pack(self.name)
-                if pack:
-                    return pack.get_compact_context()
+                from app.projects import context_pack
+
+                pack_dir = context_pack.get_context_pack_dir(self.name)
+                compact = config_cache.get_derived(
+                    ("compact_context", self.name),
+                    [pack_dir / "context_pack.json", pack_dir / "ARCHITECTURE.md"],
+                    lambda: _render_pack_context(self.name),
+                    namespace="context_packs",
+                )
+                if compact:
+                    return compact
             except ImportError:
                 pass
 
@@ -110,11 +135,19 @@ class ProjectRegistry:
         self._loaded = False
 
     def _ensure_loaded(self):
-        """Load projects from config directory if not already loaded."""
-        if self._loaded:
+        """Load projects from config directory, reloading when files change.
+
+        The directory is re-checked at most every few seconds; unchanged
+        files are served from the config cache instead of being re-parsed.
+        """
+        changed = config_cache.dir_changed(
+            ("projects", str(self._config_dir)), self._config_dir, PROJECT_FILE_PATTERNS
+        )
+        if self._loaded and not changed:
             return
 
         self._config_dir.mkdir(parents=True, exist_ok=True)
+        self._projects.clear()
         self._load_projects()
         self._loaded = True
 
@@ -137,8 +170,7 @@ class ProjectRegistry:
 
     def _load_project_file(self, file_path: Path):
         """Load a single project file."""
-        with open(file_path) as f:
-            data = yaml.safe_load(f)
+        data = config_cache.get(file_path, _load_project_data, namespace="projects")
 
         if not data:
             return
@@ -147,10 +179,10 @@ class ProjectRegistry:
             name=data.get("name", file_path.stem),
             description=data.get("description", ""),
             path=data.get("path", ""),
-            tech_stack=data.get("tech_stack", []),
-            conventions=data.get("conventions", []),
-            patterns=data.get("patterns", []),
-            dependencies=data.get("dependencies", []),
+            tech_stack=list(data.get("tech_stack") or []),
+            conventions=list(data.get("conventions") or []),
+            patterns=list(data.get("patterns") or []),
+            dependencies=list(data.get("dependencies") or []),
             notes=data.get("notes", ""),
             context_pack_version=data.get("context_pack_version", ""),
             context_pack_hash=data.get("context_pack_hash", ""),
@@ -172,6 +204,7 @@ class ProjectRegistry:
 
     def reload(self):
         """Force reload of all projects."""
+        config_cache.invalidate(namespace="projects")
         self._projects.clear()
         self._loaded = False
         self._ensure_loaded()
@@ -215,6 +248,7 @@ class ProjectRegistry:
 
             with open(config_file, "w") as f:
                 yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+            config_cache.invalidate(config_file)
 
             logger.info(f"Updated context pack metadata for {name}")
             return True
@@ -0,0 +1,747 @@
+"""Trigram Search Index - Persistent per-project code search.
+
+Project search used to fork ``rg`` (or ``grep -rn``) over the whole tree on
+every query. This module keeps an inverted index from lowercase trigrams to
+file ids for each project:
+
+- Built during ingest and stored next to the context pack (search_index.json)
+- Updated incrementally: only files whose mtime/size changed are re-read
+- Queries are planned from the regex: literal runs the pattern requires are
+  turned into trigram lookups that narrow the candidate files, which are then
+  verified with the real regex line by line
+- Matches are ranked (definitions, whole-word hits and path hits first)
+
+Changed and deleted files are tombstoned rather than removed from every
+posting list; postings are compacted once enough dead ids accumulate.
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.projects.context_pack import get_context_pack_dir
+from app.projects.ignore_rules import IgnoreRule, is_hidden, is_ignored, read_rules
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "search_index.json"
+
+# Same exclusions the ripgrep search applies
+EXCLUDED_DIRS = frozenset({
+    "node_modules", ".git", "__pycache__", ".venv", "venv",
+    "dist", "build", ".next", "coverage",
+})
+EXCLUDED_FILE_GLOBS = (
+    "*.pyc", "*.min.js", "*.map",
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
+)
+
+# Files larger than this are not tokenized; they are always scanned instead
+MAX_INDEXED_FILE_BYTES = 2 * 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+
+# Matching lines reported per file (mirrors rg --max-count 20)
+MAX_MATCHES_PER_FILE = 20
+
+# Searches re-stat the tree at most this often
+DEFAULT_REFRESH_INTERVAL = 10.0
+
+# Cap on alternatives produced while planning a regex
+MAX_PLAN_ALTERNATIVES = 32
+
+_QUANTIFIER_RE = re.compile(r"\{(\d*)(,\d*)?\}")
+_FLAGS_RE = re.compile(r"[aiLmsux-]*")
+# Escapes followed by a fixed-length payload (hex digits)
+_ESCAPE_PAYLOADS = {"x": 2, "u": 4, "U": 8}
+
+DEFINITION_RE = re.compile(
+    r"^\s*(?:export\s+)?(?:async\s+)?"
+    r"(?:def|class|function|func|interface|type|struct|enum|const|let|var)\b"
+)
+
+
+class UnsupportedQueryError(ValueError):
+    """Raised when a query cannot be evaluated by the index (invalid regex)."""
+
+
+@dataclass
+class IndexedFile:
+    """A file tracked by the index."""
+    path: str  # Relative to project root, "/" separated
+    mtime_ns: int
+    size: int
+    indexed: bool = True  # False: too large to tokenize, always a candidate
+
+    def to_list(self) -> list[Any]:
+        return [self.path, self.mtime_ns, self.size, self.indexed]
+
+    @classmethod
+    def from_list(cls, data: list[Any]) -> "IndexedFile":
+        return cls(path=data[0], mtime_ns=data[1], size=data[2], indexed=data[3])
+
+
+@dataclass
+class IndexMatch:
+    """A verified match returned by the index."""
+    file: str
+    line_number: int
+    content: str
+    context_before: list[str] = field(default_factory=list)
+    context_after: list[str] = field(default_factory=list)
+    score: float = 0.0
+
+
+@dataclass
+class IndexSearchResult:
+    """Result of an index search."""
+    matches: list[IndexMatch]
+    files_searched: int
+    candidates: int
+    truncated: bool = False
+
+
+def extract_trigrams(text: str) -> set[str]:
+    """Extract the set of lowercase trigrams in text."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def is_excluded_file(name: str) -> bool:
+    """Check a file name against the default exclude globs."""
+    return any(fnmatch.fnmatch(name, pattern) for pattern in EXCLUDED_FILE_GLOBS)
+
+
+def glob_matches(rel_path: str, file_pattern: str) -> bool:
+    """Apply an rg-style -g glob to a relative path.
+
+    Patterns without a slash match the file name, otherwise the relative
+    path. A leading "!" negates the pattern.
+    """
+    if not file_pattern:
+        return True
+    negate = file_pattern.startswith("!")
+    pattern = file_pattern[1:] if negate else file_pattern
+    target = rel_path if "/" in pattern else rel_path.rsplit("/", 1)[-1]
+    matched = fnmatch.fnmatch(target, pattern.lstrip("/"))
+    return not matched if negate else matched
+
+
+def walk_project_files(root: str) -> dict[str, os.stat_result]:
+    """Collect a project's searchable files with their stat results.
+
+    Keys are paths relative to root with "/" separators. Skips what ``rg``
+    skips: hidden entries, paths matched by .gitignore/.ignore/.rgignore
+    files and the default excludes. Symlinks are not followed.
+    """
+    found: dict[str, os.stat_result] = {}
+    root_rules = read_rules(os.path.join(root, ".git", "info"), names=("exclude",))
+    stack: list[tuple[str, str, list[IgnoreRule]]] = [(root, "", root_rules)]
+    while stack:
+        current, rel_dir, inherited = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        rules = inherited + read_rules(current, rel_dir)
+        for entry in entries:
+            if is_hidden(entry.name):
+                continue
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDED_DIRS and not is_ignored(rules, rel, True):
+                        stack.append((entry.path, rel, rules))
+                elif entry.is_file(follow_symlinks=False):
+                    if is_excluded_file(entry.name) or is_ignored(rules, rel, False):
+                        continue
+                    found[rel] = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+    return found
+
+
+# =============================================================================
+# Query Planning
+# =============================================================================
+
+
+class _UnplannableError(Exception):
+    """Raised for regex syntax the planner does not model."""
+
+
+_OTHER = ("other", None)
+
+
+class _RegexParser:
+    """Parse a regex into the nodes the query planner needs.
+
+    Nodes are ``("lit", char)``, ``("group", seq)``, ``("branch", [seq])``,
+    ``("repeat", min_count, node)`` and ``("other", None)`` for anything that
+    matches no fixed literal (classes, anchors, lookarounds, escapes). Only
+    called on patterns that already compile, so it can be lenient.
+    """
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.pos = 0
+
+    def parse(self) -> list[Any]:
+        seq = self._alternation()
+        if self.pos != len(self.pattern):
+            raise _UnplannableError(self.pattern)
+        return seq
+
+    def _alternation(self) -> list[Any]:
+        branches: list[list[Any]] = [[]]
+        pattern = self.pattern
+        while self.pos < len(pattern):
+            c = pattern[self.pos]
+            if c == "|":
+                branches.append([])
+                self.pos += 1
+            elif c == ")":
+                break
+            else:
+                branches[-1].append(self._quantified(self._atom()))
+        return branches[0] if len(branches) == 1 else [("branch", branches)]
+
+    def _quantified(self, node: Any) -> Any:
+        pattern = self.pattern
+        if self.pos >= len(pattern):
+            return node
+        c = pattern[self.pos]
+        if c in "*+?":
+            low = 1 if c == "+" else 0
+            self.pos += 1
+        elif c == "{":
+            m = _QUANTIFIER_RE.match(pattern, self.pos)
+            if not m or (not m.group(1) and m.group(2) is None):
+                return node  # Not a quantifier: a literal "{" follows
+            low = int(m.group(1) or 0)
+            self.pos = m.end()
+        else:
+            return node
+        if self.pos < len(pattern) and pattern[self.pos] in "?+":
+            self.pos += 1  # Lazy / possessive
+        return ("repeat", low, node)
+
+    def _atom(self) -> Any:
+        pattern = self.pattern
+        c = pattern[self.pos]
+        self.pos += 1
+        if c == "(":
+            return self._group()
+        if c == "[":
+            self._skip_class()
+            return _OTHER
+        if c == "\\":
+            return self._escape()
+        if c in ".^$":
+            return _OTHER
+        return ("lit", c)
+
+    def _group(self) -> Any:
+        pattern = self.pattern
+        capture = True
+        if pattern.startswith("?", self.pos):
+            rest = pattern[self.pos + 1:self.pos + 3]
+            if rest.startswith(":"):
+                self.pos += 2
+            elif rest.startswith("P<"):
+                self.pos = pattern.index(">", self.pos) + 1
+            elif rest.startswith(("#", "P=")):
+                self.pos = pattern.index(")", self.pos) + 1
+                return _OTHER
+            elif rest.startswith(("=", "!")):
+                self.pos += 2
+                capture = False
+            elif rest.startswith(("<=", "<!")):
+                self.pos += 3
+                capture = False
+            elif rest.startswith("("):
+                raise _UnplannableError(pattern)  # Conditional group
+            else:
+                flags = _FLAGS_RE.match(pattern, self.pos + 1).group()
+                if "x" in flags:
+                    raise _UnplannableError(pattern)  # Verbose: whitespace is not literal
+                self.pos += 1 + len(flags)
+                if pattern.startswith(")", self.pos):
+                    self.pos += 1
+                    return _OTHER
+                self.pos += 1  # ":" of a scoped flag group
+        seq = self._alternation()
+        self.pos += 1  # ")"
+        return ("group", seq) if capture else _OTHER
+
+    def _skip_class(self) -> None:
+        pattern = self.pattern
+        if pattern.startswith("^", self.pos):
+            self.pos += 1
+        if pattern.startswith("]", self.pos):
+            self.pos += 1
+        while pattern[self.pos] != "]":
+            self.pos += 2 if pattern[self.pos] == "\\" else 1
+        self.pos += 1
+
+    def _escape(self) -> Any:
+        pattern = self.pattern
+        c = pattern[self.pos]
+        self.pos += 1
+        if not c.isalnum():
+            return ("lit", c)
+        if c in _ESCAPE_PAYLOADS:
+            self.pos += _ESCAPE_PAYLOADS[c]
+        elif c == "N":
+            self.pos = pattern.index("}", self.pos) + 1
+        elif c.isdigit():
+            # Backreference or octal escape: up to two more digits
+            end = min(self.pos + 2, len(pattern))
+            while self.pos < end and pattern[self.pos].isdigit():
+                self.pos += 1
+        return _OTHER
+
+
+def _and_plans(left: list[list[str]], right: list[list[str]]) -> list[list[str]]:
+    """Combine two plans where both must hold."""
+    if len(left) * len(right) > MAX_PLAN_ALTERNATIVES:
+        # Too many combinations - keep the more selective side only
+        return left if len(left) <= len(right) else right
+    return [a + b for a in left for b in right]
+
+
+def _plan_sequence(items: list[Any]) -> list[list[str]]:
+    """Build a plan for a parsed regex sequence.
+
+    A plan is a list of alternatives; each alternative is a list of literal
+    strings that must all occur in a matching line. ``[[]]`` means the
+    sequence places no constraint.
+    """
+    plan: list[list[str]] = [[]]
+    run: list[str] = []
+
+    def flush() -> None:
+        nonlocal plan
+        if len(run) >= 3:
+            plan = _and_plans(plan, [["".join(run)]])
+        run.clear()
+
+    for node in items:
+        kind = node[0]
+        if kind == "lit":
+            run.append(node[1])
+            continue
+        flush()
+        if kind == "group":
+            plan = _and_plans(plan, _plan_sequence(node[1]))
+        elif kind == "branch":
+            branches: list[list[str]] = []
+            for branch in node[1]:
+                branches.extend(_plan_sequence(branch))
+            # Any unconstrained branch makes the whole alternation unconstrained
+            if all(branches) and len(branches) <= MAX_PLAN_ALTERNATIVES:
+                plan = _and_plans(plan, branches)
+        elif kind == "repeat":
+            if node[1] >= 1:
+                plan = _and_plans(plan, _plan_sequence([node[2]]))
+        # Character classes, anchors, wildcards etc. break literal runs
+    flush()
+    return plan
+
+
+def plan_query(pattern: str) -> list[list[str]]:
+    """Plan a regex query into required literal alternatives.
+
+    Raises UnsupportedQueryError if the pattern does not compile.
+    """
+    try:
+        re.compile(pattern)
+    except (re.error, OverflowError, RecursionError) as e:
+        raise UnsupportedQueryError(str(e)) from e
+    try:
+        return _plan_sequence(_RegexParser(pattern).parse())
+    except (_UnplannableError, ValueError, IndexError, RecursionError):
+        return [[]]  # Scan every file; results are still verified with the regex
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+
+class TrigramIndex:
+    """Inverted trigram index over one project tree."""
+
+    def __init__(self, root: str | Path, storage_path: Path | None = None) -> None:
+        self.root = str(Path(root).expanduser().resolve())
+        self.storage_path = storage_path
+        self._files: dict[int, IndexedFile] = {}  # Live files by id
+        self._ids_by_path: dict[str, int] = {}
+        self._skipped: dict[str, list[int]] = {}  # Binary files: path -> [mtime_ns, size]
+        self._postings: dict[str, list[int]] = {}
+        self._next_id = 0
+        self._dead = 0
+        self._lock = threading.Lock()
+        self.last_refresh = 0.0
+        self.built_at = 0.0
+
+    @property
+    def file_count(self) -> int:
+        return len(self._files)
+
+    # -- building -----------------------------------------------------------
+
+    def _read_trigrams(self, rel: str, size: int) -> tuple[set[str], bool] | None:
+        """Read and tokenize a file. Returns None for binary/unreadable files."""
+        full = os.path.join(self.root, rel)
+        try:
+            with open(full, "rb") as f:
+                if size > MAX_INDEXED_FILE_BYTES:
+                    head = f.read(BINARY_SNIFF_BYTES)
+                    return (None if b"\x00" in head else (set(), False))
+                data = f.read()
+        except OSError:
+            return None
+        if b"\x00" in data[:BINARY_SNIFF_BYTES]:
+            return None
+        return extract_trigrams(data.decode("utf-8", errors="replace")), True
+
+    def _remove(self, rel: str) -> None:
+        file_id = self._ids_by_path.pop(rel, None)
+        if file_id is not None:
+            self._files.pop(file_id, None)
+            self._dead += 1
+
+    def _add(self, rel: str, st: os.stat_result) -> None:
+        tokenized = self._read_trigrams(rel, st.st_size)
+        if tokenized is None:
+            self._skipped[rel] = [st.st_mtime_ns, st.st_size]
+            return
+        trigrams, indexed = tokenized
+        file_id = self._next_id
+        self._next_id += 1
+        self._files[file_id] = IndexedFile(rel, st.st_mtime_ns, st.st_size, indexed)
+        self._ids_by_path[rel] = file_id
+        for trigram in trigrams:
+            postings = self._postings.get(trigram)
+            if postings is None:
+                self._postings[trigram] = [file_id]
+            else:
+                postings.append(file_id)
+
+    def _compact(self) -> None:
+        """Drop tombstoned ids from postings."""
+        live = self._files
+        compacted: dict[str, list[int]] = {}
+        for trigram, ids in self._postings.items():
+            kept = [i for i in ids if i in live]
+            if kept:
+                compacted[trigram] = kept
+        self._postings = compacted
+        self._dead = 0
+
+    def update(self) -> dict[str, int]:
+        """Bring the index up to date with the tree.
+
+        Only new or changed files (by mtime and size) are re-read.
+        Returns counts of added, updated and removed files.
+        """
+        with self._lock:
+            current = walk_project_files(self.root)
+            added = updated = removed = 0
+
+            for rel in [p for p in self._ids_by_path if p not in current]:
+                self._remove(rel)
+                removed += 1
+            for rel in [p for p in self._skipped if p not in current]:
+                del self._skipped[rel]
+
+            for rel, st in current.items():
+                skipped = self._skipped.get(rel)
+                if skipped is not None:
+                    if skipped == [st.st_mtime_ns, st.st_size]:
+                        continue
+                    del self._skipped[rel]
+                file_id = self._ids_by_path.get(rel)
+                if file_id is not None:
+                    known = self._files[file_id]
+                    if known.mtime_ns == st.st_mtime_ns and known.size == st.st_size:
+                        continue
+                    self._remove(rel)
+                    updated += 1
+                else:
+                    added += 1
+                self._add(rel, st)
+
+            if self._dead > max(1000, len(self._files) // 2):
+                self._compact()
+
+            now = time.time()
+            self.last_refresh = now
+            if not self.built_at:
+                self.built_at = now
+            return {"added": added, "updated": updated, "removed": removed}
+
+    # -- querying -----------------------------------------------------------
+
+    def _candidate_ids(self, plan: list[list[str]]) -> set[int]:
+        """Resolve a query plan to candidate file ids."""
+        live = set(self._files)
+        unindexed = {i for i, f in self._files.items() if not f.indexed}
+        result: set[int] = set()
+        for literals in plan:
+            trigrams = set()
+            for literal in literals:
+                trigrams |= extract_trigrams(literal)
+            if not trigrams:
+                return live
+            # Intersect starting with the rarest trigram
+            lists = sorted((self._postings.get(t, []) for t in trigrams), key=len)
+            ids = set(lists[0])
+            for postings in lists[1:]:
+                if not ids:
+                    break
+                ids.intersection_update(postings)
+            result |= ids
+        return (result & live) | unindexed
+
+    def candidates(
+        self,
+        pattern: str,
+        file_pattern: str = "",
+        plan: list[list[str]] | None = None,
+    ) -> list[str]:
+        """Get relative paths of files that may match a pattern."""
+        if plan is None:
+            plan = plan_query(pattern)
+        with self._lock:
+            ids = self._candidate_ids(plan)
+            paths = [self._files[i].path for i in ids]
+        return sorted(p for p in paths if glob_matches(p, file_pattern))
+
+    def search(
+        self,
+        query: str,
+        file_pattern: str = "",
+        context_lines: int = 2,
+        max_results: int = 50,
+        case_sensitive: bool = False,
+    ) -> IndexSearchResult:
+        """Search the project, returning ranked matches with context.
+
+        Raises UnsupportedQueryError if the regex does not compile.
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        try:
+            regex = re.compile(query, flags)
+        except re.error as e:
+            raise UnsupportedQueryError(str(e)) from e
+
+        plan = plan_query(query)
+        candidates = self.candidates(query, file_pattern, plan)
+        plan_literals = {lit.lower() for alt in plan for lit in alt}
+
+        matches: list[IndexMatch] = []
+        for rel in candidates:
+            matches.extend(self._verify(rel, regex, context_lines, plan_literals))
+
+        matches.sort(key=lambda m: (-m.score, m.file, m.line_number))
+        truncated = len(matches) > max_results
+        return IndexSearchResult(
+            matches=matches[:max_results],
+            files_searched=len(candidates),
+            candidates=len(candidates),
+            truncated=truncated,
+        )
+
+    def _verify(
+        self,
+        rel: str,
+        regex: re.Pattern,
+        context_lines: int,
+        plan_literals: set[str],
+    ) -> list[IndexMatch]:
+        """Run the regex over a candidate file."""
+        try:
+            with open(os.path.join(self.root, rel), encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+
+        path_lower = rel.lower()
+        path_bonus = 1.0 if any(lit in path_lower for lit in plan_literals) else 0.0
+        found: list[IndexMatch] = []
+        for idx, line in enumerate(lines):
+            hit = regex.search(line)
+            if not hit:
+                continue
+            score = 1.0 + path_bonus
+            if DEFINITION_RE.match(line):
+                score += 2.0
+            start, end = hit.span()
+            if (start == 0 or not _is_word_char(line[start - 1])) and \
+               (end >= len(line) or not _is_word_char(line[end])):
+                score += 1.0
+            found.append(IndexMatch(
+                file=rel,
+                line_number=idx + 1,
+                content=line,
+                context_before=lines[max(0, idx - context_lines):idx] if context_lines else [],
+                context_after=lines[idx + 1:idx + 1 + context_lines] if context_lines else [],
+                score=score,
+            ))
+            if len(found) >= MAX_MATCHES_PER_FILE:
+                break
+        return found
+
+    # -- persistence --------------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            if self._dead:
+                self._compact()
+            return {
+                "version": INDEX_VERSION,
+                "root": self.root,
+                "built_at": self.built_at,
+                "next_id": self._next_id,
+                "files": {str(i): f.to_list() for i, f in self._files.items()},
+                "skipped": self._skipped,
+                "postings": self._postings,
+            }
+
+    def save(self) -> None:
+        """Persist the index atomically."""
+        if self.storage_path is None:
+            return
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.storage_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp_path, self.storage_path)
+
+    @classmethod
+    def load(cls, root: str | Path, storage_path: Path) -> "TrigramIndex | None":
+        """Load a persisted index, or None if missing or incompatible."""
+        if not storage_path.exists():
+            return None
+        try:
+            with open(storage_path) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load search index {storage_path}: {e}")
+            return None
+
+        index = cls(root, storage_path)
+        if data.get("version") != INDEX_VERSION or data.get("root") != index.root:
+            return None
+        index.built_at = data.get("built_at", 0.0)
+        index._next_id = data.get("next_id", 0)
+        for file_id, entry in data.get("files", {}).items():
+            indexed_file = IndexedFile.from_list(entry)
+            index._files[int(file_id)] = indexed_file
+            index._ids_by_path[indexed_file.path] = int(file_id)
+        index._skipped = data.get("skipped", {})
+        index._postings = data.get("postings", {})
+        return index
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "root": self.root,
+            "files": len(self._files),
+            "trigrams": len(self._postings),
+            "dead_ids": self._dead,
+            "built_at": self.built_at,
+            "last_refresh": self.last_refresh,
+        }
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+# =============================================================================
+# Manager
+# =============================================================================
+
+
+class SearchIndexManager:
+    """Keeps per-project trigram indexes loaded and fresh."""
+
+    def __init__(self, refresh_interval: float = DEFAULT_REFRESH_INTERVAL) -> None:
+        self.refresh_interval = refresh_interval
+        self._indexes: dict[str, TrigramIndex] = {}
+        self._lock = threading.Lock()
+
+    def _storage_path(self, project_name: str) -> Path:
+        return get_context_pack_dir(project_name) / INDEX_FILENAME
+
+    def get(self, project_name: str, project_path: str | Path) -> TrigramIndex | None:
+        """Get a loaded index (from memory or disk). None if never built."""
+        root = str(Path(project_path).expanduser().resolve())
+        with self._lock:
+            index = self._indexes.get(project_name)
+            if index is not None and index.root == root:
+                return index
+            index = TrigramIndex.load(root, self._storage_path(project_name))
+            if index is not None:
+                self._indexes[project_name] = index
+            return index
+
+    def build(self, project_name: str, project_path: str | Path) -> dict[str, Any]:
+        """Build or incrementally update a project's index and persist it."""
+        index = self.get(project_name, project_path)
+        if index is None:
+            index = TrigramIndex(project_path, self._storage_path(project_name))
+            with self._lock:
+                self._indexes[project_name] = index
+
+        started = time.monotonic()
+        changes = index.update()
+        if any(changes.values()) or not index.storage_path.exists():
+            index.save()
+        logger.info(
+            f"Search index for {project_name}: {index.file_count} files, "
+            f"{changes} in {time.monotonic() - started:.2f}s"
+        )
+        return {**changes, "files": index.file_count}
+
+    def search(
+        self,
+        project_name: str,
+        project_path: str | Path,
+        query: str,
+        file_pattern: str = "",
+        context_lines: int = 2,
+        max_results: int = 50,
+        case_sensitive: bool = False,
+    ) -> IndexSearchResult | None:
+        """Search a project's index, refreshing it if stale.
+
+        Returns None if the project has no index yet (callers fall back to
+        ripgrep). Raises UnsupportedQueryError for invalid regexes.
+        """
+        index = self.get(project_name, project_path)
+        if index is None:
+            return None
+        if time.time() - index.last_refresh > self.refresh_interval:
+            if any(index.update().values()):
+                index.save()
+        return index.search(query, file_pattern, context_lines, max_results, case_sensitive)
+
+    def drop(self, project_name: str) -> None:
+        """Forget an index (memory and disk)."""
+        with self._lock:
+            self._indexes.pop(project_name, None)
+        self._storage_path(project_name).unlink(missing_ok=True)
+
+
+# Global search index manager
+search_index_manager = SearchIndexManager()
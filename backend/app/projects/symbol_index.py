@@ -0,0 +1,772 @@
+"""Symbol Index - Definitions, imports and call sites per project.
+
+The context pack maps folders and entry files, but agents still need
+several grep + read iterations to find where a function or class lives.
+This module parses Python (ast), TypeScript/JavaScript and Go (line-based
+patterns) and records:
+
+- Definitions: functions, classes, methods, types, interfaces, constants
+- Imports: imported names and the module they come from
+- Call sites: names invoked as functions
+
+Parsing runs in a process pool during ingest. The index is stored next to
+the context pack (symbol_index.json) and updated incrementally by mtime.
+Lookups are dictionary hits on in-memory name maps.
+"""
+
+import ast
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.projects.context_pack import get_context_pack_dir
+from app.projects.search_index import walk_project_files
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_FILENAME = "symbol_index.json"
+
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".pyi": "python",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".go": "go",
+}
+
+# Files larger than this are not parsed (generated code, bundles)
+MAX_PARSE_FILE_BYTES = 1024 * 1024
+
+# Below this many changed files, parse inline instead of starting a pool
+PROCESS_POOL_MIN_FILES = 64
+MAX_POOL_WORKERS = 8
+
+# Lookups re-stat the tree at most this often
+DEFAULT_REFRESH_INTERVAL = 10.0
+
+MAX_SIGNATURE_CHARS = 200
+
+
+@dataclass
+class SymbolDef:
+    """A symbol definition."""
+    name: str
+    kind: str  # function, method, class, interface, type, struct, enum, variable, constant
+    file: str
+    line: int
+    container: str = ""  # Enclosing class/receiver for methods
+    signature: str = ""
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.container}.{self.name}" if self.container else self.name
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "qualified_name": self.qualified_name,
+            "kind": self.kind,
+            "file": self.file,
+            "line": self.line,
+            "container": self.container,
+            "signature": self.signature,
+        }
+
+
+@dataclass
+class SymbolRef:
+    """A reference to a symbol (import or call site)."""
+    name: str
+    kind: str  # import, call
+    file: str
+    line: int
+    detail: str = ""  # Module for imports
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "file": self.file,
+            "line": self.line,
+            "detail": self.detail,
+        }
+
+
+@dataclass
+class FileSymbols:
+    """Parsed symbols of one file."""
+    path: str
+    language: str
+    mtime_ns: int
+    size: int
+    definitions: list[SymbolDef] = field(default_factory=list)
+    references: list[SymbolRef] = field(default_factory=list)
+
+    def to_list(self) -> list[Any]:
+        return [
+            self.language,
+            self.mtime_ns,
+            self.size,
+            [[d.name, d.kind, d.line, d.container, d.signature] for d in self.definitions],
+            [[r.name, r.kind, r.line, r.detail] for r in self.references],
+        ]
+
+    @classmethod
+    def from_list(cls, path: str, data: list[Any]) -> "FileSymbols":
+        language, mtime_ns, size, defs, refs = data
+        return cls(
+            path=path,
+            language=language,
+            mtime_ns=mtime_ns,
+            size=size,
+            definitions=[SymbolDef(d[0], d[1], path, d[2], d[3], d[4]) for d in defs],
+            references=[SymbolRef(r[0], r[1], path, r[2], r[3]) for r in refs],
+        )
+
+
+# =============================================================================
+# Parsers
+# =============================================================================
+
+
+def _signature(line: str) -> str:
+    return line.strip()[:MAX_SIGNATURE_CHARS]
+
+
+class _PythonVisitor(ast.NodeVisitor):
+    """Collect definitions, imports and calls from a Python module."""
+
+    def __init__(self, path: str, lines: list[str]) -> None:
+        self.path = path
+        self.lines = lines
+        self.defs: list[SymbolDef] = []
+        self.refs: list[SymbolRef] = []
+        self._containers: list[tuple[str, str]] = []  # (name, kind)
+
+    def _line(self, lineno: int) -> str:
+        return self.lines[lineno - 1] if 0 < lineno <= len(self.lines) else ""
+
+    def _define(self, node: ast.AST, name: str, kind: str) -> None:
+        container = ".".join(n for n, _ in self._containers)
+        self.defs.append(SymbolDef(
+            name, kind, self.path, node.lineno, container, _signature(self._line(node.lineno))
+        ))
+
+    def _visit_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        in_class = bool(self._containers) and self._containers[-1][1] == "class"
+        self._define(node, node.name, "method" if in_class else "function")
+        self._containers.append((node.name, "function"))
+        self.generic_visit(node)
+        self._containers.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._define(node, node.name, "class")
+        self._containers.append((node.name, "class"))
+        self.generic_visit(node)
+        self._containers.pop()
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        if not self._containers or self._containers[-1][1] == "class":
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    kind = "constant" if target.id.isupper() else "variable"
+                    self._define(node, target.id, kind)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if isinstance(node.target, ast.Name) and (
+            not self._containers or self._containers[-1][1] == "class"
+        ):
+            kind = "constant" if node.target.id.isupper() else "variable"
+            self._define(node, node.target.id, kind)
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            self.refs.append(SymbolRef(name, "import", self.path, node.lineno, alias.name))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = "." * node.level + (node.module or "")
+        for alias in node.names:
+            if alias.name == "*":
+                continue
+            self.refs.append(SymbolRef(alias.name, "import", self.path, node.lineno, module))
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        name = None
+        if isinstance(func, ast.Name):
+            name = func.id
+        elif isinstance(func, ast.Attribute):
+            name = func.attr
+        if name:
+            self.refs.append(SymbolRef(name, "call", self.path, node.lineno))
+        self.generic_visit(node)
+
+
+def parse_python(path: str, source: str) -> tuple[list[SymbolDef], list[SymbolRef]]:
+    """Parse Python source with the ast module."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError, RecursionError):
+        return [], []
+    visitor = _PythonVisitor(path, source.splitlines())
+    visitor.visit(tree)
+    return visitor.defs, visitor.refs
+
+
+_JS_IDENT = r"[A-Za-z_$][\w$]*"
+_JS_DEF_PATTERNS: list[tuple[re.Pattern, str]] = [
+    (re.compile(
+        rf"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*({_JS_IDENT})"
+    ), "function"),
+    (re.compile(
+        rf"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+({_JS_IDENT})"
+    ), "class"),
+    (re.compile(rf"^\s*(?:export\s+)?(?:declare\s+)?interface\s+({_JS_IDENT})"), "interface"),
+    (re.compile(
+        rf"^\s*(?:export\s+)?(?:declare\s+)?type\s+({_JS_IDENT})\s*(?:<[^=]*>)?\s*="
+    ), "type"),
+    (re.compile(rf"^\s*(?:export\s+)?(?:declare\s+)?(?:const\s+)?enum\s+({_JS_IDENT})"), "enum"),
+    (re.compile(
+        rf"^\s*(?:export\s+)?(?:const|let|var)\s+({_JS_IDENT})\s*(?::[^=]+)?=\s*(?:async\s+)?"
+        rf"(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|{_JS_IDENT}\s*=>)"
+    ), "function"),
+    (re.compile(rf"^\s*export\s+(?:const|let|var)\s+({_JS_IDENT})"), "variable"),
+]
+_JS_METHOD = re.compile(
+    rf"^\s*(?:(?:public|private|protected|static|async|readonly|override|get|set)\s+)*"
+    rf"\*?\s*({_JS_IDENT})\s*(?:<[^>]*>)?\s*\([^)]*\)?\s*(?::[^{{;]*)?\{{"
+)
+_JS_IMPORT = re.compile(r"""^\s*import\s+(?:type\s+)?(.+?)\s+from\s+['"]([^'"]+)['"]""")
+_JS_SIDE_EFFECT_IMPORT = re.compile(r"""^\s*import\s+['"]([^'"]+)['"]""")
+_JS_REQUIRE = re.compile(
+    rf"""(?:const|let|var)\s+({_JS_IDENT}|\{{[^}}]*\}})\s*=\s*require\(\s*['"]([^'"]+)['"]\s*\)"""
+)
+_CALL = re.compile(r"\b([A-Za-z_$][\w$]*)\s*\(")
+
+_JS_KEYWORDS = frozenset({
+    "if", "for", "while", "switch", "catch", "function", "return", "typeof", "new",
+    "await", "yield", "super", "import", "require", "constructor", "else", "do", "with",
+    "async",
+})
+_GO_KEYWORDS = frozenset({
+    "if", "for", "switch", "func", "return", "go", "defer", "select", "range",
+    "make", "new", "len", "cap", "append", "panic", "recover", "type", "map", "chan",
+    "interface", "struct", "else", "case",
+})
+
+
+def _js_import_names(clause: str) -> list[str]:
+    """Extract local names from an import clause."""
+    names: list[str] = []
+    clause = clause.strip()
+    braces = re.search(r"\{([^}]*)\}", clause)
+    if braces:
+        for part in braces.group(1).split(","):
+            part = part.strip()
+            if part.startswith("type "):
+                part = part[5:].strip()
+            if part:
+                names.append(part.split(" as ")[0].strip())
+        clause = clause[:braces.start()] + clause[braces.end():]
+    for part in clause.split(","):
+        part = part.strip()
+        if part.startswith("* as "):
+            names.append(part[5:].strip())
+        elif re.fullmatch(_JS_IDENT, part):
+            names.append(part)
+    return names
+
+
+def _is_comment(stripped: str) -> bool:
+    return stripped.startswith(("//", "/*", "*"))
+
+
+def parse_javascript(path: str, source: str) -> tuple[list[SymbolDef], list[SymbolRef]]:
+    """Parse TypeScript/JavaScript with line-based patterns."""
+    defs: list[SymbolDef] = []
+    refs: list[SymbolRef] = []
+    class_stack: list[tuple[str, int]] = []  # (class name, brace depth at open)
+    depth = 0
+
+    for lineno, line in enumerate(source.splitlines(), start=1):
+        stripped = line.strip()
+        if not stripped or _is_comment(stripped):
+            continue
+
+        defined = None
+        for pattern, kind in _JS_DEF_PATTERNS:
+            m = pattern.match(line)
+            if m:
+                defined = m.group(1)
+                defs.append(SymbolDef(defined, kind, path, lineno, "", _signature(line)))
+                if kind == "class":
+                    class_stack.append((defined, depth))
+                break
+        else:
+            if class_stack and depth == class_stack[-1][1] + 1:
+                m = _JS_METHOD.match(line)
+                if m and m.group(1) not in _JS_KEYWORDS:
+                    defined = m.group(1)
+                    defs.append(SymbolDef(
+                        defined, "method", path, lineno, class_stack[-1][0], _signature(line)
+                    ))
+
+        m = _JS_IMPORT.match(line)
+        if m:
+            for name in _js_import_names(m.group(1)):
+                refs.append(SymbolRef(name, "import", path, lineno, m.group(2)))
+        else:
+            m = _JS_SIDE_EFFECT_IMPORT.match(line)
+            if m:
+                refs.append(SymbolRef(m.group(1), "import", path, lineno, m.group(1)))
+        m = _JS_REQUIRE.search(line)
+        if m:
+            target = m.group(1)
+            names = _js_import_names(target) if target.startswith("{") else [target]
+            for name in names:
+                refs.append(SymbolRef(name, "import", path, lineno, m.group(2)))
+
+        seen: set[str] = set()
+        for call in _CALL.finditer(line):
+            name = call.group(1)
+            if name in _JS_KEYWORDS or name == defined or name in seen:
+                continue
+            seen.add(name)
+            refs.append(SymbolRef(name, "call", path, lineno))
+
+        depth += line.count("{") - line.count("}")
+        while class_stack and depth <= class_stack[-1][1] and "}" in line:
+            class_stack.pop()
+
+    return defs, refs
+
+
+_GO_FUNC = re.compile(r"^func\s+(\w+)\s*[\[(]")
+_GO_METHOD = re.compile(r"^func\s+\(\s*\w*\s*\*?\s*(\w+)(?:\[[^\]]*\])?\s*\)\s*(\w+)\s*[\[(]")
+_GO_TYPE = re.compile(r"^(?:type\s+|\s+)(\w+)(?:\[[^\]]*\])?\s+(struct|interface)\b")
+_GO_TYPE_ALIAS = re.compile(r"^(?:type\s+|\s+)(\w+)(?:\[[^\]]*\])?\s+=?\s*[\w.*\[\]]+")
+_GO_VALUE = re.compile(r"^(const|var)\s+(\w+)")
+_GO_BLOCK_VALUE = re.compile(r"^\s+(\w+)\b")
+_GO_IMPORT = re.compile(r"""^(?:import\s+|\s*)(?:(\w+|\.|_)\s+)?"([^"]+)\"""")
+
+
+def parse_go(path: str, source: str) -> tuple[list[SymbolDef], list[SymbolRef]]:
+    """Parse Go with line-based patterns."""
+    defs: list[SymbolDef] = []
+    refs: list[SymbolRef] = []
+    block: str | None = None  # "import", "const", "var" or "type" inside ( ... )
+
+    for lineno, line in enumerate(source.splitlines(), start=1):
+        stripped = line.strip()
+        if not stripped or _is_comment(stripped):
+            continue
+
+        if block:
+            if stripped == ")":
+                block = None
+                continue
+            if block == "import":
+                m = _GO_IMPORT.match(line)
+                if m:
+                    module = m.group(2)
+                    refs.append(SymbolRef(
+                        m.group(1) or module.rsplit("/", 1)[-1], "import", path, lineno, module
+                    ))
+                continue
+            if block == "type":
+                m = _GO_TYPE.match(line)
+                if m:
+                    defs.append(
+                        SymbolDef(m.group(1), m.group(2), path, lineno, "", _signature(line))
+                    )
+                elif line.startswith("\t") and not line.startswith("\t\t"):
+                    m = _GO_TYPE_ALIAS.match(line)
+                    if m:
+                        defs.append(
+                            SymbolDef(m.group(1), "type", path, lineno, "", _signature(line))
+                        )
+            elif line.startswith("\t") and not line.startswith("\t\t"):
+                m = _GO_BLOCK_VALUE.match(line)
+                if m and m.group(1) != "_":
+                    kind = "constant" if block == "const" else "variable"
+                    defs.append(SymbolDef(m.group(1), kind, path, lineno, "", _signature(line)))
+
+        opener = re.match(r"^(import|const|var|type)\s*\($", stripped)
+        if opener and not line[0].isspace():
+            block = opener.group(1)
+            continue
+
+        defined = None
+        if not line[0].isspace():
+            m = _GO_METHOD.match(line)
+            if m:
+                defined = m.group(2)
+                defs.append(
+                    SymbolDef(defined, "method", path, lineno, m.group(1), _signature(line))
+                )
+            elif (m := _GO_FUNC.match(line)):
+                defined = m.group(1)
+                defs.append(SymbolDef(defined, "function", path, lineno, "", _signature(line)))
+            elif line.startswith("type "):
+                m = _GO_TYPE.match(line) or _GO_TYPE_ALIAS.match(line)
+                if m:
+                    defined = m.group(1)
+                    kind = m.group(2) if m.re is _GO_TYPE else "type"
+                    defs.append(SymbolDef(defined, kind, path, lineno, "", _signature(line)))
+            elif line.startswith("import "):
+                m = _GO_IMPORT.match(line)
+                if m:
+                    module = m.group(2)
+                    refs.append(SymbolRef(
+                        m.group(1) or module.rsplit("/", 1)[-1], "import", path, lineno, module
+                    ))
+                continue
+            elif (m := _GO_VALUE.match(line)):
+                defined = m.group(2)
+                kind = "constant" if m.group(1) == "const" else "variable"
+                defs.append(SymbolDef(defined, kind, path, lineno, "", _signature(line)))
+
+        seen: set[str] = set()
+        for call in _CALL.finditer(line):
+            name = call.group(1)
+            if name in _GO_KEYWORDS or name == defined or name in seen:
+                continue
+            seen.add(name)
+            refs.append(SymbolRef(name, "call", path, lineno))
+
+    return defs, refs
+
+
+PARSERS = {
+    "python": parse_python,
+    "typescript": parse_javascript,
+    "javascript": parse_javascript,
+    "go": parse_go,
+}
+
+
+def parse_file(root: str, rel: str, mtime_ns: int, size: int) -> FileSymbols | None:
+    """Parse one source file. Module-level so it can run in worker processes."""
+    language = LANGUAGE_BY_EXTENSION.get(os.path.splitext(rel)[1])
+    if language is None:
+        return None
+    try:
+        with open(os.path.join(root, rel), encoding="utf-8", errors="replace") as f:
+            source = f.read()
+    except OSError:
+        return None
+    defs, refs = PARSERS[language](rel, source)
+    return FileSymbols(rel, language, mtime_ns, size, defs, refs)
+
+
+def _parse_batch(root: str, batch: list[tuple[str, int, int]]) -> list[FileSymbols | None]:
+    return [parse_file(root, rel, mtime_ns, size) for rel, mtime_ns, size in batch]
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+
+class SymbolIndex:
+    """Symbol definitions and references for one project tree."""
+
+    def __init__(self, root: str | Path, storage_path: Path | None = None) -> None:
+        self.root = str(Path(root).expanduser().resolve())
+        self.storage_path = storage_path
+        self._files: dict[str, FileSymbols] = {}
+        self._defs_by_name: dict[str, list[SymbolDef]] = {}
+        self._refs_by_name: dict[str, list[SymbolRef]] = {}
+        self._lock = threading.Lock()
+        self.last_refresh = 0.0
+        self.built_at = 0.0
+
+    @property
+    def file_count(self) -> int:
+        return len(self._files)
+
+    @property
+    def symbol_count(self) -> int:
+        return sum(len(f.definitions) for f in self._files.values())
+
+    # -- building -----------------------------------------------------------
+
+    def _link(self, parsed: FileSymbols) -> None:
+        self._files[parsed.path] = parsed
+        for d in parsed.definitions:
+            self._defs_by_name.setdefault(d.name, []).append(d)
+        for r in parsed.references:
+            self._refs_by_name.setdefault(r.name, []).append(r)
+
+    def _unlink(self, rel: str) -> None:
+        old = self._files.pop(rel, None)
+        if old is None:
+            return
+        for name in {d.name for d in old.definitions}:
+            kept = [d for d in self._defs_by_name.get(name, []) if d.file != rel]
+            if kept:
+                self._defs_by_name[name] = kept
+            else:
+                self._defs_by_name.pop(name, None)
+        for name in {r.name for r in old.references}:
+            kept = [r for r in self._refs_by_name.get(name, []) if r.file != rel]
+            if kept:
+                self._refs_by_name[name] = kept
+            else:
+                self._refs_by_name.pop(name, None)
+
+    def _parse_all(self, pending: list[tuple[str, int, int]]) -> list[FileSymbols | None]:
+        """Parse files, in a process pool when there are enough of them."""
+        if len(pending) < PROCESS_POOL_MIN_FILES:
+            return _parse_batch(self.root, pending)
+
+        workers = min(MAX_POOL_WORKERS, os.cpu_count() or 1)
+        size = max(16, len(pending) // (workers * 4))
+        batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+        try:
+            # spawn: forking a process that runs the event loop and threads is unsafe
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                results: list[FileSymbols | None] = []
+                for parsed in pool.map(_parse_batch, [self.root] * len(batches), batches):
+                    results.extend(parsed)
+                return results
+        except Exception as e:
+            logger.warning(f"Symbol parsing pool failed, parsing inline: {e}")
+            return _parse_batch(self.root, pending)
+
+    def update(self) -> dict[str, int]:
+        """Bring the index up to date, re-parsing only changed files."""
+        with self._lock:
+            current = {
+                rel: st for rel, st in walk_project_files(self.root).items()
+                if os.path.splitext(rel)[1] in LANGUAGE_BY_EXTENSION
+                and st.st_size <= MAX_PARSE_FILE_BYTES
+            }
+            removed = 0
+            for rel in [p for p in self._files if p not in current]:
+                self._unlink(rel)
+                removed += 1
+
+            pending: list[tuple[str, int, int]] = []
+            added = updated = 0
+            for rel, st in current.items():
+                known = self._files.get(rel)
+                if known is not None:
+                    if known.mtime_ns == st.st_mtime_ns and known.size == st.st_size:
+                        continue
+                    updated += 1
+                else:
+                    added += 1
+                pending.append((rel, st.st_mtime_ns, st.st_size))
+
+            for parsed in self._parse_all(pending):
+                if parsed is not None:
+                    self._unlink(parsed.path)
+                    self._link(parsed)
+
+            now = time.time()
+            self.last_refresh = now
+            if not self.built_at:
+                self.built_at = now
+            return {"added": added, "updated": updated, "removed": removed}
+
+    # -- lookups ------------------------------------------------------------
+
+    def find_definitions(
+        self, name: str, kind: str | None = None, limit: int = 50
+    ) -> list[SymbolDef]:
+        """Find definitions by name or qualified name (Class.method)."""
+        container = ""
+        if "." in name:
+            container, name = name.rsplit(".", 1)
+        with self._lock:
+            found = [
+                d for d in self._defs_by_name.get(name, [])
+                if (not kind or d.kind == kind)
+                and (
+                    not container
+                    or d.container == container
+                    or d.container.endswith("." + container)
+                )
+            ]
+        # Classes and functions before variables; shallower paths first
+        found.sort(key=lambda d: (
+            d.kind in ("variable", "constant"), d.file.count("/"), d.file, d.line
+        ))
+        return found[:limit]
+
+    def find_references(
+        self, name: str, kind: str | None = None, limit: int = 100
+    ) -> list[SymbolRef]:
+        """Find imports and call sites of a name."""
+        name = name.rsplit(".", 1)[-1]
+        with self._lock:
+            found = [r for r in self._refs_by_name.get(name, []) if not kind or r.kind == kind]
+        found.sort(key=lambda r: (r.file, r.line))
+        return found[:limit]
+
+    def search(self, query: str, kind: str | None = None, limit: int = 50) -> list[SymbolDef]:
+        """Fuzzy symbol search: exact, then prefix, then substring matches."""
+        needle = query.lower()
+        with self._lock:
+            names = [n for n in self._defs_by_name if needle in n.lower()]
+            ranked = sorted(
+                names,
+                key=lambda n: (n.lower() != needle, not n.lower().startswith(needle), len(n), n),
+            )
+            results: list[SymbolDef] = []
+            for n in ranked:
+                for d in self._defs_by_name[n]:
+                    if not kind or d.kind == kind:
+                        results.append(d)
+                if len(results) >= limit:
+                    break
+        return results[:limit]
+
+    def outline(self, rel: str) -> list[SymbolDef]:
+        """Get the definitions of a file in source order."""
+        with self._lock:
+            parsed = self._files.get(rel.replace(os.sep, "/").removeprefix("./"))
+            return list(parsed.definitions) if parsed else []
+
+    # -- persistence --------------------------------------------------------
+
+    def save(self) -> None:
+        """Persist the index atomically."""
+        if self.storage_path is None:
+            return
+        with self._lock:
+            data = {
+                "version": INDEX_VERSION,
+                "root": self.root,
+                "built_at": self.built_at,
+                "files": {rel: f.to_list() for rel, f in self._files.items()},
+            }
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.storage_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, self.storage_path)
+
+    @classmethod
+    def load(cls, root: str | Path, storage_path: Path) -> "SymbolIndex | None":
+        """Load a persisted index, or None if missing or incompatible."""
+        if not storage_path.exists():
+            return None
+        try:
+            with open(storage_path) as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to load symbol index {storage_path}: {e}")
+            return None
+
+        index = cls(root, storage_path)
+        if data.get("version") != INDEX_VERSION or data.get("root") != index.root:
+            return None
+        index.built_at = data.get("built_at", 0.0)
+        for rel, entry in data.get("files", {}).items():
+            index._link(FileSymbols.from_list(rel, entry))
+        return index
+
+    def get_stats(self) -> dict[str, Any]:
+        languages: dict[str, int] = {}
+        for f in self._files.values():
+            languages[f.language] = languages.get(f.language, 0) + 1
+        return {
+            "root": self.root,
+            "files": len(self._files),
+            "symbols": self.symbol_count,
+            "names": len(self._defs_by_name),
+            "languages": languages,
+            "built_at": self.built_at,
+            "last_refresh": self.last_refresh,
+        }
+
+
+# =============================================================================
+# Manager
+# =============================================================================
+
+
+class SymbolIndexManager:
+    """Keeps per-project symbol indexes loaded and fresh."""
+
+    def __init__(self, refresh_interval: float = DEFAULT_REFRESH_INTERVAL) -> None:
+        self.refresh_interval = refresh_interval
+        self._indexes: dict[str, SymbolIndex] = {}
+        self._lock = threading.Lock()
+
+    def _storage_path(self, project_name: str) -> Path:
+        return get_context_pack_dir(project_name) / INDEX_FILENAME
+
+    def get(self, project_name: str, project_path: str | Path) -> SymbolIndex | None:
+        """Get a loaded index (from memory or disk). None if never built."""
+        root = str(Path(project_path).expanduser().resolve())
+        with self._lock:
+            index = self._indexes.get(project_name)
+            if index is not None and index.root == root:
+                return index
+            index = SymbolIndex.load(root, self._storage_path(project_name))
+            if index is not None:
+                self._indexes[project_name] = index
+            return index
+
+    def build(self, project_name: str, project_path: str | Path) -> dict[str, Any]:
+        """Build or incrementally update a project's index and persist it."""
+        index = self.get(project_name, project_path)
+        if index is None:
+            index = SymbolIndex(project_path, self._storage_path(project_name))
+            with self._lock:
+                self._indexes[project_name] = index
+
+        started = time.monotonic()
+        changes = index.update()
+        if any(changes.values()) or not index.storage_path.exists():
+            index.save()
+        logger.info(
+            f"Symbol index for {project_name}: {index.file_count} files, "
+            f"{changes} in {time.monotonic() - started:.2f}s"
+        )
+        return {**changes, "files": index.file_count, "symbols": index.symbol_count}
+
+    def get_fresh(self, project_name: str, project_path: str | Path) -> SymbolIndex | None:
+        """Get an index, refreshing it from file mtimes if stale."""
+        index = self.get(project_name, project_path)
+        if index is not None and time.time() - index.last_refresh > self.refresh_interval:
+            if any(index.update().values()):
+                index.save()
+        return index
+
+    def drop(self, project_name: str) -> None:
+        """Forget an index (memory and disk)."""
+        with self._lock:
+            self._indexes.pop(project_name, None)
+        self._storage_path(project_name).unlink(missing_ok=True)
+
+
+# Global symbol index manager
+symbol_index_manager = SymbolIndexManager()
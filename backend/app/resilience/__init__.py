@@ -2,22 +2,34 @@
 
 from app.resilience.circuit_breaker import (
     CircuitBreaker,
+    CircuitBreakerConfig,
     CircuitBreakerError,
+    CircuitGuard,
     CircuitState,
     circuit_breaker_registry,
+    circuit_protected,
 )
 from app.resilience.rate_limiter import (
+    KeyedRateLimiter,
+    RateLimitConfig,
     RateLimiter,
     RateLimitError,
+    WindowCounter,
     rate_limiter_registry,
 )
 
 __all__ = [
     "CircuitBreaker",
+    "CircuitBreakerConfig",
     "CircuitBreakerError",
+    "CircuitGuard",
     "CircuitState",
     "circuit_breaker_registry",
+    "circuit_protected",
+    "KeyedRateLimiter",
+    "RateLimitConfig",
     "RateLimiter",
     "RateLimitError",
+    "WindowCounter",
     "rate_limiter_registry",
 ]
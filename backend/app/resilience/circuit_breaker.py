@@ -1,13 +1,16 @@
 """Circuit breaker implementation for external service protection."""
 
-import asyncio
+import functools
 import logging
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from types import TracebackType
 from typing import Any, Callable, Coroutine, TypeVar
 
+from app.resilience.rate_limiter import WindowCounter
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -33,13 +36,95 @@ class CircuitBreakerError(Exception):
 
 @dataclass
 class CircuitBreakerConfig:
-    """Configuration for a circuit breaker."""
+    """Configuration for a circuit breaker.
+
+    The breaker opens when, within the last ``window_seconds``, at least
+    ``failure_threshold`` calls failed and they make up at least
+    ``failure_rate_threshold`` of all calls. Slow calls are judged the same
+    way against ``slow_call_rate_threshold`` when ``slow_call_seconds`` is set.
+    """
 
-    failure_threshold: int = 5  # Failures before opening
+    failure_threshold: int = 5  # Minimum failures (or slow calls) in the window before opening
     success_threshold: int = 3  # Successes in half-open before closing
     timeout_seconds: float = 30.0  # Time before transitioning to half-open
     half_open_max_calls: int = 3  # Max concurrent calls in half-open
 
+    # Rolling window
+    window_seconds: float = 60.0
+    failure_rate_threshold: float = 0.5  # Fraction of failed calls that opens the circuit
+
+    # Slow-call detection (disabled when slow_call_seconds is None)
+    slow_call_seconds: float | None = None
+    slow_call_rate_threshold: float = 1.0
+
+    # Exceptions that indicate a caller error rather than an unhealthy service
+    excluded_exceptions: tuple[type[BaseException], ...] = ()
+
+
+class CircuitGuard:
+    """Admission ticket for one call through a circuit breaker.
+
+    Returned by ``CircuitBreaker.protect()``. Usable as a sync or async
+    context manager: an exception escaping the block records a failure,
+    otherwise the call is recorded as a success unless ``fail()`` was called.
+    """
+
+    __slots__ = ("_breaker", "_generation", "_probe", "_started", "_failed", "_done")
+
+    def __init__(self, breaker: "CircuitBreaker", generation: int, probe: bool) -> None:
+        self._breaker = breaker
+        self._generation = generation
+        self._probe = probe
+        self._started = time.monotonic()
+        self._failed = False
+        self._done = False
+
+    def fail(self) -> None:
+        """Mark the call as failed without raising (e.g. a timeout the caller handles)."""
+        self._failed = True
+
+    def _finish(self, exc: BaseException | None) -> None:
+        if self._done:
+            return
+        self._done = True
+        breaker = self._breaker
+        if exc is not None and not isinstance(exc, Exception):
+            # Cancellation says nothing about the service's health
+            breaker._release(self._generation, self._probe)
+            return
+        failed = self._failed or (
+            exc is not None and not isinstance(exc, breaker.config.excluded_exceptions)
+        )
+        breaker._record(
+            self._generation,
+            self._probe,
+            failed,
+            time.monotonic() - self._started,
+            exc if exc is not None else "marked failed",
+        )
+
+    def __enter__(self) -> "CircuitGuard":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._finish(exc)
+
+    async def __aenter__(self) -> "CircuitGuard":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._finish(exc)
+
 
 @dataclass
 class CircuitBreaker:
@@ -47,9 +132,15 @@ class CircuitBreaker:
 
     States:
     - CLOSED: Normal operation, calls pass through
-    - OPEN: Too many failures, calls are rejected immediately
+    - OPEN: Failure (or slow-call) rate over the rolling window is too high,
+      calls are rejected immediately
     - HALF_OPEN: Testing recovery, limited calls allowed
 
+    Admission and outcome recording never await, so on the event loop no
+    lock is needed; in the CLOSED state admission is a single state check.
+    Outcomes of calls admitted before the last state change only feed the
+    metrics, never the state machine.
+
     Usage:
         breaker = CircuitBreaker("api_service")
         try:
@@ -57,24 +148,44 @@ class CircuitBreaker:
         except CircuitBreakerError as e:
             # Handle circuit open
             pass
+
+        # Or around an arbitrary block
+        async with breaker.protect() as guard:
+            output = await run_subprocess()
+            if output.timed_out:
+                guard.fail()
     """
 
     name: str
     config: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
 
     _state: CircuitState = field(default=CircuitState.CLOSED, init=False)
-    _failure_count: int = field(default=0, init=False)
+    _generation: int = field(default=0, init=False)
     _success_count: int = field(default=0, init=False)
-    _last_failure_time: float = field(default=0, init=False)
+    _opened_at: float = field(default=0, init=False)
     _half_open_calls: int = field(default=0, init=False)
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+
+    # Rolling window
+    _calls: WindowCounter = field(init=False)
+    _failures: WindowCounter = field(init=False)
+    _slow_calls: WindowCounter = field(init=False)
 
     # Metrics
     _total_calls: int = field(default=0, init=False)
     _total_failures: int = field(default=0, init=False)
+    _total_slow_calls: int = field(default=0, init=False)
     _total_rejections: int = field(default=0, init=False)
+    _times_opened: int = field(default=0, init=False)
     _last_state_change: datetime = field(default_factory=datetime.now, init=False)
 
+    def __post_init__(self) -> None:
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self._calls = WindowCounter(self.config.window_seconds)
+        self._failures = WindowCounter(self.config.window_seconds)
+        self._slow_calls = WindowCounter(self.config.window_seconds)
+
     @property
     def state(self) -> CircuitState:
         return self._state
@@ -87,6 +198,36 @@ class CircuitBreaker:
     def is_open(self) -> bool:
         return self._state == CircuitState.OPEN
 
+    def protect(self) -> CircuitGuard:
+        """Admit one call, returning a guard that records its outcome.
+
+        Raises:
+            CircuitBreakerError: If the circuit is open, or half-open with
+                all probe slots taken
+        """
+        if self._state is CircuitState.CLOSED:
+            self._total_calls += 1
+            return CircuitGuard(self, self._generation, probe=False)
+        return self._admit_slow_path()
+
+    def _admit_slow_path(self) -> CircuitGuard:
+        self._check_state_transition()
+
+        if self._state == CircuitState.OPEN:
+            self._total_rejections += 1
+            raise CircuitBreakerError(self.name, self._state, self._time_until_half_open())
+
+        if self._state == CircuitState.HALF_OPEN:
+            if self._half_open_calls >= self.config.half_open_max_calls:
+                self._total_rejections += 1
+                raise CircuitBreakerError(self.name, self._state, 1.0)
+            self._half_open_calls += 1
+            self._total_calls += 1
+            return CircuitGuard(self, self._generation, probe=True)
+
+        self._total_calls += 1
+        return CircuitGuard(self, self._generation, probe=False)
+
     async def call(
         self,
         func: Callable[..., Coroutine[Any, Any, T]],
@@ -107,115 +248,154 @@ class CircuitBreaker:
             CircuitBreakerError: If circuit is open
             Exception: Any exception from the function
         """
-        async with self._lock:
-            self._check_state_transition()
+        with self.protect():
+            return await func(*args, **kwargs)
 
-            if self._state == CircuitState.OPEN:
-                retry_after = self._time_until_half_open()
-                self._total_rejections += 1
-                raise CircuitBreakerError(self.name, self._state, retry_after)
+    def _is_slow(self, duration: float) -> bool:
+        threshold = self.config.slow_call_seconds
+        return threshold is not None and duration >= threshold
 
-            if self._state == CircuitState.HALF_OPEN:
-                if self._half_open_calls >= self.config.half_open_max_calls:
-                    raise CircuitBreakerError(self.name, self._state, 1.0)
-                self._half_open_calls += 1
+    def _record(
+        self,
+        generation: int,
+        probe: bool,
+        failed: bool,
+        duration: float,
+        error: BaseException | str,
+    ) -> None:
+        """Record the outcome of a call admitted at the given generation."""
+        now = time.monotonic()
+        slow = self._is_slow(duration)
+
+        self._calls.add(now)
+        if failed:
+            self._total_failures += 1
+            self._failures.add(now)
+        if slow:
+            self._total_slow_calls += 1
+            self._slow_calls.add(now)
 
-        self._total_calls += 1
+        if generation != self._generation:
+            return
 
-        try:
-            result = await func(*args, **kwargs)
-            await self._record_success()
-            return result
-        except Exception as e:
-            await self._record_failure(e)
-            raise
-
-    async def _record_success(self) -> None:
-        """Record a successful call."""
-        async with self._lock:
-            if self._state == CircuitState.HALF_OPEN:
-                self._success_count += 1
+        if self._state == CircuitState.HALF_OPEN:
+            if probe:
                 self._half_open_calls -= 1
-
+            if failed or slow:
+                self._transition_to(CircuitState.OPEN)
+                reason = error if failed else f"slow call ({duration:.1f}s)"
+                logger.warning(
+                    f"Circuit '{self.name}' reopened after failure in half-open: {reason}"
+                )
+            else:
+                self._success_count += 1
                 if self._success_count >= self.config.success_threshold:
                     self._transition_to(CircuitState.CLOSED)
-            else:
-                # In closed state, reset failure count on success
-                self._failure_count = 0
-
-    async def _record_failure(self, error: Exception) -> None:
-        """Record a failed call."""
-        async with self._lock:
-            self._total_failures += 1
-            self._last_failure_time = time.time()
-
-            if self._state == CircuitState.HALF_OPEN:
-                self._half_open_calls -= 1
+        elif self._state == CircuitState.CLOSED and (failed or slow):
+            reason = self._trip_reason(now)
+            if reason:
                 self._transition_to(CircuitState.OPEN)
-                logger.warning(f"Circuit '{self.name}' reopened after failure in half-open: {error}")
-            else:
-                self._failure_count += 1
-
-                if self._failure_count >= self.config.failure_threshold:
-                    self._transition_to(CircuitState.OPEN)
-                    logger.warning(
-                        f"Circuit '{self.name}' opened after {self._failure_count} failures"
-                    )
+                logger.warning(f"Circuit '{self.name}' opened: {reason}")
+
+    def _release(self, generation: int, probe: bool) -> None:
+        """Free a half-open slot for a call that ended without an outcome."""
+        if probe and generation == self._generation and self._state == CircuitState.HALF_OPEN:
+            self._half_open_calls -= 1
+
+    def _trip_reason(self, now: float) -> str | None:
+        """Why the window warrants opening the circuit, if it does."""
+        calls = self._calls.count(now)
+        if calls == 0:
+            return None
+        minimum = self.config.failure_threshold
+
+        failures = self._failures.count(now)
+        if failures >= minimum and failures / calls >= self.config.failure_rate_threshold:
+            return f"{failures}/{calls} calls failed in the last {self.config.window_seconds:g}s"
+
+        if self.config.slow_call_seconds is not None:
+            slow = self._slow_calls.count(now)
+            if slow >= minimum and slow / calls >= self.config.slow_call_rate_threshold:
+                return (
+                    f"{slow}/{calls} calls took over {self.config.slow_call_seconds:g}s "
+                    f"in the last {self.config.window_seconds:g}s"
+                )
+        return None
 
     def _check_state_transition(self) -> None:
-        """Check if state should transition (called under lock)."""
+        """Move from OPEN to HALF_OPEN once the open timeout has elapsed."""
         if self._state == CircuitState.OPEN:
-            if time.time() - self._last_failure_time >= self.config.timeout_seconds:
+            if time.monotonic() - self._opened_at >= self.config.timeout_seconds:
                 self._transition_to(CircuitState.HALF_OPEN)
                 logger.info(f"Circuit '{self.name}' transitioned to half-open")
 
     def _transition_to(self, new_state: CircuitState) -> None:
-        """Transition to a new state (called under lock)."""
-        old_state = self._state
+        """Transition to a new state."""
         self._state = new_state
+        self._generation += 1
         self._last_state_change = datetime.now()
+        self._success_count = 0
+        self._half_open_calls = 0
 
         if new_state == CircuitState.CLOSED:
-            self._failure_count = 0
-            self._success_count = 0
+            self._reset_window()
             logger.info(f"Circuit '{self.name}' closed")
-        elif new_state == CircuitState.HALF_OPEN:
-            self._success_count = 0
-            self._half_open_calls = 0
         elif new_state == CircuitState.OPEN:
-            self._success_count = 0
+            self._opened_at = time.monotonic()
+            self._times_opened += 1
 
     def _time_until_half_open(self) -> float:
         """Calculate time until circuit transitions to half-open."""
-        elapsed = time.time() - self._last_failure_time
+        elapsed = time.monotonic() - self._opened_at
         remaining = self.config.timeout_seconds - elapsed
         return max(0, remaining)
 
     def reset(self) -> None:
         """Manually reset the circuit to closed state."""
         self._state = CircuitState.CLOSED
-        self._failure_count = 0
+        self._generation += 1
         self._success_count = 0
         self._half_open_calls = 0
+        self._reset_window()
         self._last_state_change = datetime.now()
         logger.info(f"Circuit '{self.name}' manually reset")
 
     def get_status(self) -> dict[str, Any]:
         """Get current circuit status."""
+        now = time.monotonic()
+        calls = self._calls.count(now)
+        failures = self._failures.count(now)
+        slow = self._slow_calls.count(now)
         return {
             "name": self.name,
             "state": self._state.value,
-            "failure_count": self._failure_count,
+            "failure_count": failures,
             "success_count": self._success_count,
+            "window": {
+                "seconds": self.config.window_seconds,
+                "calls": calls,
+                "failures": failures,
+                "slow_calls": slow,
+                "failure_rate": failures / calls if calls else 0.0,
+                "slow_call_rate": slow / calls if calls else 0.0,
+            },
             "total_calls": self._total_calls,
             "total_failures": self._total_failures,
+            "total_slow_calls": self._total_slow_calls,
             "total_rejections": self._total_rejections,
+            "times_opened": self._times_opened,
             "last_state_change": self._last_state_change.isoformat(),
-            "time_until_half_open": self._time_until_half_open() if self._state == CircuitState.OPEN else None,
+            "time_until_half_open": (
+                self._time_until_half_open() if self._state == CircuitState.OPEN else None
+            ),
             "config": {
                 "failure_threshold": self.config.failure_threshold,
+                "failure_rate_threshold": self.config.failure_rate_threshold,
                 "success_threshold": self.config.success_threshold,
                 "timeout_seconds": self.config.timeout_seconds,
+                "window_seconds": self.config.window_seconds,
+                "slow_call_seconds": self.config.slow_call_seconds,
+                "slow_call_rate_threshold": self.config.slow_call_rate_threshold,
             },
         }
 
@@ -232,12 +412,11 @@ class CircuitBreakerRegistry:
         config: CircuitBreakerConfig | None = None,
     ) -> CircuitBreaker:
         """Get or create a circuit breaker."""
-        if name not in self._breakers:
-            self._breakers[name] = CircuitBreaker(
-                name=name,
-                config=config or CircuitBreakerConfig(),
-            )
-        return self._breakers[name]
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name=name, config=config or CircuitBreakerConfig())
+            self._breakers[name] = breaker
+        return breaker
 
     def get(self, name: str) -> CircuitBreaker | None:
         """Get a circuit breaker by name."""
@@ -255,3 +434,28 @@ class CircuitBreakerRegistry:
 
 # Global registry
 circuit_breaker_registry = CircuitBreakerRegistry()
+
+
+def circuit_protected(
+    name: str,
+    config: CircuitBreakerConfig | None = None,
+) -> Callable[[Callable[..., Coroutine[Any, Any, T]]], Callable[..., Coroutine[Any, Any, T]]]:
+    """Decorate an async function so every call goes through a named breaker.
+
+    Usage:
+        @circuit_protected("payments", CircuitBreakerConfig(failure_threshold=3))
+        async def charge(...): ...
+    """
+
+    def decorator(
+        func: Callable[..., Coroutine[Any, Any, T]],
+    ) -> Callable[..., Coroutine[Any, Any, T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            breaker = circuit_breaker_registry.get_or_create(name, config)
+            with breaker.protect():
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
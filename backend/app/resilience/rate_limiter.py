@@ -3,9 +3,8 @@
 import asyncio
 import logging
 import time
-from collections import defaultdict
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -39,6 +38,63 @@ class RateLimitConfig:
     min_interval_seconds: float = 0.0
 
 
+class WindowCounter:
+    """Sliding-window call counter backed by a ring of fixed-width buckets.
+
+    Counts calls in the last ``window`` seconds at ``window / buckets``
+    granularity. Recording and counting are O(1) amortized: expired buckets
+    are zeroed as the clock advances and a running total is kept.
+    """
+
+    __slots__ = ("window", "width", "size", "total", "_counts", "_head")
+
+    def __init__(self, window: float, buckets: int = 60) -> None:
+        self.window = window
+        self.width = window / buckets
+        self.size = buckets
+        self.total = 0
+        self._counts = [0] * buckets
+        self._head: int | None = None  # Absolute index of the newest bucket
+
+    def _advance(self, now: float) -> int:
+        idx = int(now // self.width)
+        if self._head is None:
+            self._head = idx
+        elif idx > self._head:
+            if idx - self._head >= self.size:
+                self._counts = [0] * self.size
+                self.total = 0
+            else:
+                for i in range(self._head + 1, idx + 1):
+                    slot = i % self.size
+                    self.total -= self._counts[slot]
+                    self._counts[slot] = 0
+            self._head = idx
+        return self._head
+
+    def count(self, now: float) -> int:
+        """Calls recorded within the window ending at now."""
+        self._advance(now)
+        return self.total
+
+    def add(self, now: float, n: int = 1) -> None:
+        """Record n calls at time now."""
+        idx = self._advance(now)
+        self._counts[idx % self.size] += n
+        self.total += n
+
+    def retry_after(self, now: float, limit: int) -> float:
+        """Seconds until the count drops below limit."""
+        idx = self._advance(now)
+        excess = self.total - limit + 1
+        for i in range(idx - self.size + 1, idx + 1):
+            excess -= self._counts[i % self.size]
+            if excess <= 0:
+                # Bucket i leaves the window once the head reaches i + size
+                return max((i + self.size) * self.width - now, 0.0)
+        return 0.0
+
+
 @dataclass
 class RateLimiter:
     """Token bucket rate limiter with sliding window support.
@@ -47,7 +103,11 @@ class RateLimiter:
     - Token bucket for smooth rate limiting
     - Optional sliding window limits (per minute, per hour)
     - Optional minimum interval between requests
-    - Async-safe with proper locking
+    - FIFO waiter queue: waiting callers are woken by a single timer exactly
+      when their tokens become available, rather than by sleep polling
+
+    Every operation is O(1) and never awaits while inspecting state, so no
+    lock is needed on the event loop.
 
     Usage:
         limiter = RateLimiter("api_calls", RateLimitConfig(requests_per_second=5))
@@ -57,6 +117,10 @@ class RateLimiter:
         except RateLimitError as e:
             # Handle rate limit
             await asyncio.sleep(e.retry_after)
+
+        # Or block until allowed
+        if await limiter.wait_and_acquire(max_wait=10):
+            # Make API call
     """
 
     name: str
@@ -67,18 +131,93 @@ class RateLimiter:
     _last_refill: float = field(default=0, init=False)
 
     # Sliding window state
-    _call_history: list[float] = field(default_factory=list, init=False)
-    _last_call_time: float = field(default=0, init=False)
+    _minute_window: WindowCounter = field(
+        default_factory=lambda: WindowCounter(60.0), init=False
+    )
+    _hour_window: WindowCounter = field(
+        default_factory=lambda: WindowCounter(3600.0), init=False
+    )
+    _last_call_time: float = field(default=float("-inf"), init=False)
+
+    # Waiters: (tokens, future) in arrival order
+    _waiters: deque = field(default_factory=deque, init=False)
+    _wakeup: asyncio.TimerHandle | None = field(default=None, init=False)
 
     # Metrics
     _total_requests: int = field(default=0, init=False)
     _total_limited: int = field(default=0, init=False)
 
-    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
-
     def __post_init__(self) -> None:
         self._tokens = float(self.config.burst_size)
-        self._last_refill = time.time()
+        self._last_refill = time.monotonic()
+
+    def _refill_tokens(self, now: float) -> None:
+        """Refill tokens based on elapsed time."""
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            new_tokens = elapsed * self.config.requests_per_second
+            self._tokens = min(self.config.burst_size, self._tokens + new_tokens)
+            self._last_refill = now
+
+    def _violations(self, tokens: int, now: float) -> list[tuple[str, float]]:
+        """Return (limit_type, retry_after) for every limit that blocks now."""
+        violations = []
+
+        if self.config.min_interval_seconds > 0:
+            elapsed = now - self._last_call_time
+            if elapsed < self.config.min_interval_seconds:
+                violations.append(("min_interval", self.config.min_interval_seconds - elapsed))
+
+        self._refill_tokens(now)
+        if self._tokens < tokens:
+            retry_after = (tokens - self._tokens) / self.config.requests_per_second
+            violations.append(("token_bucket", retry_after))
+
+        max_per_minute = self.config.max_per_minute
+        if max_per_minute is not None and self._minute_window.count(now) >= max_per_minute:
+            violations.append(("per_minute", self._minute_window.retry_after(now, max_per_minute)))
+
+        max_per_hour = self.config.max_per_hour
+        if max_per_hour is not None and self._hour_window.count(now) >= max_per_hour:
+            violations.append(("per_hour", self._hour_window.retry_after(now, max_per_hour)))
+
+        return violations
+
+    def _consume(self, tokens: int, now: float) -> None:
+        self._tokens -= tokens
+        self._minute_window.add(now)
+        self._hour_window.add(now)
+        self._last_call_time = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Acquire tokens if available right now, without raising."""
+        try:
+            self._acquire_now(tokens)
+            return True
+        except RateLimitError:
+            return False
+
+    def _acquire_now(self, tokens: int) -> None:
+        now = time.monotonic()
+        self._total_requests += 1
+
+        if self._waiters:
+            # Queued callers go first
+            self._total_limited += 1
+            retry_after = (
+                self._wakeup.when() - asyncio.get_running_loop().time()
+                if self._wakeup
+                else 0.0
+            )
+            raise RateLimitError(self.name, max(retry_after, 0.0), "queued")
+
+        violations = self._violations(tokens, now)
+        if violations:
+            self._total_limited += 1
+            limit_type, retry_after = violations[0]
+            raise RateLimitError(self.name, retry_after, limit_type)
+
+        self._consume(tokens, now)
 
     async def acquire(self, tokens: int = 1) -> bool:
         """Acquire tokens from the rate limiter.
@@ -92,58 +231,14 @@ class RateLimiter:
         Raises:
             RateLimitError: If rate limit exceeded
         """
-        async with self._lock:
-            now = time.time()
-            self._total_requests += 1
-
-            # Check minimum interval
-            if self.config.min_interval_seconds > 0:
-                elapsed = now - self._last_call_time
-                if elapsed < self.config.min_interval_seconds:
-                    self._total_limited += 1
-                    retry_after = self.config.min_interval_seconds - elapsed
-                    raise RateLimitError(self.name, retry_after, "min_interval")
-
-            # Refill tokens
-            self._refill_tokens(now)
-
-            # Check token bucket
-            if self._tokens < tokens:
-                self._total_limited += 1
-                retry_after = (tokens - self._tokens) / self.config.requests_per_second
-                raise RateLimitError(self.name, retry_after, "token_bucket")
-
-            # Check sliding window limits
-            self._cleanup_history(now)
-
-            if self.config.max_per_minute is not None:
-                minute_ago = now - 60
-                calls_last_minute = sum(1 for t in self._call_history if t > minute_ago)
-                if calls_last_minute >= self.config.max_per_minute:
-                    self._total_limited += 1
-                    oldest_in_window = min(t for t in self._call_history if t > minute_ago)
-                    retry_after = 60 - (now - oldest_in_window)
-                    raise RateLimitError(self.name, retry_after, "per_minute")
-
-            if self.config.max_per_hour is not None:
-                hour_ago = now - 3600
-                calls_last_hour = sum(1 for t in self._call_history if t > hour_ago)
-                if calls_last_hour >= self.config.max_per_hour:
-                    self._total_limited += 1
-                    oldest_in_window = min(t for t in self._call_history if t > hour_ago)
-                    retry_after = 3600 - (now - oldest_in_window)
-                    raise RateLimitError(self.name, retry_after, "per_hour")
-
-            # Consume tokens and record call
-            self._tokens -= tokens
-            self._call_history.append(now)
-            self._last_call_time = now
-
-            return True
+        self._acquire_now(tokens)
+        return True
 
     async def wait_and_acquire(self, tokens: int = 1, max_wait: float = 30.0) -> bool:
         """Wait for tokens to become available, then acquire.
 
+        Waiters are served in FIFO order.
+
         Args:
             tokens: Number of tokens to acquire
             max_wait: Maximum time to wait in seconds
@@ -151,56 +246,159 @@ class RateLimiter:
         Returns:
             True if acquired, False if max_wait exceeded
         """
-        start = time.time()
-        while time.time() - start < max_wait:
-            try:
-                return await self.acquire(tokens)
-            except RateLimitError as e:
-                wait_time = min(e.retry_after, max_wait - (time.time() - start))
-                if wait_time <= 0:
-                    return False
-                await asyncio.sleep(wait_time)
-        return False
+        now = time.monotonic()
+        self._total_requests += 1
 
-    def _refill_tokens(self, now: float) -> None:
-        """Refill tokens based on elapsed time (called under lock)."""
-        elapsed = now - self._last_refill
-        new_tokens = elapsed * self.config.requests_per_second
-        self._tokens = min(self.config.burst_size, self._tokens + new_tokens)
-        self._last_refill = now
+        if not self._waiters and not self._violations(tokens, now):
+            self._consume(tokens, now)
+            return True
 
-    def _cleanup_history(self, now: float) -> None:
-        """Remove old entries from call history (called under lock)."""
-        # Keep only last hour of history
-        hour_ago = now - 3600
-        self._call_history = [t for t in self._call_history if t > hour_ago]
+        self._total_limited += 1
+        if max_wait <= 0 or tokens > self.config.burst_size:
+            return False
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        waiter = (tokens, future)
+        self._waiters.append(waiter)
+        self._serve_waiters()
+
+        try:
+            await asyncio.wait_for(future, timeout=max_wait)
+            return True
+        except asyncio.TimeoutError:
+            # Granted in the same tick the timeout fired
+            return future.done() and not future.cancelled()
+        finally:
+            if future.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+                # The head may have changed; re-arm the timer for the new head
+                self._serve_waiters()
+
+    def _serve_waiters(self) -> None:
+        """Grant tokens to queued waiters in order and arm the next wakeup."""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+
+        while self._waiters:
+            tokens, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+
+            now = time.monotonic()
+            violations = self._violations(tokens, now)
+            if not violations:
+                self._consume(tokens, now)
+                self._waiters.popleft()
+                future.set_result(True)
+                continue
+
+            # Small floor avoids spinning on float rounding at bucket edges
+            delay = max(max(retry_after for _, retry_after in violations), 0.001)
+            self._wakeup = asyncio.get_running_loop().call_later(delay, self._serve_waiters)
+            break
 
     def get_status(self) -> dict[str, Any]:
         """Get current rate limiter status."""
-        now = time.time()
-        minute_ago = now - 60
-        hour_ago = now - 3600
+        now = time.monotonic()
+        self._refill_tokens(now)
 
         return {
             "name": self.name,
             "tokens_available": round(self._tokens, 2),
             "burst_size": self.config.burst_size,
             "requests_per_second": self.config.requests_per_second,
-            "calls_last_minute": sum(1 for t in self._call_history if t > minute_ago),
+            "calls_last_minute": self._minute_window.count(now),
             "max_per_minute": self.config.max_per_minute,
-            "calls_last_hour": sum(1 for t in self._call_history if t > hour_ago),
+            "calls_last_hour": self._hour_window.count(now),
             "max_per_hour": self.config.max_per_hour,
+            "waiters": len(self._waiters),
             "total_requests": self._total_requests,
             "total_limited": self._total_limited,
             "limit_rate": round(self._total_limited / max(1, self._total_requests), 3),
         }
 
 
+class KeyedRateLimiter:
+    """Independent rate limiters per key (e.g. per session or per agent).
+
+    Limiters are created lazily from a shared config and evicted LRU once
+    max_keys is exceeded (limiters with queued waiters are kept).
+
+    Usage:
+        limiter = rate_limiter_registry.get_or_create_keyed("chat_per_session", config)
+        await limiter.acquire(session_id)
+    """
+
+    def __init__(self, name: str, config: RateLimitConfig, max_keys: int = 10_000) -> None:
+        self.name = name
+        self.config = config
+        self._max_keys = max_keys
+        self._limiters: OrderedDict[str, RateLimiter] = OrderedDict()
+        self._evicted_requests = 0
+        self._evicted_limited = 0
+
+    def get(self, key: str) -> RateLimiter:
+        """Get (or create) the limiter for a key."""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(name=f"{self.name}:{key}", config=self.config)
+            self._limiters[key] = limiter
+            self._evict()
+        else:
+            self._limiters.move_to_end(key)
+        return limiter
+
+    def _evict(self) -> None:
+        for key in list(self._limiters):
+            if len(self._limiters) <= self._max_keys:
+                break
+            limiter = self._limiters[key]
+            if limiter._waiters:
+                continue
+            self._evicted_requests += limiter._total_requests
+            self._evicted_limited += limiter._total_limited
+            del self._limiters[key]
+
+    async def acquire(self, key: str, tokens: int = 1) -> bool:
+        """Acquire tokens for a key, raising RateLimitError if limited."""
+        return await self.get(key).acquire(tokens)
+
+    async def wait_and_acquire(self, key: str, tokens: int = 1, max_wait: float = 30.0) -> bool:
+        """Wait for tokens for a key."""
+        return await self.get(key).wait_and_acquire(tokens, max_wait)
+
+    def get_status(self) -> dict[str, Any]:
+        """Get aggregate status across keys."""
+        total_requests = self._evicted_requests + sum(
+            limiter._total_requests for limiter in self._limiters.values()
+        )
+        total_limited = self._evicted_limited + sum(
+            limiter._total_limited for limiter in self._limiters.values()
+        )
+        return {
+            "name": self.name,
+            "keyed": True,
+            "keys": len(self._limiters),
+            "burst_size": self.config.burst_size,
+            "requests_per_second": self.config.requests_per_second,
+            "max_per_minute": self.config.max_per_minute,
+            "max_per_hour": self.config.max_per_hour,
+            "total_requests": total_requests,
+            "total_limited": total_limited,
+            "limit_rate": round(total_limited / max(1, total_requests), 3),
+        }
+
+
 class RateLimiterRegistry:
     """Registry for managing rate limiters."""
 
     def __init__(self) -> None:
-        self._limiters: dict[str, RateLimiter] = {}
+        self._limiters: dict[str, RateLimiter | KeyedRateLimiter] = {}
 
     def get_or_create(
         self,
@@ -215,13 +413,28 @@ class RateLimiterRegistry:
             )
         return self._limiters[name]
 
-    def get(self, name: str) -> RateLimiter | None:
+    def get_or_create_keyed(
+        self,
+        name: str,
+        config: RateLimitConfig | None = None,
+        max_keys: int = 10_000,
+    ) -> KeyedRateLimiter:
+        """Get or create a per-key rate limiter."""
+        if name not in self._limiters:
+            self._limiters[name] = KeyedRateLimiter(
+                name=name,
+                config=config or RateLimitConfig(),
+                max_keys=max_keys,
+            )
+        return self._limiters[name]
+
+    def get(self, name: str) -> RateLimiter | KeyedRateLimiter | None:
         """Get a rate limiter by name."""
         return self._limiters.get(name)
 
     def list_all(self) -> list[dict[str, Any]]:
         """List all rate limiters with their status."""
-        return [l.get_status() for l in self._limiters.values()]
+        return [limiter.get_status() for limiter in self._limiters.values()]
 
 
 # Global registry
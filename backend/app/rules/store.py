@@ -5,13 +5,15 @@ Stores rules in ~/.maratos/rules/ as YAML files.
 
 import logging
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from app.utils.config_cache import config_cache
+
 logger = logging.getLogger(__name__)
 
 # Rules directory
@@ -76,6 +78,22 @@ def _sanitize_id(name: str) -> str:
     return safe[:50]  # Limit length
 
 
+def _load_rule_file(file_path: Path) -> Rule | None:
+    """Parse a rule file (cached by config_cache)."""
+    with open(file_path) as f:
+        data = yaml.safe_load(f)
+    return Rule.from_dict(data) if data else None
+
+
+def _cached_rule(file_path: Path) -> Rule | None:
+    """Get a parsed rule, re-reading the file only when it changed.
+
+    Returns a copy so callers may modify it without touching the cache.
+    """
+    rule = config_cache.get(file_path, _load_rule_file, namespace="rules")
+    return replace(rule, tags=list(rule.tags)) if rule else None
+
+
 def list_rules() -> list[Rule]:
     """List all rules."""
     _ensure_rules_dir()
@@ -83,10 +101,9 @@ def list_rules() -> list[Rule]:
 
     for file_path in RULES_DIR.glob("*.yaml"):
         try:
-            with open(file_path) as f:
-                data = yaml.safe_load(f)
-                if data:
-                    rules.append(Rule.from_dict(data))
+            rule = _cached_rule(file_path)
+            if rule:
+                rules.append(rule)
         except Exception as e:
             logger.warning(f"Failed to load rule {file_path}: {e}")
 
@@ -102,9 +119,7 @@ def get_rule(rule_id: str) -> Rule | None:
         return None
 
     try:
-        with open(file_path) as f:
-            data = yaml.safe_load(f)
-            return Rule.from_dict(data) if data else None
+        return _cached_rule(file_path)
     except Exception as e:
         logger.error(f"Failed to load rule {rule_id}: {e}")
         return None
@@ -145,6 +160,7 @@ def create_rule(
     # Save to file
     with open(_rule_path(rule_id), 'w') as f:
         yaml.safe_dump(rule.to_dict(), f, default_flow_style=False, allow_unicode=True)
+    config_cache.invalidate(_rule_path(rule_id))
 
     logger.info(f"Created rule: {rule_id}")
     return rule
@@ -176,6 +192,7 @@ def update_rule(
     # Save to file
     with open(_rule_path(rule_id), 'w') as f:
         yaml.safe_dump(rule.to_dict(), f, default_flow_style=False, allow_unicode=True)
+    config_cache.invalidate(_rule_path(rule_id))
 
     logger.info(f"Updated rule: {rule_id}")
     return rule
@@ -189,6 +206,7 @@ def delete_rule(rule_id: str) -> bool:
 
     try:
         file_path.unlink()
+        config_cache.invalidate(file_path)
         logger.info(f"Deleted rule: {rule_id}")
         return True
     except Exception as e:
@@ -208,6 +226,17 @@ def get_rules_for_context(rule_ids: list[str]) -> str:
     if not rule_ids:
         return ""
 
+    # The rendered block is cached until any of the rule files changes
+    return config_cache.get_derived(
+        ("rules_context", tuple(rule_ids)),
+        [_rule_path(rule_id) for rule_id in rule_ids],
+        lambda: _render_rules_context(rule_ids),
+        namespace="rules",
+    )
+
+
+def _render_rules_context(rule_ids: list[str]) -> str:
+    """Render rules for prompt injection."""
     rules = []
     for rule_id in rule_ids:
         rule = get_rule(rule_id)
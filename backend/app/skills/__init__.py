@@ -8,7 +8,7 @@ The skills system provides:
 """
 
 from app.skills.base import Skill, SkillStep, SkillRegistry, skill_registry
-from app.skills.loader import load_skills_from_dir
+from app.skills.loader import load_skills_from_dir, refresh_skills_from_dir
 from app.skills.schema import (
     SkillSchema,
     SkillStepSchema,
@@ -40,6 +40,7 @@ __all__ = [
     "SkillRegistry",
     "skill_registry",
     "load_skills_from_dir",
+    "refresh_skills_from_dir",
     # Schema
     "SkillSchema",
     "SkillStepSchema",
@@ -1,66 +1,142 @@
 """Base skill interface for MaratOS."""
 
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
+
 import yaml
 
 
 @dataclass
 class SkillStep:
     """A step in a skill workflow."""
-    
+
     name: str
     action: str  # kiro_architect, kiro_validate, kiro_test, shell, filesystem
     description: str = ""
     params: dict[str, Any] = field(default_factory=dict)
     condition: str | None = None  # Optional condition to run this step
 
+    # Scheduling: None means "after the previous step", [] means no dependencies
+    depends_on: list[str] | None = None
+    outputs: list[str] = field(default_factory=list)  # Context keys this step publishes
+    required: bool = True  # A failed required step cancels the rest of the workflow
+    timeout_seconds: float | None = None
+
+
+_TEMPLATE_VAR_PATTERN = re.compile(r"\{\{\s*([\w.-]+)\s*\}\}")
+
+
+def resolve_step_dependencies(steps: list[SkillStep]) -> list[set[int]]:
+    """Resolve each step's dependencies to indices into steps.
+
+    A step depends on the steps named in depends_on (or on the previous step
+    when depends_on is None), plus any step whose declared outputs appear as
+    {{templates}} in its params.
+
+    Raises ValueError for duplicate step names, unknown dependencies or cycles.
+    """
+    index_by_name: dict[str, int] = {}
+    for i, step in enumerate(steps):
+        if step.name in index_by_name:
+            raise ValueError(f"Duplicate workflow step name: '{step.name}'")
+        index_by_name[step.name] = i
+
+    producers: dict[str, int] = {}
+    for i, step in enumerate(steps):
+        for output in step.outputs:
+            producers[output] = i
+
+    deps: list[set[int]] = []
+    for i, step in enumerate(steps):
+        step_deps: set[int] = set()
+        if step.depends_on is None:
+            if i > 0:
+                step_deps.add(i - 1)
+        else:
+            for name in step.depends_on:
+                if name not in index_by_name:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{name}'")
+                step_deps.add(index_by_name[name])
+
+        for value in step.params.values():
+            if isinstance(value, str):
+                for var in _TEMPLATE_VAR_PATTERN.findall(value):
+                    producer = producers.get(var)
+                    if producer is not None and producer != i:
+                        step_deps.add(producer)
+        deps.append(step_deps)
+
+    # Kahn's algorithm to reject cycles up front
+    remaining = [len(d) for d in deps]
+    dependents: list[list[int]] = [[] for _ in steps]
+    for i, step_deps in enumerate(deps):
+        for d in step_deps:
+            dependents[d].append(i)
+    ready = [i for i, n in enumerate(remaining) if n == 0]
+    visited = 0
+    while ready:
+        i = ready.pop()
+        visited += 1
+        for j in dependents[i]:
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                ready.append(j)
+    if visited != len(steps):
+        cyclic = [steps[i].name for i, n in enumerate(remaining) if n > 0]
+        raise ValueError(f"Workflow steps have a dependency cycle: {', '.join(cyclic)}")
+
+    return deps
+
 
 @dataclass
 class Skill:
     """A skill definition that can be executed by agents via Kiro."""
-    
+
     id: str
     name: str
     description: str
     version: str = "1.0.0"
-    
+
     # When to use this skill
     triggers: list[str] = field(default_factory=list)  # Keywords that trigger this skill
-    
+
     # Kiro-compatible workflow
     workflow: list[SkillStep] = field(default_factory=list)
-    
+
     # Context/prompts for Kiro
     system_context: str = ""  # Added to Kiro prompts
     quality_checklist: list[str] = field(default_factory=list)  # Validation points
     test_requirements: list[str] = field(default_factory=list)  # Test generation guidance
-    
+
+    # Max workflow steps run concurrently
+    max_parallel_steps: int = 4
+
     # Metadata
     author: str = ""
     tags: list[str] = field(default_factory=list)
     path: Path | None = None
-    
+
     def to_kiro_context(self) -> str:
         """Generate context to add to Kiro prompts."""
         parts = []
-        
+
         if self.system_context:
             parts.append(f"## Skill: {self.name}\n{self.system_context}")
-        
+
         if self.quality_checklist:
             parts.append("## Quality Checklist")
             for item in self.quality_checklist:
                 parts.append(f"- {item}")
-        
+
         if self.test_requirements:
             parts.append("## Test Requirements")
             for item in self.test_requirements:
                 parts.append(f"- {item}")
-        
+
         return "\n\n".join(parts)
-    
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -72,13 +148,13 @@ class Skill:
             "tags": self.tags,
             "workflow_steps": len(self.workflow),
         }
-    
+
     @classmethod
     def from_yaml(cls, path: Path) -> "Skill":
         """Load skill from YAML file."""
         with open(path) as f:
             data = yaml.safe_load(f)
-        
+
         workflow = []
         for step_data in data.get("workflow", []):
             workflow.append(SkillStep(
@@ -87,8 +163,12 @@ class Skill:
                 description=step_data.get("description", ""),
                 params=step_data.get("params", {}),
                 condition=step_data.get("condition"),
+                depends_on=step_data.get("depends_on"),
+                outputs=step_data.get("outputs", []),
+                required=step_data.get("required", True),
+                timeout_seconds=step_data.get("timeout_seconds"),
             ))
-        
+
         return cls(
             id=data.get("id", path.stem),
             name=data.get("name", path.stem),
@@ -99,6 +179,7 @@ class Skill:
             system_context=data.get("system_context", ""),
             quality_checklist=data.get("quality_checklist", []),
             test_requirements=data.get("test_requirements", []),
+            max_parallel_steps=data.get("max_parallel_steps", 4),
             author=data.get("author", ""),
             tags=data.get("tags", []),
             path=path,
@@ -107,20 +188,41 @@ class Skill:
 
 class SkillRegistry:
     """Registry for managing skills."""
-    
+
     def __init__(self) -> None:
         self._skills: dict[str, Skill] = {}
-    
+        self._watched_dirs: list[Path] = []
+
     def register(self, skill: Skill) -> None:
         """Register a skill."""
         self._skills[skill.id] = skill
-    
+
+    def unregister(self, skill_id: str) -> bool:
+        """Unregister a skill. Returns True if it was registered."""
+        return self._skills.pop(skill_id, None) is not None
+
+    def watch_dir(self, skills_dir: Path) -> None:
+        """Reload skills from a directory when its files change."""
+        if skills_dir not in self._watched_dirs:
+            self._watched_dirs.append(skills_dir)
+
+    def _refresh(self) -> None:
+        """Pick up added, changed or removed skill files in watched directories."""
+        if not self._watched_dirs:
+            return
+        from app.skills.loader import refresh_skills_from_dir
+
+        for skills_dir in list(self._watched_dirs):
+            refresh_skills_from_dir(skills_dir)
+
     def get(self, skill_id: str) -> Skill | None:
         """Get a skill by ID."""
+        self._refresh()
         return self._skills.get(skill_id)
-    
+
     def find_by_trigger(self, text: str) -> list[Skill]:
         """Find skills that match trigger keywords in text."""
+        self._refresh()
         text_lower = text.lower()
         matches = []
         for skill in self._skills.values():
@@ -129,13 +231,15 @@ class SkillRegistry:
                     matches.append(skill)
                     break
         return matches
-    
+
     def list_all(self) -> list[dict[str, Any]]:
         """List all skills."""
+        self._refresh()
         return [s.to_dict() for s in self._skills.values()]
-    
+
     def search(self, query: str) -> list[Skill]:
         """Search skills by name, description, or tags."""
+        self._refresh()
         query_lower = query.lower()
         matches = []
         for skill in self._skills.values():
@@ -1,12 +1,13 @@
 """Skill executor - runs skill workflows via Kiro with guardrails enforcement."""
 
+import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
-from app.skills.base import Skill, SkillStep
+from app.skills.base import Skill, SkillStep, resolve_step_dependencies
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,8 @@ class SkillExecutionResult:
     error: str | None = None
     validation_passed: bool = True
     validation_errors: list[str] = field(default_factory=list)
+    skipped_steps: list[str] = field(default_factory=list)
+    cancelled_steps: list[str] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -51,6 +54,8 @@ class SkillExecutionResult:
             "error": self.error,
             "validation_passed": self.validation_passed,
             "validation_errors": self.validation_errors,
+            "skipped_steps": self.skipped_steps,
+            "cancelled_steps": self.cancelled_steps,
         }
 
 
@@ -60,6 +65,8 @@ class SkillExecutor:
     Features:
     - Guardrails enforcement for all tool executions
     - Audit logging for all step executions
+    - Dependency-ordered workflow steps, independent steps run concurrently
+    - Per-step timeouts and cancellation when a required step fails
     - Validation enforcement (quality checklist)
     - Step-level metrics
     - Graceful error handling
@@ -71,11 +78,13 @@ class SkillExecutor:
         session_id: str | None = None,
         task_id: str | None = None,
         skill_id: str | None = None,
+        max_parallel_steps: int | None = None,
     ) -> None:
         self.workdir = workdir
         self.session_id = session_id
         self.task_id = task_id
         self.skill_id = skill_id
+        self.max_parallel_steps = max_parallel_steps
         self.results: list[dict[str, Any]] = []
         self._execution_history: list[SkillExecutionResult] = []
 
@@ -127,35 +136,13 @@ class SkillExecutor:
         validation_passed = True
         validation_errors: list[str] = []
 
-        try:
-            for step in skill.workflow:
-                # Check condition
-                if step.condition and not self._evaluate_condition(step.condition, context):
-                    logger.info(f"Skipping step '{step.name}' - condition not met")
-                    continue
-
-                logger.info(f"Running step: {step.name}")
-                step_start = time.time()
-
-                result = await self._execute_step(step, kiro_context, context)
-                step_duration = (time.time() - step_start) * 1000
+        skipped_steps: list[str] = []
+        cancelled_steps: list[str] = []
 
-                self.results.append({
-                    "step": step.name,
-                    "action": step.action,
-                    "success": result.get("success", False),
-                    "output": result.get("output", ""),
-                    "duration_ms": round(step_duration, 2),
-                })
-
-                # Update context with result
-                context[f"step_{step.name}_result"] = result
-
-                # Stop on failure unless configured otherwise
-                if not result.get("success", False):
-                    error_msg = f"Step '{step.name}' failed: {result.get('error', 'Unknown error')}"
-                    logger.warning(f"Step '{step.name}' failed, stopping workflow")
-                    break
+        try:
+            error_msg = await self._run_workflow(
+                skill, kiro_context, context, skipped_steps, cancelled_steps
+            )
 
             # Run validation if all steps passed and enforcement is enabled
             if enforce_validation and skill.quality_checklist and error_msg is None:
@@ -172,7 +159,9 @@ class SkillExecutor:
         # Calculate final result
         duration_ms = (time.time() - start_time) * 1000
         completed_at = datetime.now()
-        success = error_msg is None and all(r["success"] for r in self.results)
+        success = error_msg is None and all(
+            r["success"] for r in self.results if r.get("required", True)
+        )
 
         # Create execution result
         execution_result = SkillExecutionResult(
@@ -188,6 +177,8 @@ class SkillExecutor:
             error=error_msg,
             validation_passed=validation_passed,
             validation_errors=validation_errors,
+            skipped_steps=skipped_steps,
+            cancelled_steps=cancelled_steps,
         )
         self._execution_history.append(execution_result)
 
@@ -199,6 +190,133 @@ class SkillExecutor:
 
         return execution_result.to_dict()
 
+    async def _run_workflow(
+        self,
+        skill: Skill,
+        kiro_context: str,
+        context: dict[str, Any],
+        skipped_steps: list[str],
+        cancelled_steps: list[str],
+    ) -> str | None:
+        """Run workflow steps as a dependency graph.
+
+        A step starts once all of its dependencies have finished, with at most
+        max_parallel_steps running at once. Steps whose condition is not met
+        are skipped and count as finished. A failed optional step is recorded
+        but does not hold up its dependents; a failed required step cancels
+        running steps and stops the workflow.
+
+        Returns an error message, or None if no required step failed.
+        """
+        steps = skill.workflow
+        deps = resolve_step_dependencies(steps)
+        limit = max(1, self.max_parallel_steps or skill.max_parallel_steps)
+
+        pending = set(range(len(steps)))
+        finished: set[int] = set()
+        running: dict[asyncio.Task, int] = {}
+        results: list[tuple[int, dict[str, Any]]] = []
+        error_msg = None
+
+        try:
+            while True:
+                # Launch every ready step, repeating while skips unlock more steps
+                progress = True
+                while progress and error_msg is None:
+                    progress = False
+                    for i in sorted(pending):
+                        if len(running) >= limit:
+                            break
+                        if not deps[i] <= finished:
+                            continue
+
+                        step = steps[i]
+                        pending.discard(i)
+                        progress = True
+                        if step.condition and not self._evaluate_condition(step.condition, context):
+                            logger.info(f"Skipping step '{step.name}' - condition not met")
+                            skipped_steps.append(step.name)
+                            finished.add(i)
+                            continue
+                        task = asyncio.create_task(self._run_step(step, kiro_context, context))
+                        running[task] = i
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: running[t]):
+                    i = running.pop(task)
+                    step = steps[i]
+                    result, step_duration = task.result()
+                    success = result.get("success", False)
+
+                    results.append((i, {
+                        "step": step.name,
+                        "action": step.action,
+                        "success": success,
+                        "output": result.get("output", ""),
+                        "duration_ms": round(step_duration, 2),
+                        "required": step.required,
+                    }))
+
+                    # Update context with result
+                    context[f"step_{step.name}_result"] = result
+
+                    finished.add(i)
+
+                    if success:
+                        for output in step.outputs:
+                            context[output] = result.get(output, result.get("output", ""))
+                    elif not step.required:
+                        logger.warning(f"Optional step '{step.name}' failed, continuing")
+                    elif error_msg is None:
+                        error = result.get("error", "Unknown error")
+                        error_msg = f"Step '{step.name}' failed: {error}"
+                        logger.warning(f"Step '{step.name}' failed, stopping workflow")
+
+                if error_msg is not None and running:
+                    for task in running:
+                        task.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+                    cancelled_steps.extend(steps[i].name for i in sorted(running.values()))
+                    running.clear()
+        finally:
+            # Don't leak step tasks if this run itself is cancelled
+            for task in running:
+                task.cancel()
+
+        # Report results in workflow order regardless of completion order
+        self.results.extend(r for _, r in sorted(results, key=lambda item: item[0]))
+        return error_msg
+
+    async def _run_step(
+        self,
+        step: SkillStep,
+        kiro_context: str,
+        context: dict[str, Any],
+    ) -> tuple[dict[str, Any], float]:
+        """Run one step with its timeout. Returns (result, duration_ms)."""
+        logger.info(f"Running step: {step.name}")
+        step_start = time.time()
+        try:
+            if step.timeout_seconds:
+                result = await asyncio.wait_for(
+                    self._execute_step(step, kiro_context, context), step.timeout_seconds
+                )
+            else:
+                result = await self._execute_step(step, kiro_context, context)
+        except asyncio.TimeoutError:
+            result = {
+                "success": False,
+                "output": "",
+                "error": f"Timed out after {step.timeout_seconds}s",
+            }
+        except Exception as e:
+            logger.error(f"Step '{step.name}' raised: {e}", exc_info=True)
+            result = {"success": False, "output": "", "error": str(e)}
+        return result, (time.time() - step_start) * 1000
+
     async def _validate_quality(
         self,
         skill: Skill,
@@ -214,66 +332,81 @@ class SkillExecutor:
 
         Returns (passed, list of errors).
         """
-        errors = []
-
         # Gather all step results from context
         step_results = {
             k: v for k, v in context.items()
             if k.startswith("step_") and k.endswith("_result")
         }
 
+        # Each distinct check runs once, concurrently, off the event loop -
+        # they scan potentially large step outputs
+        checks: dict[tuple, Any] = {}
+        item_checks: list[tuple | None] = []
         for item in skill.quality_checklist:
-            item_lower = item.lower()
             logger.debug(f"Quality check: {item}")
+            check = self._quality_check_for(item, step_results, context)
+            item_checks.append(check[0] if check else None)
+            if check:
+                checks.setdefault(check[0], check[1])
+
+        keys = list(checks)
+        outcomes = await asyncio.gather(*(asyncio.to_thread(checks[k]) for k in keys))
+        passed_by_key = dict(zip(keys, outcomes))
+
+        errors = [
+            f"Quality check failed: {item}"
+            for item, key in zip(skill.quality_checklist, item_checks)
+            if key is not None and not passed_by_key[key]
+        ]
+        return len(errors) == 0, errors
 
-            # Check for test-related quality items
-            if any(kw in item_lower for kw in ["test", "pytest", "jest", "spec"]):
-                if not self._check_tests_passed(step_results):
-                    errors.append(f"Quality check failed: {item}")
-                continue
-
-            # Check for lint-related quality items
-            if any(kw in item_lower for kw in ["lint", "ruff", "eslint", "flake"]):
-                if not self._check_lint_passed(step_results):
-                    errors.append(f"Quality check failed: {item}")
-                continue
+    def _quality_check_for(
+        self,
+        item: str,
+        step_results: dict[str, Any],
+        context: dict[str, Any],
+    ) -> tuple[tuple, Any] | None:
+        """Map a checklist item to (dedupe key, check callable), or None if not checkable."""
+        item_lower = item.lower()
 
-            # Check for type-check related quality items
-            if any(kw in item_lower for kw in ["type", "mypy", "pyright", "typescript"]):
-                if not self._check_type_check_passed(step_results):
-                    errors.append(f"Quality check failed: {item}")
-                continue
+        # Check for test-related quality items
+        if any(kw in item_lower for kw in ["test", "pytest", "jest", "spec"]):
+            return ("tests",), lambda: self._check_tests_passed(step_results)
 
-            # Check for build-related quality items
-            if any(kw in item_lower for kw in ["build", "compile", "bundle"]):
-                if not self._check_build_passed(step_results):
-                    errors.append(f"Quality check failed: {item}")
-                continue
+        # Check for lint-related quality items
+        if any(kw in item_lower for kw in ["lint", "ruff", "eslint", "flake"]):
+            return ("lint",), lambda: self._check_lint_passed(step_results)
 
-            # Check for coverage-related quality items
-            if "coverage" in item_lower:
-                threshold = self._extract_threshold(item)
-                if not self._check_coverage_threshold(step_results, threshold):
-                    errors.append(f"Quality check failed: {item}")
-                continue
+        # Check for type-check related quality items
+        if any(kw in item_lower for kw in ["type", "mypy", "pyright", "typescript"]):
+            return ("types",), lambda: self._check_type_check_passed(step_results)
 
-            # Check for file existence requirements
-            if any(kw in item_lower for kw in ["file exist", "exists", "created"]):
-                # Extract file path from the checklist item if possible
-                file_path = self._extract_file_path(item, context)
-                if file_path and not self._check_file_exists(file_path):
-                    errors.append(f"Quality check failed: {item}")
-                continue
+        # Check for build-related quality items
+        if any(kw in item_lower for kw in ["build", "compile", "bundle"]):
+            return ("build",), lambda: self._check_build_passed(step_results)
 
-            # Generic success check - if the checklist item mentions a step by name,
-            # check if that step succeeded
-            matching_step = self._find_matching_step(item, step_results)
-            if matching_step:
-                result = step_results.get(matching_step, {})
-                if not result.get("success", False):
-                    errors.append(f"Quality check failed: {item}")
+        # Check for coverage-related quality items
+        if "coverage" in item_lower:
+            threshold = self._extract_threshold(item)
+            return ("coverage", threshold), lambda: self._check_coverage_threshold(
+                step_results, threshold
+            )
 
-        return len(errors) == 0, errors
+        # Check for file existence requirements
+        if any(kw in item_lower for kw in ["file exist", "exists", "created"]):
+            # Extract file path from the checklist item if possible
+            file_path = self._extract_file_path(item, context)
+            if not file_path:
+                return None
+            return ("file", file_path), lambda: self._check_file_exists(file_path)
+
+        # Generic success check - if the checklist item mentions a step by name,
+        # check if that step succeeded
+        matching_step = self._find_matching_step(item, step_results)
+        if matching_step:
+            result = step_results.get(matching_step, {})
+            return ("step", matching_step), lambda: bool(result.get("success", False))
+        return None
 
     def _check_tests_passed(self, step_results: dict[str, Any]) -> bool:
         """Check if any test step passed by examining outputs."""
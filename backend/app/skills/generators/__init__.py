@@ -12,6 +12,7 @@ from app.skills.generators.config import (
     DatabaseType,
     CIProvider,
 )
+from app.skills.generators.dep_cache import DependencyCache, dependency_cache
 from app.skills.generators.generator import ProjectGenerator
 from app.skills.generators.manifest import ArtifactManifest, FileArtifact
 from app.skills.generators.verification import (
@@ -30,6 +31,9 @@ __all__ = [
     "CIProvider",
     # Generator
     "ProjectGenerator",
+    # Dependency cache
+    "DependencyCache",
+    "dependency_cache",
     # Manifest
     "ArtifactManifest",
     "FileArtifact",
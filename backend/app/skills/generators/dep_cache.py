@@ -0,0 +1,226 @@
+"""Content-addressed cache for generated projects' dependencies.
+
+Every App Factory run used to do a cold `npm install` and `pip install`.
+Generated projects of the same stack/features share identical dependency
+specs, so the installed result is cached under a key derived from the
+dependency spec (or lockfile, when present) plus the platform:
+
+    ~/.maratos/dep-cache/npm/<key>/node_modules   copied (reflinked where supported)
+    ~/.maratos/dep-cache/pip/<key>/*.whl          wheelhouse for offline installs
+
+A warm cache lets scaffolding install dependencies without network access.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tomllib
+import uuid
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".maratos" / "dep-cache"
+
+# Linux ioctl that clones a file's extents (btrfs, XFS, overlayfs on those)
+FICLONE = 0x40049409
+
+
+def _digest(payload: dict[str, Any]) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()[:32]
+
+
+def _clone_file(src: str, dst: str) -> bool:
+    """Copy-on-write clone (reflink) of a file. Returns False if unsupported."""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def _clone_or_copy(src: str, dst: str) -> None:
+    """Copy a file, sharing blocks copy-on-write where the filesystem allows.
+
+    Never hard-links: an in-place edit (or ``npm`` patch) in one project must
+    not change the cached copy or other projects restored from it.
+    """
+    if not _clone_file(src, dst):
+        shutil.copy2(src, dst)
+
+
+def npm_cache_key(package_json: Path) -> str:
+    """Cache key for a frontend's node_modules.
+
+    Uses package-lock.json when present, otherwise the declared dependency
+    ranges (name/version/scripts do not affect what gets installed).
+    """
+    lockfile = package_json.parent / "package-lock.json"
+    if lockfile.exists():
+        spec: Any = {"lock": hashlib.sha256(lockfile.read_bytes()).hexdigest()}
+    else:
+        data = json.loads(package_json.read_text())
+        spec = {
+            "dependencies": data.get("dependencies", {}),
+            "devDependencies": data.get("devDependencies", {}),
+        }
+    return _digest({
+        "kind": "npm",
+        "spec": spec,
+        "platform": sys.platform,
+        "machine": platform.machine(),
+    })
+
+
+def pip_requirements(pyproject: Path) -> list[str]:
+    """Runtime and build requirements declared in a pyproject.toml."""
+    data = tomllib.loads(pyproject.read_text())
+    deps = list(data.get("project", {}).get("dependencies", []))
+    deps.extend(data.get("build-system", {}).get("requires", []))
+    return sorted(set(deps))
+
+
+def pip_cache_key(pyproject: Path) -> str:
+    """Cache key for a backend's wheelhouse."""
+    return _digest({
+        "kind": "pip",
+        "requirements": pip_requirements(pyproject),
+        "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+        "platform": sys.platform,
+        "machine": platform.machine(),
+    })
+
+
+class DependencyCache:
+    """Local store of installed dependency trees keyed by content hash.
+
+    Entries are written to a temporary directory and renamed into place,
+    so concurrent generators never observe a partial entry.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root or DEFAULT_CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, kind: str, key: str) -> Path:
+        return self.root / kind / key
+
+    def _publish(self, tmp: Path, entry: Path) -> bool:
+        try:
+            tmp.rename(entry)
+            return True
+        except OSError:
+            # Another run published the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            return entry.exists()
+
+    def _tmp_dir(self, kind: str) -> Path:
+        tmp = self.root / kind / f".tmp-{uuid.uuid4().hex}"
+        tmp.mkdir(parents=True)
+        return tmp
+
+    def restore_node_modules(self, key: str, frontend_path: Path) -> bool:
+        """Hydrate frontend_path/node_modules from the cache. Returns True on a hit."""
+        entry = self._entry("npm", key)
+        cached = entry / "node_modules"
+        if not cached.is_dir() or (frontend_path / "node_modules").exists():
+            self.misses += 1
+            return False
+
+        shutil.copytree(
+            cached, frontend_path / "node_modules",
+            symlinks=True, copy_function=_clone_or_copy,
+        )
+        lockfile = entry / "package-lock.json"
+        if lockfile.exists() and not (frontend_path / "package-lock.json").exists():
+            shutil.copy2(lockfile, frontend_path / "package-lock.json")
+        self.hits += 1
+        logger.info(f"Restored node_modules from dependency cache ({key})")
+        return True
+
+    def store_node_modules(self, key: str, frontend_path: Path) -> bool:
+        """Add a freshly installed node_modules to the cache."""
+        entry = self._entry("npm", key)
+        source = frontend_path / "node_modules"
+        if entry.exists() or not source.is_dir():
+            return False
+
+        tmp = self._tmp_dir("npm")
+        try:
+            shutil.copytree(
+                source, tmp / "node_modules",
+                symlinks=True, copy_function=_clone_or_copy,
+            )
+            lockfile = frontend_path / "package-lock.json"
+            if lockfile.exists():
+                shutil.copy2(lockfile, tmp / "package-lock.json")
+        except OSError as e:
+            logger.warning(f"Could not cache node_modules: {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        return self._publish(tmp, entry)
+
+    def get_wheelhouse(self, key: str) -> Path | None:
+        """Get the cached wheelhouse for a key, if any."""
+        entry = self._entry("pip", key)
+        if entry.is_dir() and any(entry.glob("*.whl")):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def new_wheelhouse(self) -> Path:
+        """Create a temporary directory to build a wheelhouse into."""
+        return self._tmp_dir("pip")
+
+    def publish_wheelhouse(self, key: str, tmp: Path) -> Path | None:
+        """Move a built wheelhouse into place. Returns the entry path."""
+        entry = self._entry("pip", key)
+        if not any(tmp.glob("*.whl")):
+            shutil.rmtree(tmp, ignore_errors=True)
+            return None
+        return entry if self._publish(tmp, entry) else None
+
+    def discard(self, tmp: Path) -> None:
+        """Remove an unpublished temporary directory."""
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        def count(kind: str) -> int:
+            path = self.root / kind
+            if not path.exists():
+                return 0
+            return sum(1 for p in path.iterdir() if not p.name.startswith("."))
+
+        return {
+            "root": str(self.root),
+            "npm_entries": count("npm"),
+            "pip_entries": count("pip"),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global dependency cache
+dependency_cache = DependencyCache()
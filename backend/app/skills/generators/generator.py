@@ -3,7 +3,10 @@
 Generates projects from Jinja2 templates with no LLM involvement for boilerplate.
 """
 
+import asyncio
 import logging
+import shlex
+import threading
 import time
 from pathlib import Path
 from typing import Any
@@ -15,6 +18,12 @@ from app.skills.generators.config import (
     BackendStack,
     FrontendStack,
 )
+from app.skills.generators.dep_cache import (
+    dependency_cache,
+    npm_cache_key,
+    pip_cache_key,
+    pip_requirements,
+)
 from app.skills.generators.manifest import (
     ArtifactManifest,
     CommandExecution,
@@ -33,6 +42,31 @@ logger = logging.getLogger(__name__)
 # Template directory
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+_template_env: Environment | None = None
+_template_env_lock = threading.Lock()
+
+
+def get_template_env() -> Environment:
+    """Get the shared Jinja2 environment.
+
+    Templates ship with the package, so each one is compiled once per process
+    and reused by every generator instead of per ProjectGenerator.
+    """
+    global _template_env
+    if _template_env is None:
+        with _template_env_lock:
+            if _template_env is None:
+                _template_env = Environment(
+                    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                    autoescape=select_autoescape(["html", "xml"]),
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    keep_trailing_newline=True,
+                    auto_reload=False,
+                    cache_size=-1,
+                )
+    return _template_env
+
 
 class ProjectGenerator:
     """Deterministic project generator using Jinja2 templates.
@@ -44,20 +78,11 @@ class ProjectGenerator:
     def __init__(self, config: AppFactoryConfig) -> None:
         self.config = config
         self.manifest: ArtifactManifest | None = None
-        self._env: Environment | None = None
 
     @property
     def env(self) -> Environment:
-        """Get or create Jinja2 environment."""
-        if self._env is None:
-            self._env = Environment(
-                loader=FileSystemLoader(str(TEMPLATE_DIR)),
-                autoescape=select_autoescape(["html", "xml"]),
-                trim_blocks=True,
-                lstrip_blocks=True,
-                keep_trailing_newline=True,
-            )
-        return self._env
+        """Get the Jinja2 environment."""
+        return get_template_env()
 
     async def generate(
         self,
@@ -86,15 +111,16 @@ class ProjectGenerator:
             # Create project directory
             self.config.project_path.mkdir(parents=True, exist_ok=True)
 
-            # Generate based on stack
-            if self.config.has_backend:
-                await self._generate_backend()
-
-            if self.config.has_frontend:
-                await self._generate_frontend()
-
-            # Generate shared files
-            await self._generate_shared()
+            # Render backend, frontend and shared files concurrently; the
+            # manifest lists them in a fixed order regardless of timing
+            groups = await asyncio.gather(
+                self._generate_backend(),
+                self._generate_frontend(),
+                self._generate_shared(),
+            )
+            for artifacts in groups:
+                for artifact in artifacts:
+                    self.manifest.add_file(artifact)
 
             # Install dependencies
             if install_deps:
@@ -137,16 +163,19 @@ class ProjectGenerator:
                 )
             raise
 
-    async def _generate_backend(self) -> None:
+    async def _generate_backend(self) -> list[FileArtifact]:
         """Generate backend files."""
+        if not self.config.has_backend:
+            return []
         logger.info("Generating backend...")
 
         if self.config.backend_stack == BackendStack.FASTAPI:
-            await self._generate_fastapi_backend()
+            return await self._generate_fastapi_backend()
         elif self.config.backend_stack == BackendStack.EXPRESS:
-            await self._generate_express_backend()
+            return await self._generate_express_backend()
+        return []
 
-    async def _generate_fastapi_backend(self) -> None:
+    async def _generate_fastapi_backend(self) -> list[FileArtifact]:
         """Generate FastAPI backend structure."""
         backend_path = self.config.backend_path
         backend_path.mkdir(parents=True, exist_ok=True)
@@ -193,8 +222,7 @@ class ProjectGenerator:
             templates.append(("fastapi/Dockerfile.j2", "Dockerfile"))
 
         # Render all templates
-        for template_name, output_path in templates:
-            await self._render_template(template_name, backend_path / output_path, ctx)
+        artifacts = await self._render_templates(templates, backend_path, ctx)
 
         # Create empty __init__.py files for packages
         for pkg_path in ["app/api"]:
@@ -202,23 +230,29 @@ class ProjectGenerator:
             if not init_file.exists():
                 init_file.parent.mkdir(parents=True, exist_ok=True)
                 init_file.write_text("")
-                self._add_file_to_manifest(init_file, None, "generated")
+                artifacts.append(self._artifact(init_file, None, "generated"))
 
-    async def _generate_express_backend(self) -> None:
+        return artifacts
+
+    async def _generate_express_backend(self) -> list[FileArtifact]:
         """Generate Express.js backend structure."""
         # Placeholder for Express backend
         logger.warning("Express backend generation not yet implemented")
+        return []
 
-    async def _generate_frontend(self) -> None:
+    async def _generate_frontend(self) -> list[FileArtifact]:
         """Generate frontend files."""
+        if not self.config.has_frontend:
+            return []
         logger.info("Generating frontend...")
 
         if self.config.frontend_stack == FrontendStack.REACT:
-            await self._generate_react_frontend()
+            return await self._generate_react_frontend()
         elif self.config.frontend_stack == FrontendStack.VUE:
-            await self._generate_vue_frontend()
+            return await self._generate_vue_frontend()
+        return []
 
-    async def _generate_react_frontend(self) -> None:
+    async def _generate_react_frontend(self) -> list[FileArtifact]:
         """Generate React/TypeScript/Vite frontend."""
         frontend_path = self.config.frontend_path
         frontend_path.mkdir(parents=True, exist_ok=True)
@@ -270,15 +304,15 @@ class ProjectGenerator:
         templates.append(("react/eslint.config.js.j2", "eslint.config.js"))
 
         # Render all templates
-        for template_name, output_path in templates:
-            await self._render_template(template_name, frontend_path / output_path, ctx)
+        return await self._render_templates(templates, frontend_path, ctx)
 
-    async def _generate_vue_frontend(self) -> None:
+    async def _generate_vue_frontend(self) -> list[FileArtifact]:
         """Generate Vue.js frontend structure."""
         # Placeholder for Vue frontend
         logger.warning("Vue frontend generation not yet implemented")
+        return []
 
-    async def _generate_shared(self) -> None:
+    async def _generate_shared(self) -> list[FileArtifact]:
         """Generate shared project files."""
         logger.info("Generating shared files...")
 
@@ -309,15 +343,29 @@ class ProjectGenerator:
             templates.append(("shared/.pre-commit-config.yaml.j2", ".pre-commit-config.yaml"))
 
         # Render all templates
-        for template_name, output_path in templates:
-            await self._render_template(template_name, project_path / output_path, ctx)
+        return await self._render_templates(templates, project_path, ctx)
+
+    async def _render_templates(
+        self,
+        templates: list[tuple[str, str]],
+        base_path: Path,
+        context: dict[str, Any],
+    ) -> list[FileArtifact]:
+        """Render (template, relative output path) pairs concurrently.
+
+        Returns artifacts in the same order as templates.
+        """
+        return list(await asyncio.gather(*(
+            asyncio.to_thread(self._render_template, template_name, base_path / output_path, context)
+            for template_name, output_path in templates
+        )))
 
-    async def _render_template(
+    def _render_template(
         self,
         template_name: str,
         output_path: Path,
         context: dict[str, Any],
-    ) -> None:
+    ) -> FileArtifact:
         """Render a single template to a file."""
         try:
             template = self.env.get_template(template_name)
@@ -329,15 +377,28 @@ class ProjectGenerator:
             # Write file
             output_path.write_text(content)
 
-            # Track in manifest
-            self._add_file_to_manifest(output_path, template_name, "generated")
-
             logger.debug(f"Generated: {output_path}")
 
+            return self._artifact(output_path, template_name, "generated")
+
         except Exception as e:
             logger.error(f"Failed to render template {template_name}: {e}")
             raise
 
+    def _artifact(
+        self,
+        file_path: Path,
+        template_source: str | None,
+        category: str,
+    ) -> FileArtifact:
+        """Create a manifest artifact for a file."""
+        return FileArtifact.from_file(
+            file_path,
+            self.config.project_path,
+            template_source,
+            category,
+        )
+
     def _add_file_to_manifest(
         self,
         file_path: Path,
@@ -346,57 +407,111 @@ class ProjectGenerator:
     ) -> None:
         """Add a file to the manifest."""
         if self.manifest:
-            artifact = FileArtifact.from_file(
-                file_path,
-                self.config.project_path,
-                template_source,
-                category,
-            )
-            self.manifest.add_file(artifact)
+            self.manifest.add_file(self._artifact(file_path, template_source, category))
 
     async def _install_dependencies(self) -> None:
-        """Install project dependencies."""
+        """Install backend and frontend dependencies concurrently."""
         logger.info("Installing dependencies...")
 
-        # Backend dependencies
-        if self.config.has_backend:
-            backend_path = self.config.backend_path
-            if (backend_path / "pyproject.toml").exists():
-                exit_code, stdout, stderr = await run_command(
-                    "pip install -e . --quiet",
-                    backend_path,
-                    timeout_seconds=300,
-                )
-                if self.manifest:
-                    self.manifest.add_command(
-                        CommandExecution(
-                            command="pip install -e .",
-                            working_dir=str(backend_path),
-                            exit_code=exit_code,
-                            stdout=stdout,
-                            stderr=stderr,
-                        )
-                    )
+        groups = await asyncio.gather(
+            self._install_backend_dependencies(),
+            self._install_frontend_dependencies(),
+        )
+        if self.manifest:
+            for commands in groups:
+                for command in commands:
+                    self.manifest.add_command(command)
 
-        # Frontend dependencies
-        if self.config.has_frontend:
-            frontend_path = self.config.frontend_path
-            if (frontend_path / "package.json").exists():
-                exit_code, stdout, stderr = await run_command(
-                    "npm install --legacy-peer-deps",
-                    frontend_path,
-                    timeout_seconds=300,
-                )
-                if self.manifest:
-                    self.manifest.add_command(
-                        CommandExecution(
-                            command="npm install",
-                            working_dir=str(frontend_path),
-                            exit_code=exit_code,
-                            stdout=stdout,
-                            stderr=stderr,
-                        )
-                    )
+    async def _run_install_command(
+        self,
+        command: str,
+        working_dir: Path,
+        display: str | None = None,
+    ) -> CommandExecution:
+        start = time.time()
+        exit_code, stdout, stderr = await run_command(command, working_dir, timeout_seconds=300)
+        return CommandExecution(
+            command=display or command,
+            working_dir=str(working_dir),
+            exit_code=exit_code,
+            stdout=stdout,
+            stderr=stderr,
+            duration_ms=(time.time() - start) * 1000,
+        )
+
+    async def _install_backend_dependencies(self) -> list[CommandExecution]:
+        """Install backend dependencies from the cached wheelhouse when possible.
+
+        On a cache miss the dependency closure is built into a wheelhouse
+        first, so later projects with the same requirements install offline.
+        """
+        if not self.config.has_backend:
+            return []
+        backend_path = self.config.backend_path
+        pyproject = backend_path / "pyproject.toml"
+        if not pyproject.exists():
+            return []
+
+        commands = []
+        key = pip_cache_key(pyproject)
+        wheelhouse = dependency_cache.get_wheelhouse(key)
+
+        if wheelhouse is None:
+            tmp = dependency_cache.new_wheelhouse()
+            requirements = tmp / "requirements.txt"
+            requirements.write_text("\n".join(pip_requirements(pyproject)) + "\n")
+            build = await self._run_install_command(
+                f"pip wheel --quiet --wheel-dir {shlex.quote(str(tmp))} -r {shlex.quote(str(requirements))}",
+                backend_path,
+                display="pip wheel -r requirements.txt",
+            )
+            commands.append(build)
+            requirements.unlink()
+            if build.exit_code == 0:
+                wheelhouse = dependency_cache.publish_wheelhouse(key, tmp)
+            else:
+                dependency_cache.discard(tmp)
+
+        if wheelhouse is not None:
+            install = await self._run_install_command(
+                f"pip install --quiet --no-index --find-links {shlex.quote(str(wheelhouse))} -e .",
+                backend_path,
+                display=f"pip install --no-index -e . (dependency cache {key})",
+            )
+            commands.append(install)
+            if install.exit_code == 0:
+                return commands
+
+        commands.append(await self._run_install_command(
+            "pip install -e . --quiet", backend_path, display="pip install -e ."
+        ))
+        return commands
+
+    async def _install_frontend_dependencies(self) -> list[CommandExecution]:
+        """Install frontend dependencies, hydrating node_modules from the cache."""
+        if not self.config.has_frontend:
+            return []
+        frontend_path = self.config.frontend_path
+        package_json = frontend_path / "package.json"
+        if not package_json.exists():
+            return []
+
+        key = npm_cache_key(package_json)
+        start = time.time()
+        if await asyncio.to_thread(dependency_cache.restore_node_modules, key, frontend_path):
+            return [CommandExecution(
+                command=f"restore node_modules (dependency cache {key})",
+                working_dir=str(frontend_path),
+                exit_code=0,
+                duration_ms=(time.time() - start) * 1000,
+            )]
+
+        install = await self._run_install_command(
+            "npm install --legacy-peer-deps", frontend_path, display="npm install"
+        )
+        if install.exit_code == 0:
+            await asyncio.to_thread(dependency_cache.store_node_modules, key, frontend_path)
+        return [install]
 
     async def _run_verification(self) -> None:
         """Run verification gates."""
@@ -417,6 +532,7 @@ class ProjectGenerator:
                             "output": result.output[:500] if result.output else "",
                             "error": result.error[:500] if result.error else "",
                             "duration_ms": result.duration_ms,
+                            "cached": result.cached,
                         },
                     )
                 )
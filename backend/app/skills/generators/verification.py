@@ -1,18 +1,57 @@
 """Verification gates for project generation.
 
 Runs lint, tests, and docker build checks to verify generated projects.
+Gates of different scopes (backend, frontend, project) run concurrently;
+gates sharing a scope run in order, since they work on the same tree.
+Passing results are cached by a content hash of the files each gate reads
+plus the state of the installed dependencies, so re-verifying after an
+unrelated change only re-runs the gates whose inputs changed.
 """
 
 import asyncio
+import hashlib
+import json
 import logging
+import os
+import re
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Max gates running at once
+DEFAULT_MAX_CONCURRENT_GATES = 4
+
+# Directories never hashed as gate inputs (installed deps, caches, build output)
+INPUT_EXCLUDED_DIRS = {
+    ".git", "node_modules", ".venv", "venv", "__pycache__", ".pytest_cache",
+    ".ruff_cache", ".mypy_cache", "dist", "build", ".vite",
+}
+
+# Files written by the generator after verification
+INPUT_EXCLUDED_FILES = {"ARTIFACTS.json", "VALIDATION.md"}
+
+# Installed-dependency markers in a gate's tree. Their state is part of the
+# cache key, so installing or removing dependencies re-runs the gate.
+ENVIRONMENT_MARKERS = (
+    "node_modules",
+    "node_modules/.package-lock.json",
+    ".venv",
+    ".venv/pyvenv.cfg",
+    "venv",
+    "package-lock.json",
+    "uv.lock",
+    "poetry.lock",
+)
+
+# File digests remembered across runs
+MAX_FILE_DIGESTS = 50_000
+
 
 class GateType(str, Enum):
     """Types of verification gates."""
@@ -36,6 +75,8 @@ class VerificationGate:
     command: str | None = None  # For command-based gates
     file_path: str | None = None  # For file-exists gates
     timeout_seconds: int = 300  # 5 minute default
+    scope: str = "project"  # backend, frontend or project - which tree the gate checks
+    inputs: list[str] | None = None  # Globs of files the result depends on (default: by scope)
 
 
 @dataclass
@@ -49,6 +90,7 @@ class VerificationResult:
     error: str = ""
     duration_ms: float = 0.0
     required: bool = True
+    cached: bool = False  # Reused from an earlier run with identical inputs
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -60,9 +102,189 @@ class VerificationResult:
             "error": self.error[:1000] if len(self.error) > 1000 else self.error,
             "duration_ms": round(self.duration_ms, 2),
             "required": self.required,
+            "cached": self.cached,
+        }
+
+
+def gate_input_patterns(gate: VerificationGate, project_path: Path) -> list[str]:
+    """Globs (relative to project_path) of the files a gate's result depends on."""
+    if gate.inputs is not None:
+        return gate.inputs
+    if gate.gate_type == GateType.FILE_EXISTS:
+        return [gate.file_path] if gate.file_path else []
+    if gate.scope in ("backend", "frontend") and (project_path / gate.scope).is_dir():
+        return [f"{gate.scope}/**/*"]
+    return ["**/*"]
+
+
+class _FileDigests:
+    """sha256 of file contents, memoized by (mtime_ns, size) in a bounded LRU."""
+
+    def __init__(self, max_entries: int = MAX_FILE_DIGESTS) -> None:
+        self._digests: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> str:
+        st = os.stat(path)
+        with self._lock:
+            cached = self._digests.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                self._digests.move_to_end(path)
+                return cached[2]
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with self._lock:
+            self._digests[path] = (st.st_mtime_ns, st.st_size, digest)
+            self._digests.move_to_end(path)
+            while len(self._digests) > self._max_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+
+_file_digests = _FileDigests()
+
+
+def glob_to_regex(pattern: str) -> re.Pattern[str]:
+    """Compile a path glob: "*" and "?" stay within one path segment, "**"
+    spans segments ("a/**/b" also matches "a/b") and "[...]" is a class."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[" and (j := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1:j].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = j + 1
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out) + r"\Z", re.DOTALL)
+
+
+def compute_inputs_digest(project_path: Path, patterns: list[str]) -> str:
+    """Content hash of all files under project_path matching patterns."""
+    globs = [glob_to_regex(p) for p in patterns]
+    h = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(project_path):
+        dirnames[:] = sorted(d for d in dirnames if d not in INPUT_EXCLUDED_DIRS)
+        rel_dir = os.path.relpath(dirpath, project_path)
+        for name in sorted(filenames):
+            if name in INPUT_EXCLUDED_FILES:
+                continue
+            rel = name if rel_dir == "." else f"{rel_dir}/{name}".replace(os.sep, "/")
+            if not any(g.match(rel) for g in globs):
+                continue
+            try:
+                digest = _file_digests.get(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            h.update(f"{rel}\0{digest}\n".encode())
+    return h.hexdigest()
+
+
+def environment_state(gate: VerificationGate, project_path: Path) -> str:
+    """Fingerprint of the installed dependencies in a gate's tree.
+
+    Input digests skip node_modules and virtualenvs, so this stands in for
+    them: the stat of each ENVIRONMENT_MARKERS entry that exists.
+    """
+    root = project_path
+    if gate.scope in ("backend", "frontend") and (project_path / gate.scope).is_dir():
+        root = project_path / gate.scope
+    state = []
+    for marker in ENVIRONMENT_MARKERS:
+        try:
+            st = os.stat(root / marker)
+        except OSError:
+            continue
+        state.append(f"{marker}:{st.st_mtime_ns}:{st.st_size}")
+    return ";".join(state)
+
+
+class GateResultCache:
+    """LRU cache of gate results keyed by gate definition and input digest."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._entries: OrderedDict[str, VerificationResult] = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        gate: VerificationGate,
+        project_path: Path,
+        inputs_digest: str,
+        environment: str = "",
+    ) -> str:
+        payload = [
+            gate.name,
+            gate.gate_type.value,
+            gate.command,
+            gate.file_path,
+            str(project_path.resolve()),
+            inputs_digest,
+            environment,
+        ]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+    def get(self, key: str) -> VerificationResult | None:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return replace(result, cached=True)
+
+    def put(self, key: str, result: VerificationResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
         }
 
 
+# Global gate result cache
+gate_result_cache = GateResultCache()
+
+
+def _is_cacheable(result: VerificationResult) -> bool:
+    """Only cache passes: a failure may come from the environment (a missing
+    dependency, a timeout) rather than the inputs, and must be re-checked."""
+    return result.passed
+
+
 async def run_command(
     command: str,
     working_dir: Path,
@@ -374,36 +596,94 @@ async def run_verification_gates(
     gates: list[VerificationGate],
     project_path: Path,
     fail_fast: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENT_GATES,
+    use_cache: bool = True,
 ) -> list[VerificationResult]:
-    """Run all verification gates.
+    """Run verification gates, scopes concurrently and each scope in order.
+
+    Gates sharing a scope work on the same tree (installs, builds, caches),
+    so each waits for the previous gate of its scope to finish.
 
     Args:
         gates: List of gates to run
         project_path: Path to the project
-        fail_fast: If True, stop on first required gate failure
+        fail_fast: If True, cancel remaining gates on the first required gate failure
+        max_concurrency: Max gates running at once
+        use_cache: Reuse results of gates whose input files are unchanged
 
     Returns:
-        List of verification results
+        Results of the gates that completed, in gate order. Each result's
+        duration_ms is that gate's wall time (near zero when cached).
     """
-    results = []
-
-    for gate in gates:
-        logger.info(f"Running verification gate: {gate.name}")
-        result = await run_gate(gate, project_path)
-        results.append(result)
-
-        if fail_fast and not result.passed and result.required:
-            logger.warning(f"Required gate '{gate.name}' failed, stopping verification")
-            break
-
-        if result.passed:
-            logger.info(f"Gate '{gate.name}' passed")
-        else:
-            level = logging.WARNING if result.required else logging.INFO
-            status = 'failed' if result.required else 'failed (optional)'
-            logger.log(level, f"Gate '{gate.name}' {status}")
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(
+        gate: VerificationGate, after: asyncio.Task | None
+    ) -> VerificationResult:
+        if after is not None:
+            await asyncio.wait([after])
+        async with semaphore:
+            start_time = time.time()
+            key = None
+            if use_cache and gate.gate_type != GateType.FILE_EXISTS:
+                digest = await asyncio.to_thread(
+                    compute_inputs_digest, project_path, gate_input_patterns(gate, project_path)
+                )
+                key = gate_result_cache.make_key(
+                    gate, project_path, digest, environment_state(gate, project_path)
+                )
+                cached = gate_result_cache.get(key)
+                if cached is not None:
+                    cached.duration_ms = (time.time() - start_time) * 1000
+                    return cached
+
+            logger.info(f"Running verification gate: {gate.name}")
+            result = await run_gate(gate, project_path)
+            result.duration_ms = (time.time() - start_time) * 1000
+            if key is not None and _is_cacheable(result):
+                gate_result_cache.put(key, replace(result))
+            return result
+
+    pending: dict[asyncio.Task, int] = {}
+    last_in_scope: dict[str, asyncio.Task] = {}
+    for i, gate in enumerate(gates):
+        task = asyncio.create_task(run_one(gate, last_in_scope.get(gate.scope)))
+        last_in_scope[gate.scope] = task
+        pending[task] = i
+    results: dict[int, VerificationResult] = {}
 
-    return results
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            stop = False
+            for task in done:
+                i = pending.pop(task)
+                gate = gates[i]
+                result = task.result()
+                results[i] = result
+
+                if result.passed:
+                    logger.info(
+                        f"Gate '{gate.name}' passed ({result.duration_ms:.0f}ms"
+                        f"{', cached' if result.cached else ''})"
+                    )
+                else:
+                    level = logging.WARNING if result.required else logging.INFO
+                    status = 'failed' if result.required else 'failed (optional)'
+                    logger.log(level, f"Gate '{gate.name}' {status}")
+
+                if fail_fast and not result.passed and result.required:
+                    logger.warning(f"Required gate '{gate.name}' failed, stopping verification")
+                    stop = True
+            if stop:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return [results[i] for i in sorted(results)]
 
 
 def get_default_gates(config: Any) -> list[VerificationGate]:
@@ -431,12 +711,14 @@ def get_default_gates(config: Any) -> list[VerificationGate]:
         gates.extend([
             VerificationGate(
                 name="backend_lint",
+                scope="backend",
                 gate_type=GateType.LINT_PASSES,
                 description="Backend code passes linting",
                 required=True,
             ),
             VerificationGate(
                 name="backend_imports",
+                scope="backend",
                 gate_type=GateType.IMPORT_CHECK,
                 description="Backend imports work correctly",
                 required=True,
@@ -447,6 +729,7 @@ def get_default_gates(config: Any) -> list[VerificationGate]:
             gates.append(
                 VerificationGate(
                     name="backend_tests",
+                    scope="backend",
                     gate_type=GateType.TESTS_PASS,
                     description="Backend tests pass",
                     required=True,
@@ -459,6 +742,7 @@ def get_default_gates(config: Any) -> list[VerificationGate]:
         gates.extend([
             VerificationGate(
                 name="frontend_lint",
+                scope="frontend",
                 gate_type=GateType.COMMAND_SUCCESS,
                 description="Frontend code passes linting",
                 command="cd frontend && npm run lint",
@@ -466,6 +750,7 @@ def get_default_gates(config: Any) -> list[VerificationGate]:
             ),
             VerificationGate(
                 name="frontend_build",
+                scope="frontend",
                 gate_type=GateType.COMMAND_SUCCESS,
                 description="Frontend builds successfully",
                 command="cd frontend && npm run build",
@@ -478,6 +763,7 @@ def get_default_gates(config: Any) -> list[VerificationGate]:
             gates.append(
                 VerificationGate(
                     name="frontend_tests",
+                    scope="frontend",
                     gate_type=GateType.COMMAND_SUCCESS,
                     description="Frontend tests pass",
                     command="cd frontend && npm test -- --run --passWithNoTests",
@@ -7,7 +7,8 @@ from typing import Any
 
 import yaml
 
-from app.skills.base import Skill, skill_registry
+from app.skills.base import Skill, SkillStep, resolve_step_dependencies, skill_registry
+from app.utils.config_cache import config_cache
 
 logger = logging.getLogger(__name__)
 
@@ -134,6 +135,22 @@ def validate_skill_yaml(path: Path) -> SkillValidationResult:
                     severity="warning"
                 ))
 
+        # Validate step dependencies (only meaningful once steps are well-formed)
+        if not result.errors:
+            try:
+                resolve_step_dependencies([
+                    SkillStep(
+                        name=step["name"],
+                        action=step["action"],
+                        params=step.get("params") or {},
+                        depends_on=step.get("depends_on"),
+                        outputs=step.get("outputs") or [],
+                    )
+                    for step in workflow
+                ])
+            except ValueError as e:
+                result.errors.append(SkillValidationError(field="workflow", message=str(e)))
+
     # Validate quality_checklist
     checklist = data.get("quality_checklist", [])
     if checklist and not isinstance(checklist, list):
@@ -156,37 +173,77 @@ def validate_skill_yaml(path: Path) -> SkillValidationResult:
     return result
 
 
+SKILL_FILE_PATTERNS = ("**/*.yaml", "**/*.yml")
+
+# Skill ids loaded from each directory, so removed files can be unregistered
+_dir_skill_ids: dict[str, set[str]] = {}
+
+
+def _load_skill_file(path: Path) -> tuple[SkillValidationResult, Skill | None]:
+    """Validate and parse a skill file (cached per file by load_skills_from_dir)."""
+    validation = validate_skill_yaml(path)
+    if not validation.valid:
+        return validation, None
+    try:
+        return validation, Skill.from_yaml(path)
+    except Exception as e:
+        validation.valid = False
+        validation.errors.append(SkillValidationError(field="load", message=str(e)))
+        return validation, None
+
+
 def load_skills_from_dir(skills_dir: Path) -> int:
     """Load all skills from a directory.
 
+    Parsed skills are cached per file, so reloading a directory only
+    re-parses files that changed. Skills whose files were removed since the
+    last load are unregistered. The directory is watched by skill_registry
+    and refreshed automatically when its files change.
+
     Returns the number of skills loaded.
     """
+    dir_key = str(skills_dir)
+    skill_registry.watch_dir(skills_dir)
+    # Record the current signature so the next refresh only fires on change
+    config_cache.dir_changed(("skills", dir_key), skills_dir, SKILL_FILE_PATTERNS, force=True)
+
+    loaded_ids: set[str] = set()
     if not skills_dir.exists():
         logger.info(f"Skills directory does not exist: {skills_dir}")
-        return 0
+    else:
+        for pattern in SKILL_FILE_PATTERNS:
+            for path in skills_dir.glob(pattern):
+                validation, skill = config_cache.get(path, _load_skill_file, namespace="skills")
+                if not validation.valid:
+                    for error in validation.errors:
+                        logger.error(f"Skill {path}: {error.field} - {error.message}")
+                    continue
+
+                for warning in validation.warnings:
+                    logger.warning(f"Skill {path}: {warning.field} - {warning.message}")
 
-    count = 0
-    for ext in ["*.yaml", "*.yml"]:
-        for path in skills_dir.glob(f"**/{ext}"):
-            # Validate first
-            validation = validate_skill_yaml(path)
-            if not validation.valid:
-                for error in validation.errors:
-                    logger.error(f"Skill {path}: {error.field} - {error.message}")
-                continue
-
-            for warning in validation.warnings:
-                logger.warning(f"Skill {path}: {warning.field} - {warning.message}")
-
-            try:
-                skill = Skill.from_yaml(path)
                 skill_registry.register(skill)
                 logger.info(f"Loaded skill: {skill.id} from {path}")
-                count += 1
-            except Exception as e:
-                logger.error(f"Failed to load skill from {path}: {e}")
+                loaded_ids.add(skill.id)
+
+    for skill_id in _dir_skill_ids.get(dir_key, set()) - loaded_ids:
+        skill_registry.unregister(skill_id)
+        logger.info(f"Unloaded skill: {skill_id} (file removed from {skills_dir})")
+    _dir_skill_ids[dir_key] = loaded_ids
 
-    return count
+    return len(loaded_ids)
+
+
+def refresh_skills_from_dir(skills_dir: Path) -> bool:
+    """Reload a directory's skills if any of its skill files changed.
+
+    Directory checks are throttled by config_cache, so this is cheap to call
+    on every registry lookup. Returns True if the directory was reloaded.
+    """
+    if not config_cache.dir_changed(("skills", str(skills_dir)), skills_dir, SKILL_FILE_PATTERNS):
+        return False
+    load_skills_from_dir(skills_dir)
+    return True
 
 
 def validate_all_skills(skills_dir: Path) -> list[SkillValidationResult]:
@@ -166,6 +166,9 @@ class SkillStepSchema(BaseModel):
 
     # For parallel execution
     parallel_steps: list["SkillStepSchema"] = Field(default_factory=list)
+    depends_on: list[str] | None = None  # None = after the previous step
+    outputs: list[str] = Field(default_factory=list)  # Context keys published on success
+    required: bool = True  # Failure cancels the rest of the workflow
 
     # For conditional branching
     branches: dict[str, list["SkillStepSchema"]] = Field(default_factory=dict)
@@ -222,6 +225,7 @@ class SkillSchema(BaseModel):
     workflow: list[SkillStepSchema] = Field(default_factory=list)
     retry_policy: RetryPolicy = Field(default_factory=RetryPolicy)
     timeout_seconds: int = 3600  # Overall skill timeout
+    max_parallel_steps: int = Field(default=4, ge=1)
 
     # Context
     system_context: str = ""
@@ -243,6 +247,23 @@ class SkillSchema(BaseModel):
 
         return self
 
+    @model_validator(mode="after")
+    def validate_step_dependencies(self):
+        """Validate that step dependencies exist and form no cycle."""
+        from app.skills.base import SkillStep, resolve_step_dependencies
+
+        resolve_step_dependencies([
+            SkillStep(
+                name=step.name,
+                action=step.action,
+                params=step.params,
+                depends_on=step.depends_on,
+                outputs=step.outputs,
+            )
+            for step in self.workflow
+        ])
+        return self
+
     def get_required_inputs(self) -> list[InputField]:
         """Get all required inputs."""
         return [i for i in self.inputs if i.required]
@@ -1,12 +1,21 @@
 """Task metrics for tracking performance and adaptive sizing."""
 
 import logging
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
+from app.utils.metrics_store import MetricsStore, metrics_store
+
 logger = logging.getLogger(__name__)
 
+# Series namespace for subagent task durations (seconds) in the metrics store
+METRICS_NAMESPACE = "subagent"
+
+# Tasks whose p95 duration exceeds this are sized down
+LONG_TASK_SECONDS = 300
+
 
 @dataclass
 class TaskMetric:
@@ -63,6 +72,8 @@ class AgentMetrics:
     total_duration_seconds: float = 0.0
     total_goals: int = 0
     completed_goals: int = 0
+    p50_duration_seconds: float | None = None
+    p95_duration_seconds: float | None = None
 
     @property
     def success_rate(self) -> float:
@@ -96,9 +107,15 @@ class AgentMetrics:
             "total_goals": self.total_goals,
             "completed_goals": self.completed_goals,
             "goal_completion_rate": round(self.goal_completion_rate, 2),
+            "p50_duration_seconds": _round(self.p50_duration_seconds),
+            "p95_duration_seconds": _round(self.p95_duration_seconds),
         }
 
 
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
 @dataclass
 class TaskSizingRecommendation:
     """Recommendation for task sizing based on metrics."""
@@ -118,11 +135,16 @@ class TaskSizingRecommendation:
 
 
 class TaskMetricsManager:
-    """Manages task metrics collection and analysis."""
+    """Manages task metrics collection and analysis.
 
-    def __init__(self, max_history: int = 500) -> None:
-        self._metrics: list[TaskMetric] = []
-        self._max_history = max_history
+    Aggregates (counts, goal totals, duration percentiles) come from a
+    metrics store with O(1) recording and fixed memory; only the most recent
+    tasks are kept as objects for listing and failure analysis.
+    """
+
+    def __init__(self, max_history: int = 500, store: MetricsStore | None = None) -> None:
+        self._metrics: deque[TaskMetric] = deque(maxlen=max_history)
+        self._store = store if store is not None else MetricsStore()
 
     def record(
         self,
@@ -151,13 +173,23 @@ class TaskMetricsManager:
 
         self._metrics.append(metric)
 
-        # Trim old metrics
-        if len(self._metrics) > self._max_history:
-            self._metrics = self._metrics[-self._max_history :]
+        duration = metric.duration_seconds or 0.0
+        self._store.record(
+            METRICS_NAMESPACE,
+            agent_id,
+            duration,
+            success=success,
+            timestamp=completed_at.timestamp(),
+            counters={
+                "goals_total": goals_total,
+                "goals_completed": goals_completed,
+                "success_seconds": duration if success else 0.0,
+            },
+        )
 
         logger.info(
             f"Recorded metrics for task {task_id}: "
-            f"success={success}, duration={metric.duration_seconds:.1f}s, "
+            f"success={success}, duration={duration:.1f}s, "
             f"goals={goals_completed}/{goals_total}"
         )
 
@@ -172,36 +204,32 @@ class TaskMetricsManager:
         if since is None:
             since = datetime.now() - timedelta(days=7)
 
-        metrics = AgentMetrics(agent_id=agent_id)
-
-        for m in self._metrics:
-            if m.agent_id != agent_id:
-                continue
-            if m.started_at < since:
-                continue
-
-            metrics.total_tasks += 1
-            metrics.total_goals += m.goals_total
-            metrics.completed_goals += m.goals_completed
-
-            if m.success:
-                metrics.successful_tasks += 1
-                if m.duration_seconds:
-                    metrics.total_duration_seconds += m.duration_seconds
-            else:
-                metrics.failed_tasks += 1
-
-        return metrics
+        summary = self._store.query(
+            METRICS_NAMESPACE,
+            agent_id,
+            window=max(datetime.now() - since, timedelta(0)),
+            quantiles=(0.5, 0.95),
+        )
+        return AgentMetrics(
+            agent_id=agent_id,
+            total_tasks=summary.count,
+            successful_tasks=summary.successes,
+            failed_tasks=summary.errors,
+            total_duration_seconds=summary.counters.get("success_seconds", 0.0),
+            total_goals=int(summary.counters.get("goals_total", 0)),
+            completed_goals=int(summary.counters.get("goals_completed", 0)),
+            p50_duration_seconds=summary.percentile(0.5),
+            p95_duration_seconds=summary.percentile(0.95),
+        )
 
     def get_all_agent_metrics(
         self,
         since: datetime | None = None,
     ) -> dict[str, AgentMetrics]:
         """Get aggregated metrics for all agents."""
-        agent_ids = set(m.agent_id for m in self._metrics)
         return {
             agent_id: self.get_agent_metrics(agent_id, since)
-            for agent_id in agent_ids
+            for agent_id in self._store.keys(METRICS_NAMESPACE)
         }
 
     def get_sizing_recommendation(self, agent_id: str) -> TaskSizingRecommendation:
@@ -248,10 +276,11 @@ class TaskMetricsManager:
             base_goals = min(10, base_goals + 1)
             reasoning_parts.append(f"High goal completion ({metrics.goal_completion_rate:.0%}) increases recommendation")
 
-        # Consider duration
-        if metrics.avg_duration_seconds > 300:  # > 5 minutes
+        # Consider duration (tail latency, not the mean, drives timeouts)
+        p95 = metrics.p95_duration_seconds
+        if p95 is not None and p95 > LONG_TASK_SECONDS:
             base_goals = max(3, base_goals - 1)
-            reasoning_parts.append(f"Long avg duration ({metrics.avg_duration_seconds:.0f}s) suggests smaller scope")
+            reasoning_parts.append(f"Long p95 duration ({p95:.0f}s) suggests smaller scope")
 
         return TaskSizingRecommendation(
             agent_id=agent_id,
@@ -262,7 +291,7 @@ class TaskMetricsManager:
 
     def get_recent_metrics(self, limit: int = 20) -> list[TaskMetric]:
         """Get recent task metrics."""
-        return self._metrics[-limit:]
+        return list(self._metrics)[-limit:]
 
     def get_failure_patterns(self, agent_id: str | None = None) -> dict[str, int]:
         """Analyze common failure patterns."""
@@ -290,8 +319,9 @@ class TaskMetricsManager:
     def clear(self) -> None:
         """Clear all metrics."""
         self._metrics.clear()
+        self._store.clear(METRICS_NAMESPACE)
         logger.info("Cleared all task metrics")
 
 
 # Global metrics manager
-task_metrics = TaskMetricsManager()
+task_metrics = TaskMetricsManager(store=metrics_store)
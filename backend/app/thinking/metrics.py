@@ -4,11 +4,20 @@ Tracks thinking performance metrics to enable:
 - Understanding which thinking levels produce better outcomes
 - Optimizing token usage
 - Identifying patterns in thinking effectiveness
+
+Entries are persisted as append-only JSON lines: new entries and later
+outcome/feedback updates are buffered and appended in batches, and the file
+is compacted once it holds about twice as many lines as live entries.
+Aggregates are maintained incrementally (overall, per level, per template,
+and per hour for time-filtered queries), so reads never re-scan history.
 """
 
+import asyncio
 import json
+import logging
+import os
 import time
-from collections import defaultdict
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -16,6 +25,22 @@ from typing import Any
 
 from app.thinking.models import ThinkingLevel, ThinkingSession
 
+logger = logging.getLogger(__name__)
+
+# Buffered lines are appended once this many are pending or this long has passed
+FLUSH_BATCH_SIZE = 20
+FLUSH_INTERVAL_SECONDS = 5.0
+
+# Rewrite the file once it holds this many lines per live entry
+COMPACTION_RATIO = 2
+
+# Time-filtered aggregates resolve `since` to the start of its hour
+BUCKET_SECONDS = 3600
+
+# Aggregate keys: ("all", ""), ("level", <level>), ("template", <template>)
+_AggKey = tuple[str, str]
+_ALL: _AggKey = ("all", "")
+
 
 @dataclass
 class ThinkingMetricEntry:
@@ -56,7 +81,11 @@ class ThinkingMetricEntry:
             session_id=data["session_id"],
             message_id=data["message_id"],
             level=ThinkingLevel.from_string(data["level"]),
-            adaptive_level=ThinkingLevel.from_string(data["adaptive_level"]) if data.get("adaptive_level") else None,
+            adaptive_level=(
+                ThinkingLevel.from_string(data["adaptive_level"])
+                if data.get("adaptive_level")
+                else None
+            ),
             template=data.get("template"),
             duration_ms=data.get("duration_ms", 0),
             tokens_used=data.get("tokens_used", 0),
@@ -64,7 +93,11 @@ class ThinkingMetricEntry:
             complexity_score=data.get("complexity_score", 0.5),
             outcome=data.get("outcome"),
             user_feedback=data.get("user_feedback"),
-            timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else datetime.utcnow(),
+            timestamp=(
+                datetime.fromisoformat(data["timestamp"])
+                if data.get("timestamp")
+                else datetime.utcnow()
+            ),
         )
 
     @classmethod
@@ -123,6 +156,32 @@ class AggregateMetrics:
             return 0.0
         return (self.positive_feedback - self.negative_feedback) / total
 
+    def apply(self, entry: ThinkingMetricEntry, sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) an entry's contribution."""
+        self.total_sessions += sign
+        self.total_duration_ms += sign * entry.duration_ms
+        self.total_tokens += sign * entry.tokens_used
+        self.total_steps += sign * entry.step_count
+
+        if entry.outcome == "success":
+            self.success_count += sign
+        elif entry.outcome == "error":
+            self.error_count += sign
+        elif entry.outcome == "retry":
+            self.retry_count += sign
+
+        if entry.user_feedback == 1:
+            self.positive_feedback += sign
+        elif entry.user_feedback == -1:
+            self.negative_feedback += sign
+        elif entry.user_feedback == 0:
+            self.neutral_feedback += sign
+
+    def merge(self, other: "AggregateMetrics") -> None:
+        """Add another aggregate's totals to this one."""
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "total_sessions": self.total_sessions,
@@ -146,7 +205,7 @@ class AggregateMetrics:
 class ThinkingMetrics:
     """Tracks and analyzes thinking metrics.
 
-    Stores metrics in memory with optional persistence to disk.
+    Stores metrics in memory with optional append-only persistence to disk.
     Provides aggregation and analysis methods.
     """
 
@@ -154,19 +213,36 @@ class ThinkingMetrics:
         self,
         persist_path: Path | str | None = None,
         max_entries: int = 10000,
+        flush_batch_size: int = FLUSH_BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
     ):
         """Initialize the metrics tracker.
 
         Args:
-            persist_path: Optional path to persist metrics
+            persist_path: Optional JSONL path to persist metrics
             max_entries: Maximum entries to keep in memory
+            flush_batch_size: Pending lines that trigger an append
+            flush_interval: Seconds after which pending lines are appended
         """
-        self._entries: list[ThinkingMetricEntry] = []
+        self._entries: deque[ThinkingMetricEntry] = deque()
         self._max_entries = max_entries
         self._persist_path = Path(persist_path) if persist_path else None
+        self._flush_batch_size = flush_batch_size
+        self._flush_interval = flush_interval
+
+        # Incrementally maintained aggregates
+        self._totals: dict[_AggKey, AggregateMetrics] = {}
+        self._buckets: dict[int, dict[_AggKey, AggregateMetrics]] = {}
+        self._by_message: dict[str, ThinkingMetricEntry] = {}
+
+        # Write buffer
+        self._pending: list[str] = []
+        self._last_flush = time.monotonic()
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._file_lines = 0
 
         # Load existing metrics if persistence is enabled
-        if self._persist_path and self._persist_path.exists():
+        if self._persist_path:
             self._load()
 
     def record(self, session: ThinkingSession, outcome: str | None = None) -> ThinkingMetricEntry:
@@ -202,12 +278,7 @@ class ThinkingMetrics:
         Returns:
             True if entry was found and updated
         """
-        for entry in reversed(self._entries):
-            if entry.message_id == message_id:
-                entry.user_feedback = feedback
-                self._save()
-                return True
-        return False
+        return self._update(message_id, "user_feedback", feedback)
 
     def record_outcome(
         self,
@@ -223,22 +294,62 @@ class ThinkingMetrics:
         Returns:
             True if entry was found and updated
         """
-        for entry in reversed(self._entries):
-            if entry.message_id == message_id:
-                entry.outcome = outcome
-                self._save()
-                return True
-        return False
+        return self._update(message_id, "outcome", outcome)
+
+    def _update(self, message_id: str, attr: str, value: Any) -> bool:
+        """Change an entry field, keeping aggregates and the log in sync."""
+        entry = self._by_message.get(message_id)
+        if entry is None:
+            return False
+        self._apply_aggregates(entry, -1)
+        setattr(entry, attr, value)
+        self._apply_aggregates(entry, 1)
+        self._append_line({"op": "update", "message_id": message_id, attr: value})
+        return True
 
     def _add_entry(self, entry: ThinkingMetricEntry) -> None:
         """Add an entry, maintaining max size."""
-        self._entries.append(entry)
+        self._insert(entry)
+        self._append_line(entry.to_dict())
 
-        # Trim if over max
-        if len(self._entries) > self._max_entries:
-            self._entries = self._entries[-self._max_entries:]
-
-        self._save()
+    def _insert(self, entry: ThinkingMetricEntry) -> None:
+        """Add an entry to memory and aggregates, evicting the oldest if full."""
+        self._entries.append(entry)
+        self._by_message[entry.message_id] = entry
+        self._apply_aggregates(entry, 1)
+
+        while len(self._entries) > self._max_entries:
+            evicted = self._entries.popleft()
+            self._apply_aggregates(evicted, -1)
+            if self._by_message.get(evicted.message_id) is evicted:
+                del self._by_message[evicted.message_id]
+
+    @staticmethod
+    def _keys_for(entry: ThinkingMetricEntry) -> set[_AggKey]:
+        keys = {_ALL, ("level", entry.level.value)}
+        if entry.adaptive_level:
+            keys.add(("level", entry.adaptive_level.value))
+        if entry.template:
+            keys.add(("template", entry.template))
+        return keys
+
+    @staticmethod
+    def _bucket_for(timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // BUCKET_SECONDS)
+
+    def _apply_aggregates(self, entry: ThinkingMetricEntry, sign: int) -> None:
+        bucket_idx = self._bucket_for(entry.timestamp)
+        bucket = self._buckets.setdefault(bucket_idx, {})
+        for key in self._keys_for(entry):
+            for table in (self._totals, bucket):
+                agg = table.get(key)
+                if agg is None:
+                    agg = table[key] = AggregateMetrics()
+                agg.apply(entry, sign)
+                if agg.total_sessions == 0:
+                    del table[key]
+        if not bucket:
+            del self._buckets[bucket_idx]
 
     def get_entries(
         self,
@@ -258,7 +369,7 @@ class ThinkingMetrics:
         Returns:
             List of matching entries
         """
-        entries = self._entries
+        entries = list(self._entries)
 
         if since:
             entries = [e for e in entries if e.timestamp >= since]
@@ -272,6 +383,21 @@ class ThinkingMetrics:
 
         return entries
 
+    def _aggregate_key(self, key: _AggKey, since: datetime | None) -> AggregateMetrics:
+        """Aggregate for one key, from incremental totals or hourly buckets."""
+        agg = AggregateMetrics()
+        if since is None:
+            total = self._totals.get(key)
+            if total:
+                agg.merge(total)
+            return agg
+
+        start = self._bucket_for(since)
+        for idx, bucket in self._buckets.items():
+            if idx >= start and key in bucket:
+                agg.merge(bucket[key])
+        return agg
+
     def aggregate(
         self,
         since: datetime | None = None,
@@ -281,37 +407,40 @@ class ThinkingMetrics:
         """Get aggregated metrics.
 
         Args:
-            since: Only include entries after this time
+            since: Only include entries after this time (resolved to the hour)
             level: Filter by thinking level
             template: Filter by template
 
         Returns:
             AggregateMetrics for the filtered entries
         """
-        entries = self.get_entries(since=since, level=level, template=template)
-        agg = AggregateMetrics()
-
-        for entry in entries:
-            agg.total_sessions += 1
-            agg.total_duration_ms += entry.duration_ms
-            agg.total_tokens += entry.tokens_used
-            agg.total_steps += entry.step_count
-
-            if entry.outcome == "success":
-                agg.success_count += 1
-            elif entry.outcome == "error":
-                agg.error_count += 1
-            elif entry.outcome == "retry":
-                agg.retry_count += 1
-
-            if entry.user_feedback == 1:
-                agg.positive_feedback += 1
-            elif entry.user_feedback == -1:
-                agg.negative_feedback += 1
-            elif entry.user_feedback == 0:
-                agg.neutral_feedback += 1
-
-        return agg
+        if level and template:
+            # Combined filters are not pre-aggregated
+            agg = AggregateMetrics()
+            for entry in self.get_entries(level=level, template=template):
+                if since is None or self._bucket_for(entry.timestamp) >= self._bucket_for(since):
+                    agg.apply(entry)
+            return agg
+        if level:
+            return self._aggregate_key(("level", level.value), since)
+        if template:
+            return self._aggregate_key(("template", template), since)
+        return self._aggregate_key(_ALL, since)
+
+    def _aggregate_kind(self, kind: str, since: datetime | None) -> dict[str, AggregateMetrics]:
+        """Aggregates for every key of one kind ("level" or "template")."""
+        if since is None:
+            tables = [self._totals]
+        else:
+            start = self._bucket_for(since)
+            tables = [bucket for idx, bucket in self._buckets.items() if idx >= start]
+
+        result: dict[str, AggregateMetrics] = {}
+        for table in tables:
+            for (key_kind, name), agg in table.items():
+                if key_kind == kind:
+                    result.setdefault(name, AggregateMetrics()).merge(agg)
+        return result
 
     def aggregate_by_level(
         self,
@@ -320,17 +449,18 @@ class ThinkingMetrics:
         """Get metrics aggregated by thinking level.
 
         Args:
-            since: Only include entries after this time
+            since: Only include entries after this time (resolved to the hour)
 
         Returns:
             Dict mapping level name to AggregateMetrics
         """
-        result = {}
-        for level in ThinkingLevel:
-            metrics = self.aggregate(since=since, level=level)
-            if metrics.total_sessions > 0:
-                result[level.value] = metrics
-        return result
+        by_level = self._aggregate_kind("level", since)
+        # Keep the ThinkingLevel declaration order
+        return {
+            level.value: by_level[level.value]
+            for level in ThinkingLevel
+            if level.value in by_level
+        }
 
     def aggregate_by_template(
         self,
@@ -339,22 +469,12 @@ class ThinkingMetrics:
         """Get metrics aggregated by template.
 
         Args:
-            since: Only include entries after this time
+            since: Only include entries after this time (resolved to the hour)
 
         Returns:
             Dict mapping template name to AggregateMetrics
         """
-        # Get unique templates
-        entries = self.get_entries(since=since)
-        templates = set(e.template for e in entries if e.template)
-
-        result = {}
-        for template in templates:
-            metrics = self.aggregate(since=since, template=template)
-            if metrics.total_sessions > 0:
-                result[template] = metrics
-
-        return result
+        return self._aggregate_kind("template", since)
 
     def get_level_effectiveness(
         self,
@@ -459,29 +579,127 @@ class ThinkingMetrics:
             "entry_count": len(self._entries),
         }
 
-    def _save(self) -> None:
-        """Save metrics to disk if persistence is enabled."""
+    # Persistence
+
+    def _append_line(self, record: dict[str, Any]) -> None:
+        """Buffer a log line, appending the batch when it is due.
+
+        Inside an event loop a timer appends whatever is pending once the
+        flush interval has passed, even if no further record arrives.
+        Without a loop, pending lines wait for the next record or flush().
+        """
         if not self._persist_path:
             return
+        self._pending.append(json.dumps(record, separators=(",", ":")))
+        elapsed = time.monotonic() - self._last_flush
+        if len(self._pending) >= self._flush_batch_size or elapsed >= self._flush_interval:
+            self.flush()
+        elif self._flush_timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._flush_timer = loop.call_later(self._flush_interval - elapsed, self.flush)
+
+    def flush(self) -> None:
+        """Append buffered lines to disk, compacting the file if it has grown."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._last_flush = time.monotonic()
+        if not self._persist_path or not self._pending:
+            return
 
+        lines, self._pending = self._pending, []
         try:
             self._persist_path.parent.mkdir(parents=True, exist_ok=True)
-            data = [e.to_dict() for e in self._entries]
-            self._persist_path.write_text(json.dumps(data, indent=2))
-        except Exception as e:
+            with open(self._persist_path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+            self._file_lines += len(lines)
+        except OSError as e:
             # Don't fail on persistence errors
-            pass
+            logger.debug(f"Failed to append thinking metrics: {e}")
+            return
+
+        if self._file_lines > COMPACTION_RATIO * max(len(self._entries), 1):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per live entry."""
+        if not self._persist_path:
+            return
+        lines = [json.dumps(e.to_dict(), separators=(",", ":")) for e in self._entries]
+        lines.extend(self._pending)
+        self._pending = []
+        tmp = self._persist_path.with_suffix(".tmp")
+        try:
+            self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text("".join(line + "\n" for line in lines))
+            os.replace(tmp, self._persist_path)
+            self._file_lines = len(lines)
+        except OSError as e:
+            logger.debug(f"Failed to compact thinking metrics: {e}")
 
     def _load(self) -> None:
-        """Load metrics from disk."""
-        if not self._persist_path or not self._persist_path.exists():
+        """Load metrics from disk, replaying updates in order."""
+        path = self._persist_path
+        if not path:
+            return
+
+        # Pre-JSONL format: one pretty-printed array, possibly at the old .json path
+        legacy = path if path.exists() else path.with_suffix(".json")
+        if legacy.exists() and self._is_legacy_file(legacy):
+            try:
+                records = json.loads(legacy.read_text())
+            except (OSError, ValueError):
+                records = []
+            for data in records:
+                self._load_record(data)
+            self.compact()
+            return
+
+        if not path.exists():
             return
 
         try:
-            data = json.loads(self._persist_path.read_text())
-            self._entries = [ThinkingMetricEntry.from_dict(d) for d in data]
-        except Exception:
-            self._entries = []
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    self._file_lines += 1
+                    try:
+                        self._load_record(json.loads(line))
+                    except (ValueError, KeyError):
+                        continue  # Torn or malformed line
+        except OSError as e:
+            logger.debug(f"Failed to load thinking metrics: {e}")
+            return
+
+        if self._file_lines > COMPACTION_RATIO * max(len(self._entries), 1):
+            self.compact()
+
+    @staticmethod
+    def _is_legacy_file(path: Path) -> bool:
+        try:
+            with open(path) as f:
+                return f.read(64).lstrip().startswith("[")
+        except OSError:
+            return False
+
+    def _load_record(self, data: dict[str, Any]) -> None:
+        if data.get("op") == "update":
+            entry = self._by_message.get(data["message_id"])
+            if entry is None:
+                return
+            self._apply_aggregates(entry, -1)
+            if "outcome" in data:
+                entry.outcome = data["outcome"]
+            if "user_feedback" in data:
+                entry.user_feedback = data["user_feedback"]
+            self._apply_aggregates(entry, 1)
+        else:
+            self._insert(ThinkingMetricEntry.from_dict(data))
 
 
 # Global instance
@@ -494,6 +712,12 @@ def get_metrics(persist_path: Path | str | None = None) -> ThinkingMetrics:
     if _metrics is None:
         # Default persistence path
         if persist_path is None:
-            persist_path = Path.home() / ".maratos" / "thinking_metrics.json"
+            persist_path = Path.home() / ".maratos" / "thinking_metrics.jsonl"
         _metrics = ThinkingMetrics(persist_path=persist_path)
     return _metrics
+
+
+def flush_metrics() -> None:
+    """Flush buffered entries of the global instance, if it was created."""
+    if _metrics is not None:
+        _metrics.flush()
@@ -23,6 +23,7 @@ from app.tools.canvas import CanvasTool
 from app.tools.routing import RoutingTool
 from app.tools.market_data import MarketDataTool, QuoteTool
 from app.tools.collaboration import CreateHandoffTool
+from app.tools.symbols import CodeSymbolsTool
 
 __all__ = [
     "Tool",
@@ -53,4 +54,5 @@ __all__ = [
     "MarketDataTool",
     "QuoteTool",
     "CreateHandoffTool",
+    "CodeSymbolsTool",
 ]
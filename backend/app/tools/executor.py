@@ -14,12 +14,21 @@ import time
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+from app.audit import ToolAuditEvent, audit_logger
 from app.tools.base import Tool, ToolResult, registry
+from app.tools.result_cache import tool_result_cache
+from app.utils.metrics_store import MetricsStore, metrics_store
+
+if TYPE_CHECKING:
+    from app.guardrails import GuardrailsEnforcer
 
 logger = logging.getLogger(__name__)
 
+# Series namespace for tool call durations (milliseconds) in the metrics store
+METRICS_NAMESPACE = "tool"
+
 # Guardrails integration - lazy import to avoid circular dependencies
 _guardrails_checked = False
 _guardrails_available = False
@@ -52,6 +61,7 @@ class ToolMetrics:
     total_calls: int = 0
     successful_calls: int = 0
     failed_calls: int = 0
+    cache_hits: int = 0
     total_duration_ms: float = 0.0
     last_called_at: datetime | None = None
 
@@ -73,6 +83,7 @@ class ToolMetrics:
             "total_calls": self.total_calls,
             "successful_calls": self.successful_calls,
             "failed_calls": self.failed_calls,
+            "cache_hits": self.cache_hits,
             "success_rate": round(self.success_rate, 3),
             "avg_duration_ms": round(self.avg_duration_ms, 2),
             "total_duration_ms": round(self.total_duration_ms, 2),
@@ -96,11 +107,13 @@ class ToolExecutor:
     - Audit logging
     - Metrics collection
     - Rate limiting
+    - Result caching for idempotent calls
     - Error handling
     """
 
-    def __init__(self) -> None:
+    def __init__(self, store: MetricsStore | None = None) -> None:
         self._metrics: dict[str, ToolMetrics] = {}
+        self._store = store if store is not None else MetricsStore()
         self._rate_limits: dict[str, ToolRateLimit] = {}
         self._call_history: dict[str, list[datetime]] = defaultdict(list)
         self._last_call_time: dict[str, float] = {}
@@ -213,6 +226,20 @@ class ToolExecutor:
                     error=enforcement_result.error,
                 )
 
+        # Get tool
+        tool = registry.get(tool_id)
+        if not tool:
+            error = f"Tool not found: {tool_id}"
+            return ToolResult(success=False, output="", error=error)
+
+        # Serve idempotent calls from the result cache (no rate limit charge)
+        probe = tool_result_cache.probe(tool_id, kwargs, str(getattr(tool, "workspace", "")))
+        if probe and probe.hit:
+            return await self._record_cache_hit(
+                tool_id, kwargs, probe.hit, session_id, task_id, agent_id,
+                enforcer, enforcement_result,
+            )
+
         # Check rate limit
         async with self._lock:
             allowed, error = self._check_rate_limit(tool_id)
@@ -224,18 +251,15 @@ class ToolExecutor:
             self._call_history[tool_id].append(datetime.now())
             self._last_call_time[tool_id] = time.time()
 
-        # Get tool
-        tool = registry.get(tool_id)
-        if not tool:
-            error = f"Tool not found: {tool_id}"
-            return ToolResult(success=False, output="", error=error)
-
         # Execute with timing
         start_time = time.time()
         try:
             result = await tool.execute(**kwargs)
             duration_ms = (time.time() - start_time) * 1000
 
+            if probe:
+                tool_result_cache.store(probe, result)
+
             # Update metrics
             metrics = self._get_metrics(tool_id)
             metrics.total_calls += 1
@@ -245,6 +269,7 @@ class ToolExecutor:
                 metrics.successful_calls += 1
             else:
                 metrics.failed_calls += 1
+            self._store.record(METRICS_NAMESPACE, tool_id, duration_ms, success=result.success)
 
             # Record in enforcer
             if enforcer and enforcement_result:
@@ -264,6 +289,7 @@ class ToolExecutor:
             metrics.failed_calls += 1
             metrics.total_duration_ms += duration_ms
             metrics.last_called_at = datetime.now()
+            self._store.record(METRICS_NAMESPACE, tool_id, duration_ms, success=False)
 
             logger.error(f"Tool {tool_id} execution error: {e}", exc_info=True)
 
@@ -277,6 +303,42 @@ class ToolExecutor:
 
             return result
 
+    async def _record_cache_hit(
+        self,
+        tool_id: str,
+        kwargs: dict[str, Any],
+        result: ToolResult,
+        session_id: str | None,
+        task_id: str | None,
+        agent_id: str | None,
+        enforcer: "GuardrailsEnforcer | None",
+        enforcement_result: Any,
+    ) -> ToolResult:
+        """Record metrics and audit for a result served from cache."""
+        metrics = self._get_metrics(tool_id)
+        metrics.total_calls += 1
+        metrics.successful_calls += 1
+        metrics.cache_hits += 1
+        metrics.last_called_at = datetime.now()
+
+        audit_logger.log(ToolAuditEvent(
+            action="tool_cache_hit",
+            session_id=session_id,
+            task_id=task_id,
+            agent_id=agent_id,
+            tool_name=tool_id,
+            tool_action=kwargs.get("action"),
+            parameters_hash=ToolAuditEvent.hash_params(kwargs),
+            output_length=len(result.output) if result.output else 0,
+        ))
+
+        if enforcer and enforcement_result:
+            await enforcer.record_tool_execution(
+                tool_id, kwargs, result, 0.0, enforcement_result
+            )
+
+        return result
+
     def get_metrics(self, tool_id: str | None = None) -> dict[str, Any]:
         """Get tool metrics.
 
@@ -292,10 +354,33 @@ class ToolExecutor:
 
         return {
             "tools": {tid: m.to_dict() for tid, m in self._metrics.items()},
+            "history": {
+                tid: self._store.query(METRICS_NAMESPACE, tid).to_dict()
+                for tid in self._store.keys(METRICS_NAMESPACE)
+            },
             "total_calls": sum(m.total_calls for m in self._metrics.values()),
             "total_errors": sum(m.failed_calls for m in self._metrics.values()),
+            "result_cache": tool_result_cache.get_stats(),
         }
 
+    def get_latency(
+        self,
+        tool_id: str,
+        window: timedelta | None = None,
+        quantiles: tuple[float, ...] = (0.5, 0.95, 0.99),
+    ) -> dict[str, Any]:
+        """Get persisted duration percentiles (ms) for a tool over a window.
+
+        Args:
+            tool_id: Tool to query
+            window: Trailing window, or all recorded history if None
+            quantiles: Quantiles to estimate
+
+        Returns:
+            Count, error rate and percentile dictionary
+        """
+        return self._store.query(METRICS_NAMESPACE, tool_id, window, quantiles).to_dict()
+
     def get_rate_limit_status(self, tool_id: str) -> dict[str, Any]:
         """Get current rate limit status for a tool."""
         limit = self._rate_limits.get(tool_id)
@@ -321,4 +406,4 @@ class ToolExecutor:
 
 
 # Global tool executor
-tool_executor = ToolExecutor()
+tool_executor = ToolExecutor(store=metrics_store)
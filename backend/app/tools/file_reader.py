@@ -0,0 +1,255 @@
+"""Ranged, non-blocking file reads for the filesystem tool.
+
+Reading a window of lines from a large file should not require loading the
+whole file into memory or blocking the event loop. This module keeps a sparse
+line-offset index per file (one checkpoint per chunk scanned) so that:
+- The total line count is known without re-reading the file
+- A read of lines [offset, offset + limit) seeks to the nearest checkpoint and
+  only scans at most one chunk before the requested window
+- Indexes are invalidated automatically when the file's mtime or size changes
+
+All disk I/O runs in a worker thread via ``asyncio.to_thread``.
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Size of the blocks scanned while building an index. One checkpoint is
+# recorded per block, so seeking never scans more than this many bytes.
+INDEX_CHUNK_SIZE = 64 * 1024
+
+# Bytes sniffed from the head of a file for binary detection
+BINARY_SNIFF_BYTES = 8192
+
+# Maximum bytes of content returned by a single read
+DEFAULT_MAX_READ_BYTES = 512 * 1024
+
+
+@dataclass
+class LineIndex:
+    """Sparse line-offset index for a single file.
+
+    ``checkpoint_lines[i]`` is a 0-indexed line number and
+    ``checkpoint_offsets[i]`` is the byte offset where that line starts.
+    """
+
+    path: str
+    mtime_ns: int
+    size: int
+    total_lines: int
+    is_binary: bool
+    checkpoint_lines: array = field(default_factory=lambda: array("Q", [0]))
+    checkpoint_offsets: array = field(default_factory=lambda: array("Q", [0]))
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Check whether this index is still valid for the given stat result."""
+        return self.mtime_ns == st.st_mtime_ns and self.size == st.st_size
+
+    def seek_point(self, line: int) -> tuple[int, int]:
+        """Return (line_number, byte_offset) of the closest checkpoint at or before line."""
+        i = bisect.bisect_right(self.checkpoint_lines, line) - 1
+        return self.checkpoint_lines[i], self.checkpoint_offsets[i]
+
+
+@dataclass
+class FileWindow:
+    """Result of a ranged file read."""
+
+    content: str
+    total_lines: int
+    returned_lines: int
+    bytes_read: int
+    truncated: bool = False
+    is_binary: bool = False
+    size: int = 0
+
+
+def _build_index(path: Path, st: os.stat_result) -> LineIndex:
+    """Scan a file once and build its sparse line index."""
+    checkpoint_lines = array("Q", [0])
+    checkpoint_offsets = array("Q", [0])
+    lines = 0
+    base = 0
+    last_byte = b""
+
+    with open(path, "rb") as f:
+        head = f.read(BINARY_SNIFF_BYTES)
+        if b"\x00" in head:
+            return LineIndex(
+                path=str(path),
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                total_lines=0,
+                is_binary=True,
+            )
+        f.seek(0)
+
+        while chunk := f.read(INDEX_CHUNK_SIZE):
+            newlines = chunk.count(b"\n")
+            if newlines:
+                lines += newlines
+                # Start of the first line beginning after the last newline
+                checkpoint_lines.append(lines)
+                checkpoint_offsets.append(base + chunk.rfind(b"\n") + 1)
+            base += len(chunk)
+            last_byte = chunk[-1:]
+
+    # A trailing line without a newline still counts (matches readlines())
+    if base and last_byte != b"\n":
+        lines += 1
+
+    return LineIndex(
+        path=str(path),
+        mtime_ns=st.st_mtime_ns,
+        size=st.st_size,
+        total_lines=lines,
+        is_binary=False,
+        checkpoint_lines=checkpoint_lines,
+        checkpoint_offsets=checkpoint_offsets,
+    )
+
+
+class LineIndexCache:
+    """LRU cache of line indexes keyed by resolved path.
+
+    Entries are validated against (mtime_ns, size) on every lookup, so a
+    modified file is re-indexed transparently. Thread-safe, since lookups
+    happen from worker threads.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._entries: OrderedDict[str, LineIndex] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> LineIndex:
+        """Get a valid index for path, building it if missing or stale."""
+        st = os.stat(path)
+        key = str(path)
+
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None and index.matches(st):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+
+        index = _build_index(path, st)
+
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+        return index
+
+    def invalidate(self, path: Path | str) -> None:
+        """Drop the cached index for a path."""
+        with self._lock:
+            self._entries.pop(str(path), None)
+
+    def clear(self) -> None:
+        """Drop all cached indexes."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get cache statistics."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def read_window_sync(
+    path: Path,
+    offset: int = 0,
+    limit: int = 500,
+    max_bytes: int = DEFAULT_MAX_READ_BYTES,
+    cache: "LineIndexCache | None" = None,
+) -> FileWindow:
+    """Read lines [offset, offset + limit) from a file (0-indexed offset).
+
+    Blocking; use ``read_window`` from async code.
+    """
+    index = (cache or line_index_cache).get(path)
+    if index.is_binary:
+        return FileWindow(
+            content="",
+            total_lines=0,
+            returned_lines=0,
+            bytes_read=0,
+            is_binary=True,
+            size=index.size,
+        )
+
+    offset = max(offset, 0)
+    if limit <= 0 or offset >= index.total_lines:
+        return FileWindow(
+            content="",
+            total_lines=index.total_lines,
+            returned_lines=0,
+            bytes_read=0,
+            size=index.size,
+        )
+
+    start_line, start_offset = index.seek_point(offset)
+    selected: list[bytes] = []
+    bytes_read = 0
+    truncated = False
+
+    with open(path, "rb") as f:
+        f.seek(start_offset)
+        for _ in range(offset - start_line):
+            if not f.readline():
+                break
+
+        while len(selected) < limit:
+            line = f.readline()
+            if not line:
+                break
+            if bytes_read + len(line) > max_bytes:
+                remaining = max_bytes - bytes_read
+                if remaining > 0:
+                    selected.append(line[:remaining])
+                    bytes_read += remaining
+                truncated = True
+                break
+            selected.append(line)
+            bytes_read += len(line)
+
+    content = b"".join(selected).decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+    return FileWindow(
+        content=content,
+        total_lines=index.total_lines,
+        returned_lines=len(selected),
+        bytes_read=bytes_read,
+        truncated=truncated,
+        size=index.size,
+    )
+
+
+async def read_window(
+    path: Path,
+    offset: int = 0,
+    limit: int = 500,
+    max_bytes: int = DEFAULT_MAX_READ_BYTES,
+) -> FileWindow:
+    """Read a line window from a file in a worker thread."""
+    return await asyncio.to_thread(read_window_sync, path, offset, limit, max_bytes)
+
+
+# Global line index cache
+line_index_cache = LineIndexCache()
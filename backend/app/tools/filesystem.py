@@ -6,12 +6,14 @@ from pathlib import Path
 from typing import Any
 
 from app.tools.base import Tool, ToolParameter, ToolResult, registry
+from app.tools.file_reader import line_index_cache, read_window
 from app.tools.path_security import (
     FileOperation,
     PathValidator,
     security_audit,
     validate_and_audit,
 )
+from app.tools.result_cache import tool_result_cache
 
 
 class FilesystemTool(Tool):
@@ -212,24 +214,34 @@ class FilesystemTool(Tool):
                 offset = int(kwargs.get("offset", 1)) - 1
                 limit = int(kwargs.get("limit", 500))
 
-                with open(path, "r", encoding="utf-8", errors="replace") as f:
-                    lines = f.readlines()
+                # Ranged read in a worker thread using a cached line index
+                window = await read_window(path, offset=offset, limit=limit)
 
-                selected = lines[offset : offset + limit]
-                content = "".join(selected)
+                if window.is_binary:
+                    security_audit.log_operation(
+                        FileOperation.READ, path_str, str(path), success=False, allowed=True,
+                        agent_id=self._agent_id, error="Binary file"
+                    )
+                    return ToolResult(
+                        success=False,
+                        output="",
+                        error=f"Binary file ({window.size} bytes), not shown: {path}",
+                    )
 
                 security_audit.log_operation(
                     FileOperation.READ, path_str, str(path), success=True, allowed=True,
-                    agent_id=self._agent_id, details={"lines": len(selected), "bytes": len(content)}
+                    agent_id=self._agent_id,
+                    details={"lines": window.returned_lines, "bytes": window.bytes_read},
                 )
 
                 return ToolResult(
                     success=True,
-                    output=content,
+                    output=window.content,
                     data={
                         "path": str(path),
-                        "total_lines": len(lines),
-                        "returned_lines": len(selected),
+                        "total_lines": window.total_lines,
+                        "returned_lines": window.returned_lines,
+                        "truncated": window.truncated,
                         "in_workspace": self._is_in_workspace(path),
                     },
                 )
@@ -313,6 +325,8 @@ class FilesystemTool(Tool):
                 path.parent.mkdir(parents=True, exist_ok=True)
                 with open(path, "w", encoding="utf-8") as f:
                     f.write(content)
+                line_index_cache.invalidate(path)
+                tool_result_cache.invalidate_path(path)
 
                 security_audit.log_operation(
                     FileOperation.WRITE, path_str, str(path), success=True, allowed=True,
@@ -350,6 +364,8 @@ class FilesystemTool(Tool):
                     shutil.rmtree(path)
                 else:
                     path.unlink()
+                    line_index_cache.invalidate(path)
+                tool_result_cache.invalidate_path(path)
 
                 security_audit.log_operation(
                     FileOperation.DELETE, path_str, str(path), success=True, allowed=True,
@@ -385,6 +401,7 @@ class FilesystemTool(Tool):
                     if dest.exists():
                         shutil.rmtree(dest)
                     shutil.copytree(source, dest, symlinks=False)  # Don't copy symlinks
+                    tool_result_cache.invalidate_path(dest)
                     file_count = sum(1 for _ in dest.rglob("*") if _.is_file())
 
                     security_audit.log_operation(
@@ -400,6 +417,9 @@ class FilesystemTool(Tool):
                 else:
                     dest.parent.mkdir(parents=True, exist_ok=True)
                     shutil.copy2(source, dest)
+                    # copy2 preserves mtime, so drop any stale index explicitly
+                    line_index_cache.invalidate(dest)
+                    tool_result_cache.invalidate_path(dest)
 
                     security_audit.log_operation(
                         FileOperation.COPY, path_str, str(dest), success=True, allowed=True,
@@ -6,7 +6,8 @@ tool executor, and formats results for the next LLM turn.
 Protocol:
     <tool_call>{"tool": "filesystem", "args": {"action": "read", "path": "/file"}}</tool_call>
 
-Multiple tool calls can appear in a single response and are executed sequentially.
+Multiple tool calls can appear in a single response. Read-only calls run
+concurrently; mutating calls run sequentially in the order given.
 
 Enterprise guardrails:
     - Budget enforcement (tool loops, shell time, etc.)
@@ -102,6 +103,7 @@ class ToolPolicy:
     max_iterations: int = 6
     per_call_timeout_seconds: float = 300.0
     workspace_path: str | None = None  # For filesystem jail
+    max_concurrent_reads: int = 4  # Per-turn cap for parallel read-only calls (1 = sequential)
 
     def is_tool_allowed(self, tool_id: str) -> bool:
         if self.allowed_tools is None:
@@ -260,63 +262,241 @@ async def execute_invocations(
     - Per-call timeout
     - Audit logging via AuditRepository
 
+    Contiguous runs of read-only invocations (as declared by the tool
+    contract) run concurrently, up to ``policy.max_concurrent_reads`` at a
+    time. Mutating invocations act as barriers and run one at a time, in
+    order. Results are always returned in the original invocation order.
+
     Returns list of execution results.
     """
-    results = []
+    results: list[ToolExecutionResult] = []
+
+    for read_only, batch in _partition_invocations(invocations):
+        if read_only and len(batch) > 1 and context.policy.max_concurrent_reads > 1:
+            batch_results, stop = await _execute_read_only_batch(batch, context)
+        else:
+            batch_results, stop = await _execute_sequential(batch, context)
+
+        results.extend(batch_results)
+        if stop:
+            # Budget exhausted - skip remaining invocations
+            break
+
+    return results
+
+
+def _is_read_only(invocation: ToolInvocation) -> bool:
+    """Check whether an invocation is side-effect free per the tool contract."""
+    # Lazy import to avoid circular dependency with app.agents
+    from app.agents.tool_contract import is_read_only_invocation
+
+    if invocation.parse_error:
+        # Never reaches a tool, so it cannot mutate anything
+        return True
+    return is_read_only_invocation(invocation.tool_id, invocation.args)
+
+
+def _partition_invocations(
+    invocations: list[ToolInvocation],
+) -> list[tuple[bool, list[ToolInvocation]]]:
+    """Split invocations into contiguous (read_only, batch) runs, preserving order."""
+    batches: list[tuple[bool, list[ToolInvocation]]] = []
+    for invocation in invocations:
+        read_only = _is_read_only(invocation)
+        if batches and batches[-1][0] == read_only:
+            batches[-1][1].append(invocation)
+        else:
+            batches.append((read_only, [invocation]))
+    return batches
+
+
+async def _blocked_tool_result(
+    invocation: ToolInvocation,
+    context: InterpreterContext,
+) -> ToolExecutionResult:
+    """Build (and audit) the result for a tool blocked by the allowlist."""
+    error_msg = f"Tool '{invocation.tool_id}' not allowed for agent '{context.agent_id}'"
+
+    # Log blocked tool call
+    if context.enable_audit:
+        try:
+            log = await AuditRepository.log_tool_call(
+                tool_name=invocation.tool_id,
+                parameters=invocation.args,
+                session_id=context.session_id,
+                task_id=context.task_id,
+                agent_id=context.agent_id,
+            )
+            await AuditRepository.log_tool_result(
+                log_id=log.id,
+                success=False,
+                error=error_msg,
+                policy_blocked=True,
+            )
+        except Exception as e:
+            logger.error(f"Audit logging failed: {e}")
+
+    return ToolExecutionResult(
+        invocation=invocation,
+        result=ToolResult(
+            success=False,
+            output="",
+            error=error_msg,
+        ),
+        duration_ms=0,
+    )
+
+
+async def _budget_exceeded_result(
+    invocation: ToolInvocation,
+    error: BudgetExceededError,
+    context: InterpreterContext,
+) -> ToolExecutionResult:
+    """Build (and audit) the result for an invocation rejected by the budget."""
+    # Log budget violation
+    if context.enable_audit:
+        try:
+            await AuditRepository.log_budget_check(
+                budget_type=error.budget_type.value,
+                current_value=float(error.current),
+                limit_value=float(error.limit),
+                exceeded=True,
+                session_id=context.session_id,
+                task_id=context.task_id,
+                agent_id=context.agent_id,
+            )
+        except Exception as log_err:
+            logger.error(f"Budget audit logging failed: {log_err}")
+
+    return ToolExecutionResult(
+        invocation=invocation,
+        result=ToolResult(
+            success=False,
+            output="",
+            error=error.message,
+        ),
+        duration_ms=0,
+    )
+
+
+def _unknown_tool_result(invocation: ToolInvocation) -> ToolExecutionResult:
+    """Build the result for an invocation naming an unregistered tool."""
+    return ToolExecutionResult(
+        invocation=invocation,
+        result=ToolResult(
+            success=False,
+            output="",
+            error=f"Unknown tool: {invocation.tool_id}",
+        ),
+        duration_ms=0,
+    )
+
+
+def _parse_error_result(invocation: ToolInvocation) -> ToolExecutionResult:
+    """Build the result for an invocation that failed to parse."""
+    return ToolExecutionResult(
+        invocation=invocation,
+        result=ToolResult(
+            success=False,
+            output="",
+            error=f"Parse error: {invocation.parse_error}",
+        ),
+        duration_ms=0,
+    )
+
+
+def _record_executed(exec_result: ToolExecutionResult, context: InterpreterContext) -> None:
+    """Record an executed invocation in the context history."""
+    context.execution_history.append(exec_result)
+    context.total_tool_calls += 1
+
+    logger.info(
+        f"Tool {exec_result.invocation.tool_id}: success={exec_result.result.success}, "
+        f"duration={exec_result.duration_ms:.0f}ms"
+    )
+
+
+async def _execute_read_only_batch(
+    invocations: list[ToolInvocation],
+    context: InterpreterContext,
+) -> tuple[list[ToolExecutionResult], bool]:
+    """Execute a batch of read-only invocations concurrently.
+
+    Pre-checks (allowlist, budget, tool lookup) run in order first, and the
+    tool-call budget is reserved for every admitted invocation before any of
+    them start, so concurrent execution can never overrun the budget.
+
+    Returns (results in original order, whether the budget was exhausted).
+    """
     budget_tracker = context.budget_tracker
+    slots: list[ToolExecutionResult | None] = []
+    admitted: list[tuple[int, ToolInvocation]] = []
+    stop = False
 
     for invocation in invocations:
-        audit_log_id: str | None = None
-        sandbox_violation = False
-        budget_exceeded = False
-        policy_blocked = False
+        if invocation.parse_error:
+            slots.append(_parse_error_result(invocation))
+            continue
+
+        if not context.policy.is_tool_allowed(invocation.tool_id):
+            slots.append(await _blocked_tool_result(invocation, context))
+            continue
+
+        if budget_tracker:
+            try:
+                budget_tracker.check_tool_call()
+            except BudgetExceededError as e:
+                slots.append(await _budget_exceeded_result(invocation, e, context))
+                stop = True
+                break
 
+        if not tool_registry.get(invocation.tool_id):
+            slots.append(_unknown_tool_result(invocation))
+            continue
+
+        if budget_tracker:
+            budget_tracker.reserve_tool_call()
+
+        admitted.append((len(slots), invocation))
+        slots.append(None)
+
+    semaphore = asyncio.Semaphore(context.policy.max_concurrent_reads)
+
+    async def run(invocation: ToolInvocation) -> ToolExecutionResult:
+        async with semaphore:
+            return await _run_invocation(
+                invocation, invocation.args.copy(), context, budget_reserved=True
+            )
+
+    executed = await asyncio.gather(*(run(invocation) for _, invocation in admitted))
+
+    for (slot, _), exec_result in zip(admitted, executed):
+        slots[slot] = exec_result
+        _record_executed(exec_result, context)
+
+    return [r for r in slots if r is not None], stop
+
+
+async def _execute_sequential(
+    invocations: list[ToolInvocation],
+    context: InterpreterContext,
+) -> tuple[list[ToolExecutionResult], bool]:
+    """Execute invocations one at a time, in order.
+
+    Returns (results, whether the budget was exhausted).
+    """
+    results = []
+    budget_tracker = context.budget_tracker
+
+    for invocation in invocations:
         # Check for parse errors
         if invocation.parse_error:
-            results.append(ToolExecutionResult(
-                invocation=invocation,
-                result=ToolResult(
-                    success=False,
-                    output="",
-                    error=f"Parse error: {invocation.parse_error}",
-                ),
-                duration_ms=0,
-            ))
+            results.append(_parse_error_result(invocation))
             continue
 
         # Check allowlist
         if not context.policy.is_tool_allowed(invocation.tool_id):
-            policy_blocked = True
-            error_msg = f"Tool '{invocation.tool_id}' not allowed for agent '{context.agent_id}'"
-
-            # Log blocked tool call
-            if context.enable_audit:
-                try:
-                    log = await AuditRepository.log_tool_call(
-                        tool_name=invocation.tool_id,
-                        parameters=invocation.args,
-                        session_id=context.session_id,
-                        task_id=context.task_id,
-                        agent_id=context.agent_id,
-                    )
-                    await AuditRepository.log_tool_result(
-                        log_id=log.id,
-                        success=False,
-                        error=error_msg,
-                        policy_blocked=True,
-                    )
-                except Exception as e:
-                    logger.error(f"Audit logging failed: {e}")
-
-            results.append(ToolExecutionResult(
-                invocation=invocation,
-                result=ToolResult(
-                    success=False,
-                    output="",
-                    error=error_msg,
-                ),
-                duration_ms=0,
-            ))
+            results.append(await _blocked_tool_result(invocation, context))
             continue
 
         # Check budget before execution
@@ -324,47 +504,14 @@ async def execute_invocations(
             try:
                 budget_tracker.check_tool_call()
             except BudgetExceededError as e:
-                budget_exceeded = True
-
-                # Log budget violation
-                if context.enable_audit:
-                    try:
-                        await AuditRepository.log_budget_check(
-                            budget_type=e.budget_type.value,
-                            current_value=float(e.current),
-                            limit_value=float(e.limit),
-                            exceeded=True,
-                            session_id=context.session_id,
-                            task_id=context.task_id,
-                            agent_id=context.agent_id,
-                        )
-                    except Exception as log_err:
-                        logger.error(f"Budget audit logging failed: {log_err}")
-
-                results.append(ToolExecutionResult(
-                    invocation=invocation,
-                    result=ToolResult(
-                        success=False,
-                        output="",
-                        error=e.message,
-                    ),
-                    duration_ms=0,
-                ))
+                results.append(await _budget_exceeded_result(invocation, e, context))
                 # Stop processing further invocations when budget exceeded
-                break
+                return results, True
 
         # Check tool exists
         tool = tool_registry.get(invocation.tool_id)
         if not tool:
-            results.append(ToolExecutionResult(
-                invocation=invocation,
-                result=ToolResult(
-                    success=False,
-                    output="",
-                    error=f"Unknown tool: {invocation.tool_id}",
-                ),
-                duration_ms=0,
-            ))
+            results.append(_unknown_tool_result(invocation))
             continue
 
         # Inject workspace path for filesystem operations
@@ -378,7 +525,6 @@ async def execute_invocations(
                 target_path = dest if action == "copy" else path
 
                 if target_path and not target_path.startswith(context.policy.workspace_path):
-                    sandbox_violation = True
                     error_msg = f"Write operations only allowed in workspace: {context.policy.workspace_path}"
 
                     # Log sandbox violation
@@ -585,115 +731,130 @@ async def execute_invocations(
                 # Continue with execution on approval error (fail-open for now)
                 # In production, you might want to fail-closed instead
 
-        # Log tool call before execution
-        if context.enable_audit:
-            try:
-                log = await AuditRepository.log_tool_call(
-                    tool_name=invocation.tool_id,
-                    tool_action=args.get("action"),
-                    parameters=invocation.args,
-                    session_id=context.session_id,
-                    task_id=context.task_id,
-                    agent_id=context.agent_id,
-                )
-                audit_log_id = log.id
-            except Exception as e:
-                logger.error(f"Audit logging failed: {e}")
+        exec_result = await _run_invocation(invocation, args, context)
+        results.append(exec_result)
+        _record_executed(exec_result, context)
 
-        # Execute with timeout and optional shell time tracking
-        start_time = time.time()
-        is_shell_call = invocation.tool_id == "shell"
+    return results, False
 
+
+async def _run_invocation(
+    invocation: ToolInvocation,
+    args: dict[str, Any],
+    context: InterpreterContext,
+    budget_reserved: bool = False,
+) -> ToolExecutionResult:
+    """Run a checked invocation through the tool executor.
+
+    Handles audit logging, the per-call timeout and budget accounting.
+    When ``budget_reserved`` is set, the tool call was already counted at
+    admission time and only its output size is recorded here.
+    """
+    audit_log_id: str | None = None
+    budget_exceeded = False
+    budget_tracker = context.budget_tracker
+
+    # Log tool call before execution
+    if context.enable_audit:
         try:
-            # Check shell budget before execution
-            if is_shell_call and budget_tracker:
-                budget_tracker.check_shell_call()
-
-            result = await asyncio.wait_for(
-                tool_executor.execute(
-                    tool_id=invocation.tool_id,
-                    session_id=context.session_id,
-                    task_id=context.task_id,
-                    agent_id=context.agent_id,
-                    skip_guardrails=True,  # Interpreter already enforces guardrails
-                    **args,
-                ),
-                timeout=context.policy.per_call_timeout_seconds,
-            )
-        except asyncio.TimeoutError:
-            result = ToolResult(
-                success=False,
-                output="",
-                error=f"Tool execution timed out after {context.policy.per_call_timeout_seconds}s",
-            )
-        except BudgetExceededError as e:
-            budget_exceeded = True
-            result = ToolResult(
-                success=False,
-                output="",
-                error=e.message,
+            log = await AuditRepository.log_tool_call(
+                tool_name=invocation.tool_id,
+                tool_action=args.get("action"),
+                parameters=invocation.args,
+                session_id=context.session_id,
+                task_id=context.task_id,
+                agent_id=context.agent_id,
             )
+            audit_log_id = log.id
         except Exception as e:
-            logger.error(f"Tool execution error: {e}", exc_info=True)
-            result = ToolResult(
-                success=False,
-                output="",
-                error=str(e),
-            )
+            logger.error(f"Audit logging failed: {e}")
 
-        duration_ms = (time.time() - start_time) * 1000
-        duration_seconds = duration_ms / 1000
+    # Execute with timeout and optional shell time tracking
+    start_time = time.time()
+    is_shell_call = invocation.tool_id == "shell"
 
-        # Record shell time if applicable
-        if is_shell_call and budget_tracker and result.success:
-            budget_tracker.record_shell_time(duration_seconds)
+    try:
+        # Check shell budget before execution
+        if is_shell_call and budget_tracker:
+            budget_tracker.check_shell_call()
+
+        result = await asyncio.wait_for(
+            tool_executor.execute(
+                tool_id=invocation.tool_id,
+                session_id=context.session_id,
+                task_id=context.task_id,
+                agent_id=context.agent_id,
+                skip_guardrails=True,  # Interpreter already enforces guardrails
+                **args,
+            ),
+            timeout=context.policy.per_call_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        result = ToolResult(
+            success=False,
+            output="",
+            error=f"Tool execution timed out after {context.policy.per_call_timeout_seconds}s",
+        )
+    except BudgetExceededError as e:
+        budget_exceeded = True
+        result = ToolResult(
+            success=False,
+            output="",
+            error=e.message,
+        )
+    except Exception as e:
+        logger.error(f"Tool execution error: {e}", exc_info=True)
+        result = ToolResult(
+            success=False,
+            output="",
+            error=str(e),
+        )
 
-            # Check if shell execution exceeded per-call limit
-            if context.agent_policy:
-                max_shell_time = context.agent_policy.budget.max_shell_time_seconds
-                if duration_seconds > max_shell_time:
-                    logger.warning(
-                        f"Shell execution exceeded time limit: "
-                        f"{duration_seconds:.2f}s > {max_shell_time}s"
-                    )
+    duration_ms = (time.time() - start_time) * 1000
+    duration_seconds = duration_ms / 1000
 
-        # Record tool call in budget tracker
-        if budget_tracker:
-            budget_tracker.record_tool_call(
-                output_size=len(result.output) if result.output else 0
-            )
+    # Record shell time if applicable
+    if is_shell_call and budget_tracker and result.success:
+        budget_tracker.record_shell_time(duration_seconds)
 
-        # Log tool result
-        if context.enable_audit and audit_log_id:
-            try:
-                await AuditRepository.log_tool_result(
-                    log_id=audit_log_id,
-                    success=result.success,
-                    output=result.output,
-                    error=result.error,
-                    duration_ms=duration_ms,
-                    sandbox_violation=sandbox_violation,
-                    budget_exceeded=budget_exceeded,
-                    policy_blocked=policy_blocked,
+        # Check if shell execution exceeded per-call limit
+        if context.agent_policy:
+            max_shell_time = context.agent_policy.budget.max_shell_time_seconds
+            if duration_seconds > max_shell_time:
+                logger.warning(
+                    f"Shell execution exceeded time limit: "
+                    f"{duration_seconds:.2f}s > {max_shell_time}s"
                 )
-            except Exception as e:
-                logger.error(f"Audit logging failed: {e}")
 
-        exec_result = ToolExecutionResult(
-            invocation=invocation,
-            result=result,
-            duration_ms=duration_ms,
-        )
-        results.append(exec_result)
-        context.execution_history.append(exec_result)
-        context.total_tool_calls += 1
+    # Record tool call in budget tracker
+    if budget_tracker:
+        output_size = len(result.output) if result.output else 0
+        if budget_reserved:
+            budget_tracker.record_output_size(output_size)
+        else:
+            budget_tracker.record_tool_call(output_size=output_size)
 
-        logger.info(
-            f"Tool {invocation.tool_id}: success={result.success}, "
-            f"duration={duration_ms:.0f}ms"
-        )
+    # Log tool result
+    if context.enable_audit and audit_log_id:
+        try:
+            await AuditRepository.log_tool_result(
+                log_id=audit_log_id,
+                success=result.success,
+                output=result.output,
+                error=result.error,
+                duration_ms=duration_ms,
+                sandbox_violation=False,
+                budget_exceeded=budget_exceeded,
+                policy_blocked=False,
+            )
+        except Exception as e:
+            logger.error(f"Audit logging failed: {e}")
 
-    return results
+    return ToolExecutionResult(
+        invocation=invocation,
+        result=result,
+        duration_ms=duration_ms,
+    )
 
 
 def format_tool_results_for_llm(results: list[ToolExecutionResult]) -> str:
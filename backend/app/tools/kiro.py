@@ -4,6 +4,8 @@ import asyncio
 import os
 from typing import Any
 
+from app.llm.kiro_provider import kiro_circuit_breaker
+from app.resilience.circuit_breaker import CircuitBreakerError
 from app.tools.base import Tool, ToolParameter, ToolResult, registry
 
 
@@ -200,17 +202,32 @@ class KiroTool(Tool):
         # Use subprocess with stdin pipe to pass the prompt
         cmd = [kiro_cmd, "chat", "--trust-all-tools", "--no-interactive"]
 
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=workdir,
-            env={**os.environ},
-        )
+        try:
+            guard = kiro_circuit_breaker().protect()
+        except CircuitBreakerError as e:
+            return ToolResult(
+                success=False,
+                output="",
+                error=(
+                    "Kiro CLI is unavailable after repeated failures, "
+                    f"retry in {e.retry_after:.0f}s"
+                ),
+            )
+
+        with guard:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=workdir,
+                env={**os.environ},
+            )
 
-        # Send prompt via stdin and wait for completion
-        stdout, stderr = await process.communicate(input=prompt.encode("utf-8"))
+            # Send prompt via stdin and wait for completion
+            stdout, stderr = await process.communicate(input=prompt.encode("utf-8"))
+            if process.returncode != 0:
+                guard.fail()
 
         output = stdout.decode("utf-8", errors="replace")
         stderr_text = stderr.decode("utf-8", errors="replace")
@@ -6,6 +6,7 @@ from typing import Any
 import httpx
 
 from app.tools.base import Tool, ToolParameter, ToolResult, registry
+from app.utils.http_client import http_client_manager
 
 
 class MarketDataTool(Tool):
@@ -60,10 +61,11 @@ class MarketDataTool(Tool):
             url = "https://query1.finance.yahoo.com/v8/finance/chart/" + symbol
             params = {"range": period, "interval": interval, "includePrePost": "false"}
 
-            async with httpx.AsyncClient(timeout=30, verify=False) as client:
-                resp = await client.get(url, params=params, headers={"User-Agent": "MaratOS/1.0"})
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await http_client_manager.get(
+                url, verify=False, params=params, headers={"User-Agent": "MaratOS/1.0"}, timeout=30
+            )
+            resp.raise_for_status()
+            data = resp.json()
 
             result = data.get("chart", {}).get("result", [])
             if not result:
@@ -156,46 +158,52 @@ class QuoteTool(Tool):
             output_lines = []
             quote_data = []
 
-            async with httpx.AsyncClient(timeout=30, verify=False) as client:
-                for sym in symbols[:10]:  # Limit to 10 symbols
-                    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{sym}"
-                    params = {"range": "1d", "interval": "1d"}
-                    
-                    resp = await client.get(url, params=params, headers={"User-Agent": "MaratOS/1.0"})
-                    if resp.status_code != 200:
-                        output_lines.append(f"**{sym}**: Error fetching data")
-                        continue
-                    
-                    data = resp.json()
-                    result = data.get("chart", {}).get("result", [])
-                    if not result:
-                        output_lines.append(f"**{sym}**: No data")
-                        continue
-                    
-                    meta = result[0].get("meta", {})
-                    price = meta.get("regularMarketPrice")
-                    prev = meta.get("previousClose", meta.get("chartPreviousClose"))
-                    name = meta.get("shortName", sym)
-                    
-                    line = f"**{sym}** ({name}): "
-                    if price:
-                        line += f"${price:.2f}"
-                        if prev:
-                            change = price - prev
-                            pct = (change / prev) * 100
-                            line += f" ({'+' if change >= 0 else ''}{change:.2f}, {'+' if pct >= 0 else ''}{pct:.2f}%)"
-                    else:
-                        line += "N/A"
-                    
-                    output_lines.append(line)
-                    quote_data.append({
-                        "symbol": sym,
-                        "name": name,
-                        "price": price,
-                        "change": (price - prev) if price and prev else None,
-                        "change_percent": ((price - prev) / prev * 100) if price and prev else None,
-                        "volume": meta.get("regularMarketVolume"),
-                    })
+            for sym in symbols[:10]:  # Limit to 10 symbols
+                url = f"https://query1.finance.yahoo.com/v8/finance/chart/{sym}"
+                params = {"range": "1d", "interval": "1d"}
+
+                resp = await http_client_manager.get(
+                    url,
+                    verify=False,
+                    params=params,
+                    headers={"User-Agent": "MaratOS/1.0"},
+                    timeout=30,
+                )
+                if resp.status_code != 200:
+                    output_lines.append(f"**{sym}**: Error fetching data")
+                    continue
+
+                data = resp.json()
+                result = data.get("chart", {}).get("result", [])
+                if not result:
+                    output_lines.append(f"**{sym}**: No data")
+                    continue
+
+                meta = result[0].get("meta", {})
+                price = meta.get("regularMarketPrice")
+                prev = meta.get("previousClose", meta.get("chartPreviousClose"))
+                name = meta.get("shortName", sym)
+
+                line = f"**{sym}** ({name}): "
+                if price:
+                    line += f"${price:.2f}"
+                    if prev:
+                        change = price - prev
+                        pct = (change / prev) * 100
+                        sign = "+" if change >= 0 else ""
+                        line += f" ({sign}{change:.2f}, {sign}{pct:.2f}%)"
+                else:
+                    line += "N/A"
+
+                output_lines.append(line)
+                quote_data.append({
+                    "symbol": sym,
+                    "name": name,
+                    "price": price,
+                    "change": (price - prev) if price and prev else None,
+                    "change_percent": ((price - prev) / prev * 100) if price and prev else None,
+                    "volume": meta.get("regularMarketVolume"),
+                })
 
             return ToolResult(
                 success=True,
@@ -0,0 +1,267 @@
+"""Result cache for idempotent tool calls.
+
+Agents repeatedly issue the same read-only calls (filesystem read/list,
+web_fetch, sessions lookups) across loop iterations and subagents. This cache
+memoizes successful results of invocations the tool contract declares
+read-only.
+
+Cache key: (tool_id, normalized args, workspace). Entries that depend on
+local filesystem state also store a fingerprint (mtime/size) of the target
+path (and of its children, for directory listings), checked on every lookup,
+and are invalidated explicitly by:
+- Writes, deletes and copies through FilesystemTool (path-scoped)
+- Shell commands (drop all filesystem entries - a command can touch any path)
+
+Network and session entries expire by TTL.
+"""
+
+import json
+import logging
+import os
+import stat
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from app.tools.base import ToolResult
+
+logger = logging.getLogger(__name__)
+
+# TTL per cacheable tool. Only invocations the tool contract declares
+# read-only are cached, and only for tools listed here.
+CACHE_TTL_SECONDS: dict[str, float] = {
+    "filesystem": 300.0,
+    "web_fetch": 300.0,
+    "web_search": 600.0,
+    "sessions": 15.0,
+}
+
+# Tools whose results depend on local filesystem state
+LOCAL_STATE_TOOLS = frozenset({"filesystem"})
+
+# Results with larger output are not cached
+MAX_CACHED_OUTPUT_CHARS = 1_000_000
+
+
+@dataclass
+class CacheEntry:
+    """A cached tool result."""
+
+    result: ToolResult
+    expires_at: float
+    workspace: str
+    target: str | None = None
+    fingerprint: tuple | None = None
+
+
+@dataclass
+class CacheProbe:
+    """Outcome of a cache lookup, used to store the result on a miss."""
+
+    tool_id: str
+    key: tuple[str, str, str]
+    workspace: str
+    generation: int
+    target: str | None = None
+    fingerprint: tuple | None = None
+    hit: ToolResult | None = None
+
+
+def _fingerprint(target: str) -> tuple | None:
+    """Fingerprint a path's current state (None if it does not exist)."""
+    try:
+        st = os.stat(target)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode):
+        return (st.st_mtime_ns, st.st_size, st.st_mode)
+    # Listings include child sizes, and an in-place edit of a child does not
+    # touch the directory's own mtime, so fingerprint the children as well
+    children = []
+    try:
+        with os.scandir(target) as entries:
+            for entry in entries:
+                try:
+                    child = entry.stat()
+                except OSError:
+                    continue
+                children.append((entry.name, child.st_mtime_ns, child.st_size, child.st_mode))
+    except OSError:
+        return None
+    children.sort()
+    return (st.st_mtime_ns, st.st_mode, tuple(children))
+
+
+def _resolve_target(path_str: str, workspace: str) -> str | None:
+    """Resolve a tool path argument the same way FilesystemTool does."""
+    if not path_str:
+        return None
+    try:
+        p = Path(path_str).expanduser()
+        if not p.is_absolute() and workspace:
+            p = Path(workspace) / p
+        return os.path.realpath(p)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_within(path: str, parent: str) -> bool:
+    """Check whether path equals or is inside parent."""
+    return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+
+class ToolResultCache:
+    """LRU + TTL cache of tool results with workspace-aware invalidation."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self._entries: OrderedDict[tuple[str, str, str], CacheEntry] = OrderedDict()
+        self._max_entries = max_entries
+        # Bumped on every invalidation so results computed across an
+        # invalidation are never stored
+        self._generation = 0
+        self.enabled = True
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._tool_hits: dict[str, int] = {}
+        self._tool_misses: dict[str, int] = {}
+
+    def is_cacheable(self, tool_id: str, args: dict[str, Any]) -> bool:
+        """Check whether an invocation may be served from cache."""
+        if not self.enabled or tool_id not in CACHE_TTL_SECONDS:
+            return False
+        # Lazy import to avoid circular dependency with app.agents
+        from app.agents.tool_contract import is_read_only_invocation
+
+        return is_read_only_invocation(tool_id, args)
+
+    def probe(self, tool_id: str, args: dict[str, Any], workspace: str = "") -> CacheProbe | None:
+        """Look up an invocation. Returns None if it is not cacheable."""
+        if not self.is_cacheable(tool_id, args):
+            return None
+
+        target = None
+        fingerprint = None
+        key_args = dict(args)
+        if tool_id in LOCAL_STATE_TOOLS:
+            target = _resolve_target(str(args.get("path", "")), workspace)
+            if target:
+                key_args["path"] = target
+                fingerprint = _fingerprint(target)
+
+        key = (tool_id, json.dumps(key_args, sort_keys=True, default=str), workspace)
+        probe = CacheProbe(
+            tool_id=tool_id,
+            key=key,
+            workspace=workspace,
+            generation=self._generation,
+            target=target,
+            fingerprint=fingerprint,
+        )
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at <= time.monotonic() or entry.fingerprint != fingerprint:
+                del self._entries[key]
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._tool_hits[tool_id] = self._tool_hits.get(tool_id, 0) + 1
+                data = dict(entry.result.data or {})
+                data["cache_hit"] = True
+                probe.hit = replace(entry.result, data=data)
+                return probe
+
+        self.misses += 1
+        self._tool_misses[tool_id] = self._tool_misses.get(tool_id, 0) + 1
+        return probe
+
+    def store(self, probe: CacheProbe, result: ToolResult) -> None:
+        """Store the result of a missed probe."""
+        if not result.success or probe.generation != self._generation:
+            return
+        if result.output and len(result.output) > MAX_CACHED_OUTPUT_CHARS:
+            return
+
+        self._entries[probe.key] = CacheEntry(
+            result=result,
+            expires_at=time.monotonic() + CACHE_TTL_SECONDS[probe.tool_id],
+            workspace=probe.workspace,
+            target=probe.target,
+            fingerprint=probe.fingerprint,
+        )
+        self._entries.move_to_end(probe.key)
+        self.stores += 1
+
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_path(self, path: Path | str) -> int:
+        """Drop local entries affected by a change to path.
+
+        Covers the path itself, anything under it (directory deletes) and its
+        ancestors (directory listings and existence checks).
+        """
+        changed = os.path.realpath(path)
+        self._generation += 1
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.target is not None
+            and (_is_within(entry.target, changed) or _is_within(changed, entry.target))
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def invalidate_local(self, workspace: str | None = None) -> int:
+        """Drop all entries that depend on local filesystem state.
+
+        If workspace is given, only entries recorded for that workspace.
+        """
+        self._generation += 1
+        stale = [
+            key for key, entry in self._entries.items()
+            if key[0] in LOCAL_STATE_TOOLS
+            and (workspace is None or entry.workspace == workspace)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._generation += 1
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "by_tool": {
+                tool_id: {
+                    "hits": self._tool_hits.get(tool_id, 0),
+                    "misses": self._tool_misses.get(tool_id, 0),
+                }
+                for tool_id in sorted(set(self._tool_hits) | set(self._tool_misses))
+            },
+        }
+
+
+# Global tool result cache
+tool_result_cache = ToolResultCache()
@@ -6,6 +6,7 @@ from typing import Any, AsyncIterator, Callable
 
 from app.config import settings
 from app.tools.base import Tool, ToolParameter, ToolResult, registry
+from app.tools.result_cache import tool_result_cache
 
 
 # Type for activity callbacks
@@ -94,6 +95,9 @@ class ShellTool(Tool):
 
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
+        finally:
+            # A command may have changed any file; drop cached filesystem results
+            tool_result_cache.invalidate_local()
 
     async def execute_streaming(
         self,
@@ -184,6 +188,9 @@ class ShellTool(Tool):
 
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
+        finally:
+            # A command may have changed any file; drop cached filesystem results
+            tool_result_cache.invalidate_local()
 
     async def stream_output(self, **kwargs: Any) -> AsyncIterator[str]:
         """Execute shell command and yield output lines as they arrive.
@@ -271,6 +278,8 @@ class ShellTool(Tool):
             yield json.dumps({"type": "error", "error": f"Command timed out after {timeout}s"})
         except Exception as e:
             yield json.dumps({"type": "error", "error": str(e)})
+        finally:
+            tool_result_cache.invalidate_local()
 
 
 # Register the tool
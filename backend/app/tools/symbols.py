@@ -0,0 +1,148 @@
+"""Code symbol lookup tool backed by the project symbol index."""
+
+import asyncio
+from typing import Any
+
+from app.projects import project_registry
+from app.projects.symbol_index import SymbolDef, SymbolRef, symbol_index_manager
+from app.tools.base import Tool, ToolParameter, ToolResult, registry
+
+
+def _format_def(d: SymbolDef) -> str:
+    return f"{d.file}:{d.line}  {d.kind} {d.qualified_name}  |  {d.signature}"
+
+
+def _format_ref(r: SymbolRef) -> str:
+    detail = f" from {r.detail}" if r.detail and r.detail != r.name else ""
+    return f"{r.file}:{r.line}  {r.kind} {r.name}{detail}"
+
+
+class CodeSymbolsTool(Tool):
+    """Look up definitions, references and file outlines in a project.
+
+    Uses the symbol index built during project ingest, so jump-to-definition
+    takes one call instead of several grep + read iterations.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            id="code_symbols",
+            name="Code Symbols",
+            description=(
+                "Find where functions/classes are defined or used in a registered project "
+                "(Python, TS/JS, Go)"
+            ),
+            parameters=[
+                ToolParameter(
+                    name="action",
+                    type="string",
+                    description="Action to perform",
+                    enum=["definition", "references", "search", "outline"],
+                ),
+                ToolParameter(
+                    name="project",
+                    type="string",
+                    description="Registered project name",
+                ),
+                ToolParameter(
+                    name="name",
+                    type="string",
+                    description=(
+                        "Symbol name, e.g. 'authenticate' or 'AuthService.refresh' "
+                        "(definition/references/search)"
+                    ),
+                    required=False,
+                ),
+                ToolParameter(
+                    name="path",
+                    type="string",
+                    description="File path relative to the project root (outline)",
+                    required=False,
+                ),
+                ToolParameter(
+                    name="kind",
+                    type="string",
+                    description=(
+                        "Optional kind filter (function, method, class, type, import, call, ...)"
+                    ),
+                    required=False,
+                ),
+                ToolParameter(
+                    name="limit",
+                    type="number",
+                    description="Max results to return (default: 30)",
+                    required=False,
+                    default=30,
+                ),
+            ],
+        )
+
+    async def execute(self, **kwargs: Any) -> ToolResult:
+        """Execute a symbol lookup."""
+        action = kwargs.get("action")
+        if action not in ("definition", "references", "search", "outline"):
+            return ToolResult(
+                success=False,
+                output="",
+                error=f"Unknown action: {action}. Use: definition, references, search, outline",
+            )
+
+        name = kwargs.get("name")
+        path = kwargs.get("path")
+        if action == "outline" and not path:
+            return ToolResult(success=False, output="", error="path is required for outline action")
+        if action != "outline" and not name:
+            return ToolResult(
+                success=False, output="", error=f"name is required for {action} action"
+            )
+
+        project_name = str(kwargs.get("project") or "").lower()
+        project = project_registry.get(project_name)
+        if not project:
+            return ToolResult(success=False, output="", error=f"Project not found: {project_name}")
+
+        index = await asyncio.to_thread(symbol_index_manager.get_fresh, project.name, project.path)
+        if index is None:
+            # Not ingested yet - build the index now
+            await asyncio.to_thread(symbol_index_manager.build, project.name, project.path)
+            index = symbol_index_manager.get(project.name, project.path)
+        if index is None:
+            return ToolResult(
+                success=False, output="", error=f"Could not index project: {project.name}"
+            )
+
+        kind = kwargs.get("kind") or None
+        limit = int(kwargs.get("limit", 30))
+
+        if action == "definition":
+            items = index.find_definitions(name, kind=kind, limit=limit)
+            lines = [_format_def(d) for d in items]
+        elif action == "references":
+            items = index.find_references(name, kind=kind, limit=limit)
+            lines = [_format_ref(r) for r in items]
+        elif action == "search":
+            items = index.search(name, kind=kind, limit=limit)
+            lines = [_format_def(d) for d in items]
+        else:
+            items = index.outline(path)[:limit]
+            lines = [f"{d.line}  {d.kind} {d.qualified_name}" for d in items]
+
+        target = name or path
+        if not lines:
+            return ToolResult(
+                success=True,
+                output=f"No {action} results for '{target}' in {project.name}",
+                data={"action": action, "results": []},
+            )
+
+        return ToolResult(
+            success=True,
+            output=(
+                f"{action} results for '{target}' in {project.name} (root: {index.root}):\n"
+                + "\n".join(lines)
+            ),
+            data={"action": action, "results": [i.to_dict() for i in items]},
+        )
+
+
+registry.register(CodeSymbolsTool())
@@ -6,6 +6,7 @@ import httpx
 
 from app.config import settings
 from app.tools.base import Tool, ToolParameter, ToolResult, registry
+from app.utils.http_client import http_client_manager
 
 
 class WebSearchTool(Tool):
@@ -49,17 +50,16 @@ class WebSearchTool(Tool):
             )
 
         try:
-            async with httpx.AsyncClient(timeout=settings.http_timeout) as client:
-                response = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": count},
-                    headers={
-                        "X-Subscription-Token": self.api_key,
-                        "Accept": "application/json",
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await http_client_manager.get(
+                "https://api.search.brave.com/res/v1/web/search",
+                params={"q": query, "count": count},
+                headers={
+                    "X-Subscription-Token": self.api_key,
+                    "Accept": "application/json",
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
 
             results = []
             for item in data.get("web", {}).get("results", []):
@@ -122,24 +122,17 @@ class WebFetchTool(Tool):
             return ToolResult(success=False, output="", error="No URL provided")
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                timeout=settings.http_timeout
-            ) as client:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": "MaratOS/0.1"},
-                )
-                response.raise_for_status()
+            # Streams only up to max_chars; revalidates cached pages via ETag/Last-Modified
+            response = await http_client_manager.fetch_text(url, max_chars=max_chars)
 
-            content = response.text[:max_chars]
-            if len(response.text) > max_chars:
+            content = response.text
+            if response.truncated:
                 content += f"\n\n[Truncated at {max_chars} chars]"
 
             return ToolResult(
                 success=True,
                 output=content,
-                data={"url": str(response.url), "status": response.status_code},
+                data={"url": response.url, "status": response.status_code},
             )
 
         except httpx.TimeoutException:
@@ -0,0 +1,214 @@
+"""Shared cache for parsed configuration files.
+
+Rules, project profiles, context packs and skills are YAML/JSON files under
+~/.maratos that change rarely but were re-read and re-parsed on every prompt
+assembly. ConfigCache keeps the parsed objects (and prompt fragments
+rendered from them) and validates each entry with a stat() of its source
+files (mtime, size, inode), which costs far less than open + parse.
+
+Usage:
+    rule = config_cache.get(path, load_rule, namespace="rules")
+
+    text = config_cache.get_derived(
+        ("rules_context", tuple(ids)), paths, render, namespace="rules"
+    )
+
+    if config_cache.dir_changed(("projects", str(d)), d, ("*.yaml", "*.yml")):
+        reload()
+
+Writers should call invalidate(path) after changing a file so readers in the
+same mtime tick never see stale data.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Directory signatures are recomputed at most this often
+DEFAULT_DIR_CHECK_INTERVAL = 2.0
+
+FileSignature = tuple[int, int, int] | None
+
+
+def file_signature(path: Path | str) -> FileSignature:
+    """Signature of a file's current state, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def dir_signature(directory: Path, patterns: Iterable[str]) -> tuple:
+    """Signature of all files in a directory tree matching glob patterns."""
+    entries = []
+    if directory.exists():
+        for pattern in patterns:
+            for path in directory.glob(pattern):
+                entries.append((str(path), file_signature(path)))
+    return tuple(sorted(entries))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    signatures: tuple[FileSignature, ...]
+
+
+@dataclass
+class _DirState:
+    directory: str
+    signature: tuple
+    checked_at: float
+
+
+class ConfigCache:
+    """mtime-validated cache of parsed config objects and derived fragments."""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        dir_check_interval: float = DEFAULT_DIR_CHECK_INTERVAL,
+    ) -> None:
+        self._entries: OrderedDict[tuple[str, Hashable], _Entry] = OrderedDict()
+        self._paths: dict[tuple[str, Hashable], tuple[str, ...]] = {}
+        self._dirs: dict[Hashable, _DirState] = {}
+        self._max_entries = max_entries
+        self.dir_check_interval = dir_check_interval
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    def _lookup(
+        self,
+        key: tuple[str, Hashable],
+        paths: tuple[str, ...],
+        build: Callable[[], Any],
+    ) -> Any:
+        namespace = key[0]
+        signatures = tuple(file_signature(p) for p in paths)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signatures == signatures:
+                self._entries.move_to_end(key)
+                self._hits[namespace] = self._hits.get(namespace, 0) + 1
+                return entry.value
+            self._misses[namespace] = self._misses.get(namespace, 0) + 1
+
+        # Build outside the lock; concurrent misses may both parse, which is harmless
+        value = build()
+
+        with self._lock:
+            self._entries[key] = _Entry(value, signatures)
+            self._entries.move_to_end(key)
+            self._paths[key] = paths
+            while len(self._entries) > self._max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._paths.pop(evicted, None)
+        return value
+
+    def get(
+        self,
+        path: Path | str,
+        loader: Callable[[Path], Any],
+        namespace: str = "default",
+    ) -> Any:
+        """Get the parsed object for a file, calling loader(path) on a miss.
+
+        The loader's result (including None) is cached until the file's
+        signature changes. Loader exceptions propagate and are not cached.
+        """
+        path_str = str(path)
+        return self._lookup((namespace, path_str), (path_str,), lambda: loader(Path(path_str)))
+
+    def get_derived(
+        self,
+        key: Hashable,
+        paths: Iterable[Path | str],
+        builder: Callable[[], Any],
+        namespace: str = "default",
+    ) -> Any:
+        """Get a value derived from several files (e.g. a rendered prompt).
+
+        Rebuilt when any of the source files changes, appears or disappears.
+        """
+        return self._lookup((namespace, key), tuple(str(p) for p in paths), builder)
+
+    def dir_changed(
+        self,
+        key: Hashable,
+        directory: Path,
+        patterns: Iterable[str],
+        force: bool = False,
+    ) -> bool:
+        """Check whether a directory's matching files changed since the last check.
+
+        The first check for a key reports a change. Checks within
+        dir_check_interval of the previous one report no change unless force.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._dirs.get(key)
+            if state is not None and not force and now - state.checked_at < self.dir_check_interval:
+                return False
+
+        signature = dir_signature(directory, patterns)
+        with self._lock:
+            state = self._dirs.get(key)
+            changed = state is None or state.signature != signature
+            self._dirs[key] = _DirState(str(directory), signature, now)
+        return changed
+
+    def invalidate(self, path: Path | str | None = None, namespace: str | None = None) -> int:
+        """Drop entries depending on path (or in namespace, or everything)."""
+        path_str = str(path) if path is not None else None
+        with self._lock:
+            stale = [
+                key for key, paths in self._paths.items()
+                if (path_str is None or path_str in paths)
+                and (namespace is None or key[0] == namespace)
+            ]
+            for key in stale:
+                self._entries.pop(key, None)
+                self._paths.pop(key, None)
+            if path_str is None and namespace is None:
+                self._dirs.clear()
+            else:
+                # Force the next check of watched directories containing path
+                for state in self._dirs.values():
+                    if path_str is None or path_str.startswith(state.directory.rstrip(os.sep) + os.sep):
+                        state.checked_at = float("-inf")
+            return len(stale)
+
+    def clear(self) -> None:
+        """Drop all entries and directory signatures."""
+        self.invalidate()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit/miss counters, overall and per namespace."""
+        with self._lock:
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            namespaces = sorted(set(self._hits) | set(self._misses))
+            return {
+                "entries": len(self._entries),
+                "watched_dirs": len(self._dirs),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "by_namespace": {
+                    ns: {"hits": self._hits.get(ns, 0), "misses": self._misses.get(ns, 0)}
+                    for ns in namespaces
+                },
+            }
+
+
+# Global config cache
+config_cache = ConfigCache()
@@ -0,0 +1,456 @@
+"""Unified diff generation that scales to large files.
+
+difflib.unified_diff is quadratic on large inputs with many changes, and
+callers ran it on the event loop, so an agent rewriting a multi-thousand-line
+generated file froze the server while its approval diff was computed. The
+diff service:
+- interns lines to integers, so comparisons are int compares
+- anchors on lines unique to both sides (patience diff), which splits
+  typical edits into small independent regions
+- diffs regions without unique anchors with linear-space Myers
+  (middle-snake bisection); past an edit-cost budget it splits at the
+  furthest point reached, trading minimality for bounded time
+- summarizes inputs above MAX_DIFF_LINES / MAX_DIFF_BYTES instead of diffing
+- counts added/removed lines while emitting hunks, so callers do not
+  re-parse the diff text
+- runs small diffs inline, medium ones in a thread pool and very large ones
+  in a process pool
+
+Output matches difflib.unified_diff's format (headers, hunk ranges and
+context grouping), though the chosen alignment can differ from difflib's.
+
+Usage:
+    result = await diff_service.unified_diff(old, new, "a/app.py", "b/app.py")
+    result.text, result.added, result.removed
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from math import isqrt
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Above either limit (both sides combined) only a summary is produced
+MAX_DIFF_LINES = 200_000
+MAX_DIFF_BYTES = 16 * 1024 * 1024
+
+# Myers edit distance budget per region: sqrt(region size), within these bounds
+MIN_EDIT_COST = 64
+MAX_EDIT_COST = 1024
+
+# Combined line counts that decide where a diff runs
+INLINE_MAX_LINES = 2_000
+PROCESS_POOL_MIN_LINES = 50_000
+MAX_THREAD_WORKERS = 2
+
+
+@dataclass
+class DiffResult:
+    """A unified diff and its line counts."""
+
+    text: str
+    added: int
+    removed: int
+    summarized: bool = False  # True if text is a summary, not a full diff
+
+    @property
+    def is_identical(self) -> bool:
+        return not self.text
+
+
+def count_changes(diff: str) -> tuple[int, int]:
+    """Count (added, removed) lines of a unified diff in one pass."""
+    added = removed = 0
+    for line in diff.split("\n"):
+        if line.startswith("+"):
+            if not line.startswith("+++"):
+                added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            removed += 1
+    return added, removed
+
+
+class _Matcher:
+    """Finds matching line pairs between two interned sequences."""
+
+    def __init__(self, a: list[int], b: list[int], max_cost: int = MAX_EDIT_COST):
+        self.a = a
+        self.b = b
+        self.max_cost = max_cost
+        self.matches: list[tuple[int, int]] = []
+        self.over_budget = 0
+        self.gave_up = 0
+
+    def run(self) -> list[tuple[int, int]]:
+        # Explicit stack instead of recursion; matches are sorted at the end
+        stack = [(0, len(self.a), 0, len(self.b))]
+        while stack:
+            self._region(*stack.pop(), stack)
+        self.matches.sort()
+        return self.matches
+
+    def _region(self, alo: int, ahi: int, blo: int, bhi: int, stack: list) -> None:
+        a, b, matches = self.a, self.b, self.matches
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            return
+
+        anchors = self._unique_anchors(alo, ahi, blo, bhi)
+        if anchors:
+            i0, j0 = alo, blo
+            for i, j in anchors:
+                matches.append((i, j))
+                stack.append((i0, i, j0, j))
+                i0, j0 = i + 1, j + 1
+            stack.append((i0, ahi, j0, bhi))
+            return
+
+        split = self._bisect(alo, ahi, blo, bhi)
+        if split is None:
+            self.gave_up += 1
+            return
+        x, y = split
+        stack.append((alo, x, blo, y))
+        stack.append((x, ahi, y, bhi))
+
+    def _unique_anchors(self, alo: int, ahi: int, blo: int, bhi: int) -> list[tuple[int, int]]:
+        """Longest increasing run of lines occurring exactly once on each side."""
+        a, b = self.a, self.b
+        pos_a: dict[int, int] = {}
+        for i in range(alo, ahi):
+            pos_a[a[i]] = -1 if a[i] in pos_a else i
+        pos_b: dict[int, int] = {}
+        for j in range(blo, bhi):
+            pos_b[b[j]] = -1 if b[j] in pos_b else j
+
+        pairs = [
+            (pos_a[line], j) for line, j in pos_b.items()
+            if j >= 0 and pos_a.get(line, -1) >= 0
+        ]
+        if not pairs:
+            return []
+
+        # Patience sort: pairs are in b order, keep the LIS of a positions
+        tails: list[int] = []
+        tail_index: list[int] = []
+        prev = [-1] * len(pairs)
+        for index, (i, _) in enumerate(pairs):
+            k = bisect_left(tails, i)
+            if k:
+                prev[index] = tail_index[k - 1]
+            if k == len(tails):
+                tails.append(i)
+                tail_index.append(index)
+            else:
+                tails[k] = i
+                tail_index[k] = index
+
+        result = []
+        index = tail_index[-1]
+        while index >= 0:
+            result.append(pairs[index])
+            index = prev[index]
+        result.reverse()
+        return result
+
+    def _bisect(self, alo: int, ahi: int, blo: int, bhi: int) -> tuple[int, int] | None:
+        """Find the middle snake of a region and return its split point.
+
+        Linear-space Myers: forward and reverse searches meet in the middle,
+        keeping only one V array per direction. When the edit distance
+        exceeds max_cost the furthest forward point is used instead; None
+        means no split was possible and the region is reported as replaced.
+        """
+        a, b = self.a, self.b
+        n = ahi - alo
+        m = bhi - blo
+        # Budget grows with the region like xdiff's, so large regions split
+        # into more (cheaper) pieces instead of running a full O(ND) search
+        limit = min((n + m + 1) // 2, max(MIN_EDIT_COST, min(self.max_cost, isqrt(n + m))))
+        v_offset = limit
+        v_length = 2 * limit + 2
+        v1 = [-1] * v_length
+        v1[v_offset + 1] = 0
+        v2 = v1[:]
+        delta = n - m
+        front = delta % 2 != 0
+        k1start = k1end = k2start = k2end = 0
+
+        for d in range(limit):
+            for k1 in range(-d + k1start, d + 1 - k1end, 2):
+                k1_offset = v_offset + k1
+                if k1 == -d or (k1 != d and v1[k1_offset - 1] < v1[k1_offset + 1]):
+                    x1 = v1[k1_offset + 1]
+                else:
+                    x1 = v1[k1_offset - 1] + 1
+                y1 = x1 - k1
+                while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                    x1 += 1
+                    y1 += 1
+                v1[k1_offset] = x1
+                if x1 > n:
+                    k1end += 2
+                elif y1 > m:
+                    k1start += 2
+                elif front:
+                    k2_offset = v_offset + delta - k1
+                    if 0 <= k2_offset < v_length and v2[k2_offset] != -1:
+                        if x1 >= n - v2[k2_offset]:
+                            return alo + x1, blo + y1
+
+            for k2 in range(-d + k2start, d + 1 - k2end, 2):
+                k2_offset = v_offset + k2
+                if k2 == -d or (k2 != d and v2[k2_offset - 1] < v2[k2_offset + 1]):
+                    x2 = v2[k2_offset + 1]
+                else:
+                    x2 = v2[k2_offset - 1] + 1
+                y2 = x2 - k2
+                while x2 < n and y2 < m and a[ahi - x2 - 1] == b[bhi - y2 - 1]:
+                    x2 += 1
+                    y2 += 1
+                v2[k2_offset] = x2
+                if x2 > n:
+                    k2end += 2
+                elif y2 > m:
+                    k2start += 2
+                elif not front:
+                    k1_offset = v_offset + delta - k2
+                    if 0 <= k1_offset < v_length and v1[k1_offset] != -1:
+                        x1 = v1[k1_offset]
+                        y1 = v_offset + x1 - k1_offset
+                        if x1 >= n - x2:
+                            return alo + x1, blo + y1
+
+        # Over budget: split at the forward path that got furthest. The
+        # result is no longer minimal, but each half is cheaper to diff.
+        best = best_x = best_y = -1
+        for k1 in range(-limit + 1 + k1start, limit - k1end, 2):
+            x1 = v1[v_offset + k1]
+            y1 = x1 - k1
+            if 0 <= x1 <= n and 0 <= y1 <= m and x1 + y1 > best:
+                best, best_x, best_y = x1 + y1, x1, y1
+        if best <= 0 or best >= n + m:
+            return None
+        self.over_budget += 1
+        return alo + best_x, blo + best_y
+
+
+def _opcodes(
+    matches: list[tuple[int, int]], n: int, m: int
+) -> list[tuple[str, int, int, int, int]]:
+    """Turn sorted matching pairs into difflib-style opcodes."""
+    codes = []
+    i = j = 0
+    index = 0
+    while index <= len(matches):
+        mi, mj = matches[index] if index < len(matches) else (n, m)
+        if i < mi or j < mj:
+            tag = "replace" if i < mi and j < mj else ("delete" if i < mi else "insert")
+            codes.append((tag, i, mi, j, mj))
+        if index == len(matches):
+            break
+        # Extend the run of consecutive matches
+        end = index
+        while end + 1 < len(matches):
+            next_i, next_j = matches[end + 1]
+            if (next_i, next_j) != (matches[end][0] + 1, matches[end][1] + 1):
+                break
+            end += 1
+        length = end - index + 1
+        codes.append(("equal", mi, mi + length, mj, mj + length))
+        i, j = mi + length, mj + length
+        index = end + 1
+    return codes
+
+
+def _grouped(codes: list[tuple[str, int, int, int, int]], n: int = 3):
+    """Group opcodes into hunks with n lines of context (as difflib does)."""
+    if not codes:
+        codes = [("equal", 0, 1, 0, 1)]
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > n + n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _summary(
+    a_lines: list[str], b_lines: list[str], fromfile: str, tofile: str, reason: str,
+) -> DiffResult:
+    """Line counts from a multiset comparison, without aligning the files."""
+    a_counts = Counter(a_lines)
+    b_counts = Counter(b_lines)
+    added = sum((b_counts - a_counts).values())
+    removed = sum((a_counts - b_counts).values())
+    text = (
+        f"Diff summarized ({reason}): {fromfile} ({len(a_lines)} lines) -> "
+        f"{tofile} ({len(b_lines)} lines), +{added} -{removed}\n"
+    )
+    return DiffResult(text=text, added=added, removed=removed, summarized=True)
+
+
+def compute_diff(
+    original: str,
+    new: str,
+    fromfile: str = "",
+    tofile: str = "",
+    context: int = 3,
+) -> DiffResult:
+    """Compute a unified diff and its added/removed counts (synchronous)."""
+    if original == new:
+        return DiffResult(text="", added=0, removed=0)
+
+    a_lines = original.splitlines(keepends=True)
+    b_lines = new.splitlines(keepends=True)
+    if len(a_lines) + len(b_lines) > MAX_DIFF_LINES:
+        return _summary(a_lines, b_lines, fromfile, tofile, "too many lines")
+    if len(original) + len(new) > MAX_DIFF_BYTES:
+        return _summary(a_lines, b_lines, fromfile, tofile, "too large")
+
+    ids: dict[str, int] = {}
+    a = [ids.setdefault(line, len(ids)) for line in a_lines]
+    b = [ids.setdefault(line, len(ids)) for line in b_lines]
+    matcher = _Matcher(a, b)
+    codes = _opcodes(matcher.run(), len(a), len(b))
+    if matcher.over_budget or matcher.gave_up:
+        logger.debug(
+            f"Diff of {tofile}: {matcher.over_budget} heuristic splits, "
+            f"{matcher.gave_up} regions replaced"
+        )
+
+    out: list[str] = []
+    added = removed = 0
+    for group in _grouped(codes, context):
+        if not out:
+            out.append(f"--- {fromfile}\n")
+            out.append(f"+++ {tofile}\n")
+        first, last = group[0], group[-1]
+        out.append(
+            f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in a_lines[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                out.extend("-" + line for line in a_lines[i1:i2])
+                removed += i2 - i1
+            if tag in ("replace", "insert"):
+                out.extend("+" + line for line in b_lines[j1:j2])
+                added += j2 - j1
+
+    return DiffResult(text="".join(out), added=added, removed=removed)
+
+
+class UnifiedDiffService:
+    """Runs diffs off the event loop, sized to the input."""
+
+    def __init__(self, max_thread_workers: int = MAX_THREAD_WORKERS):
+        self.max_thread_workers = max_thread_workers
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._counts = {"inline": 0, "thread": 0, "process": 0, "summarized": 0}
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.max_thread_workers, thread_name_prefix="diff-worker"
+            )
+        return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            # spawn: forking a process that runs the event loop and threads is unsafe
+            self._processes = ProcessPoolExecutor(
+                max_workers=min(self.max_thread_workers, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._processes
+
+    async def unified_diff(
+        self,
+        original: str,
+        new: str,
+        fromfile: str = "",
+        tofile: str = "",
+        context: int = 3,
+    ) -> DiffResult:
+        """Compute a unified diff without blocking the event loop."""
+        lines = original.count("\n") + new.count("\n")
+        args = (original, new, fromfile, tofile, context)
+        loop = asyncio.get_running_loop()
+
+        if lines <= INLINE_MAX_LINES:
+            result = compute_diff(*args)
+            self._counts["inline"] += 1
+        elif PROCESS_POOL_MIN_LINES <= lines <= MAX_DIFF_LINES:
+            try:
+                result = await loop.run_in_executor(self._process_pool(), compute_diff, *args)
+                self._counts["process"] += 1
+            except Exception as e:
+                logger.warning(f"Diff process pool failed, diffing in a thread: {e}")
+                if self._processes is not None:
+                    self._processes.shutdown(wait=False, cancel_futures=True)
+                    self._processes = None
+                result = await loop.run_in_executor(self._thread_pool(), compute_diff, *args)
+                self._counts["thread"] += 1
+        else:
+            result = await loop.run_in_executor(self._thread_pool(), compute_diff, *args)
+            self._counts["thread"] += 1
+
+        if result.summarized:
+            self._counts["summarized"] += 1
+        return result
+
+    def shutdown(self) -> None:
+        """Stop worker pools; they are recreated on the next large diff."""
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get how many diffs ran where."""
+        return dict(self._counts)
+
+
+# Global diff service
+diff_service = UnifiedDiffService()
@@ -0,0 +1,384 @@
+"""Shared HTTP client pool for outbound requests.
+
+Creating an ``httpx.AsyncClient`` per call pays DNS, TCP and TLS setup on
+every request. This module keeps long-lived clients (one per TLS-verify
+setting) with keep-alive connection pools, and adds:
+- HTTP/2 when the optional ``h2`` package is installed
+- Per-host concurrency limits
+- Streaming downloads that stop once a character cap is reached
+- A small validating response cache (ETag / Last-Modified, Cache-Control)
+- Per-host circuit breakers: timeouts, transport errors and 5xx responses
+  trip the host's breaker so an unreachable host fails fast
+
+Clients are bound to the event loop that created them and are recreated
+transparently if the loop changes (e.g. between test cases).
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.config import settings
+from app.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    circuit_breaker_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool sizing (shared across hosts within a client)
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Concurrent in-flight requests allowed per host
+DEFAULT_PER_HOST_LIMIT = 6
+
+DEFAULT_USER_AGENT = "MaratOS/0.1"
+
+# Breaker settings applied to every host (named "http:<host>")
+HOST_CIRCUIT_CONFIG = CircuitBreakerConfig(
+    failure_threshold=5,
+    timeout_seconds=30.0,
+    window_seconds=60.0,
+    excluded_exceptions=(httpx.HTTPStatusError,),  # 4xx are the caller's problem
+)
+
+
+@dataclass
+class FetchResult:
+    """Result of a streamed text fetch."""
+
+    url: str
+    status_code: int
+    text: str
+    truncated: bool = False
+    from_cache: bool = False
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class CachedResponse:
+    """A cached response body with its validators."""
+
+    url: str
+    status_code: int
+    text: str
+    complete: bool
+    etag: str | None = None
+    last_modified: str | None = None
+    fresh_until: float = 0.0
+
+    def satisfies(self, max_chars: int) -> bool:
+        """Check whether the cached body covers a read of max_chars."""
+        return self.complete or len(self.text) > max_chars
+
+
+def _parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into a directive map."""
+    directives: dict[str, str | None] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _freshness_lifetime(headers: httpx.Headers) -> float:
+    """Compute freshness lifetime in seconds per RFC 9111 (explicit only)."""
+    cc = _parse_cache_control(headers.get("cache-control"))
+    if "no-cache" in cc:
+        return 0.0
+    for directive in ("s-maxage", "max-age"):
+        if cc.get(directive):
+            try:
+                return max(float(cc[directive]), 0.0)
+            except ValueError:
+                return 0.0
+    expires = headers.get("expires")
+    date = headers.get("date")
+    if expires and date:
+        try:
+            delta = parsedate_to_datetime(expires) - parsedate_to_datetime(date)
+            return max(delta.total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
+
+
+class ResponseCache:
+    """LRU cache of GET response bodies, revalidated with conditional requests."""
+
+    def __init__(self, max_entries: int = 256, max_total_chars: int = 20_000_000) -> None:
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._max_entries = max_entries
+        self._max_total_chars = max_total_chars
+        self._total_chars = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def get(self, url: str) -> CachedResponse | None:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(self, entry: CachedResponse) -> None:
+        self.discard(entry.url)
+        self._entries[entry.url] = entry
+        self._total_chars += len(entry.text)
+        while self._entries and (
+            len(self._entries) > self._max_entries or self._total_chars > self._max_total_chars
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_chars -= len(evicted.text)
+
+    def discard(self, url: str) -> None:
+        old = self._entries.pop(url, None)
+        if old is not None:
+            self._total_chars -= len(old.text)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._total_chars = 0
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "total_chars": self._total_chars,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+
+class HttpClientManager:
+    """Application-wide pool of keep-alive HTTP clients.
+
+    Usage:
+        client = http_client_manager.get_client()
+        async with http_client_manager.host_slot(url):
+            response = await client.get(url)
+
+        result = await http_client_manager.fetch_text(url, max_chars=10000)
+    """
+
+    def __init__(
+        self,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._transport = transport
+        self._clients: dict[bool, httpx.AsyncClient] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._per_host_limit = per_host_limit
+        self.response_cache = ResponseCache()
+        self.requests = 0
+        self.bytes_received = 0
+
+    def _check_loop(self) -> None:
+        """Drop clients and semaphores created on a different event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Old clients cannot be closed from another loop; let them be GC'd
+            self._clients.clear()
+            self._host_semaphores.clear()
+            self._loop = loop
+
+    def get_client(self, verify: bool = True) -> httpx.AsyncClient:
+        """Get the shared client for the given TLS verification setting."""
+        self._check_loop()
+        client = self._clients.get(verify)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                verify=verify,
+                follow_redirects=True,
+                timeout=settings.http_timeout,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                headers={"User-Agent": DEFAULT_USER_AGENT},
+                transport=self._transport,
+            )
+            self._clients[verify] = client
+        return client
+
+    def host_slot(self, url: str) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the URL's host."""
+        self._check_loop()
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def host_breaker(self, url: str) -> CircuitBreaker:
+        """Get the circuit breaker for the URL's host."""
+        host = urlsplit(url).netloc.lower()
+        return circuit_breaker_registry.get_or_create(f"http:{host}", HOST_CIRCUIT_CONFIG)
+
+    async def get(self, url: str, verify: bool = True, **kwargs: Any) -> httpx.Response:
+        """GET through the shared pool, honouring the per-host limit and breaker.
+
+        Raises CircuitBreakerError without touching the network while the
+        host's circuit is open.
+        """
+        client = self.get_client(verify)
+        async with self.host_breaker(url).protect() as guard:
+            async with self.host_slot(url):
+                response = await client.get(url, **kwargs)
+            if response.is_server_error:
+                guard.fail()
+        self.requests += 1
+        self.bytes_received += len(response.content)
+        return response
+
+    async def fetch_text(
+        self,
+        url: str,
+        max_chars: int,
+        headers: dict[str, str] | None = None,
+        verify: bool = True,
+        use_cache: bool = True,
+    ) -> FetchResult:
+        """Stream a URL's text body, stopping once max_chars is exceeded.
+
+        Raises httpx.HTTPStatusError for non-success responses, and
+        CircuitBreakerError while the host's circuit is open (fresh cache
+        entries are still served).
+        """
+        request_headers = dict(headers or {})
+        cached = self.response_cache.get(url) if use_cache else None
+        if cached is not None and not cached.satisfies(max_chars):
+            cached = None
+
+        if cached is not None:
+            if cached.fresh_until > time.monotonic():
+                self.response_cache.hits += 1
+                return self._from_cache(cached, max_chars)
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        client = self.get_client(verify)
+        async with self.host_breaker(url).protect() as guard, self.host_slot(url):
+            async with client.stream("GET", url, headers=request_headers) as response:
+                self.requests += 1
+
+                if response.status_code == 304 and cached is not None:
+                    self.response_cache.revalidated += 1
+                    cached.fresh_until = time.monotonic() + _freshness_lifetime(response.headers)
+                    return self._from_cache(cached, max_chars)
+
+                if response.is_error:
+                    if response.is_server_error:
+                        guard.fail()
+                    await response.aread()
+                    response.raise_for_status()
+
+                parts: list[str] = []
+                received = 0
+                truncated = False
+                async for chunk in response.aiter_text():
+                    parts.append(chunk)
+                    received += len(chunk)
+                    if received > max_chars:
+                        truncated = True
+                        break
+                self.bytes_received += response.num_bytes_downloaded
+
+                text = "".join(parts)
+                result = FetchResult(
+                    url=str(response.url),
+                    status_code=response.status_code,
+                    text=text[:max_chars],
+                    truncated=truncated,
+                    headers=dict(response.headers),
+                )
+
+                if use_cache:
+                    self.response_cache.misses += 1
+                    self._maybe_cache(url, response, text, complete=not truncated)
+
+        return result
+
+    def _from_cache(self, cached: CachedResponse, max_chars: int) -> FetchResult:
+        return FetchResult(
+            url=cached.url,
+            status_code=cached.status_code,
+            text=cached.text[:max_chars],
+            truncated=len(cached.text) > max_chars,
+            from_cache=True,
+        )
+
+    def _maybe_cache(self, url: str, response: httpx.Response, text: str, complete: bool) -> None:
+        """Cache a 200 response if it is storable and has validators or freshness."""
+        if response.status_code != 200:
+            return
+        cc = _parse_cache_control(response.headers.get("cache-control"))
+        if "no-store" in cc or "private" in cc:
+            self.response_cache.discard(url)
+            return
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        lifetime = _freshness_lifetime(response.headers)
+        if not etag and not last_modified and lifetime <= 0:
+            return
+
+        self.response_cache.put(CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            text=text,
+            complete=complete,
+            etag=etag,
+            last_modified=last_modified,
+            fresh_until=time.monotonic() + lifetime,
+        ))
+
+    async def aclose(self) -> None:
+        """Close all pooled clients."""
+        for client in self._clients.values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+        self._clients.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get pool and cache statistics."""
+        return {
+            "http2": HTTP2_AVAILABLE,
+            "clients": len(self._clients),
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "response_cache": self.response_cache.get_stats(),
+        }
+
+
+# Global HTTP client manager
+http_client_manager = HttpClientManager()
@@ -0,0 +1,463 @@
+"""Persistent rolling metrics with fixed-memory duration histograms.
+
+Tool and subagent metrics used to live in per-process lists that were
+re-scanned on every query and lost on restart. This store keeps, per
+(namespace, key) series:
+- A log-bucketed histogram (bounded relative error, HDR-style) per time slot,
+  so recording is O(1) and memory is bounded by retention / resolution
+- Error counts and named counters per slot
+- All-time aggregates
+
+Percentiles over any window within the retention period are answered by
+merging the slots in that window. Snapshots are written periodically to
+``data_dir/metrics/snapshot.json`` and loaded lazily on first use.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Histogram precision: any reported quantile is within 2% of a recorded value
+RELATIVE_ERROR = 0.02
+_GAMMA = (1 + RELATIVE_ERROR) / (1 - RELATIVE_ERROR)
+_LOG_GAMMA = math.log(_GAMMA)
+MIN_TRACKED_VALUE = 1e-6  # Smaller values share the zero bucket
+
+DEFAULT_RESOLUTION_SECONDS = 300
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 3600
+DEFAULT_SNAPSHOT_INTERVAL = 60.0
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+SNAPSHOT_VERSION = 1
+
+
+class LogHistogram:
+    """Histogram with logarithmic buckets (relative-error quantiles).
+
+    Bucket i covers (gamma^(i-1), gamma^i]; the number of non-empty buckets
+    is bounded by log(max/min) / log(gamma) regardless of sample count.
+    """
+
+    __slots__ = ("counts", "zero_count", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float, n: int = 1) -> None:
+        """Add n observations of value."""
+        if value <= MIN_TRACKED_VALUE:
+            self.zero_count += n
+        else:
+            idx = math.ceil(math.log(value) / _LOG_GAMMA)
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.count += n
+        self.total += value * n
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Add another histogram's observations to this one."""
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-quantile (0 <= q <= 1), or None if empty."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen > rank:
+                estimate = 2 * _GAMMA ** idx / (_GAMMA + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "counts": {str(k): v for k, v in self.counts.items()},
+            "zero": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LogHistogram":
+        hist = cls()
+        hist.counts = {int(k): v for k, v in data.get("counts", {}).items()}
+        hist.zero_count = data.get("zero", 0)
+        hist.count = data.get("count", 0)
+        hist.total = data.get("total", 0.0)
+        if hist.count:
+            hist.min = data["min"]
+            hist.max = data["max"]
+        return hist
+
+
+@dataclass
+class _Slot:
+    """Aggregates for one resolution interval."""
+
+    histogram: LogHistogram = field(default_factory=LogHistogram)
+    errors: int = 0
+    counters: dict[str, float] = field(default_factory=dict)
+
+    def add(self, value: float, success: bool, counters: dict[str, float] | None) -> None:
+        self.histogram.record(value)
+        if not success:
+            self.errors += 1
+        if counters:
+            for name, amount in counters.items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, other: "_Slot") -> None:
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+        for name, amount in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "histogram": self.histogram.to_dict(),
+            "errors": self.errors,
+            "counters": self.counters,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "_Slot":
+        return cls(
+            histogram=LogHistogram.from_dict(data["histogram"]),
+            errors=data.get("errors", 0),
+            counters=dict(data.get("counters", {})),
+        )
+
+
+@dataclass
+class MetricSummary:
+    """Aggregates for a series over a time window."""
+
+    count: int = 0
+    errors: int = 0
+    mean: float = 0.0
+    min: float | None = None
+    max: float | None = None
+    percentiles: dict[float, float | None] = field(default_factory=dict)
+    counters: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def successes(self) -> int:
+        return self.count - self.errors
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float | None:
+        return self.percentiles.get(q)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 3),
+            "mean": round(self.mean, 3),
+            "min": self.min,
+            "max": self.max,
+            **{
+                f"p{q * 100:g}": round(v, 3) if v is not None else None
+                for q, v in self.percentiles.items()
+            },
+            "counters": self.counters,
+        }
+
+
+class MetricSeries:
+    """Time-slotted aggregates for one (namespace, key)."""
+
+    __slots__ = ("resolution", "retention", "_slots", "_all_time")
+
+    def __init__(self, resolution: float, retention: float) -> None:
+        self.resolution = resolution
+        self.retention = retention
+        self._slots: dict[int, _Slot] = {}  # Slot index -> aggregates, oldest first
+        self._all_time = _Slot()
+
+    def record(
+        self,
+        value: float,
+        success: bool,
+        timestamp: float,
+        counters: dict[str, float] | None = None,
+    ) -> None:
+        idx = int(timestamp // self.resolution)
+        slot = self._slots.get(idx)
+        if slot is None:
+            slot = _Slot()
+            self._slots[idx] = slot
+            self._expire(timestamp)
+        slot.add(value, success, counters)
+        self._all_time.add(value, success, counters)
+
+    def _expire(self, now: float) -> None:
+        oldest = int((now - self.retention) // self.resolution)
+        while self._slots:
+            first = next(iter(self._slots))
+            if first >= oldest:
+                break
+            del self._slots[first]
+
+    def aggregate(self, since: float | None) -> _Slot:
+        """Merge slots from since onwards (all time if None)."""
+        if since is None:
+            return self._all_time
+        start = int(since // self.resolution)
+        merged = _Slot()
+        for idx, slot in self._slots.items():
+            if idx >= start:
+                merged.merge(slot)
+        return merged
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "slots": {str(idx): slot.to_dict() for idx, slot in self._slots.items()},
+            "all_time": self._all_time.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], resolution: float, retention: float) -> "MetricSeries":
+        series = cls(resolution, retention)
+        for idx in sorted(data.get("slots", {}), key=int):
+            series._slots[int(idx)] = _Slot.from_dict(data["slots"][idx])
+        series._all_time = _Slot.from_dict(data["all_time"])
+        series._expire(time.time())
+        return series
+
+
+class MetricsStore:
+    """Namespaced metric series with percentile queries and snapshots.
+
+    Without a path the store is in-memory only (e.g. per-instance stores in
+    tests); the global store persists under ``data_dir/metrics``.
+
+    Usage:
+        metrics_store.record("tool", "shell", duration_ms, success=True)
+        summary = metrics_store.query("tool", "shell", window=timedelta(hours=1))
+        summary.percentile(0.95)
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        resolution_seconds: float = DEFAULT_RESOLUTION_SECONDS,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+        snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+    ) -> None:
+        self.path = path  # None keeps the store in memory only
+        self.resolution = resolution_seconds
+        self.retention = retention_seconds
+        self._snapshot_interval = snapshot_interval
+        self._series: dict[str, dict[str, MetricSeries]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._snapshot_task: asyncio.Task | None = None
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._loaded = True
+            self.load()
+
+    def _get_series(self, namespace: str, key: str) -> MetricSeries:
+        self._ensure_loaded()
+        series_by_key = self._series.setdefault(namespace, {})
+        series = series_by_key.get(key)
+        if series is None:
+            series = MetricSeries(self.resolution, self.retention)
+            series_by_key[key] = series
+        return series
+
+    def record(
+        self,
+        namespace: str,
+        key: str,
+        value: float,
+        success: bool = True,
+        timestamp: float | None = None,
+        counters: dict[str, float] | None = None,
+    ) -> None:
+        """Record one observation (e.g. a duration) for a series."""
+        series = self._get_series(namespace, key)
+        series.record(value, success, timestamp if timestamp is not None else time.time(), counters)
+        self._dirty = True
+
+    def query(
+        self,
+        namespace: str,
+        key: str,
+        window: timedelta | None = None,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    ) -> MetricSummary:
+        """Summarize a series over the trailing window (all time if None)."""
+        self._ensure_loaded()
+        series = self._series.get(namespace, {}).get(key)
+        if series is None:
+            return MetricSummary(percentiles={q: None for q in quantiles})
+
+        since = time.time() - window.total_seconds() if window is not None else None
+        slot = series.aggregate(since)
+        hist = slot.histogram
+        return MetricSummary(
+            count=hist.count,
+            errors=slot.errors,
+            mean=hist.mean,
+            min=hist.min if hist.count else None,
+            max=hist.max if hist.count else None,
+            percentiles={q: hist.quantile(q) for q in quantiles},
+            counters=dict(slot.counters),
+        )
+
+    def percentile(
+        self,
+        namespace: str,
+        key: str,
+        q: float,
+        window: timedelta | None = None,
+    ) -> float | None:
+        """Estimate a single quantile for a series."""
+        return self.query(namespace, key, window, quantiles=(q,)).percentile(q)
+
+    def keys(self, namespace: str) -> list[str]:
+        """Keys with recorded data in a namespace."""
+        self._ensure_loaded()
+        return sorted(self._series.get(namespace, {}))
+
+    def clear(self, namespace: str | None = None) -> None:
+        """Drop recorded data for one namespace, or everything."""
+        self._ensure_loaded()
+        if namespace is None:
+            self._series.clear()
+        else:
+            self._series.pop(namespace, None)
+        self._dirty = True
+
+    # Persistence
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "resolution": self.resolution,
+            "series": {
+                namespace: {key: series.to_dict() for key, series in by_key.items()}
+                for namespace, by_key in self._series.items()
+            },
+        }
+
+    def load(self) -> bool:
+        """Load the last snapshot, if one exists. Returns True if loaded."""
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("version") != SNAPSHOT_VERSION or data.get("resolution") != self.resolution:
+                logger.warning(f"Ignoring incompatible metrics snapshot at {self.path}")
+                return False
+            self._series = {
+                namespace: {
+                    key: MetricSeries.from_dict(series, self.resolution, self.retention)
+                    for key, series in by_key.items()
+                }
+                for namespace, by_key in data.get("series", {}).items()
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Failed to load metrics snapshot {self.path}: {e}")
+            return False
+        return True
+
+    def snapshot(self) -> bool:
+        """Write the current state to disk if it changed. Returns True if written."""
+        if not self._dirty or self.path is None:
+            return False
+        payload = json.dumps(self.to_dict(), separators=(",", ":"))
+        self._dirty = False
+        self._write(payload)
+        return True
+
+    def _write(self, payload: str) -> None:
+        assert self.path is not None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(payload)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self._dirty = True
+            logger.error(f"Failed to write metrics snapshot {self.path}: {e}")
+
+    async def start(self) -> None:
+        """Start periodic snapshots."""
+        if self._snapshot_task is not None:
+            return
+        self._ensure_loaded()
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self) -> None:
+        """Stop periodic snapshots and write a final one."""
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            try:
+                await self._snapshot_task
+            except asyncio.CancelledError:
+                pass
+            self._snapshot_task = None
+        self.snapshot()
+
+    async def _snapshot_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self._snapshot_interval)
+                if self._dirty and self.path is not None:
+                    # Serialize on the loop (consistent view), write off it
+                    payload = json.dumps(self.to_dict(), separators=(",", ":"))
+                    self._dirty = False
+                    await asyncio.to_thread(self._write, payload)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in metrics snapshot loop: {e}")
+
+
+# Global metrics store
+metrics_store = MetricsStore(settings.data_dir / "metrics" / "snapshot.json")
@@ -0,0 +1,341 @@
+"""Server-Sent Events transport.
+
+Streaming endpoints used to hand their generators straight to
+StreamingResponse: every frame was built with json.dumps inside the
+generator, keep-alives cost a task and a shield per item, and a busy run
+produced progress events as fast as it could regardless of how quickly the
+browser read them. SSEStream sits between the generator and the response:
+- a producer task drains the source into a bounded outbound buffer
+  (``max_events`` / ``max_bytes``); when it is full the producer waits, so a
+  slow client slows the source instead of growing server memory
+- superseded progress events still in the buffer are dropped, keeping only
+  the latest progress per task (see ``progress_key``)
+- one heartbeat task per connection sends a ping after ``heartbeat_interval``
+  seconds without output
+- frames are encoded once to bytes with orjson when installed (stdlib json
+  otherwise), and events, bytes and coalescing are counted per stream and in
+  process-wide totals
+
+Usage:
+    return StreamingResponse(SSEStream(generate()), media_type="text/event-stream")
+
+Sources may yield ready-made SSE strings (``'data: {...}\\n\\n'``) or
+JSON-serializable dicts, which are encoded with ``format_event``.
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Callable
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+DEFAULT_MAX_EVENTS = 256
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_HEARTBEAT_INTERVAL = 5.0
+PING_FRAME = 'data: {"type": "ping"}\n\n'
+
+# Event types where only the newest pending event per task matters
+COALESCE_TYPES = frozenset({"task_progress", "progress"})
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "dict"):
+        return obj.dict()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """Encode a payload as compact JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; json handles them
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode()
+
+
+def format_event(
+    payload: Any,
+    event: str | None = None,
+    event_id: str | int | None = None,
+) -> str:
+    """Format a payload (dict or pre-encoded string) as one SSE frame."""
+    data = payload if isinstance(payload, str) else dumps(payload).decode()
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def progress_key(payload: dict[str, Any]) -> str | None:
+    """Coalescing key for progress events: one per (type, task)."""
+    event_type = payload.get("type")
+    if event_type not in COALESCE_TYPES:
+        return None
+    data = payload.get("data")
+    task_id = payload.get("task_id")
+    if task_id is None and isinstance(data, dict):
+        task_id = data.get("task_id")
+    return f"{event_type}:{task_id}"
+
+
+@dataclass
+class SSEStats:
+    """Counters for one stream (or the process-wide totals)."""
+
+    events_in: int = 0
+    events_sent: int = 0
+    bytes_sent: int = 0
+    coalesced: int = 0
+    heartbeats: int = 0
+    backpressure_waits: int = 0
+    peak_buffered_bytes: int = 0
+
+    def add(self, other: "SSEStats") -> None:
+        self.events_in += other.events_in
+        self.events_sent += other.events_sent
+        self.bytes_sent += other.bytes_sent
+        self.coalesced += other.coalesced
+        self.heartbeats += other.heartbeats
+        self.backpressure_waits += other.backpressure_waits
+        self.peak_buffered_bytes = max(self.peak_buffered_bytes, other.peak_buffered_bytes)
+
+
+_totals = SSEStats()
+_active_streams = 0
+
+
+class _Frame:
+    __slots__ = ("data", "key")
+
+    def __init__(self, data: bytes | None, key: str | None):
+        self.data = data  # None once superseded by a newer frame with the same key
+        self.key = key
+
+
+class _ClosedError(Exception):
+    """Raised in the producer when the consumer has gone away."""
+
+
+class SSEStream:
+    """Bounded, coalescing SSE transport around an async source of events."""
+
+    def __init__(
+        self,
+        source: AsyncIterable[Any],
+        *,
+        max_events: int = DEFAULT_MAX_EVENTS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        heartbeat_interval: float | None = DEFAULT_HEARTBEAT_INTERVAL,
+        heartbeat_frame: str = PING_FRAME,
+        coalesce_key: Callable[[dict[str, Any]], str | None] | None = progress_key,
+    ):
+        self.source = source
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_frame = heartbeat_frame.encode()
+        self.coalesce_key = coalesce_key
+        self.stats = SSEStats()
+
+        self._buffer: deque[_Frame] = deque()
+        self._latest: dict[str, _Frame] = {}
+        self._buffered_events = 0
+        self._buffered_bytes = 0
+        self._superseded = 0
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._done = False
+        self._closed = False
+        self._error: BaseException | None = None
+        self._last_sent = 0.0
+
+    # =========================================================================
+    # Buffer
+    # =========================================================================
+
+    def _key_for(self, item: Any) -> str | None:
+        if self.coalesce_key is None:
+            return None
+        if isinstance(item, dict):
+            return self.coalesce_key(item)
+        # Only parse string frames that can be progress events at all
+        if '"progress"' not in item and '"task_progress"' not in item:
+            return None
+        if item.startswith("id: "):
+            item = item[item.find("\n") + 1:]
+        if not item.startswith("data: ") or "\ndata: " in item.rstrip("\n"):
+            return None
+        try:
+            payload = json.loads(item[6:])
+        except ValueError:
+            return None
+        return self.coalesce_key(payload) if isinstance(payload, dict) else None
+
+    def _full(self) -> bool:
+        return self._buffered_events > 0 and (
+            self._buffered_events >= self.max_events or self._buffered_bytes >= self.max_bytes
+        )
+
+    def _append(self, data: bytes, key: str | None) -> None:
+        frame = _Frame(data, key)
+        self._buffer.append(frame)
+        if key is not None:
+            self._latest[key] = frame
+        self._buffered_events += 1
+        self._buffered_bytes += len(data)
+        if self._buffered_bytes > self.stats.peak_buffered_bytes:
+            self.stats.peak_buffered_bytes = self._buffered_bytes
+        self._ready.set()
+
+    def _supersede(self, key: str) -> None:
+        previous = self._latest.get(key)
+        if previous is None or previous.data is None:
+            return
+        self._buffered_events -= 1
+        self._buffered_bytes -= len(previous.data)
+        previous.data = None
+        self._superseded += 1
+        self.stats.coalesced += 1
+        # Drop dead frames once they outnumber live ones
+        if self._superseded > max(64, self._buffered_events):
+            self._buffer = deque(f for f in self._buffer if f.data is not None)
+            self._superseded = 0
+
+    def _pop(self) -> bytes | None:
+        while self._buffer:
+            frame = self._buffer.popleft()
+            if frame.data is None:
+                self._superseded -= 1
+                continue
+            if frame.key is not None and self._latest.get(frame.key) is frame:
+                del self._latest[frame.key]
+            self._buffered_events -= 1
+            self._buffered_bytes -= len(frame.data)
+            self._space.set()
+            return frame.data
+        return None
+
+    async def _push(self, item: Any) -> None:
+        if self._closed:
+            raise _ClosedError()
+        if isinstance(item, bytes):
+            item = item.decode()
+        key = self._key_for(item)
+        data = item.encode() if isinstance(item, str) else format_event(item).encode()
+        self.stats.events_in += 1
+
+        if key is not None:
+            self._supersede(key)
+        while self._full():
+            self.stats.backpressure_waits += 1
+            self._space.clear()
+            await self._space.wait()
+            if self._closed:
+                raise _ClosedError()
+        self._append(data, key)
+
+    # =========================================================================
+    # Tasks
+    # =========================================================================
+
+    async def _produce(self) -> None:
+        try:
+            async for item in self.source:
+                await self._push(item)
+        except (_ClosedError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            logger.error(f"Stream error: {e}")
+            self._error = e
+        finally:
+            aclose = getattr(self.source, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception as e:
+                    logger.debug(f"Error closing stream source: {e}")
+            self._done = True
+            self._ready.set()
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            delay = self._last_sent + self.heartbeat_interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if not self._buffered_events:
+                self._append(self.heartbeat_frame, None)
+                self.stats.heartbeats += 1
+            self._last_sent = loop.time()
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._stream()
+
+    async def _stream(self) -> AsyncIterator[bytes]:
+        global _active_streams
+        loop = asyncio.get_running_loop()
+        self._last_sent = loop.time()
+        producer = asyncio.create_task(self._produce())
+        heartbeat = (
+            asyncio.create_task(self._heartbeat()) if self.heartbeat_interval else None
+        )
+        _active_streams += 1
+        try:
+            while True:
+                data = self._pop()
+                if data is None:
+                    if self._done:
+                        break
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                self._last_sent = loop.time()
+                self.stats.events_sent += 1
+                self.stats.bytes_sent += len(data)
+                yield data
+            if self._error is not None:
+                raise self._error
+        finally:
+            self._closed = True
+            self._space.set()
+            if heartbeat is not None:
+                heartbeat.cancel()
+            if not producer.done():
+                producer.cancel()
+            _active_streams -= 1
+            _totals.add(self.stats)
+
+
+def get_sse_stats() -> dict[str, Any]:
+    """Process-wide SSE counters (streams add theirs when they close)."""
+    return {**asdict(_totals), "active_streams": _active_streams, "orjson": ORJSON_AVAILABLE}
+
+
+def reset_sse_stats() -> None:
+    """Reset process-wide SSE counters."""
+    global _totals
+    _totals = SSEStats()
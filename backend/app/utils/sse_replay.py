@@ -0,0 +1,448 @@
+"""Resumable SSE streams.
+
+Streaming endpoints used to run their work inside the response generator,
+so a dropped connection cancelled the run and a reconnecting client had no
+way to pick up where it left off. An EventLog decouples the two:
+- the run drains its generator in its own task and appends every frame to
+  the log with a monotonically increasing ``id:`` line
+- the newest ``capacity`` frames stay in an in-memory replay ring; older
+  ones are written in batches to the ``stream_events`` table
+- any number of clients tail the log; a client that reconnects with
+  ``Last-Event-ID`` gets the frames after that id (ring first, database for
+  anything older) and then follows the live stream
+- a run nobody is listening to is cancelled after ``DETACHED_GRACE_SECONDS``
+  and finished logs (and their stored rows) are dropped after
+  ``FINISHED_TTL_SECONDS``
+
+Reconnect storms hit memory, not the database: ring reads are synchronous,
+database reads for one log go through a per-log lock that reuses the last
+window loaded, and all logs share a small semaphore.
+
+Usage:
+    log = sse_streams.open(f"chat:{session.id}", generate())
+    return stream_response(log, after=last_event_id(request) or 0)
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from itertools import chain
+from typing import Any, AsyncIterable, AsyncIterator
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.utils.sse import SSEStream, format_event
+
+logger = logging.getLogger(__name__)
+
+REPLAY_BUFFER_EVENTS = 1000
+FLUSH_BATCH_SIZE = 500
+MAX_PENDING_SPILL = 10000  # Frames kept in memory while the database is failing
+DETACHED_GRACE_SECONDS = 120.0
+FINISHED_TTL_SECONDS = 600.0
+SWEEP_INTERVAL_SECONDS = 15.0
+MAX_CONCURRENT_DB_REPLAYS = 4
+
+_db_replays: asyncio.Semaphore | None = None
+
+
+def _replay_semaphore() -> asyncio.Semaphore:
+    global _db_replays
+    if _db_replays is None:
+        _db_replays = asyncio.Semaphore(MAX_CONCURRENT_DB_REPLAYS)
+    return _db_replays
+
+
+class EventLog:
+    """Numbered, replayable frames of one streamed run."""
+
+    def __init__(self, key: str, start_id: int = 0, capacity: int = REPLAY_BUFFER_EVENTS):
+        self.key = key
+        self.log_id = str(uuid.uuid4())
+        self.capacity = capacity
+        self.first_id = start_id + 1
+        self.last_id = start_id
+        self.finished = False
+        self.finished_at: float | None = None
+        self.consumers = 0
+        self.detached_since: float | None = time.monotonic()
+
+        self._ring: deque[tuple[int, str]] = deque()
+        self._spill: list[tuple[int, str]] = []  # Evicted, not yet written
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._load_lock = asyncio.Lock()
+        self._window: tuple[int, int, list[tuple[int, str]]] | None = None
+        self._persisted = False
+
+        self.spilled = 0
+        self.dropped = 0
+        self.db_reads = 0
+        self.window_hits = 0
+        self.replayed = 0
+
+    @property
+    def active(self) -> bool:
+        return not self.finished
+
+    # =========================================================================
+    # Writing
+    # =========================================================================
+
+    def append(self, item: Any) -> int:
+        """Number a frame (SSE string, bytes or dict) and add it to the log."""
+        self.last_id += 1
+        event_id = self.last_id
+        if isinstance(item, bytes):
+            item = item.decode()
+        if isinstance(item, str):
+            frame = f"id: {event_id}\n{item}"
+        else:
+            frame = format_event(item, event_id=event_id)
+
+        self._ring.append((event_id, frame))
+        if len(self._ring) > self.capacity:
+            self._spill.append(self._ring.popleft())
+            self.spilled += 1
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush())
+        self._notify()
+        return event_id
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _flush(self) -> None:
+        from app.database import StreamEvent, async_session_factory
+
+        while self._spill:
+            batch = self._spill[:FLUSH_BATCH_SIZE]
+            try:
+                async with async_session_factory() as session:
+                    session.add_all([
+                        StreamEvent(stream_id=self.log_id, event_id=event_id, frame=frame)
+                        for event_id, frame in batch
+                    ])
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Failed to spill stream {self.key} events: {e}")
+                if len(self._spill) > MAX_PENDING_SPILL:
+                    excess = len(self._spill) - MAX_PENDING_SPILL
+                    del self._spill[:excess]
+                    self.dropped += excess
+                return  # Retried on the next eviction
+            # Only forget frames once they are readable from the database
+            del self._spill[:len(batch)]
+            self._persisted = True
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+
+    def _memory_start(self) -> int:
+        if self._spill:
+            return self._spill[0][0]
+        if self._ring:
+            return self._ring[0][0]
+        return self.last_id + 1
+
+    async def _load(self, after: int, before: int) -> list[tuple[int, str]]:
+        """Stored frames with after < id < before."""
+        from sqlalchemy import select
+
+        from app.database import StreamEvent, async_session_factory
+
+        async with self._load_lock:
+            # Clients reconnecting together usually ask for the same window
+            if self._window is not None:
+                low, high, rows = self._window
+                if low <= after and before <= high:
+                    self.window_hits += 1
+                    return [row for row in rows if after < row[0] < before]
+
+            async with _replay_semaphore():
+                self.db_reads += 1
+                async with async_session_factory() as session:
+                    result = await session.execute(
+                        select(StreamEvent.event_id, StreamEvent.frame)
+                        .where(
+                            StreamEvent.stream_id == self.log_id,
+                            StreamEvent.event_id > after,
+                            StreamEvent.event_id < before,
+                        )
+                        .order_by(StreamEvent.event_id)
+                    )
+                    rows = [(row[0], row[1]) for row in result.all()]
+            self._window = (after, before, rows)
+            return rows
+
+    async def read_after(self, after: int) -> tuple[list[str], int]:
+        """Frames with ids greater than ``after`` and the last id returned."""
+        cursor = max(after, self.first_id - 1)
+        frames: list[str] = []
+
+        # Evicted frames move from _spill to the database between awaits, so
+        # keep loading until the cursor reaches what memory still holds
+        while cursor + 1 < self._memory_start():
+            start = self._memory_start()
+            try:
+                rows = await self._load(cursor, start)
+            except Exception as e:
+                logger.warning(f"Failed to replay stream {self.key} from database: {e}")
+                rows = []
+            frames.extend(frame for _, frame in rows)
+            if not rows or rows[-1][0] < start - 1:
+                logger.warning(f"Stream {self.key}: events {cursor + 1}-{start - 1} unavailable")
+            cursor = start - 1
+
+        for event_id, frame in chain(self._spill, self._ring):
+            if event_id > cursor:
+                frames.append(frame)
+        self.replayed += len(frames)
+        return frames, max(cursor, self.last_id)
+
+    async def tail(self, after: int = 0) -> AsyncIterator[str]:
+        """Replay frames after ``after``, then follow the log until it finishes."""
+        self.consumers += 1
+        self.detached_since = None
+        try:
+            cursor = after
+            while True:
+                changed = self._changed
+                if self.last_id > cursor:
+                    frames, cursor = await self.read_after(cursor)
+                    for frame in frames:
+                        yield frame
+                elif self.finished:
+                    return
+                else:
+                    await changed.wait()
+        finally:
+            self.consumers -= 1
+            if self.consumers == 0:
+                self.detached_since = time.monotonic()
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    def start(self, source: AsyncIterable[Any]) -> None:
+        self._task = asyncio.create_task(self._run(source))
+
+    async def _run(self, source: AsyncIterable[Any]) -> None:
+        try:
+            async for item in source:
+                self.append(item)
+        except asyncio.CancelledError:
+            logger.info(f"Stream {self.key} cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Stream {self.key} error: {e}", exc_info=True)
+            self.append({"type": "error", "error": str(e)})
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception as e:
+                    logger.debug(f"Error closing stream source: {e}")
+            self.finished = True
+            self.finished_at = time.monotonic()
+            self._notify()
+
+    def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def wait(self) -> None:
+        """Wait for the run to finish."""
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def discard(self) -> None:
+        """Stop the run and delete its stored frames."""
+        self.cancel()
+        await self.wait()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if not self._persisted:
+            return
+        from sqlalchemy import delete
+
+        from app.database import StreamEvent, async_session_factory
+
+        try:
+            async with async_session_factory() as session:
+                await session.execute(
+                    delete(StreamEvent).where(StreamEvent.stream_id == self.log_id)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to delete stream {self.key} events: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "key": self.key,
+            "first_id": self.first_id,
+            "last_id": self.last_id,
+            "finished": self.finished,
+            "consumers": self.consumers,
+            "buffered": len(self._ring),
+            "pending_spill": len(self._spill),
+            "spilled": self.spilled,
+            "dropped": self.dropped,
+            "db_reads": self.db_reads,
+            "window_hits": self.window_hits,
+            "replayed": self.replayed,
+        }
+
+
+class StreamRegistry:
+    """Event logs of running and recently finished streams, by key."""
+
+    def __init__(self):
+        self._logs: dict[str, EventLog] = {}  # log_id -> log
+        self._current: dict[str, str] = {}  # key -> newest log_id
+        self._high_water: dict[str, int] = {}  # key -> highest id issued, outlives logs
+        self._sweeper: asyncio.Task | None = None
+        self.cancelled = 0
+        self.expired = 0
+
+    def open(
+        self,
+        key: str,
+        source: AsyncIterable[Any],
+        capacity: int = REPLAY_BUFFER_EVENTS,
+    ) -> EventLog:
+        """Start running ``source`` into a new log registered under ``key``.
+
+        Ids continue after the highest id the key has issued, which is kept
+        after the key's logs are dropped, so a stale Last-Event-ID can never
+        match an event of a later run.
+        """
+        start_id = self._high_water.get(key, 0)
+        previous = self.get(key)
+        if previous is not None:
+            start_id = max(start_id, previous.last_id)
+        log = EventLog(key, start_id=start_id, capacity=capacity)
+        self._logs[log.log_id] = log
+        self._current[key] = log.log_id
+        log.start(source)
+        return log
+
+    def get(self, key: str) -> EventLog | None:
+        log_id = self._current.get(key)
+        return self._logs.get(log_id) if log_id else None
+
+    def _remove(self, log: EventLog) -> None:
+        self._logs.pop(log.log_id, None)
+        self._high_water[log.key] = max(self._high_water.get(log.key, 0), log.last_id)
+        if self._current.get(log.key) == log.log_id:
+            del self._current[log.key]
+
+    async def sweep(self) -> int:
+        """Cancel abandoned runs and drop expired logs. Returns logs dropped."""
+        now = time.monotonic()
+        expired = []
+        for log in list(self._logs.values()):
+            if log.consumers:
+                continue
+            if log.active:
+                detached = log.detached_since
+                if detached is not None and now - detached >= DETACHED_GRACE_SECONDS:
+                    logger.info(f"Stream {log.key} has no listeners, cancelling run")
+                    log.cancel()
+                    self.cancelled += 1
+            elif now - log.finished_at >= FINISHED_TTL_SECONDS:
+                self._remove(log)
+                expired.append(log)
+        for log in expired:
+            await log.discard()
+        self.expired += len(expired)
+        return len(expired)
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Stream sweep failed: {e}")
+
+    async def start(self) -> None:
+        """Clear frames left by a previous process and start the sweeper."""
+        from sqlalchemy import delete
+
+        from app.database import StreamEvent, async_session_factory
+
+        try:
+            async with async_session_factory() as session:
+                await session.execute(delete(StreamEvent))
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to clear stale stream events: {e}")
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        """Stop the sweeper and all running streams."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        logs = list(self._logs.values())
+        for log in logs:
+            self._remove(log)
+        for log in logs:
+            await log.discard()
+
+    def get_stats(self) -> dict[str, Any]:
+        logs = list(self._logs.values())
+        return {
+            "logs": len(logs),
+            "active": sum(1 for log in logs if log.active),
+            "consumers": sum(log.consumers for log in logs),
+            "spilled": sum(log.spilled for log in logs),
+            "db_reads": sum(log.db_reads for log in logs),
+            "window_hits": sum(log.window_hits for log in logs),
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+        }
+
+
+def last_event_id(request: Request) -> int | None:
+    """Last-Event-ID sent by a reconnecting client (header or query param)."""
+    value = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    if value is None:
+        return None
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return None
+
+
+def stream_response(
+    log: EventLog,
+    after: int = 0,
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    """SSE response tailing ``log`` from the event after ``after``."""
+    return StreamingResponse(
+        SSEStream(log.tail(after)),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            **(headers or {}),
+        },
+    )
+
+
+# Global stream registry
+sse_streams = StreamRegistry()
@@ -0,0 +1,449 @@
+"""Bounded in-process state stores with LRU/TTL eviction.
+
+Per-session state (workflow router context, pending clarifications, inline
+project orchestrators) used to live in plain module-level dicts that were
+never evicted, so memory grew with every session ever seen. StateStore is a
+dict-like store that:
+- caps the number of entries, evicting the least recently used first
+- expires entries idle for longer than ``ttl_seconds``
+- never evicts entries its ``can_evict`` predicate protects (e.g. a running
+  project)
+- optionally spills evicted entries to SQLite, so they are rehydrated on the
+  next access, including after a restart
+
+Stores created through ``state_stores.create()`` are swept periodically by a
+background task and spill their live entries on shutdown.
+
+Usage:
+    sessions = state_stores.create(
+        "router.sessions",
+        ttl_seconds=1800,
+        serialize=SessionState.to_dict,
+        deserialize=SessionState.from_dict,
+    )
+    state = sessions.get(session_id)
+    sessions.set(session_id, state)
+
+    await state_stores.start(spill_path=settings.data_dir / "session_state.db")
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+_MISSING = object()
+
+
+class SQLiteStateSpill:
+    """SQLite table holding entries evicted from state stores.
+
+    Expiry times are wall-clock so they stay meaningful across restarts.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state_spill ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " expires_at REAL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+
+    def save_many(self, namespace: str, rows: list[tuple[str, dict, float | None]]) -> None:
+        """Insert or replace (key, payload, expires_at) rows."""
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO state_spill (namespace, key, payload, expires_at)"
+                " VALUES (?, ?, ?, ?)",
+                [(namespace, key, json.dumps(payload), expires) for key, payload, expires in rows],
+            )
+
+    def load(self, namespace: str, key: str) -> tuple[dict, float | None] | None:
+        """Get (payload, expires_at) for a key, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM state_spill WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def load_all(self, namespace: str) -> list[tuple[str, dict, float | None]]:
+        """Get all (key, payload, expires_at) rows of a namespace."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, payload, expires_at FROM state_spill WHERE namespace = ?",
+                (namespace,),
+            ).fetchall()
+        return [(key, json.loads(payload), expires) for key, payload, expires in rows]
+
+    def delete(self, namespace: str, keys: list[str]) -> None:
+        if not keys:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM state_spill WHERE namespace = ? AND key = ?",
+                [(namespace, key) for key in keys],
+            )
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM state_spill WHERE namespace = ?", (namespace,))
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM state_spill WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM state_spill WHERE namespace = ?", (namespace,)
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class _Slot:
+    value: Any
+    touched: float  # time.monotonic() of the last get/set
+
+
+class StateStore(Generic[V]):
+    """Dict-like store with an entry cap, idle TTL and optional SQLite spill."""
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float | None = None,
+        serialize: Callable[[V], dict] | None = None,
+        deserialize: Callable[[dict], V] | None = None,
+        can_evict: Callable[[V], bool] | None = None,
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.can_evict = can_evict
+        self.spill: SQLiteStateSpill | None = None
+
+        self._entries: OrderedDict[str, _Slot] = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "spilled": 0,
+            "rehydrated": 0,
+        }
+
+    @property
+    def spillable(self) -> bool:
+        return self.serialize is not None and self.deserialize is not None
+
+    def _expired(self, slot: _Slot, now: float) -> bool:
+        return self.ttl_seconds is not None and now - slot.touched > self.ttl_seconds
+
+    def _evictable(self, slot: _Slot) -> bool:
+        return self.can_evict is None or self.can_evict(slot.value)
+
+    # =========================================================================
+    # Dict-like access
+    # =========================================================================
+
+    def get(self, key: str, default: Any = None) -> V | Any:
+        """Get a value, refreshing its LRU position and idle timer."""
+        now = time.monotonic()
+        with self._lock:
+            slot = self._entries.get(key)
+            if slot is not None:
+                if self._expired(slot, now) and self._evictable(slot):
+                    self._expire([key])
+                else:
+                    slot.touched = now
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return slot.value
+
+            value = self._rehydrate(key)
+            if value is _MISSING:
+                self._stats["misses"] += 1
+                return default
+            self._stats["rehydrated"] += 1
+            self._insert(key, value, now)
+            return value
+
+    def set(self, key: str, value: V) -> None:
+        """Insert or replace a value."""
+        with self._lock:
+            self._insert(key, value, time.monotonic())
+
+    def pop(self, key: str, default: Any = None) -> V | Any:
+        """Remove a value (and its spilled copy)."""
+        with self._lock:
+            slot = self._entries.pop(key, None)
+            if self.spill is not None:
+                self._spill_call(self.spill.delete, self.namespace, [key])
+            return default if slot is None else slot.value
+
+    def clear(self) -> None:
+        """Remove every entry, including spilled ones."""
+        with self._lock:
+            self._entries.clear()
+            if self.spill is not None:
+                self._spill_call(self.spill.clear, self.namespace)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
+
+    def values(self) -> list[V]:
+        with self._lock:
+            return [slot.value for slot in self._entries.values()]
+
+    def items(self) -> Iterator[tuple[str, V]]:
+        with self._lock:
+            return iter([(key, slot.value) for key, slot in self._entries.items()])
+
+    # =========================================================================
+    # Eviction
+    # =========================================================================
+
+    def _insert(self, key: str, value: V, now: float) -> None:
+        slot = self._entries.get(key)
+        if slot is None:
+            self._entries[key] = _Slot(value, now)
+        else:
+            slot.value = value
+            slot.touched = now
+            self._entries.move_to_end(key)
+        self._enforce_cap()
+
+    def _enforce_cap(self) -> None:
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+        victims = []
+        for key, slot in self._entries.items():
+            if len(victims) >= excess:
+                break
+            if self._evictable(slot):
+                victims.append(key)
+        self._evict(victims)
+
+    def _evict(self, keys: list[str]) -> None:
+        """Drop entries for capacity, spilling them when configured."""
+        slots = [(key, self._entries.pop(key)) for key in keys]
+        self._stats["evictions"] += len(slots)
+        self._spill_slots(slots)
+
+    def _expire(self, keys: list[str]) -> None:
+        """Drop idle entries; expired state is not worth spilling."""
+        for key in keys:
+            self._entries.pop(key, None)
+        self._stats["expirations"] += len(keys)
+        if self.spill is not None:
+            self._spill_call(self.spill.delete, self.namespace, keys)
+
+    def sweep(self) -> int:
+        """Expire idle entries and enforce the cap; returns entries removed."""
+        now = time.monotonic()
+        with self._lock:
+            before = len(self._entries)
+            if self.ttl_seconds is not None:
+                expired = []
+                # Entries are kept in touch order, so stop at the first fresh one
+                for key, slot in self._entries.items():
+                    if not self._expired(slot, now):
+                        break
+                    if self._evictable(slot):
+                        expired.append(key)
+                self._expire(expired)
+            self._enforce_cap()
+            return before - len(self._entries)
+
+    # =========================================================================
+    # Spill
+    # =========================================================================
+
+    def _spill_call(self, fn: Callable, *args: Any) -> Any:
+        try:
+            return fn(*args)
+        except sqlite3.Error as e:
+            logger.warning(f"State spill for {self.namespace} failed: {e}")
+            return None
+
+    def _spill_slots(self, slots: list[tuple[str, _Slot]]) -> None:
+        if self.spill is None or not self.spillable or not slots:
+            return
+        now = time.monotonic()
+        wall = time.time()
+        rows = []
+        for key, slot in slots:
+            try:
+                payload = self.serialize(slot.value)
+            except Exception as e:
+                logger.warning(f"Cannot serialize {self.namespace}:{key} for spill: {e}")
+                continue
+            expires = None
+            if self.ttl_seconds is not None:
+                expires = wall + self.ttl_seconds - (now - slot.touched)
+            rows.append((key, payload, expires))
+        self._spill_call(self.spill.save_many, self.namespace, rows)
+        self._stats["spilled"] += len(rows)
+
+    def _rehydrate(self, key: str) -> V | Any:
+        if self.spill is None or not self.spillable:
+            return _MISSING
+        found = self._spill_call(self.spill.load, self.namespace, key)
+        if found is None:
+            return _MISSING
+        payload, expires = found
+        if expires is not None and expires < time.time():
+            self._spill_call(self.spill.delete, self.namespace, [key])
+            return _MISSING
+        try:
+            return self.deserialize(payload)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable spilled state {self.namespace}:{key}: {e}")
+            self._spill_call(self.spill.delete, self.namespace, [key])
+            return _MISSING
+
+    def persist(self) -> int:
+        """Spill every live entry (e.g. at shutdown); returns rows written."""
+        with self._lock:
+            before = self._stats["spilled"]
+            self._spill_slots(list(self._entries.items()))
+            return self._stats["spilled"] - before
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get store statistics."""
+        stats = {
+            "namespace": self.namespace,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            **self._stats,
+        }
+        if self.spill is not None and self.spillable:
+            stats["spilled_entries"] = self._spill_call(self.spill.count, self.namespace)
+        return stats
+
+
+class StateStoreManager:
+    """Registry of named state stores with a shared sweeper and spill."""
+
+    def __init__(self, sweep_interval: float = DEFAULT_SWEEP_INTERVAL):
+        self.sweep_interval = sweep_interval
+        self._stores: dict[str, StateStore] = {}
+        self._spill: SQLiteStateSpill | None = None
+        self._sweep_task: asyncio.Task | None = None
+
+    def create(self, namespace: str, **kwargs: Any) -> StateStore:
+        """Create and register a store (or return the existing one)."""
+        store = self._stores.get(namespace)
+        if store is None:
+            store = StateStore(namespace, **kwargs)
+            store.spill = self._spill
+            self._stores[namespace] = store
+        return store
+
+    def get(self, namespace: str) -> StateStore | None:
+        return self._stores.get(namespace)
+
+    def sweep_all(self) -> int:
+        """Sweep every store and purge expired spill rows."""
+        removed = sum(store.sweep() for store in self._stores.values())
+        if self._spill is not None:
+            try:
+                self._spill.purge_expired()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to purge expired spilled state: {e}")
+        return removed
+
+    async def start(self, spill_path: Path | None = None) -> None:
+        """Start the background sweeper, attaching a SQLite spill if given."""
+        if spill_path is not None and self._spill is None:
+            try:
+                self._spill = await asyncio.to_thread(SQLiteStateSpill, spill_path)
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"State spill disabled, cannot open {spill_path}: {e}")
+            else:
+                for store in self._stores.values():
+                    store.spill = self._spill
+                logger.info(f"Session state spill enabled at {spill_path}")
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        """Stop the sweeper and spill live entries so they survive a restart."""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+        if self._spill is not None:
+            for store in self._stores.values():
+                store.persist()
+                store.spill = None
+            self._spill.close()
+            self._spill = None
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                removed = self.sweep_all()
+                if removed:
+                    logger.debug(f"State sweeper removed {removed} entries")
+            except Exception as e:
+                logger.error(f"State sweep failed: {e}")
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Get statistics for every registered store."""
+        return {name: store.get_stats() for name, store in self._stores.items()}
+
+
+# Global state store manager
+state_stores = StateStoreManager()
@@ -1,8 +1,7 @@
 """Stream utilities for SSE responses."""
 
-import asyncio
 import logging
-from typing import AsyncGenerator, TypeVar, Any
+from typing import Any, AsyncGenerator, TypeVar
 
 logger = logging.getLogger(__name__)
 
@@ -14,40 +13,27 @@ async def keep_alive_generator(
     ping_payload: str = 'data: {"type": "ping"}\n\n'
 ) -> AsyncGenerator[str, Any]:
     """Wrap an async generator to emit ping events if no data is received within interval.
-    
+
     This ensures that SSE connections don't time out during long operations
     (like thinking, compiling, or deploying) where the upstream generator
     might be silent for a while.
-    
+
     Args:
         generator: The source generator yielding SSE strings
         interval_seconds: How often to ping if silent (default 5s)
         ping_payload: The SSE event string to send as ping
-        
+
     Yields:
         original items from generator, or ping_payload if idle
     """
-    iterator = generator.__aiter__()
-    
-    while True:
-        try:
-            # Create a task for the next item
-            future = asyncio.create_task(iterator.__anext__())
-            
-            while not future.done():
-                try:
-                    # Wait for the item with a timeout
-                    item = await asyncio.wait_for(asyncio.shield(future), timeout=interval_seconds)
-                    yield item
-                    break # Break inner loop, continue outer to get next item
-                except asyncio.TimeoutError:
-                    # Timeout reached - emit ping and keep waiting for same future
-                    # logger.debug("Stream silent, emitting keep-alive ping")
-                    yield ping_payload
-            
-        except StopAsyncIteration:
-            break
-        except Exception as e:
-            logger.error(f"Stream error: {e}")
-            # Re-raise to close stream properly or let upstream handle it
-            raise
+    from app.utils.sse import SSEStream
+
+    # One heartbeat timer per stream instead of a task and shield per item
+    stream = SSEStream(
+        generator,
+        heartbeat_interval=interval_seconds,
+        heartbeat_frame=ping_payload,
+        coalesce_key=None,
+    )
+    async for chunk in stream:
+        yield chunk.decode()
@@ -18,8 +18,13 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, AsyncIterator, Callable
 
+from app.utils.state_store import StateStore
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on workflow contexts tracked by one DeliveryLoopPolicy
+MAX_TRACKED_WORKFLOWS = 1000
+
 
 # =============================================================================
 # Workflow States
@@ -783,7 +788,13 @@ class DeliveryLoopPolicy:
     ):
         self.max_fix_cycles = max_fix_cycles
         self.max_architect_cycles = max_architect_cycles
-        self._active_workflows: dict[str, WorkflowContext] = {}
+        # Finished workflows are removed by run(); the cap only guards
+        # against contexts created outside it and never cleaned up
+        self._active_workflows: StateStore[WorkflowContext] = StateStore(
+            "delivery_loop.workflows",
+            max_entries=MAX_TRACKED_WORKFLOWS,
+            can_evict=lambda ctx: ctx.state in (WorkflowState.COMPLETED, WorkflowState.FAILED),
+        )
 
     def create_workflow(
         self,
@@ -801,7 +812,7 @@ class DeliveryLoopPolicy:
             max_fix_cycles=self.max_fix_cycles,
             max_architect_cycles=self.max_architect_cycles,
         )
-        self._active_workflows[workflow_id] = ctx
+        self._active_workflows.set(workflow_id, ctx)
         return ctx
 
     def get_workflow(self, workflow_id: str) -> WorkflowContext | None:
@@ -819,7 +830,7 @@ class DeliveryLoopPolicy:
 
     def cleanup_workflow(self, workflow_id: str) -> None:
         """Remove completed workflow."""
-        self._active_workflows.pop(workflow_id, None)
+        self._active_workflows.pop(workflow_id)
 
     async def run(
         self,
@@ -11,9 +11,16 @@ than incorrectly trigger the workflow.
 
 import logging
 import re
+from dataclasses import asdict as _asdict
 from dataclasses import dataclass, field
+from dataclasses import dataclass as _dataclass
+from dataclasses import field as _field
+from datetime import datetime as _datetime
 from enum import Enum
-from typing import Any
+from typing import Any, List, Optional
+
+from app.config import settings as _settings
+from app.utils.state_store import state_stores as _state_stores
 
 logger = logging.getLogger(__name__)
 
@@ -971,11 +978,6 @@ def get_task_with_context(message: str, session_id: str) -> str:
 # Session State Tracking (Task Continuity)
 # =============================================================================
 
-from dataclasses import dataclass as _dataclass, field as _field
-from datetime import datetime as _datetime
-from typing import Dict, List, Optional
-
-
 @_dataclass
 class SessionState:
     """Tracks workflow context for a session to enable smart follow-ups."""
@@ -1048,27 +1050,46 @@ class SessionState:
             parts.append(f"Project: {self.project_path}")
         return " | ".join(parts) if parts else ""
 
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for the state spill."""
+        data = _asdict(self)
+        data["last_task_type"] = self.last_task_type.value if self.last_task_type else None
+        data["last_updated"] = self.last_updated.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SessionState":
+        """Restore from the state spill."""
+        data = dict(data)
+        if data.get("last_task_type"):
+            data["last_task_type"] = TaskType(data["last_task_type"])
+        data["last_updated"] = _datetime.fromisoformat(data["last_updated"])
+        return cls(**data)
 
-# In-memory store for session state
-_session_states: Dict[str, SessionState] = {}
 
 # How long state is valid (30 minutes)
 SESSION_STATE_TIMEOUT_SECONDS = 1800
 
+# Bounded store for session state; idle sessions are evicted by the sweeper
+_session_states = _state_stores.create(
+    "router.session_state",
+    max_entries=_settings.session_state_max_entries,
+    ttl_seconds=SESSION_STATE_TIMEOUT_SECONDS,
+    serialize=SessionState.to_dict,
+    deserialize=SessionState.from_dict,
+)
+
 
 def get_session_state(session_id: str) -> SessionState:
     """Get or create session state."""
-    if session_id not in _session_states:
-        _session_states[session_id] = SessionState()
+    state = _session_states.get(session_id)
 
-    state = _session_states[session_id]
-
-    # Check if expired
-    elapsed = (_datetime.now() - state.last_updated).total_seconds()
-    if elapsed > SESSION_STATE_TIMEOUT_SECONDS:
-        # Reset stale state
-        _session_states[session_id] = SessionState()
-        return _session_states[session_id]
+    # Create, or reset stale state
+    if state is None or (
+        (_datetime.now() - state.last_updated).total_seconds() > SESSION_STATE_TIMEOUT_SECONDS
+    ):
+        state = SessionState()
+        _session_states.set(session_id, state)
 
     return state
 
@@ -1092,6 +1113,7 @@ def update_session_state(
         components=components,
         project_path=project_path,
     )
+    _session_states.set(session_id, state)
     logger.debug(f"Updated session state for {session_id[:8]}: {state.get_context_summary()[:100]}")
 
 
@@ -1109,14 +1131,34 @@ class PendingClarification:
     asked_at: _datetime
     matched_keywords: list[str]
 
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for the state spill."""
+        data = _asdict(self)
+        data["task_type"] = self.task_type.value
+        data["asked_at"] = self.asked_at.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PendingClarification":
+        """Restore from the state spill."""
+        data = dict(data)
+        data["task_type"] = TaskType(data["task_type"])
+        data["asked_at"] = _datetime.fromisoformat(data["asked_at"])
+        return cls(**data)
 
-# In-memory store for pending clarifications (session_id -> PendingClarification)
-# In production, this would be persisted to the database
-_pending_clarifications: Dict[str, PendingClarification] = {}
 
 # How long a clarification is valid (5 minutes)
 CLARIFICATION_TIMEOUT_SECONDS = 300
 
+# Pending clarifications (session_id -> PendingClarification)
+_pending_clarifications = _state_stores.create(
+    "router.pending_clarifications",
+    max_entries=_settings.session_state_max_entries,
+    ttl_seconds=CLARIFICATION_TIMEOUT_SECONDS,
+    serialize=PendingClarification.to_dict,
+    deserialize=PendingClarification.from_dict,
+)
+
 
 def store_pending_clarification(
     session_id: str,
@@ -1124,13 +1166,13 @@ def store_pending_clarification(
     classification: ClassificationResult,
 ) -> None:
     """Store a pending clarification for a session."""
-    _pending_clarifications[session_id] = PendingClarification(
+    _pending_clarifications.set(session_id, PendingClarification(
         original_task=original_task,
         task_type=classification.task_type,
         confidence=classification.confidence,
         asked_at=_datetime.now(),
         matched_keywords=classification.matched_keywords,
-    )
+    ))
     logger.debug(f"Stored pending clarification for session {session_id[:8]}")
 
 
@@ -1143,7 +1185,7 @@ def get_pending_clarification(session_id: str) -> PendingClarification | None:
     # Check if expired
     elapsed = (_datetime.now() - pending.asked_at).total_seconds()
     if elapsed > CLARIFICATION_TIMEOUT_SECONDS:
-        del _pending_clarifications[session_id]
+        _pending_clarifications.pop(session_id)
         logger.debug(f"Clarification for session {session_id[:8]} expired")
         return None
 
@@ -1152,8 +1194,7 @@ def get_pending_clarification(session_id: str) -> PendingClarification | None:
 
 def clear_pending_clarification(session_id: str) -> None:
     """Clear pending clarification for a session."""
-    if session_id in _pending_clarifications:
-        del _pending_clarifications[session_id]
+    if _pending_clarifications.pop(session_id) is not None:
         logger.debug(f"Cleared pending clarification for session {session_id[:8]}")
 
 
@@ -24,7 +24,9 @@ from app.skills.generators import (
     CIProvider,
     ProjectGenerator,
     ArtifactManifest,
+    DependencyCache,
 )
+from app.skills.generators.dep_cache import npm_cache_key
 from app.skills.generators.manifest import compute_config_hash
 
 
@@ -523,3 +525,95 @@ class TestConfigIsolation:
             main_py = project_path / "app" / "main.py"
             content = main_py.read_text()
             assert f"project-{i}" in content
+
+
+class TestDependencyCache:
+    """Test content-addressed dependency caching during generation."""
+
+    @pytest.fixture
+    def temp_workspace(self):
+        """Create a temporary workspace for tests."""
+        workspace = tempfile.mkdtemp()
+        yield Path(workspace)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    @pytest.fixture
+    def fake_installs(self, temp_workspace, monkeypatch):
+        """Replace installer commands with fakes and use a temporary cache."""
+        cache = DependencyCache(temp_workspace / "dep-cache")
+        monkeypatch.setattr("app.skills.generators.generator.dependency_cache", cache)
+        commands: list[str] = []
+
+        async def fake_run_command(command, working_dir, timeout_seconds=300):
+            commands.append(command.split(" --")[0].split(" -r")[0])
+            if command.startswith("npm install"):
+                pkg = Path(working_dir) / "node_modules" / "react"
+                pkg.mkdir(parents=True)
+                (pkg / "index.js").write_text("module.exports = {}\n")
+            elif command.startswith("pip wheel"):
+                wheel_dir = Path(command.split("--wheel-dir ")[1].split(" ")[0])
+                (wheel_dir / "fastapi-0.110.0-py3-none-any.whl").write_bytes(b"wheel")
+            return 0, "", ""
+
+        monkeypatch.setattr("app.skills.generators.generator.run_command", fake_run_command)
+        return cache, commands
+
+    def _config(self, workspace: Path, name: str) -> AppFactoryConfig:
+        return AppFactoryConfig(
+            name=name,
+            workspace_path=workspace,
+            backend_stack=BackendStack.FASTAPI,
+            frontend_stack=FrontendStack.REACT,
+        )
+
+    def test_keys_ignore_project_identity(self, temp_workspace):
+        first = temp_workspace / "a" / "package.json"
+        second = temp_workspace / "b" / "package.json"
+        for path, name in ((first, "one"), (second, "two")):
+            path.parent.mkdir()
+            path.write_text(f'{{"name": "{name}", "dependencies": {{"react": "^18"}}}}')
+
+        assert npm_cache_key(first) == npm_cache_key(second)
+
+        second.write_text('{"name": "two", "dependencies": {"react": "^19"}}')
+        assert npm_cache_key(first) != npm_cache_key(second)
+
+    @pytest.mark.asyncio
+    async def test_second_project_installs_from_cache(self, temp_workspace, fake_installs):
+        cache, commands = fake_installs
+
+        await ProjectGenerator(self._config(temp_workspace, "first-app")).generate(
+            run_verification=False, install_deps=True,
+        )
+        assert sorted(commands) == ["npm install", "pip install", "pip wheel"]
+
+        commands.clear()
+        manifest = await ProjectGenerator(self._config(temp_workspace, "second-app")).generate(
+            run_verification=False, install_deps=True,
+        )
+
+        # Wheelhouse reused offline, node_modules hydrated without npm
+        assert commands == ["pip install"]
+        restored = temp_workspace / "second-app" / "frontend" / "node_modules" / "react" / "index.js"
+        assert restored.read_text() == "module.exports = {}\n"
+        assert any("dependency cache" in c.command for c in manifest.commands)
+        assert cache.get_stats()["npm_entries"] == 1
+        assert cache.get_stats()["pip_entries"] == 1
+
+    def test_restored_files_are_independent_copies(self, temp_workspace):
+        cache = DependencyCache(temp_workspace / "dep-cache")
+        source = temp_workspace / "a"
+        (source / "node_modules" / "react").mkdir(parents=True)
+        (source / "node_modules" / "react" / "index.js").write_text("original\n")
+        assert cache.store_node_modules("key", source)
+
+        target = temp_workspace / "b"
+        target.mkdir()
+        assert cache.restore_node_modules("key", target)
+        (target / "node_modules" / "react" / "index.js").write_text("patched\n")
+        (source / "node_modules" / "react" / "index.js").write_text("edited\n")
+
+        other = temp_workspace / "c"
+        other.mkdir()
+        assert cache.restore_node_modules("key", other)
+        assert (other / "node_modules" / "react" / "index.js").read_text() == "original\n"
@@ -0,0 +1,148 @@
+"""Tests for the event-driven approval broker (timers, pub/sub, persistence)."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.guardrails.diff_approval import ApprovalStatus, DiffApprovalManager
+
+
+async def _write(manager: DiffApprovalManager, session_id: str = "s1", timeout: float = 300.0):
+    return await manager.create_write_approval(
+        session_id=session_id,
+        agent_id="coder",
+        task_id=None,
+        file_path="/tmp/broker.txt",
+        original_content="old\n",
+        new_content="new\n",
+        timeout_seconds=timeout,
+    )
+
+
+class TestExpiryTimer:
+    @pytest.mark.asyncio
+    async def test_timer_expires_without_sweep(self):
+        manager = DiffApprovalManager()
+        await manager.start()
+        try:
+            short = await _write(manager, timeout=0.05)
+            long = await _write(manager, timeout=60)
+
+            status = await asyncio.wait_for(manager.wait_for_approval(short.id, timeout=5), 1)
+
+            assert status == ApprovalStatus.EXPIRED
+            assert long.status == ApprovalStatus.PENDING
+            assert manager.get_stats()["expired"] == 1
+        finally:
+            await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_lazy_expiry_without_timer(self):
+        manager = DiffApprovalManager()
+        approval = await _write(manager, timeout=0)
+
+        assert manager.get_pending() == []
+        assert approval.status == ApprovalStatus.EXPIRED
+        assert manager.cleanup_expired() == 0  # Already fired, heap entry consumed
+
+    @pytest.mark.asyncio
+    async def test_resolved_approvals_retired(self, monkeypatch):
+        monkeypatch.setattr("app.guardrails.diff_approval.RESOLVED_RETENTION_SECONDS", 0)
+        manager = DiffApprovalManager()
+        approval = await _write(manager)
+        manager.reject(approval.id, reason="no")
+
+        assert manager.get_approval(approval.id) is None
+        assert manager.get_stats()["retired"] == 1
+
+
+class TestSubscriptions:
+    @pytest.mark.asyncio
+    async def test_per_session_events(self):
+        manager = DiffApprovalManager()
+        mine = manager.subscribe("s1")
+        everything = manager.subscribe()
+
+        approval = await _write(manager, "s1")
+        await _write(manager, "s2")
+        manager.approve(approval.id, approved_by="alice")
+
+        requested = await mine.get(timeout=1)
+        resolved = await mine.get(timeout=1)
+        assert (requested.type, resolved.type) == ("approval_requested", "approval_resolved")
+        assert resolved.approval.approved_by == "alice"
+        assert await mine.get(timeout=0.01) is None  # s2 not delivered
+        assert everything._queue.qsize() == 3
+
+        mine.close()
+        everything.close()
+        assert manager.get_stats()["subscribers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_waiter_resumes_on_decision(self):
+        manager = DiffApprovalManager()
+        approval = await _write(manager)
+        waiter = asyncio.create_task(manager.wait_for_approval(approval.id))
+        await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        manager.cancel(approval.id)
+        status = await waiter
+
+        assert status == ApprovalStatus.EXPIRED
+        assert time.perf_counter() - started < 0.05
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest(self):
+        manager = DiffApprovalManager()
+        subscription = manager.subscribe("s1")
+        subscription._queue = asyncio.Queue(maxsize=2)
+
+        approvals = [await _write(manager) for _ in range(3)]
+
+        assert subscription.dropped == 1
+        assert (await subscription.get()).approval is approvals[1]
+
+
+class TestPersistence:
+    @pytest.mark.asyncio
+    async def test_pending_restored_as_orphaned(self, tmp_path):
+        path = tmp_path / "approvals.db"
+        first = DiffApprovalManager()
+        await first.start(persist_path=path)
+        kept = await _write(first, timeout=60)
+        decided = await _write(first, timeout=60)
+        first.approve(decided.id)
+        await first.stop()
+
+        second = DiffApprovalManager()
+        await second.start(persist_path=path)
+        try:
+            assert second.get_pending() == []
+            restored = second.get_approval(kept.id)
+            assert restored.status == ApprovalStatus.ORPHANED
+            assert restored.diff == kept.diff and restored.content_hash == kept.content_hash
+            assert restored.expires_at == kept.expires_at
+            assert second.get_approval(decided.id) is None
+
+            # Nothing is waiting on it any more, so it cannot be approved
+            assert not second.approve(kept.id)
+            assert second.get_stats()["restored"] == 1
+            await second._store_tail
+            assert second._store.count("approvals") == 0
+        finally:
+            await second.stop()
+
+    @pytest.mark.asyncio
+    async def test_file_contents_not_persisted(self, tmp_path):
+        manager = DiffApprovalManager()
+        await manager.start(persist_path=tmp_path / "approvals.db")
+        try:
+            approval = await _write(manager, timeout=60)
+
+            [(_, payload, _)] = manager._store.load_all("approvals")
+            assert payload["diff"] == approval.diff
+            assert "original_content" not in payload and "new_content" not in payload
+        finally:
+            await manager.stop()
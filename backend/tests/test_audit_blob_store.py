@@ -0,0 +1,162 @@
+"""Tests for the content-addressed audit blob store."""
+
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.audit.blob_store import (
+    BLOB_KIND_DIFF,
+    BLOB_KIND_LLM_REQUEST,
+    BlobStore,
+    _build_zlib_dictionary,
+    blob_ref,
+    parse_blob_ref,
+)
+from app.audit.retention import get_retention_config, purge_old_records
+from app.database import AuditBlob, Base, FileChangeLog, LLMExchangeLog
+from app.guardrails.audit_repository import AuditRepository
+
+
+@pytest_asyncio.fixture
+async def db_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fresh = BlobStore(train_samples=5, use_zstd=False)
+    monkeypatch.setattr("app.audit.blob_store.audit_blob_store", fresh)
+    monkeypatch.setattr("app.audit.purge.audit_blob_store", fresh)
+    monkeypatch.setattr("app.guardrails.audit_repository.audit_blob_store", fresh)
+    return fresh
+
+
+def _diff(i: int) -> str:
+    header = "".join(f"    context line {n} shared by every diff\n" for n in range(40))
+    return f"--- a/file{i}.py\n+++ b/file{i}.py\n{header}+added line {i}\n-removed line {i}\n"
+
+
+async def _blobs(session) -> list[AuditBlob]:
+    return list((await session.execute(select(AuditBlob))).scalars())
+
+
+class TestBlobStore:
+    @pytest.mark.asyncio
+    async def test_put_deduplicates_and_round_trips(self, db_factory, store):
+        content = "You are a helpful assistant.\n" * 200
+        async with db_factory() as session:
+            h1 = await store.put(BLOB_KIND_LLM_REQUEST, content, db=session)
+            h2 = await store.put(BLOB_KIND_LLM_REQUEST, content, db=session)
+            await session.commit()
+
+            assert h1 == h2 == hashlib.sha256(content.encode()).hexdigest()
+            [blob] = await _blobs(session)
+            assert blob.refcount == 2
+            assert isinstance(blob.data, bytes)
+            assert blob.stored_size < blob.size / 10
+            assert await store.get(h1, db=session) == content
+
+        assert store.get_stats()["dedup_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_dictionary_trained_and_persisted(self, db_factory, store):
+        async with db_factory() as session:
+            for i in range(5):
+                await store.put(BLOB_KIND_DIFF, _diff(i), db=session)
+
+            h = await store.put(BLOB_KIND_DIFF, _diff(99), db=session)
+            await session.commit()
+            blob = await session.get(AuditBlob, h)
+            assert blob.dictionary_id == store.get_stats()["dictionaries"][BLOB_KIND_DIFF]
+
+        # A fresh store loads the dictionary from the database to decode
+        async with db_factory() as session:
+            assert await BlobStore(use_zstd=False).get(h, db=session) == _diff(99)
+
+    @pytest.mark.asyncio
+    async def test_release_and_gc(self, db_factory, store):
+        async with db_factory() as session:
+            shared = await store.put(BLOB_KIND_DIFF, _diff(1), db=session)
+            await store.put(BLOB_KIND_DIFF, _diff(1), db=session)
+            single = await store.put(BLOB_KIND_DIFF, _diff(2), db=session)
+
+            assert await store.release([shared, single], db=session) == 2
+            assert await store.gc(db=session) == 1
+            await session.commit()
+
+            assert [b.hash for b in await _blobs(session)] == [shared]
+
+    def test_refs_and_zlib_dictionary(self):
+        assert parse_blob_ref(blob_ref("abc")) == "abc"
+        assert parse_blob_ref("GZIP:abc") is None
+        assert parse_blob_ref(None) is None
+
+        samples = [b"common header line\nunique %d\n" % i for i in range(3)]
+        assert _build_zlib_dictionary(samples) == b"common header line\n"
+
+
+class TestRepositoryIntegration:
+    @pytest.mark.asyncio
+    async def test_llm_bodies_truncated_by_default(self, db_factory, store):
+        prompt = "System prompt. " * 500
+        async with db_factory() as session:
+            entry = await AuditRepository.log_llm_request(prompt, include_content=True, db=session)
+            await session.commit()
+
+            assert entry.content_redacted == prompt[:1000] + "..."
+            assert await _blobs(session) == []
+
+    @pytest.mark.asyncio
+    async def test_llm_bodies_share_blob(self, db_factory, store, monkeypatch):
+        monkeypatch.setattr(get_retention_config(), "retain_full_llm_content", True)
+        prompt = "System prompt. " * 500
+        async with db_factory() as session:
+            for _ in range(3):
+                await AuditRepository.log_llm_request(prompt, include_content=True, db=session)
+            await AuditRepository.log_llm_request("short", include_content=True, db=session)
+            await session.commit()
+
+            rows = list((await session.execute(select(LLMExchangeLog))).scalars())
+            refs = {r.content_redacted for r in rows}
+            assert refs == {blob_ref(hashlib.sha256(prompt.encode()).hexdigest()), "short"}
+            [blob] = await _blobs(session)
+            assert blob.refcount == 3
+
+    @pytest.mark.asyncio
+    async def test_purge_releases_blob_references(self, db_factory, store):
+        diff = _diff(7)
+        async with db_factory() as session:
+            old = await AuditRepository.log_file_operation("a.py", "write", diff=diff, db=session)
+            await AuditRepository.log_file_operation("b.py", "write", diff=diff, db=session)
+            other = await AuditRepository.log_file_operation(
+                "c.py", "write", diff=_diff(8), db=session
+            )
+            await session.commit()
+            assert old.diff == blob_ref(old.diff_original_hash)
+
+            await session.execute(
+                update(FileChangeLog)
+                .where(FileChangeLog.id.in_([old.id, other.id]))
+                .values(created_at=datetime.utcnow() - timedelta(days=200))
+            )
+            result = await purge_old_records("file_change_logs", 90, db=session)
+            await session.commit()
+
+            assert result.deleted_count == 2
+            assert result.blobs_freed == 1
+            [blob] = await _blobs(session)
+            assert blob.hash == old.diff_original_hash
+            assert blob.refcount == 1
+            remaining = await session.execute(select(func.count(FileChangeLog.id)))
+            assert remaining.scalar() == 1
+            assert await store.resolve(old.diff, db=session) == diff
@@ -0,0 +1,131 @@
+"""Tests for the batched, resumable audit retention purge."""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.audit.purge import RetentionPurger
+from app.audit.retention import RetentionConfig, TableRetentionPolicy, purge_all_tables
+from app.database import AuditLog, Base, BudgetLog
+
+
+@pytest_asyncio.fixture
+async def db_factory(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _incremental(dbapi_conn, _):
+        # Must be set before the first table is created
+        dbapi_conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr("app.audit.purge.async_session_factory", factory)
+    monkeypatch.setattr("app.audit.retention.async_session_factory", factory)
+    yield factory
+
+    await engine.dispose()
+
+
+async def _seed(factory, old: int, recent: int, payload: str = "") -> None:
+    now = datetime.utcnow()
+    async with factory() as session:
+        for i in range(old + recent):
+            session.add(AuditLog(
+                id=str(uuid.uuid4()),
+                category="tool",
+                action="call",
+                error=payload or None,
+                created_at=now - timedelta(days=120 if i < old else 1),
+            ))
+        await session.commit()
+
+
+async def _count(factory, model=AuditLog) -> int:
+    async with factory() as session:
+        return (await session.execute(select(func.count(model.id)))).scalar()
+
+
+def _config(**tables: int) -> RetentionConfig:
+    return RetentionConfig(
+        policies={name: TableRetentionPolicy(name, days) for name, days in tables.items()}
+    )
+
+
+class TestRetentionPurger:
+    @pytest.mark.asyncio
+    async def test_batches_pause_and_resume(self, db_factory, tmp_path):
+        await _seed(db_factory, old=25, recent=5)
+        state_path = tmp_path / "purge_state.json"
+        seen = []
+
+        def stop_after_two(progress):
+            seen.append(progress.deleted)
+            if progress.batches == 2:
+                first._deadline = 0  # Spend the time budget
+
+        first = RetentionPurger(
+            _config(audit_logs=90, budget_logs=30),
+            batch_size=10,
+            pause_seconds=0,
+            time_budget_seconds=3600,
+            state_path=state_path,
+            on_progress=stop_after_two,
+        )
+        partial = await first.run()
+
+        assert seen == [10, 20]
+        assert partial.completed is False
+        assert partial.results[0].deleted_count == 20
+        assert state_path.exists()
+        assert await _count(db_factory) == 10
+
+        second = RetentionPurger(
+            _config(audit_logs=90, budget_logs=30),
+            batch_size=10,
+            pause_seconds=0,
+            state_path=state_path,
+        )
+        done = await second.run()
+
+        assert done.completed is True
+        assert done.results[0].deleted_count == 25  # Cumulative across runs
+        assert done.results[0].batches == 3
+        assert not state_path.exists()
+        assert await _count(db_factory) == 5
+
+    @pytest.mark.asyncio
+    async def test_changed_retention_restarts_table(self, db_factory, tmp_path):
+        await _seed(db_factory, old=3, recent=2)
+        state_path = tmp_path / "purge_state.json"
+        stale = RetentionPurger(
+            _config(audit_logs=365), state_path=state_path, time_budget_seconds=0
+        )
+        await stale.run()
+        assert await _count(db_factory) == 5
+
+        result = await RetentionPurger(_config(audit_logs=90), state_path=state_path).run()
+        assert result.total_deleted == 3
+
+    @pytest.mark.asyncio
+    async def test_purge_all_tables_with_incremental_vacuum(self, db_factory):
+        await _seed(db_factory, old=200, recent=1, payload="x" * 2000)
+
+        result = await purge_all_tables(
+            _config(audit_logs=90, budget_logs=30),
+            pause_seconds=0,
+            incremental_vacuum=True,
+        )
+
+        assert result.completed
+        assert result.total_deleted == 200
+        assert result.vacuum_run is False
+        assert result.analyze_run is True
+        assert result.incremental_vacuum_pages > 0
+        assert await _count(db_factory, BudgetLog) == 0
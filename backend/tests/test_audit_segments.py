@@ -0,0 +1,136 @@
+"""Tests for segmented, indexed audit trail storage."""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.audit.logger import AuditLogger
+from app.audit.models import AuditCategory, AuditEvent
+from app.audit.segments import SegmentStore
+
+
+def _event(i: int, day: datetime, category=AuditCategory.TOOL, session_id=None) -> AuditEvent:
+    return AuditEvent(
+        category=category,
+        action=f"action-{i}",
+        session_id=session_id or f"s{i % 3}",
+        timestamp=day + timedelta(seconds=i),
+        metadata={"i": i, "padding": "x" * 200},
+    )
+
+
+DAY = datetime(2024, 3, 1, 12, 0, 0)
+
+
+class TestSegmentStore:
+    def test_rolls_by_size_and_compresses(self, tmp_path):
+        store = SegmentStore(tmp_path, max_segment_bytes=4096, block_size=1024)
+        store.append([_event(i, DAY) for i in range(60)])
+        store.close()
+
+        assert not list(tmp_path.glob("*.jsonl"))
+        segments = sorted(tmp_path.glob("audit-2024-03-01-*.jsonl.gz"))
+        assert len(segments) > 2
+        # Multi-member gzip stays readable by standard tools
+        lines = gzip.decompress(segments[0].read_bytes()).splitlines()
+        assert json.loads(lines[0])["action"] == "action-0"
+
+        stats = store.get_stats()
+        assert stats["records"] == 60
+        assert stats["compressed_bytes"] < stats["uncompressed_bytes"]
+
+    def test_indexed_query_matches_scan(self, tmp_path):
+        store = SegmentStore(tmp_path, max_segment_bytes=8192, block_size=1024)
+        events = [
+            _event(i, DAY, category=AuditCategory.FILE if i % 4 == 0 else AuditCategory.TOOL)
+            for i in range(100)
+        ]
+        store.append(events[:70])
+        store.close()
+        store.append(events[70:])  # Still in the active, uncompressed segment
+
+        found = store.query("2024-03-01", "2024-03-01", category="file", session_id="s1")
+        expected = [
+            e.action for e in events if e.category == AuditCategory.FILE and e.session_id == "s1"
+        ]
+        assert [r["action"] for r in found] == expected
+
+        assert len(store.query("2024-03-01", "2024-03-01", limit=1000)) == 100
+        assert len(store.query("2024-03-01", "2024-03-01", session_id="s2", limit=5)) == 5
+        assert store.query("2024-03-01", "2024-03-01", session_id="missing") == []
+
+    def test_only_summaries_resident(self, tmp_path):
+        store = SegmentStore(tmp_path, max_segment_bytes=4096, block_size=1024)
+        store.append([_event(i, DAY) for i in range(60)])
+        store.close()
+
+        reopened = SegmentStore(tmp_path, index_cache_size=1)
+        reopened.open()
+        assert all(not s.sessions and not s.blocks for s in reopened._sealed)
+
+        found = reopened.query("2024-03-01", "2024-03-01", session_id="s1")
+        assert [r["action"] for r in found] == [f"action-{i}" for i in range(1, 60, 3)]
+        assert reopened.get_stats()["cached_indexes"] == 1
+        assert reopened.get_stats()["index_loads"] == len(reopened._sealed)
+
+    def test_date_range_skips_segments(self, tmp_path):
+        store = SegmentStore(tmp_path)
+        store.append([_event(i, DAY + timedelta(days=i)) for i in range(5)])
+        store.close()
+
+        found = store.query("2024-03-02", "2024-03-03")
+        assert [r["action"] for r in found] == ["action-1", "action-2"]
+        assert len(list(tmp_path.glob("*.idx.json"))) == 5
+
+    def test_active_sealed_during_read_falls_back_to_gzip(self, tmp_path, monkeypatch):
+        store = SegmentStore(tmp_path)
+        store.append([_event(i, DAY) for i in range(10)])
+        read_plain = SegmentStore._read_plain_lines
+
+        def seal_then_read(path, offsets, size):
+            store.close()  # Seals and removes the plain file the plan points at
+            return read_plain(path, offsets, size)
+
+        monkeypatch.setattr(store, "_read_plain_lines", seal_then_read)
+        found = store.query("2024-03-01", "2024-03-01")
+
+        assert [r["action"] for r in found] == [f"action-{i}" for i in range(10)]
+        assert not list(tmp_path.glob("*.jsonl"))
+
+    def test_reopen_seals_legacy_and_unclean_files(self, tmp_path):
+        legacy = tmp_path / "audit-2024-02-28.jsonl"
+        lines = [_event(i, DAY - timedelta(days=2)).to_json() for i in range(3)]
+        legacy.write_text("\n".join(lines) + "\n")
+
+        store = SegmentStore(tmp_path)
+        store.append([_event(0, DAY)])  # Never closed, as after a crash
+
+        reopened = SegmentStore(tmp_path)
+        assert len(reopened.query("2024-02-28", "2024-03-01")) == 4
+        assert not list(tmp_path.glob("*.jsonl"))
+
+        reopened.append([_event(1, DAY)])
+        reopened.close()
+        names = sorted(p.name for p in tmp_path.glob("audit-2024-03-01-*.jsonl.gz"))
+        assert names == ["audit-2024-03-01-0001.jsonl.gz", "audit-2024-03-01-0002.jsonl.gz"]
+
+
+class TestAuditLoggerFileBackend:
+    @pytest.mark.asyncio
+    async def test_flush_and_query(self, tmp_path):
+        audit = AuditLogger(log_dir=tmp_path, flush_interval=3600)
+        await audit.start()
+        for i in range(5):
+            audit.log(
+                AuditEvent(category=AuditCategory.SYSTEM, action=f"boot-{i}", session_id="abc")
+            )
+        await audit._flush_to_file()
+
+        events = await audit.query_events(category=AuditCategory.SYSTEM, session_id="abc")
+        assert [e["action"] for e in events] == [f"boot-{i}" for i in range(5)]
+
+        await audit.stop()
+        assert (await audit.get_storage_stats())["active_segment"] is None
+        assert len(await audit.query_events(session_id="abc")) == 5
@@ -0,0 +1,238 @@
+"""Tests for the resilience circuit breaker."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.autonomous.git_ops import is_remote_unavailable
+from app.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerError,
+    CircuitBreakerRegistry,
+    CircuitState,
+    circuit_protected,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch("app.resilience.circuit_breaker.time.monotonic", fake):
+        yield fake
+
+
+def _fail(breaker: CircuitBreaker) -> None:
+    with pytest.raises(RuntimeError):
+        with breaker.protect():
+            raise RuntimeError("boom")
+
+
+def _succeed(breaker: CircuitBreaker) -> None:
+    with breaker.protect():
+        pass
+
+
+class TestFailureRate:
+    """Test rolling-window failure-rate tripping."""
+
+    def test_consecutive_failures_open(self, clock):
+        breaker = CircuitBreaker("svc", CircuitBreakerConfig(failure_threshold=3))
+        for _ in range(3):
+            _fail(breaker)
+
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitBreakerError) as exc:
+            breaker.protect()
+        assert exc.value.retry_after == pytest.approx(30.0)
+
+    def test_low_failure_rate_stays_closed(self, clock):
+        breaker = CircuitBreaker("svc", CircuitBreakerConfig(failure_threshold=3))
+        for _ in range(3):
+            _succeed(breaker)
+            _succeed(breaker)
+            _succeed(breaker)
+            _fail(breaker)
+
+        # 3 of 12 calls failed: over the count, under the 50% rate
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_status()["window"]["failure_rate"] == pytest.approx(0.25)
+
+    def test_failures_expire_from_window(self, clock):
+        breaker = CircuitBreaker(
+            "svc", CircuitBreakerConfig(failure_threshold=3, window_seconds=60.0)
+        )
+        _fail(breaker)
+        _fail(breaker)
+        clock.now += 120
+        _fail(breaker)
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_status()["failure_count"] == 1
+
+    def test_excluded_exceptions_count_as_success(self, clock):
+        breaker = CircuitBreaker(
+            "svc", CircuitBreakerConfig(failure_threshold=1, excluded_exceptions=(KeyError,))
+        )
+        with pytest.raises(KeyError):
+            with breaker.protect():
+                raise KeyError("missing")
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_status()["total_failures"] == 0
+
+    def test_fail_marks_without_exception(self, clock):
+        breaker = CircuitBreaker("svc", CircuitBreakerConfig(failure_threshold=1))
+        with breaker.protect() as guard:
+            guard.fail()
+
+        assert breaker.state == CircuitState.OPEN
+
+
+class TestSlowCalls:
+    def test_slow_calls_open(self, clock):
+        breaker = CircuitBreaker(
+            "svc",
+            CircuitBreakerConfig(failure_threshold=2, slow_call_seconds=5.0),
+        )
+        for _ in range(2):
+            with breaker.protect():
+                clock.now += 6
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.get_status()["total_slow_calls"] == 2
+
+
+class TestHalfOpen:
+    """Test recovery through the half-open state."""
+
+    def _opened(self, **kwargs) -> CircuitBreaker:
+        breaker = CircuitBreaker(
+            "svc", CircuitBreakerConfig(failure_threshold=1, timeout_seconds=10.0, **kwargs)
+        )
+        _fail(breaker)
+        return breaker
+
+    def test_recovers_after_successes(self, clock):
+        breaker = self._opened(success_threshold=2)
+        clock.now += 10
+
+        _succeed(breaker)
+        assert breaker.state == CircuitState.HALF_OPEN
+        _succeed(breaker)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_status()["window"]["calls"] == 0
+
+    def test_failure_reopens(self, clock):
+        breaker = self._opened()
+        clock.now += 10
+
+        _fail(breaker)
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.get_status()["times_opened"] == 2
+
+    def test_probe_slots_limited(self, clock):
+        breaker = self._opened(half_open_max_calls=1)
+        clock.now += 10
+
+        probe = breaker.protect()
+        with pytest.raises(CircuitBreakerError):
+            breaker.protect()
+        assert breaker.get_status()["total_rejections"] == 1
+
+        # Cancellation frees the slot without counting as an outcome
+        probe.__exit__(asyncio.CancelledError, asyncio.CancelledError(), None)
+        assert breaker.state == CircuitState.HALF_OPEN
+        _succeed(breaker)
+
+    def test_stale_outcome_ignored(self, clock):
+        breaker = CircuitBreaker("svc", CircuitBreakerConfig(failure_threshold=1))
+        slow_call = breaker.protect()
+        _fail(breaker)
+        breaker.reset()
+
+        # A call admitted before the reset failing must not reopen the circuit
+        slow_call.fail()
+        slow_call.__exit__(None, None, None)
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_status()["total_failures"] == 2
+
+
+class TestAsyncUsage:
+    @pytest.mark.asyncio
+    async def test_call_and_decorator(self):
+        registry = CircuitBreakerRegistry()
+
+        async def flaky():
+            raise ConnectionError("down")
+
+        breaker = registry.get_or_create("svc", CircuitBreakerConfig(failure_threshold=2))
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await breaker.call(flaky)
+        with pytest.raises(CircuitBreakerError):
+            await breaker.call(flaky)
+
+        calls = []
+
+        with patch("app.resilience.circuit_breaker.circuit_breaker_registry", registry):
+            @circuit_protected("decorated", CircuitBreakerConfig(failure_threshold=1))
+            async def fetch(value):
+                calls.append(value)
+                raise ConnectionError("down")
+
+            with pytest.raises(ConnectionError):
+                await fetch(1)
+            with pytest.raises(CircuitBreakerError):
+                await fetch(2)
+
+        assert calls == [1]
+        assert registry.get("decorated").is_open
+
+
+class TestHttpHostBreaker:
+    @pytest.mark.asyncio
+    async def test_server_errors_trip_host_only(self):
+        from app.utils.http_client import HttpClientManager
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = 503 if request.url.host == "down.example" else 404
+            return httpx.Response(status, text="x")
+
+        registry = CircuitBreakerRegistry()
+        manager = HttpClientManager(transport=httpx.MockTransport(handler))
+        with patch("app.utils.http_client.circuit_breaker_registry", registry):
+            for _ in range(5):
+                response = await manager.get("https://down.example/a")
+                assert response.status_code == 503
+                with pytest.raises(httpx.HTTPStatusError):
+                    await manager.fetch_text("https://fine.example/a", max_chars=100)
+
+            with pytest.raises(CircuitBreakerError):
+                await manager.get("https://down.example/a")
+            with pytest.raises(httpx.HTTPStatusError):
+                await manager.fetch_text("https://fine.example/a", max_chars=100)
+
+        assert registry.get("http:down.example").is_open
+        assert registry.get("http:fine.example").is_closed
+        await manager.aclose()
+
+
+class TestGitRemoteErrors:
+    def test_transport_errors_detected(self):
+        assert is_remote_unavailable(
+            "fatal: unable to access 'https://github.com/x/y/': Could not resolve host: github.com"
+        )
+        assert not is_remote_unavailable("! [rejected] main -> main (fetch first)")
@@ -0,0 +1,168 @@
+"""Tests for the mtime-validated config cache and its users."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.projects.registry import ProjectRegistry
+from app.skills.base import SkillRegistry
+from app.utils.config_cache import ConfigCache
+
+
+def _touch(path: Path, content: str, mtime_ns: int) -> None:
+    """Write a file with an explicit mtime so changes are visible within one tick."""
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestConfigCache:
+    """Test hits, invalidation and directory change detection."""
+
+    def test_get_caches_until_file_changes(self, tmp_path):
+        cache = ConfigCache()
+        path = tmp_path / "a.yaml"
+        _touch(path, "one", 1_000)
+        calls = []
+
+        def loader(p: Path) -> str:
+            calls.append(p)
+            return p.read_text()
+
+        assert cache.get(path, loader, namespace="rules") == "one"
+        assert cache.get(path, loader, namespace="rules") == "one"
+        assert len(calls) == 1
+
+        _touch(path, "two!", 2_000)
+        assert cache.get(path, loader, namespace="rules") == "two!"
+        assert len(calls) == 2
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+        assert stats["by_namespace"]["rules"] == {"hits": 1, "misses": 2}
+
+    def test_loader_errors_not_cached(self, tmp_path):
+        cache = ConfigCache()
+        path = tmp_path / "a.yaml"
+        path.write_text("x")
+
+        def failing(p: Path) -> str:
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            cache.get(path, failing)
+        assert cache.get(path, lambda p: "ok") == "ok"
+
+    def test_derived_rebuilt_when_any_source_changes(self, tmp_path):
+        cache = ConfigCache()
+        a, b = tmp_path / "a", tmp_path / "b"
+        _touch(a, "a", 1_000)
+        builds = []
+
+        def build() -> str:
+            builds.append(1)
+            return "+".join(p.read_text() for p in (a, b) if p.exists())
+
+        assert cache.get_derived("ctx", [a, b], build) == "a"
+        assert cache.get_derived("ctx", [a, b], build) == "a"
+        _touch(b, "b", 1_000)  # Appearing file counts as a change
+        assert cache.get_derived("ctx", [a, b], build) == "a+b"
+        assert len(builds) == 2
+
+    def test_invalidate_by_path(self, tmp_path):
+        cache = ConfigCache()
+        path = tmp_path / "a.yaml"
+        path.write_text("x")
+        cache.get(path, lambda p: "x")
+
+        assert cache.invalidate(path) == 1
+        assert cache.get_stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ConfigCache(max_entries=2)
+        for name in ("a", "b", "c"):
+            (tmp_path / name).write_text(name)
+            cache.get(tmp_path / name, lambda p: p.read_text())
+
+        assert cache.get_stats()["entries"] == 2
+
+    def test_dir_changed_is_throttled(self, tmp_path):
+        cache = ConfigCache(dir_check_interval=3600)
+        key = ("projects", str(tmp_path))
+
+        assert cache.dir_changed(key, tmp_path, ("*.yaml",)) is True
+        (tmp_path / "new.yaml").write_text("x")
+        assert cache.dir_changed(key, tmp_path, ("*.yaml",)) is False
+        assert cache.dir_changed(key, tmp_path, ("*.yaml",), force=True) is True
+        assert cache.dir_changed(key, tmp_path, ("*.yaml",), force=True) is False
+
+    def test_invalidate_forces_dir_recheck(self, tmp_path):
+        cache = ConfigCache(dir_check_interval=3600)
+        key = ("projects", str(tmp_path))
+        cache.dir_changed(key, tmp_path, ("*.yaml",))
+
+        path = tmp_path / "new.yaml"
+        path.write_text("x")
+        cache.invalidate(path)
+
+        assert cache.dir_changed(key, tmp_path, ("*.yaml",)) is True
+
+
+class TestCacheUsers:
+    """Test the rules store, project registry and skills loader on the cache."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch) -> ConfigCache:
+        cache = ConfigCache(dir_check_interval=0)
+        monkeypatch.setattr("app.rules.store.config_cache", cache)
+        monkeypatch.setattr("app.projects.registry.config_cache", cache)
+        monkeypatch.setattr("app.skills.loader.config_cache", cache)
+        return cache
+
+    def test_rules_context_cached(self, cache, tmp_path, monkeypatch):
+        from app.rules import store
+
+        monkeypatch.setattr(store, "RULES_DIR", tmp_path)
+        rule = store.create_rule("Style", "Code style", "Use tabs")
+
+        first = store.get_rules_for_context([rule.id])
+        second = store.get_rules_for_context([rule.id])
+
+        assert "Use tabs" in first
+        assert first == second
+        assert cache.get_stats()["by_namespace"]["rules"]["hits"] >= 1
+
+        store.update_rule(rule.id, content="Use spaces")
+        assert "Use spaces" in store.get_rules_for_context([rule.id])
+
+    def test_registry_reloads_changed_files(self, cache, tmp_path):
+        registry = ProjectRegistry(config_dir=tmp_path)
+        assert registry.list_all() == []
+
+        _touch(tmp_path / "demo.yaml", "name: demo\npath: /tmp/demo\n", 1_000)
+        assert registry.get("demo").path == "/tmp/demo"
+
+        _touch(tmp_path / "demo.yaml", "name: demo\npath: /srv/demo\n", 2_000)
+        assert registry.get("demo").path == "/srv/demo"
+
+        (tmp_path / "demo.yaml").unlink()
+        assert registry.get("demo") is None
+
+    def test_skills_refresh_on_change(self, cache, tmp_path, monkeypatch):
+        from app.skills import loader
+
+        registry = SkillRegistry()
+        monkeypatch.setattr(loader, "skill_registry", registry)
+        monkeypatch.setattr(loader, "_dir_skill_ids", {})
+        skill_file = tmp_path / "deploy.yaml"
+        _touch(skill_file, "id: deploy\nname: Deploy\ndescription: Ship it\n", 1_000)
+
+        assert loader.load_skills_from_dir(tmp_path) == 1
+        assert registry.get("deploy").name == "Deploy"
+
+        _touch(skill_file, "id: deploy\nname: Deploy v2\ndescription: Ship it\n", 2_000)
+        assert registry.get("deploy").name == "Deploy v2"
+
+        skill_file.unlink()
+        assert registry.get("deploy") is None
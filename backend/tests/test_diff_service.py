@@ -0,0 +1,128 @@
+"""Tests for the diff service (patience/Myers diff, summaries, offloading)."""
+
+import difflib
+import random
+
+import pytest
+
+from app.utils import diff_service as diff_module
+from app.utils.diff_service import (
+    UnifiedDiffService,
+    _Matcher,
+    compute_diff,
+    count_changes,
+)
+
+
+def _apply(original: list[str], diff: str) -> list[str]:
+    """Apply a unified diff produced from original (context is verified)."""
+    out, pos = [], 0
+    for line in diff.splitlines(keepends=True):
+        if line.startswith(("---", "+++")):
+            continue
+        if line.startswith("@@"):
+            start = int(line.split()[1][1:].split(",")[0])
+            length = line.split()[1].split(",")
+            start = start - 1 if len(length) == 1 or length[1] != "0" else start
+            out.extend(original[pos:start])
+            pos = start
+        elif line.startswith(" "):
+            assert original[pos] == line[1:]
+            out.append(line[1:])
+            pos += 1
+        elif line.startswith("-"):
+            assert original[pos] == line[1:]
+            pos += 1
+        elif line.startswith("+"):
+            out.append(line[1:])
+    return out + original[pos:]
+
+
+class TestComputeDiff:
+    def test_format_matches_difflib(self):
+        old = "".join(f"line {i}\n" for i in range(40))
+        new = old.replace("line 5\n", "line five\n").replace("line 30\n", "")
+
+        result = compute_diff(old, new, "a/x.py", "b/x.py")
+        expected = "".join(difflib.unified_diff(
+            old.splitlines(keepends=True), new.splitlines(keepends=True), "a/x.py", "b/x.py",
+        ))
+
+        assert result.text == expected
+        assert (result.added, result.removed) == (1, 2)
+        assert (result.added, result.removed) == count_changes(result.text)
+
+    def test_random_edits_round_trip(self):
+        rng = random.Random(11)
+        for _ in range(300):
+            old = [f"{rng.randint(0, 6)}\n" for _ in range(rng.randint(0, 40))]
+            new = list(old)
+            for _ in range(rng.randint(1, 8)):
+                pos = rng.randint(0, len(new))
+                if rng.random() < 0.5 or not new:
+                    new.insert(pos, f"{rng.randint(0, 9)}\n")
+                else:
+                    del new[min(pos, len(new) - 1)]
+
+            result = compute_diff("".join(old), "".join(new))
+
+            assert _apply(old, result.text) == new
+            assert result.added - result.removed == len(new) - len(old)
+
+    def test_over_budget_split_stays_valid(self):
+        old = ["a\n", "b\n"] * 300
+        new = ["b\n", "c\n"] * 300
+        ids: dict[str, int] = {}
+        matcher = _Matcher(
+            [ids.setdefault(x, len(ids)) for x in old],
+            [ids.setdefault(x, len(ids)) for x in new],
+            max_cost=1,
+        )
+        matches = matcher.run()
+
+        assert matcher.over_budget > 0
+        assert all(old[i] == new[j] for i, j in matches)
+        assert all(p[0] < q[0] and p[1] < q[1] for p, q in zip(matches, matches[1:]))
+
+    def test_large_input_summarized(self, monkeypatch):
+        monkeypatch.setattr(diff_module, "MAX_DIFF_LINES", 10)
+        result = compute_diff("a\nb\nc\n" * 3, "a\nb\nd\n" * 3, "a/f", "b/f")
+
+        assert result.summarized
+        assert (result.added, result.removed) == (3, 3)
+        assert result.text.startswith("Diff summarized (too many lines): a/f (9 lines)")
+
+    def test_identical(self):
+        assert compute_diff("x\n", "x\n").is_identical
+
+
+class TestDiffService:
+    @pytest.mark.asyncio
+    async def test_routes_by_size(self, monkeypatch):
+        monkeypatch.setattr(diff_module, "INLINE_MAX_LINES", 5)
+        service = UnifiedDiffService()
+        try:
+            await service.unified_diff("a\n", "b\n")
+            threaded = await service.unified_diff("a\n" * 10, "b\n" * 10)
+        finally:
+            service.shutdown()
+
+        assert threaded.added == 10
+        assert service.get_stats()["inline"] == 1
+        assert service.get_stats()["thread"] == 1
+
+    @pytest.mark.asyncio
+    async def test_approval_carries_counts(self):
+        from app.guardrails.diff_approval import DiffApprovalManager
+
+        approval = await DiffApprovalManager().create_write_approval(
+            session_id="s",
+            agent_id="coder",
+            task_id=None,
+            file_path="gen.py",
+            original_content="a\nb\n",
+            new_content="a\nc\nd\n",
+        )
+
+        assert approval.diff.startswith("--- a/gen.py\n+++ b/gen.py\n")
+        assert (approval.lines_added, approval.lines_removed) == (2, 1)
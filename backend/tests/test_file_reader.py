@@ -0,0 +1,145 @@
+"""Tests for ranged file reads with cached line indexes."""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.tools import file_reader
+from app.tools.file_reader import LineIndexCache, read_window, read_window_sync
+from app.tools.filesystem import FilesystemTool
+
+
+@pytest.fixture
+def tmp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(os.path.realpath(tmpdir))
+
+
+@pytest.fixture
+def small_chunks():
+    """Force many checkpoints so seeking is exercised on small files."""
+    with patch.object(file_reader, "INDEX_CHUNK_SIZE", 64):
+        yield
+
+
+class TestReadWindow:
+    """Test line window reads against readlines() semantics."""
+
+    @pytest.mark.parametrize("offset,limit", [(0, 10), (5, 3), (97, 10), (0, 1000), (150, 5)])
+    def test_window_matches_readlines(self, tmp_dir, small_chunks, offset, limit):
+        path = tmp_dir / "lines.txt"
+        path.write_text("".join(f"line {i}\n" for i in range(100)))
+        expected = path.read_text().splitlines(keepends=True)
+
+        window = read_window_sync(path, offset, limit, cache=LineIndexCache())
+
+        assert window.content == "".join(expected[offset:offset + limit])
+        assert window.total_lines == 100
+        assert window.returned_lines == len(expected[offset:offset + limit])
+
+    def test_trailing_line_without_newline_counted(self, tmp_dir):
+        path = tmp_dir / "tail.txt"
+        path.write_text("a\nb\nc")
+
+        window = read_window_sync(path, 0, 10, cache=LineIndexCache())
+
+        assert window.total_lines == 3
+        assert window.content == "a\nb\nc"
+
+    def test_empty_file(self, tmp_dir):
+        path = tmp_dir / "empty.txt"
+        path.write_text("")
+
+        window = read_window_sync(path, 0, 10, cache=LineIndexCache())
+
+        assert window.total_lines == 0
+        assert window.content == ""
+
+    def test_binary_detected(self, tmp_dir):
+        path = tmp_dir / "blob.bin"
+        path.write_bytes(b"\x89PNG\x00\x00\x01\x02")
+
+        window = read_window_sync(path, 0, 10, cache=LineIndexCache())
+
+        assert window.is_binary is True
+        assert window.content == ""
+
+    def test_byte_cap_truncates(self, tmp_dir):
+        path = tmp_dir / "big.txt"
+        path.write_text("x" * 50 + "\n" + "y" * 50 + "\n")
+
+        window = read_window_sync(path, 0, 10, max_bytes=60, cache=LineIndexCache())
+
+        assert window.truncated is True
+        assert window.bytes_read == 60
+        assert window.total_lines == 2
+
+    def test_index_invalidated_on_change(self, tmp_dir):
+        path = tmp_dir / "grow.txt"
+        path.write_text("one\n")
+        cache = LineIndexCache()
+
+        assert read_window_sync(path, 0, 10, cache=cache).total_lines == 1
+        assert read_window_sync(path, 0, 10, cache=cache).total_lines == 1
+        assert cache.get_stats()["hits"] == 1
+
+        path.write_text("one\ntwo\nthree\n")
+        assert read_window_sync(path, 0, 10, cache=cache).total_lines == 3
+        assert cache.get_stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_async_read(self, tmp_dir):
+        path = tmp_dir / "async.txt"
+        path.write_text("hello\nworld\n")
+
+        window = await read_window(path, 1, 1)
+
+        assert window.content == "world\n"
+
+
+class TestFilesystemToolRead:
+    """Test the filesystem tool's read action."""
+
+    @pytest.fixture
+    def fs_tool(self, tmp_dir):
+        with patch("app.config.settings") as mock_settings:
+            mock_settings.workspace_dir = tmp_dir
+            tool = FilesystemTool(workspace=tmp_dir)
+            with patch.object(tool, "_get_allowed_dirs", return_value=[tmp_dir]):
+                yield tool
+
+    @pytest.mark.asyncio
+    async def test_read_offset_is_one_indexed(self, fs_tool, tmp_dir):
+        path = tmp_dir / "data.txt"
+        path.write_text("a\nb\nc\nd\n")
+
+        result = await fs_tool.execute(action="read", path=str(path), offset=2, limit=2)
+
+        assert result.success is True
+        assert result.output == "b\nc\n"
+        assert result.data["total_lines"] == 4
+        assert result.data["returned_lines"] == 2
+
+    @pytest.mark.asyncio
+    async def test_read_binary_rejected(self, fs_tool, tmp_dir):
+        path = tmp_dir / "image.bin"
+        path.write_bytes(b"\x00\x01\x02")
+
+        result = await fs_tool.execute(action="read", path=str(path))
+
+        assert result.success is False
+        assert "Binary" in result.error
+
+    @pytest.mark.asyncio
+    async def test_read_after_write_sees_new_content(self, fs_tool, tmp_dir):
+        path = tmp_dir / "rewrite.txt"
+        await fs_tool.execute(action="write", path=str(path), content="old\n")
+        await fs_tool.execute(action="read", path=str(path))
+        await fs_tool.execute(action="write", path=str(path), content="new\n")
+
+        result = await fs_tool.execute(action="read", path=str(path))
+
+        assert result.output == "new\n"
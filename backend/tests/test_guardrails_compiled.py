@@ -0,0 +1,144 @@
+"""Tests for compiled guardrail policies and the per-agent decision cache."""
+
+import os
+
+import pytest
+
+from app.guardrails import GuardrailsEnforcer, get_agent_policy, reset_guardrails_settings
+from app.guardrails.compiled import PatternSet, PolicyCompiler
+from app.guardrails.policies import (
+    AgentPolicy,
+    DiffApprovalPolicy,
+    FilesystemPolicy,
+    ShellPolicy,
+)
+
+
+@pytest.fixture
+def compiler(monkeypatch):
+    fresh = PolicyCompiler()
+    monkeypatch.setattr("app.guardrails.compiled.policy_compiler", fresh)
+    monkeypatch.setattr("app.guardrails.enforcer.policy_compiler", fresh)
+    return fresh
+
+
+class TestCompiledFilesystem:
+    def test_jail_matches_path_semantics(self, tmp_path, compiler):
+        workspace = tmp_path / "ws"
+        (workspace / "sub").mkdir(parents=True)
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (workspace / "escape").symlink_to(outside)
+        policy = FilesystemPolicy(
+            write_paths=[str(workspace)],
+            write_allowed=True,
+            workspace_path=str(workspace),
+        )
+
+        assert policy.can_write(str(workspace / "sub" / "a.py"))
+        assert policy.can_write(str(workspace))
+        assert not policy.can_write(str(tmp_path / "ws-sibling" / "a.py"))
+        assert not policy.can_write(str(workspace / ".." / "outside" / "a.py"))
+        assert not policy.can_write(str(workspace / "escape" / "a.py"))
+
+    def test_roots_resolved_once(self, tmp_path, compiler, monkeypatch):
+        policy = FilesystemPolicy(
+            read_paths=[str(tmp_path)],
+            write_paths=[str(tmp_path)],
+            write_allowed=True,
+            workspace_path=str(tmp_path),
+        )
+        compiled = compiler.filesystem(policy)
+
+        calls = []
+        real = os.path.realpath
+        monkeypatch.setattr(
+            "app.guardrails.compiled.os.path.realpath",
+            lambda p: calls.append(p) or real(p),
+        )
+        for i in range(10):
+            assert policy.can_write(str(tmp_path / f"f{i}"))
+            assert policy.can_read(str(tmp_path / f"f{i}"))
+
+        assert compiler.filesystem(policy) is compiled
+        assert len(calls) == 20  # Only the targets, never the roots
+
+    def test_edit_recompiles(self, tmp_path, compiler):
+        policy = FilesystemPolicy(write_paths=[str(tmp_path / "a")], write_allowed=True, workspace_only=False)
+        assert not policy.can_write(str(tmp_path / "b" / "x"))
+
+        policy.write_paths.append(str(tmp_path / "b"))
+        assert policy.can_write(str(tmp_path / "b" / "x"))
+
+
+class TestCompiledShell:
+    def test_banned_and_allowed(self, compiler):
+        policy = ShellPolicy(allowed_commands=[r"git\s", r"ls\b"])
+
+        assert policy.is_command_allowed("git status") == (True, None)
+        assert policy.is_command_allowed("ls -la") == (True, None)
+        assert policy.is_command_allowed("cat x")[0] is False
+        allowed, reason = policy.is_command_allowed("git clean; mkfs /dev/sda")
+        assert allowed is False
+        assert reason == "Command matches banned pattern: mkfs"
+
+    def test_pattern_set_falls_back_for_groups(self):
+        grouped = PatternSet([r"(a)\1", r"b"])
+        assert grouped._combined is None
+        assert grouped.search("xaa") == r"(a)\1"
+        assert grouped.search("xa") is None
+
+        flat = PatternSet([r"foo", r"bar"])
+        assert flat._combined is not None
+        assert flat.search("a bar foo") == "foo"  # First in list order
+        assert flat.match("bar") and not flat.match("xbar")
+
+    def test_protected_paths(self, compiler):
+        policy = DiffApprovalPolicy(enabled=True, protected_paths=["Dockerfile*", "*.yml"])
+
+        assert policy.requires_approval("write", "/x/Dockerfile.prod")
+        assert policy.requires_approval("write", "ci.yml")
+        assert not policy.requires_approval("write", "notes.md")
+        assert policy.requires_approval("delete", "notes.md")
+
+
+class TestDecisionCache:
+    def test_cached_per_agent_and_workspace(self, compiler):
+        coder = get_agent_policy("coder")
+        assert compiler.compile(coder) is compiler.compile(coder)
+
+        skill_a = GuardrailsEnforcer.for_skill("s", workdir="/tmp/a")._compiled_policy()
+        skill_b = GuardrailsEnforcer.for_skill("s", workdir="/tmp/b")._compiled_policy()
+        assert skill_a is not skill_b
+        assert GuardrailsEnforcer.for_skill("s", workdir="/tmp/a")._compiled_policy() is skill_a
+
+        stats = compiler.get_stats()
+        assert stats["compiles"] == 3
+        assert stats["hits"] == 2
+
+    def test_policy_change_and_reset_invalidate(self, compiler):
+        policy = AgentPolicy(agent_id="tmp", description="", allowed_tools=["filesystem"])
+        first = compiler.compile(policy)
+        assert not first.is_tool_allowed("shell")
+
+        policy.allowed_tools.append("shell")
+        assert compiler.compile(policy).is_tool_allowed("shell")
+
+        reset_guardrails_settings()
+        assert compiler.get_stats()["policies"] == 0
+
+    @pytest.mark.asyncio
+    async def test_enforcer_uses_compiled_policy(self, tmp_path, compiler):
+        enforcer = GuardrailsEnforcer.for_skill("s", workdir=str(tmp_path))
+        enforcer.context.enable_audit = False
+
+        ok = await enforcer.check_tool_execution(
+            "filesystem", {"action": "write", "path": str(tmp_path / "a.py")}
+        )
+        blocked = await enforcer.check_tool_execution(
+            "shell", {"command": "echo hi", "workdir": "/"}
+        )
+
+        assert ok.allowed
+        assert not blocked.allowed and blocked.sandbox_violation
+        assert compiler.get_stats()["policies"] == 1
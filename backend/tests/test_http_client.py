@@ -0,0 +1,121 @@
+"""Tests for the shared HTTP client pool and web fetch tool."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.tools.web import WebFetchTool
+from app.utils.http_client import HttpClientManager
+
+
+def _manager(handler) -> HttpClientManager:
+    return HttpClientManager(transport=httpx.MockTransport(handler))
+
+
+class TestHttpClientManager:
+    """Test pooling, streaming caps and response caching."""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_within_loop(self):
+        manager = _manager(lambda request: httpx.Response(200, text="ok"))
+
+        assert manager.get_client() is manager.get_client()
+        assert manager.get_client(verify=False) is not manager.get_client()
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_fetch_text_truncates_at_cap(self):
+        manager = _manager(lambda request: httpx.Response(200, text="x" * 5000))
+
+        result = await manager.fetch_text("https://example.com/doc", max_chars=100)
+
+        assert result.text == "x" * 100
+        assert result.truncated is True
+
+    @pytest.mark.asyncio
+    async def test_fetch_text_raises_for_errors(self):
+        manager = _manager(lambda request: httpx.Response(404, text="missing"))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await manager.fetch_text("https://example.com/missing", max_chars=100)
+
+    @pytest.mark.asyncio
+    async def test_etag_revalidation_serves_cached_body(self):
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text="page body", headers={"ETag": '"v1"'})
+
+        manager = _manager(handler)
+
+        first = await manager.fetch_text("https://example.com/page", max_chars=1000)
+        second = await manager.fetch_text("https://example.com/page", max_chars=1000)
+
+        assert first.from_cache is False
+        assert second.from_cache is True
+        assert second.text == "page body"
+        assert seen_headers == [None, '"v1"']
+        assert manager.response_cache.revalidated == 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_response_served_without_request(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, text="doc", headers={"Cache-Control": "max-age=60"})
+
+        manager = _manager(handler)
+
+        await manager.fetch_text("https://example.com/doc", max_chars=1000)
+        result = await manager.fetch_text("https://example.com/doc", max_chars=1000)
+
+        assert result.from_cache is True
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_store_not_cached(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(
+                200, text="doc", headers={"Cache-Control": "no-store", "ETag": '"a"'}
+            )
+
+        manager = _manager(handler)
+
+        await manager.fetch_text("https://example.com/doc", max_chars=1000)
+        await manager.fetch_text("https://example.com/doc", max_chars=1000)
+
+        assert len(calls) == 2
+        assert manager.response_cache.get_stats()["entries"] == 0
+
+
+class TestWebFetchTool:
+    """Test WebFetchTool on top of the shared pool."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_truncation_marker(self):
+        manager = _manager(lambda request: httpx.Response(200, text="y" * 50))
+
+        with patch("app.tools.web.http_client_manager", manager):
+            result = await WebFetchTool().execute(url="https://example.com", max_chars=10)
+
+        assert result.success is True
+        assert result.output.startswith("y" * 10)
+        assert "[Truncated at 10 chars]" in result.output
+
+    @pytest.mark.asyncio
+    async def test_fetch_http_error(self):
+        manager = _manager(lambda request: httpx.Response(500))
+
+        with patch("app.tools.web.http_client_manager", manager):
+            result = await WebFetchTool().execute(url="https://example.com")
+
+        assert result.success is False
+        assert "HTTP error" in result.error
@@ -245,3 +245,46 @@ class TestGetProjectContextForSession:
         assert name == "myapp"
         assert context == "MyApp context"
         assert auto is True
+
+
+class TestMentionMatcher:
+    """Tests for the cached single-pass matcher."""
+
+    def test_matcher_reused_until_registry_changes(self, monkeypatch):
+        from app.projects import mention_detector
+
+        projects = [MockProject("alpha"), MockProject("beta")]
+        monkeypatch.setattr(
+            "app.projects.mention_detector.project_registry.list_all",
+            lambda: projects,
+        )
+
+        detect_project_mentions("alpha")
+        matcher = mention_detector._matcher
+        detect_project_mentions("beta")
+        assert mention_detector._matcher is matcher
+
+        projects.append(MockProject("gamma"))
+        result = detect_project_mentions("gamma")
+        assert mention_detector._matcher is not matcher
+        assert result.project_names == ["gamma"]
+
+    def test_adjacent_and_repeated_mentions(self, mock_registry):
+        result = detect_project_mentions("backend myapp backend, myapp-api")
+        assert result.project_names == ["backend", "myapp", "myapp-api"]
+
+    def test_longest_match_at_position(self):
+        from app.projects.mention_detector import MentionMatcher
+
+        matcher = MentionMatcher(("web", "web-ui", "web-ui-v2"))
+        assert matcher.find("ship (web-ui-v2) and web-ui.") == [
+            ("web-ui-v2", 6, 15),
+            ("web-ui", 21, 27),
+        ]
+        assert matcher.find("web-uix") == []
+
+    def test_special_characters_in_names(self):
+        from app.projects.mention_detector import MentionMatcher
+
+        matcher = MentionMatcher(("c++lib", "a.b"))
+        assert [m[0] for m in matcher.find("use C++LIB with a.b")] == ["c++lib", "a.b"]
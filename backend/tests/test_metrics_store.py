@@ -0,0 +1,147 @@
+"""Tests for the persistent metrics store."""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.subagents.metrics import TaskMetricsManager
+from app.utils.metrics_store import RELATIVE_ERROR, LogHistogram, MetricsStore
+
+
+class TestLogHistogram:
+    """Test quantile estimation and merging."""
+
+    def test_quantiles_within_relative_error(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(3, 1.5) for _ in range(5000))
+        hist = LogHistogram()
+        for v in values:
+            hist.record(v)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert hist.quantile(q) == pytest.approx(exact, rel=RELATIVE_ERROR * 1.01)
+        assert hist.quantile(0) == values[0]
+        assert hist.quantile(1) == values[-1]
+
+    def test_bucket_count_is_bounded(self):
+        hist = LogHistogram()
+        for i in range(100_000):
+            hist.record(1 + (i % 1000))
+
+        # 1..1000 spans log(1000)/log(gamma) ~ 173 buckets
+        assert len(hist.counts) < 180
+        assert hist.count == 100_000
+
+    def test_zero_values_and_merge(self):
+        a, b = LogHistogram(), LogHistogram()
+        for _ in range(3):
+            a.record(0.0)
+        b.record(10.0)
+        a.merge(b)
+
+        assert a.count == 4
+        assert a.quantile(0.5) == 0.0
+        assert a.quantile(1.0) == 10.0
+        assert LogHistogram().quantile(0.5) is None
+
+
+class TestMetricsStore:
+    def test_windowed_queries(self):
+        store = MetricsStore(resolution_seconds=60)
+        now = time.time()
+        store.record("tool", "shell", 500, success=False, timestamp=now - 7200)
+        for ms in (10, 20, 30):
+            store.record("tool", "shell", ms, timestamp=now)
+
+        recent = store.query("tool", "shell", window=timedelta(minutes=30))
+        assert recent.count == 3
+        assert recent.errors == 0
+        assert recent.percentile(0.5) == pytest.approx(20, rel=RELATIVE_ERROR)
+
+        everything = store.query("tool", "shell")
+        assert everything.count == 4
+        assert everything.error_rate == 0.25
+        assert everything.max == 500
+
+    def test_old_slots_expire(self):
+        store = MetricsStore(resolution_seconds=60, retention_seconds=3600)
+        now = time.time()
+        store.record("tool", "shell", 1, timestamp=now - 7200)
+        store.record("tool", "shell", 2, timestamp=now)
+
+        series = store._series["tool"]["shell"]
+        assert len(series._slots) == 1
+        # All-time aggregates are kept
+        assert store.query("tool", "shell").count == 2
+
+    def test_counters_and_unknown_series(self):
+        store = MetricsStore()
+        store.record("subagent", "coder", 30, counters={"goals": 3})
+        store.record("subagent", "coder", 60, counters={"goals": 2})
+
+        assert store.query("subagent", "coder").counters == {"goals": 5}
+        assert store.keys("subagent") == ["coder"]
+        empty = store.query("subagent", "missing")
+        assert empty.count == 0
+        assert empty.percentile(0.95) is None
+
+    def test_snapshot_round_trip(self, tmp_path):
+        path = tmp_path / "metrics" / "snapshot.json"
+        store = MetricsStore(path)
+        for ms in range(1, 101):
+            store.record("tool", "web_fetch", ms, success=ms % 10 != 0)
+
+        assert store.snapshot() is True
+        assert store.snapshot() is False  # Nothing changed
+
+        restored = MetricsStore(path)
+        summary = restored.query("tool", "web_fetch", window=timedelta(hours=1))
+        assert summary.count == 100
+        assert summary.errors == 10
+        assert summary.percentile(0.95) == store.query("tool", "web_fetch").percentile(0.95)
+
+    def test_corrupt_snapshot_ignored(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        path.write_text("{not json")
+
+        store = MetricsStore(path)
+        assert store.query("tool", "shell").count == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_writes_final_snapshot(self, tmp_path):
+        path = tmp_path / "snapshot.json"
+        store = MetricsStore(path, snapshot_interval=3600)
+        await store.start()
+        store.record("tool", "shell", 5)
+        await store.stop()
+
+        assert MetricsStore(path).query("tool", "shell").count == 1
+
+
+class TestTaskMetricsPercentiles:
+    def test_agent_percentiles_and_sizing(self):
+        manager = TaskMetricsManager(store=MetricsStore())
+        now = datetime.now()
+        for i in range(20):
+            seconds = 600 if i >= 18 else 30
+            manager.record(
+                task_id=f"t{i}",
+                agent_id="coder",
+                task_description="Test",
+                started_at=now - timedelta(seconds=seconds),
+                completed_at=now,
+                success=True,
+                goals_total=5,
+                goals_completed=5,
+            )
+
+        metrics = manager.get_agent_metrics("coder")
+        assert metrics.total_tasks == 20
+        assert metrics.p50_duration_seconds == pytest.approx(30, rel=RELATIVE_ERROR)
+        assert metrics.p95_duration_seconds == pytest.approx(600, rel=RELATIVE_ERROR)
+
+        rec = manager.get_sizing_recommendation("coder")
+        assert "p95 duration" in rec.reasoning
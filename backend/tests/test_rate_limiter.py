@@ -0,0 +1,150 @@
+"""Tests for the resilience rate limiter."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.resilience.rate_limiter import (
+    KeyedRateLimiter,
+    RateLimitConfig,
+    RateLimiter,
+    RateLimiterRegistry,
+    RateLimitError,
+    WindowCounter,
+)
+
+
+class TestWindowCounter:
+    """Test bucketed sliding window counts."""
+
+    def test_counts_expire_after_window(self):
+        window = WindowCounter(60.0)
+        window.add(0.0)
+        window.add(30.0)
+
+        assert window.count(59.0) == 2
+        assert window.count(61.0) == 1
+        assert window.count(200.0) == 0
+
+    def test_retry_after_until_below_limit(self):
+        window = WindowCounter(60.0)
+        window.add(10.0)
+        window.add(20.0)
+
+        # One call must expire to drop below a limit of 2
+        assert window.retry_after(25.0, 2) == pytest.approx(45.0)
+        # Both must expire to drop below a limit of 1
+        assert window.retry_after(25.0, 1) == pytest.approx(55.0)
+
+
+class TestRateLimiter:
+    """Test token bucket, windows and waiter queue."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_limited(self):
+        limiter = RateLimiter("t", RateLimitConfig(requests_per_second=1, burst_size=2))
+
+        assert await limiter.acquire() is True
+        assert await limiter.acquire() is True
+        with pytest.raises(RateLimitError) as exc:
+            await limiter.acquire()
+
+        assert exc.value.limit_type == "token_bucket"
+        assert 0 < exc.value.retry_after <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_per_minute_window(self):
+        limiter = RateLimiter(
+            "t", RateLimitConfig(requests_per_second=1000, burst_size=1000, max_per_minute=3)
+        )
+        for _ in range(3):
+            await limiter.acquire()
+
+        with pytest.raises(RateLimitError) as exc:
+            await limiter.acquire()
+
+        assert exc.value.limit_type == "per_minute"
+        assert limiter.get_status()["calls_last_minute"] == 3
+
+    @pytest.mark.asyncio
+    async def test_min_interval(self):
+        limiter = RateLimiter("t", RateLimitConfig(min_interval_seconds=10))
+
+        await limiter.acquire()
+        with pytest.raises(RateLimitError) as exc:
+            await limiter.acquire()
+
+        assert exc.value.limit_type == "min_interval"
+
+    @pytest.mark.asyncio
+    async def test_waiters_woken_in_order_without_polling(self):
+        limiter = RateLimiter("t", RateLimitConfig(requests_per_second=50, burst_size=1))
+        await limiter.acquire()
+        order = []
+
+        async def waiter(i: int) -> None:
+            assert await limiter.wait_and_acquire(max_wait=2.0)
+            order.append(i)
+
+        with patch("app.resilience.rate_limiter.asyncio.sleep") as mock_sleep:
+            await asyncio.gather(*(waiter(i) for i in range(3)))
+
+        assert order == [0, 1, 2]
+        mock_sleep.assert_not_called()
+        assert limiter.get_status()["waiters"] == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        limiter = RateLimiter("t", RateLimitConfig(requests_per_second=0.1, burst_size=1))
+        await limiter.acquire()
+
+        assert await limiter.wait_and_acquire(max_wait=0.05) is False
+        assert limiter.get_status()["waiters"] == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_does_not_jump_queue(self):
+        limiter = RateLimiter("t", RateLimitConfig(requests_per_second=20, burst_size=1))
+        await limiter.acquire()
+
+        waiting = asyncio.create_task(limiter.wait_and_acquire(max_wait=1.0))
+        await asyncio.sleep(0)
+
+        with pytest.raises(RateLimitError) as exc:
+            await limiter.acquire()
+        assert exc.value.limit_type == "queued"
+        assert await waiting is True
+
+
+class TestKeyedRateLimiter:
+    """Test per-key limiters."""
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self):
+        keyed = KeyedRateLimiter("sessions", RateLimitConfig(requests_per_second=1, burst_size=1))
+
+        await keyed.acquire("a")
+        await keyed.acquire("b")
+        with pytest.raises(RateLimitError):
+            await keyed.acquire("a")
+
+        status = keyed.get_status()
+        assert status["keys"] == 2
+        assert status["total_limited"] == 1
+
+    def test_lru_eviction(self):
+        keyed = KeyedRateLimiter("agents", RateLimitConfig(), max_keys=2)
+        keyed.get("a")
+        keyed.get("b")
+        keyed.get("a")
+        keyed.get("c")
+
+        assert list(keyed._limiters) == ["a", "c"]
+
+    def test_registry_lists_keyed(self):
+        registry = RateLimiterRegistry()
+        registry.get_or_create("global")
+        registry.get_or_create_keyed("per_session")
+
+        names = {s["name"] for s in registry.list_all()}
+        assert names == {"global", "per_session"}
@@ -0,0 +1,198 @@
+"""Tests for the persistent trigram project search index."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from app.projects.search_index import (
+    SearchIndexManager,
+    TrigramIndex,
+    UnsupportedQueryError,
+    glob_matches,
+    plan_query,
+)
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    (root / "app").mkdir(parents=True)
+    (root / "node_modules" / "lib").mkdir(parents=True)
+    (root / "app" / "auth.py").write_text(
+        "import os\n\n\ndef authenticate(user):\n    return check(user)\n"
+    )
+    (root / "app" / "views.py").write_text(
+        "from app.auth import authenticate\n\n# TODO: cache\nresult = authenticate(u)\n"
+    )
+    (root / "web.ts").write_text("export function authenticate() {}\n// FIXME later\n")
+    (root / "node_modules" / "lib" / "index.js").write_text("function authenticate() {}\n")
+    (root / "image.bin").write_bytes(b"\x00\x01authenticate\x00")
+    return root
+
+
+class TestQueryPlanning:
+    """Test extraction of required literals from regexes."""
+
+    def test_literal(self):
+        assert plan_query("def authenticate") == [["def authenticate"]]
+
+    def test_alternation(self):
+        assert plan_query("TODO|FIXME") == [["TODO"], ["FIXME"]]
+
+    def test_wildcards_split_literals(self):
+        assert plan_query("import.*auth") == [["import", "auth"]]
+
+    def test_optional_parts_ignored(self):
+        assert plan_query("foo(bar)?") == [["foo"]]
+        assert plan_query("(bar)*") == [[]]
+        assert plan_query("(?:authenticate)+") == [["authenticate"]]
+
+    def test_unconstrained_branch(self):
+        assert plan_query("abc|x") == [[]]
+
+    def test_escapes_and_lookarounds(self):
+        assert plan_query(r"\x41BC") == [[]]
+        assert plan_query(r"(?=abc)xyz") == [["xyz"]]
+        assert plan_query(r"(?x) a b c") == [[]]
+
+    def test_invalid_regex(self):
+        with pytest.raises(UnsupportedQueryError):
+            plan_query("foo(")
+
+
+class TestGlobMatching:
+    def test_basename_and_path_globs(self):
+        assert glob_matches("app/auth.py", "*.py")
+        assert not glob_matches("web.ts", "*.py")
+        assert glob_matches("app/auth.py", "app/*.py")
+        assert not glob_matches("app/auth.py", "!*.py")
+
+
+class TestTrigramIndex:
+    """Test building, searching and incremental updates."""
+
+    def test_excludes_and_binary_files(self, project):
+        index = TrigramIndex(project)
+        index.update()
+
+        paths = index.candidates("authenticate")
+        assert paths == ["app/auth.py", "app/views.py", "web.ts"]
+
+    def test_skips_hidden_and_ignored_files(self, project):
+        (project / ".env").write_text("API_KEY=supersecret\n")
+        (project / ".gitignore").write_text("target/\n*.log\n!keep.log\n")
+        (project / "target").mkdir()
+        (project / "target" / "out.txt").write_text("supersecret build output\n")
+        (project / "app" / "debug.log").write_text("supersecret\n")
+        (project / "app" / "keep.log").write_text("supersecret kept\n")
+        (project / "app" / ".ignore").write_text("/views.py\n")
+        index = TrigramIndex(project)
+        index.update()
+
+        assert [m.file for m in index.search("supersecret").matches] == ["app/keep.log"]
+        assert "app/views.py" not in index.candidates("authenticate")
+
+    def test_candidates_narrowed(self, project):
+        index = TrigramIndex(project)
+        index.update()
+
+        assert index.candidates("TODO|FIXME") == ["app/views.py", "web.ts"]
+        assert index.candidates("authenticate", file_pattern="*.py") == [
+            "app/auth.py", "app/views.py",
+        ]
+
+    def test_search_ranks_definitions_first(self, project):
+        index = TrigramIndex(project)
+        index.update()
+
+        result = index.search("authenticate", context_lines=1)
+
+        assert result.matches[0].file == "app/auth.py"
+        assert result.matches[0].line_number == 4
+        assert result.matches[0].context_before == [""]
+        assert result.matches[0].context_after == ["    return check(user)"]
+        assert len(result.matches) == 4
+        assert result.truncated is False
+
+    def test_case_sensitivity(self, project):
+        index = TrigramIndex(project)
+        index.update()
+
+        assert index.search("todo").matches
+        assert not index.search("todo", case_sensitive=True).matches
+
+    def test_truncation(self, project):
+        index = TrigramIndex(project)
+        index.update()
+
+        result = index.search("authenticate", max_results=2)
+
+        assert len(result.matches) == 2
+        assert result.truncated is True
+
+    def test_incremental_update(self, project):
+        index = TrigramIndex(project)
+        index.update()
+
+        target = project / "app" / "auth.py"
+        target.write_text("def login(user):\n    pass\n")
+        os.utime(target, ns=(1, 1))
+        (project / "web.ts").unlink()
+        (project / "new.py").write_text("authenticate = None\n")
+
+        changes = index.update()
+
+        assert changes == {"added": 1, "updated": 1, "removed": 1}
+        assert index.candidates("authenticate") == ["app/views.py", "new.py"]
+        assert index.candidates("login") == ["app/auth.py"]
+
+    def test_unchanged_files_not_reread(self, project):
+        index = TrigramIndex(project)
+        index.update()
+
+        assert index.update() == {"added": 0, "updated": 0, "removed": 0}
+
+    def test_large_files_always_scanned(self, project, monkeypatch):
+        monkeypatch.setattr("app.projects.search_index.MAX_INDEXED_FILE_BYTES", 10)
+        index = TrigramIndex(project)
+        index.update()
+
+        assert "app/auth.py" in index.candidates("zzzzzz")
+        assert index.search("def authenticate").matches[0].file == "app/auth.py"
+
+    def test_persistence_roundtrip(self, project, tmp_path):
+        storage = tmp_path / "index.json"
+        index = TrigramIndex(project, storage)
+        index.update()
+        index.save()
+
+        loaded = TrigramIndex.load(project, storage)
+
+        assert loaded is not None
+        assert loaded.candidates("TODO|FIXME") == ["app/views.py", "web.ts"]
+        assert TrigramIndex.load(tmp_path, storage) is None  # Different root
+
+
+class TestSearchIndexManager:
+    def test_search_without_index_returns_none(self, project, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "app.projects.search_index.get_context_pack_dir",
+            lambda name: tmp_path / "packs" / name,
+        )
+        manager = SearchIndexManager()
+
+        assert manager.search("proj", project, "authenticate") is None
+
+    def test_build_then_search_from_disk(self, project, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "app.projects.search_index.get_context_pack_dir",
+            lambda name: tmp_path / "packs" / name,
+        )
+        SearchIndexManager().build("proj", project)
+
+        # A fresh manager loads the persisted index
+        result = SearchIndexManager().search("proj", project, "FIXME")
+
+        assert [m.file for m in result.matches] == ["web.ts"]
+        assert (tmp_path / "packs" / "proj" / "search_index.json").exists()
@@ -0,0 +1,202 @@
+"""Tests for dependency-ordered, concurrent skill workflow execution."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.skills.base import Skill, SkillStep, resolve_step_dependencies
+from app.skills.executor import SkillExecutor
+from app.skills.schema import SkillSchema
+
+
+class FakeExecutor(SkillExecutor):
+    """Executor whose steps sleep for params["delay"] instead of running tools."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.started: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def _execute_step(self, step, kiro_context, context):
+        params = self._resolve_params(step.params, context)
+        self.started.append(step.name)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(params.get("delay", 0))
+        finally:
+            self.active -= 1
+        if params.get("fail"):
+            return {"success": False, "output": "", "error": "boom"}
+        return {"success": True, "output": params.get("echo", f"{step.name} ok")}
+
+
+def _step(name: str, **kwargs) -> SkillStep:
+    params = kwargs.pop("params", {})
+    return SkillStep(name=name, action="shell", params=params, **kwargs)
+
+
+def _skill(*steps: SkillStep, **kwargs) -> Skill:
+    return Skill(id="demo", name="Demo", description="", workflow=list(steps), **kwargs)
+
+
+class TestResolveDependencies:
+    """Test dependency resolution and validation."""
+
+    def test_default_is_sequential(self):
+        steps = [_step("a"), _step("b"), _step("c")]
+        assert resolve_step_dependencies(steps) == [set(), {0}, {1}]
+
+    def test_explicit_and_output_dependencies(self):
+        steps = [
+            _step("build", depends_on=[], outputs=["artifact"]),
+            _step("lint", depends_on=[]),
+            _step("deploy", depends_on=["lint"], params={"command": "ship {{artifact}}"}),
+        ]
+        assert resolve_step_dependencies(steps) == [set(), set(), {0, 1}]
+
+    def test_unknown_dependency(self):
+        with pytest.raises(ValueError, match="unknown step 'missing'"):
+            resolve_step_dependencies([_step("a", depends_on=["missing"])])
+
+    def test_cycle(self):
+        steps = [_step("a", depends_on=["b"]), _step("b", depends_on=["a"])]
+        with pytest.raises(ValueError, match="cycle"):
+            resolve_step_dependencies(steps)
+
+    def test_schema_rejects_cycle(self):
+        with pytest.raises(ValueError):
+            SkillSchema(
+                id="demo",
+                name="Demo",
+                description="",
+                workflow=[
+                    {"name": "a", "action": "shell", "depends_on": ["b"]},
+                    {"name": "b", "action": "shell", "depends_on": ["a"]},
+                ],
+            )
+
+
+class TestParallelExecution:
+    """Test scheduling, cancellation and timeouts."""
+
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        skill = _skill(
+            _step("generate", depends_on=[]),
+            _step("lint", depends_on=["generate"], params={"delay": 0.2}),
+            _step("typecheck", depends_on=["generate"], params={"delay": 0.2}),
+            _step("tests", depends_on=["generate"], params={"delay": 0.2}),
+            _step("report", depends_on=["lint", "typecheck", "tests"]),
+        )
+        executor = FakeExecutor()
+
+        start = time.monotonic()
+        result = await executor.execute(skill)
+        elapsed = time.monotonic() - start
+
+        assert result["success"] is True
+        assert elapsed < 0.5
+        assert executor.max_active == 3
+        assert executor.started[0] == "generate"
+        assert executor.started[-1] == "report"
+        # Results are reported in workflow order
+        assert [r["step"] for r in result["results"]] == [
+            "generate", "lint", "typecheck", "tests", "report"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        steps = [_step(f"s{i}", depends_on=[], params={"delay": 0.02}) for i in range(6)]
+        executor = FakeExecutor(max_parallel_steps=2)
+
+        result = await executor.execute(_skill(*steps))
+
+        assert result["steps_run"] == 6
+        assert executor.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_outputs_published_to_context(self):
+        skill = _skill(
+            _step("detect", depends_on=[], outputs=["framework"], params={"echo": "pytest"}),
+            _step("run", depends_on=[], params={"echo": "running {{framework}}"}),
+        )
+
+        result = await FakeExecutor().execute(skill)
+
+        assert result["results"][1]["output"] == "running pytest"
+
+    @pytest.mark.asyncio
+    async def test_required_failure_cancels_running_steps(self):
+        skill = _skill(
+            _step("fails", depends_on=[], params={"delay": 0.01, "fail": True}),
+            _step("slow", depends_on=[], params={"delay": 5}),
+            _step("after", depends_on=["slow"]),
+        )
+
+        result = await FakeExecutor().execute(skill)
+
+        assert result["success"] is False
+        assert result["error"] == "Step 'fails' failed: boom"
+        assert result["cancelled_steps"] == ["slow"]
+        assert [r["step"] for r in result["results"]] == ["fails"]
+
+    @pytest.mark.asyncio
+    async def test_optional_failure_does_not_stop_workflow(self):
+        skill = _skill(
+            _step("scan", depends_on=[], required=False, params={"fail": True}),
+            _step("report", depends_on=["scan"]),
+        )
+
+        result = await FakeExecutor().execute(skill)
+
+        assert result["success"] is True
+        assert [r["success"] for r in result["results"]] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_step_timeout(self):
+        skill = _skill(_step("hang", params={"delay": 5}, timeout_seconds=0.05))
+
+        result = await FakeExecutor().execute(skill)
+
+        assert result["success"] is False
+        assert "Timed out after 0.05s" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_condition_skips_step(self):
+        skill = _skill(_step("a"), _step("b", condition="run_b"), _step("c"))
+
+        result = await FakeExecutor().execute(skill, context={"run_b": False})
+
+        assert result["skipped_steps"] == ["b"]
+        assert [r["step"] for r in result["results"]] == ["a", "c"]
+
+
+class TestQualityValidation:
+    @pytest.mark.asyncio
+    async def test_checks_deduplicated_and_reported_in_order(self, monkeypatch):
+        executor = FakeExecutor()
+        calls = []
+
+        def fake_tests_passed(step_results):
+            calls.append("tests")
+            return False
+
+        monkeypatch.setattr(executor, "_check_tests_passed", fake_tests_passed)
+        skill = _skill(
+            _step("build"),
+            quality_checklist=["All tests pass", "Lint clean", "pytest green"],
+        )
+
+        passed, errors = await executor._validate_quality(
+            skill, {"step_build_result": {"success": True, "output": ""}}
+        )
+
+        assert passed is False
+        assert errors == [
+            "Quality check failed: All tests pass",
+            "Quality check failed: pytest green",
+        ]
+        assert calls == ["tests"]
@@ -0,0 +1,159 @@
+"""Tests for resumable SSE streams (event ids, replay ring, database spill)."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import func, select
+
+from app.database import StreamEvent
+from app.utils import sse_replay
+from app.utils.sse import SSEStream
+from app.utils.sse_replay import EventLog, StreamRegistry
+
+
+def _event_id(frame: str) -> int:
+    return int(frame.split("\n", 1)[0][len("id: "):])
+
+
+async def _numbers(n: int, delay: float = 0):
+    for i in range(n):
+        yield {"type": "output", "n": i}
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def _drain(log: EventLog, after: int = 0) -> list[str]:
+    return [frame async for frame in log.tail(after)]
+
+
+class TestEventLog:
+    @pytest.mark.asyncio
+    async def test_ids_increase_and_continue_per_key(self):
+        registry = StreamRegistry()
+        first = registry.open("chat:s1", _numbers(3))
+        frames = await _drain(first)
+        second = registry.open("chat:s1", _numbers(2))
+        more = await _drain(second)
+
+        assert [_event_id(f) for f in frames + more] == [1, 2, 3, 4, 5]
+        assert frames[0] == 'id: 1\ndata: {"type":"output","n":0}\n\n'
+        assert registry.get("chat:s1") is second
+
+    @pytest.mark.asyncio
+    async def test_ids_not_reused_after_log_dropped(self, monkeypatch):
+        monkeypatch.setattr(sse_replay, "FINISHED_TTL_SECONDS", 0)
+        registry = StreamRegistry()
+        await _drain(registry.open("run:r1", _numbers(3)))
+
+        assert await registry.sweep() == 1
+        assert registry.get("run:r1") is None
+
+        frames = await _drain(registry.open("run:r1", _numbers(2)))
+        assert [_event_id(f) for f in frames] == [4, 5]
+
+    @pytest.mark.asyncio
+    async def test_resume_from_memory(self):
+        log = EventLog("chat:s1")
+        log.start(_numbers(10))
+        await log.wait()
+
+        frames = await _drain(log, after=7)
+
+        assert [_event_id(f) for f in frames] == [8, 9, 10]
+        assert log.db_reads == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_from_database_spill(self, test_db):
+        log = EventLog("autonomous:p1", capacity=5)
+        log.start(_numbers(40))
+        await log.wait()
+        await log._flush_task
+
+        frames = await _drain(log, after=3)
+        again = await _drain(log, after=10)  # Served from the loaded window
+
+        assert [_event_id(f) for f in frames] == list(range(4, 41))
+        assert json.loads(frames[0].split("data: ", 1)[1])["n"] == 3
+        assert [_event_id(f) for f in again] == list(range(11, 41))
+        assert (log.db_reads, log.window_hits) == (1, 1)
+
+        await log.discard()
+        async with test_db() as session:
+            assert await session.scalar(select(func.count(StreamEvent.id))) == 0
+
+    @pytest.mark.asyncio
+    async def test_live_tail_through_sse_stream(self):
+        log = EventLog("run:r1")
+        log.start(_numbers(5, delay=0.01))
+
+        chunks = [chunk.decode() async for chunk in SSEStream(log.tail(), heartbeat_interval=None)]
+
+        assert [_event_id(c) for c in chunks] == [1, 2, 3, 4, 5]
+
+
+class TestDetachedRuns:
+    @pytest.mark.asyncio
+    async def test_run_continues_after_disconnect(self):
+        log = EventLog("chat:s1")
+        log.start(_numbers(20, delay=0.005))
+
+        tail = log.tail()
+        await tail.__anext__()
+        await tail.aclose()
+        assert log.consumers == 0 and log.detached_since is not None
+
+        await asyncio.wait_for(log.wait(), 1)
+        assert log.finished and log.last_id == 20
+
+    @pytest.mark.asyncio
+    async def test_abandoned_run_cancelled_after_grace(self, monkeypatch):
+        monkeypatch.setattr(sse_replay, "DETACHED_GRACE_SECONDS", 0)
+        monkeypatch.setattr(sse_replay, "FINISHED_TTL_SECONDS", 0)
+        cancelled = asyncio.Event()
+
+        async def forever():
+            try:
+                while True:
+                    yield {"type": "tick"}
+                    await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        registry = StreamRegistry()
+        log = registry.open("autonomous:p1", forever())
+        await asyncio.sleep(0.02)
+
+        assert await registry.sweep() == 0
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await log.wait()
+        assert log.finished and registry.cancelled == 1
+
+        assert await registry.sweep() == 1
+        assert registry.get("autonomous:p1") is None
+
+
+class TestResumeEndpoints:
+    @pytest.mark.asyncio
+    async def test_reconnect_after_run_finished(self, monkeypatch):
+        from app.api import autonomous
+
+        registry = StreamRegistry()
+        monkeypatch.setattr(autonomous, "sse_streams", registry)
+        log = registry.open("run:r1", _numbers(5))
+        await log.wait()
+
+        app = FastAPI()
+        app.include_router(autonomous.router)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/autonomous/runs/r1/resume", headers={"Last-Event-ID": "3"}
+            )
+
+        assert response.status_code == 200
+        frames = [f + "\n\n" for f in response.text.split("\n\n") if f]
+        assert [_event_id(f) for f in frames] == [4, 5]
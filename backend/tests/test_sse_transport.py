@@ -0,0 +1,121 @@
+"""Tests for the bounded, coalescing SSE transport."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.utils.sse import SSEStream, format_event, get_sse_stats, progress_key, reset_sse_stats
+
+
+def _progress(task_id: str, value: float) -> str:
+    event = {"type": "task_progress", "data": {"task_id": task_id, "progress": value}}
+    return f"data: {json.dumps(event)}\n\n"
+
+
+async def _collect(stream: SSEStream) -> list[dict]:
+    events = []
+    async for chunk in stream:
+        events.append(json.loads(chunk.decode()[len("data: "):]))
+    return events
+
+
+class TestFormatting:
+    def test_format_event(self):
+        frame = format_event({"type": "x", "n": 1}, event="update", event_id=7)
+        assert frame == 'id: 7\nevent: update\ndata: {"type":"x","n":1}\n\n'
+        assert format_event("a\nb") == "data: a\ndata: b\n\n"
+
+    def test_progress_key(self):
+        assert progress_key({"type": "task_progress", "task_id": "t1"}) == "task_progress:t1"
+        nested = {"type": "task_progress", "data": {"task_id": "t2"}}
+        assert progress_key(nested) == "task_progress:t2"
+        assert progress_key({"type": "task_completed", "task_id": "t1"}) is None
+
+
+class TestSSEStream:
+    @pytest.mark.asyncio
+    async def test_superseded_progress_coalesced(self):
+        async def source():
+            for i in range(50):
+                yield _progress("t1", i / 50)
+                yield {"type": "task_progress", "task_id": "t2", "progress": i}
+            yield {"type": "task_completed", "task_id": "t1"}
+
+        stream = SSEStream(source(), heartbeat_interval=None)
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            await asyncio.sleep(0.01)  # Slow client: progress piles up behind it
+
+        events = [json.loads(c.decode()[6:]) for c in chunks]
+        assert events[-1] == {"type": "task_completed", "task_id": "t1"}
+        assert stream.stats.coalesced > 0
+        assert stream.stats.events_sent + stream.stats.coalesced == 101
+        # The last progress of each task survives
+        assert {"type": "task_progress", "task_id": "t2", "progress": 49} in events
+        t1 = [e["data"]["progress"] for e in events if "data" in e]
+        assert t1[-1] == pytest.approx(49 / 50)
+        assert t1 == sorted(t1)  # Order preserved
+
+    @pytest.mark.asyncio
+    async def test_bounded_buffer_applies_backpressure(self):
+        produced = []
+
+        async def source():
+            for i in range(100):
+                produced.append(i)
+                yield {"type": "output", "n": i}
+
+        stream = SSEStream(source(), max_events=5, heartbeat_interval=None)
+        iterator = stream.__aiter__()
+        first = await iterator.__anext__()
+        await asyncio.sleep(0.05)
+
+        assert json.loads(first.decode()[6:])["n"] == 0
+        assert len(produced) <= 7  # Buffer full: producer is waiting
+        assert stream.stats.backpressure_waits >= 1
+        rest = [chunk async for chunk in iterator]
+        assert len(rest) == 99
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle(self):
+        async def source():
+            yield {"type": "start"}
+            await asyncio.sleep(0.12)
+            yield {"type": "end"}
+
+        stream = SSEStream(source(), heartbeat_interval=0.05)
+        events = await _collect(stream)
+
+        assert events[0] == {"type": "start"}
+        assert events[-1] == {"type": "end"}
+        assert {"type": "ping"} in events
+        assert stream.stats.heartbeats >= 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_source_and_counts(self):
+        reset_sse_stats()
+        closed = asyncio.Event()
+
+        async def source():
+            try:
+                i = 0
+                while True:
+                    yield {"type": "output", "n": i}
+                    i += 1
+                    await asyncio.sleep(0)
+            finally:
+                closed.set()
+
+        stream = SSEStream(source(), heartbeat_interval=None)
+        iterator = stream.__aiter__()
+        for _ in range(3):
+            await iterator.__anext__()
+        await iterator.aclose()
+        await asyncio.wait_for(closed.wait(), 1)
+
+        stats = get_sse_stats()
+        assert stats["events_sent"] == 3
+        assert stats["bytes_sent"] > 0
+        assert stats["active_streams"] == 0
@@ -0,0 +1,108 @@
+"""Tests for bounded, TTL-evicting state stores with SQLite spill."""
+
+import time
+from dataclasses import asdict, dataclass
+
+import pytest
+
+from app.utils.state_store import SQLiteStateSpill, StateStore, StateStoreManager
+
+
+@dataclass
+class Item:
+    name: str
+    busy: bool = False
+
+
+def _store(**kwargs) -> StateStore:
+    return StateStore(
+        "test",
+        serialize=asdict,
+        deserialize=lambda data: Item(**data),
+        **kwargs,
+    )
+
+
+class TestStateStore:
+    def test_lru_cap_respects_can_evict(self):
+        store = _store(max_entries=3, can_evict=lambda item: not item.busy)
+        store.set("a", Item("a", busy=True))
+        store.set("b", Item("b"))
+        store.set("c", Item("c"))
+        store.get("b")  # b is now more recent than c
+        store.set("d", Item("d"))
+
+        assert sorted(store.keys()) == ["a", "b", "d"]
+        assert store.get_stats()["evictions"] == 1
+
+    def test_idle_ttl_and_sweep(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.state_store.time.monotonic", lambda: now[0])
+        store = _store(ttl_seconds=60)
+        for key in "abc":
+            store.set(key, Item(key))
+
+        now[0] += 40
+        assert store.get("a").name == "a"  # Refreshes a
+        now[0] += 30
+        assert store.sweep() == 2
+        assert store.keys() == ["a"]
+        now[0] += 61
+        assert store.get("a") is None
+        assert store.get_stats()["expirations"] == 3
+
+    def test_spill_and_rehydrate(self, tmp_path):
+        spill = SQLiteStateSpill(tmp_path / "spill.db")
+        store = _store(max_entries=2)
+        store.spill = spill
+        for key in "abc":
+            store.set(key, Item(key))
+
+        assert "a" not in store.keys()
+        assert spill.count("test") == 1
+        assert store.get("a") == Item("a")
+        assert store.get_stats()["rehydrated"] == 1
+
+        store.pop("a")
+        assert store.get("a") is None
+        store.clear()
+        assert spill.count("test") == 0
+        spill.close()
+
+    def test_expired_spill_rows_are_ignored(self, tmp_path):
+        spill = SQLiteStateSpill(tmp_path / "spill.db")
+        spill.save_many("test", [("old", {"name": "old"}, time.time() - 1)])
+        store = _store()
+        store.spill = spill
+
+        assert store.get("old") is None
+        assert spill.count("test") == 0
+        spill.close()
+
+
+class TestStateStoreManager:
+    @pytest.mark.asyncio
+    async def test_state_survives_restart(self, tmp_path):
+        path = tmp_path / "state.db"
+        first = StateStoreManager()
+        store = first.create("sessions", serialize=asdict, deserialize=lambda d: Item(**d))
+        await first.start(spill_path=path)
+        store.set("s1", Item("s1"))
+        await first.stop()
+
+        second = StateStoreManager()
+        restored = second.create("sessions", serialize=asdict, deserialize=lambda d: Item(**d))
+        await second.start(spill_path=path)
+        assert restored.get("s1") == Item("s1")
+        assert second.get_stats()["sessions"]["rehydrated"] == 1
+        await second.stop()
+
+    def test_router_session_state_round_trip(self):
+        from app.workflows.router import SessionState, TaskType
+
+        state = SessionState(
+            last_task="deploy", last_task_type=TaskType.DEVOPS, files_touched=["a.py"]
+        )
+        restored = SessionState.from_dict(state.to_dict())
+
+        assert restored == state
@@ -0,0 +1,253 @@
+"""Tests for the project symbol index and code_symbols tool."""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.projects.symbol_index import (
+    SymbolIndex,
+    SymbolIndexManager,
+    parse_go,
+    parse_javascript,
+    parse_python,
+)
+from app.tools.symbols import CodeSymbolsTool
+
+PY_SOURCE = '''import os
+from app.auth import check as verify
+
+MAX_USERS = 10
+
+
+class AuthService:
+    timeout: int = 5
+
+    async def refresh(self, force=False):
+        return verify(self.token)
+
+
+def authenticate(user):
+    service = AuthService()
+    return service.refresh()
+'''
+
+TS_SOURCE = '''import React, { useState } from 'react';
+
+export function login(user: string) {
+  return authenticate(user);
+}
+
+export const logout = async () => {
+  clearSession();
+};
+
+export class Session {
+  refresh(force: boolean): void {
+    if (force) { this.reset(); }
+  }
+}
+
+export interface User { id: string }
+'''
+
+GO_SOURCE = '''package server
+
+import (
+\t"fmt"
+\tlog "github.com/sirupsen/logrus"
+)
+
+type Server struct {
+\tname string
+}
+
+func (s *Server) Start() error {
+\tfmt.Println(s.name)
+\treturn nil
+}
+
+func NewServer() *Server {
+\treturn &Server{}
+}
+'''
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    (root / "app").mkdir(parents=True)
+    (root / "web").mkdir()
+    (root / "node_modules").mkdir()
+    (root / "app" / "service.py").write_text(PY_SOURCE)
+    (root / "web" / "auth.ts").write_text(TS_SOURCE)
+    (root / "server.go").write_text(GO_SOURCE)
+    (root / "node_modules" / "dep.js").write_text("function authenticate() {}\n")
+    return root
+
+
+def _kinds(defs) -> set[tuple[str, str, str]]:
+    return {(d.kind, d.name, d.container) for d in defs}
+
+
+class TestParsers:
+    """Test per-language definition and reference extraction."""
+
+    def test_python(self):
+        defs, refs = parse_python("a.py", PY_SOURCE)
+
+        assert _kinds(defs) == {
+            ("constant", "MAX_USERS", ""),
+            ("class", "AuthService", ""),
+            ("variable", "timeout", "AuthService"),
+            ("method", "refresh", "AuthService"),
+            ("function", "authenticate", ""),
+        }
+        imports = {(r.name, r.detail) for r in refs if r.kind == "import"}
+        assert imports == {("os", "os"), ("check", "app.auth")}
+        calls = {r.name for r in refs if r.kind == "call"}
+        assert {"verify", "AuthService", "refresh"} <= calls
+
+    def test_python_syntax_error(self):
+        assert parse_python("bad.py", "def (:\n") == ([], [])
+
+    def test_typescript(self):
+        defs, refs = parse_javascript("a.ts", TS_SOURCE)
+
+        assert _kinds(defs) == {
+            ("function", "login", ""),
+            ("function", "logout", ""),
+            ("class", "Session", ""),
+            ("method", "refresh", "Session"),
+            ("interface", "User", ""),
+        }
+        imports = {r.name for r in refs if r.kind == "import"}
+        assert imports == {"React", "useState"}
+        calls = {r.name for r in refs if r.kind == "call"}
+        assert calls == {"authenticate", "clearSession", "reset"}
+
+    def test_go(self):
+        defs, refs = parse_go("a.go", GO_SOURCE)
+
+        assert _kinds(defs) == {
+            ("struct", "Server", ""),
+            ("method", "Start", "Server"),
+            ("function", "NewServer", ""),
+        }
+        imports = {(r.name, r.detail) for r in refs if r.kind == "import"}
+        assert imports == {("fmt", "fmt"), ("log", "github.com/sirupsen/logrus")}
+        assert {r.name for r in refs if r.kind == "call"} == {"Println"}
+
+
+class TestSymbolIndex:
+    """Test lookups, incremental updates and persistence."""
+
+    def test_find_definitions(self, project):
+        index = SymbolIndex(project)
+        index.update()
+
+        found = index.find_definitions("authenticate")
+        assert [(d.file, d.line) for d in found] == [("app/service.py", 14)]
+
+        methods = index.find_definitions("refresh", kind="method")
+        assert {d.file for d in methods} == {"app/service.py", "web/auth.ts"}
+
+        qualified = index.find_definitions("Session.refresh")
+        assert [d.file for d in qualified] == ["web/auth.ts"]
+
+    def test_find_references(self, project):
+        index = SymbolIndex(project)
+        index.update()
+
+        refs = index.find_references("authenticate")
+        assert [(r.file, r.kind) for r in refs] == [("web/auth.ts", "call")]
+
+    def test_search_ranks_exact_then_prefix(self, project):
+        index = SymbolIndex(project)
+        index.update()
+
+        names = [d.name for d in index.search("server")]
+        assert names[0] == "Server"
+        assert "NewServer" in names
+
+    def test_outline(self, project):
+        index = SymbolIndex(project)
+        index.update()
+
+        assert [d.name for d in index.outline("server.go")] == ["Server", "Start", "NewServer"]
+
+    def test_incremental_update(self, project):
+        index = SymbolIndex(project)
+        index.update()
+
+        target = project / "app" / "service.py"
+        target.write_text("def login():\n    pass\n")
+        os.utime(target, ns=(1, 1))
+        (project / "server.go").unlink()
+
+        assert index.update() == {"added": 0, "updated": 1, "removed": 1}
+        assert index.find_definitions("authenticate") == []
+        assert index.find_definitions("NewServer") == []
+        login_files = {d.file for d in index.find_definitions("login")}
+        assert login_files == {"app/service.py", "web/auth.ts"}
+        assert index.update() == {"added": 0, "updated": 0, "removed": 0}
+
+    def test_process_pool_parsing(self, project, monkeypatch):
+        monkeypatch.setattr("app.projects.symbol_index.PROCESS_POOL_MIN_FILES", 1)
+        index = SymbolIndex(project)
+        index.update()
+
+        assert index.file_count == 3
+        assert index.find_definitions("NewServer")
+
+    def test_persistence_roundtrip(self, project, tmp_path):
+        storage = tmp_path / "symbols.json"
+        index = SymbolIndex(project, storage)
+        index.update()
+        index.save()
+
+        loaded = SymbolIndex.load(project, storage)
+
+        assert loaded is not None
+        assert loaded.symbol_count == index.symbol_count
+        assert loaded.find_definitions("AuthService.refresh")[0].line == 10
+
+
+class TestCodeSymbolsTool:
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "app.projects.symbol_index.get_context_pack_dir",
+            lambda name: tmp_path / "packs" / name,
+        )
+        return SymbolIndexManager()
+
+    @pytest.mark.asyncio
+    async def test_definition_builds_index_on_demand(self, project, manager):
+        fake_project = SimpleNamespace(name="proj", path=str(project))
+        with patch("app.tools.symbols.project_registry.get", return_value=fake_project), \
+             patch("app.tools.symbols.symbol_index_manager", manager):
+            result = await CodeSymbolsTool().execute(
+                action="definition", project="proj", name="authenticate"
+            )
+
+        assert result.success is True
+        assert "app/service.py:14  function authenticate" in result.output
+        assert result.data["results"][0]["qualified_name"] == "authenticate"
+
+    @pytest.mark.asyncio
+    async def test_unknown_project(self):
+        with patch("app.tools.symbols.project_registry.get", return_value=None):
+            result = await CodeSymbolsTool().execute(action="definition", project="nope", name="x")
+
+        assert result.success is False
+        assert "Project not found" in result.error
+
+    @pytest.mark.asyncio
+    async def test_outline_requires_path(self):
+        result = await CodeSymbolsTool().execute(action="outline", project="proj")
+
+        assert result.success is False
+        assert "path is required" in result.error
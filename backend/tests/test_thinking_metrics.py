@@ -0,0 +1,136 @@
+"""Tests for thinking metrics persistence and incremental aggregates."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.thinking.metrics import ThinkingMetricEntry, ThinkingMetrics
+from app.thinking.models import ThinkingLevel
+
+
+def _entry(i: int, level=ThinkingLevel.MEDIUM, template=None, **kwargs) -> ThinkingMetricEntry:
+    return ThinkingMetricEntry(
+        session_id=f"s{i}",
+        message_id=f"m{i}",
+        level=level,
+        adaptive_level=kwargs.pop("adaptive_level", None),
+        template=template,
+        duration_ms=100,
+        tokens_used=kwargs.pop("tokens_used", 200),
+        step_count=3,
+        complexity_score=0.5,
+        **kwargs,
+    )
+
+
+def _scan(metrics: ThinkingMetrics, **filters):
+    """Reference aggregate computed by scanning entries."""
+    entries = metrics.get_entries(**filters)
+    return (
+        len(entries),
+        sum(e.tokens_used for e in entries),
+        sum(1 for e in entries if e.outcome == "success"),
+        sum(1 for e in entries if e.user_feedback == 1),
+    )
+
+
+def _agg(metrics: ThinkingMetrics, **filters):
+    agg = metrics.aggregate(**filters)
+    return (agg.total_sessions, agg.total_tokens, agg.success_count, agg.positive_feedback)
+
+
+class TestIncrementalAggregates:
+    def test_matches_scan_after_updates_and_eviction(self):
+        metrics = ThinkingMetrics(max_entries=10)
+        levels = [ThinkingLevel.LOW, ThinkingLevel.HIGH]
+        for i in range(25):
+            metrics.record_entry(_entry(
+                i,
+                level=levels[i % 2],
+                template="debug" if i % 3 == 0 else None,
+                adaptive_level=ThinkingLevel.MAX if i % 5 == 0 else None,
+                outcome="success" if i % 4 else "error",
+                tokens_used=i,
+            ))
+        metrics.record_feedback("m24", 1)
+        metrics.record_outcome("m23", "success")
+        assert metrics.record_feedback("m0", 1) is False  # Evicted
+
+        assert len(metrics.get_entries()) == 10
+        assert _agg(metrics) == _scan(metrics)
+        for level in (ThinkingLevel.LOW, ThinkingLevel.HIGH, ThinkingLevel.MAX):
+            assert _agg(metrics, level=level) == _scan(metrics, level=level)
+        assert _agg(metrics, template="debug") == _scan(metrics, template="debug")
+
+        by_level = metrics.aggregate_by_level()
+        assert list(by_level) == ["low", "high", "max"]
+        assert set(metrics.aggregate_by_template()) == {"debug"}
+
+    def test_since_uses_hourly_buckets(self):
+        metrics = ThinkingMetrics()
+        old = _entry(1, timestamp=datetime.utcnow() - timedelta(days=10))
+        metrics.record_entry(old)
+        metrics.record_entry(_entry(2))
+
+        recent = metrics.aggregate(since=datetime.utcnow() - timedelta(days=7))
+        assert recent.total_sessions == 1
+        assert metrics.aggregate().total_sessions == 2
+
+
+class TestPersistence:
+    def test_buffered_appends_and_reload(self, tmp_path):
+        path = tmp_path / "thinking_metrics.jsonl"
+        metrics = ThinkingMetrics(path, flush_batch_size=5, flush_interval=3600)
+        for i in range(4):
+            metrics.record_entry(_entry(i))
+        assert not path.exists()  # Still buffered
+
+        metrics.record_entry(_entry(4))
+        assert len(path.read_text().splitlines()) == 5
+
+        metrics.record_outcome("m1", "error")
+        metrics.flush()
+
+        reloaded = ThinkingMetrics(path)
+        assert reloaded.aggregate().total_sessions == 5
+        assert reloaded.aggregate().error_count == 1
+
+    @pytest.mark.asyncio
+    async def test_timer_flushes_lone_entry(self, tmp_path):
+        path = tmp_path / "thinking_metrics.jsonl"
+        metrics = ThinkingMetrics(path, flush_batch_size=100, flush_interval=0.05)
+        metrics.record_entry(_entry(0))
+        assert not path.exists()
+
+        await asyncio.sleep(0.1)  # No further record arrives
+
+        assert len(path.read_text().splitlines()) == 1
+
+    def test_compaction_bounds_file(self, tmp_path):
+        path = tmp_path / "thinking_metrics.jsonl"
+        metrics = ThinkingMetrics(path, max_entries=10, flush_batch_size=1)
+        for i in range(100):
+            metrics.record_entry(_entry(i))
+
+        lines = path.read_text().splitlines()
+        assert len(lines) <= 20
+        reloaded = ThinkingMetrics(path, max_entries=10)
+        assert [e.message_id for e in reloaded.get_entries()] == [f"m{i}" for i in range(90, 100)]
+
+    def test_migrates_legacy_json(self, tmp_path):
+        legacy = tmp_path / "thinking_metrics.json"
+        legacy.write_text(json.dumps([_entry(i).to_dict() for i in range(3)], indent=2))
+
+        metrics = ThinkingMetrics(tmp_path / "thinking_metrics.jsonl")
+
+        assert metrics.aggregate().total_sessions == 3
+        lines = (tmp_path / "thinking_metrics.jsonl").read_text().splitlines()
+        assert [json.loads(line)["message_id"] for line in lines] == ["m0", "m1", "m2"]
+
+    def test_skips_torn_lines(self, tmp_path):
+        path = tmp_path / "thinking_metrics.jsonl"
+        path.write_text(json.dumps(_entry(1).to_dict()) + "\n{\"session_id\": \"s2\", \"mess")
+
+        assert ThinkingMetrics(path).aggregate().total_sessions == 1
@@ -414,3 +414,101 @@ class TestInvalidJsonRepair:
         assert "invalid" in prompt.lower() or "Invalid" in prompt
         assert '{"tool": "test"' in prompt
         assert "Expecting property name" in prompt
+
+
+class TestConcurrentReadExecution:
+    """Test concurrent execution of read-only invocations."""
+
+    @staticmethod
+    def _read(path: str) -> ToolInvocation:
+        return ToolInvocation(
+            tool_id="filesystem", args={"action": "read", "path": path}, raw_json="{}"
+        )
+
+    @staticmethod
+    def _write(path: str) -> ToolInvocation:
+        return ToolInvocation(
+            tool_id="filesystem",
+            args={"action": "write", "path": path, "content": "x"},
+            raw_json="{}",
+        )
+
+    @staticmethod
+    def _tracking_executor(events: list[str], active: list[int], peak: list[int]):
+        async def execute(tool_id, **kwargs):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            events.append(f"start:{kwargs['action']}:{kwargs['path']}")
+            await asyncio.sleep(0.01)
+            events.append(f"end:{kwargs['action']}:{kwargs['path']}")
+            active[0] -= 1
+            return ToolResult(success=True, output=kwargs["path"])
+
+        mock = MagicMock()
+        mock.execute = AsyncMock(side_effect=execute)
+        return mock
+
+    @pytest.mark.asyncio
+    async def test_reads_overlap_and_keep_order(self):
+        """Read-only calls run concurrently but results keep invocation order."""
+        events, active, peak = [], [0], [0]
+        context = InterpreterContext(enable_audit=False)
+        invocations = [self._read(f"/f{i}") for i in range(5)]
+
+        executor = self._tracking_executor(events, active, peak)
+        with patch("app.tools.interpreter.tool_executor", executor):
+            results = await execute_invocations(invocations, context)
+
+        assert [r.result.output for r in results] == [f"/f{i}" for i in range(5)]
+        assert peak[0] > 1
+        assert context.total_tool_calls == 5
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_respected(self):
+        """No more than max_concurrent_reads calls run at once."""
+        events, active, peak = [], [0], [0]
+        context = InterpreterContext(policy=ToolPolicy(max_concurrent_reads=2), enable_audit=False)
+        invocations = [self._read(f"/f{i}") for i in range(6)]
+
+        executor = self._tracking_executor(events, active, peak)
+        with patch("app.tools.interpreter.tool_executor", executor):
+            await execute_invocations(invocations, context)
+
+        assert peak[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_are_barriers(self):
+        """Reads after a write start only once the write has finished."""
+        events, active, peak = [], [0], [0]
+        context = InterpreterContext(enable_audit=False)
+        invocations = [self._read("/a"), self._read("/b"), self._write("/c"), self._read("/d")]
+
+        executor = self._tracking_executor(events, active, peak)
+        with patch("app.tools.interpreter.tool_executor", executor):
+            results = await execute_invocations(invocations, context)
+
+        assert [r.invocation.args["path"] for r in results] == ["/a", "/b", "/c", "/d"]
+        assert events.index("end:write:/c") < events.index("start:read:/d")
+        assert events.index("end:read:/a") < events.index("start:write:/c")
+        assert events.index("end:read:/b") < events.index("start:write:/c")
+
+    @pytest.mark.asyncio
+    async def test_budget_charged_for_concurrent_reads(self):
+        """Concurrent reads cannot overrun the per-message tool call budget."""
+        from app.guardrails import BudgetTracker
+        from app.guardrails.policies import BudgetPolicy
+
+        events, active, peak = [], [0], [0]
+        tracker = BudgetTracker(policy=BudgetPolicy(max_tool_calls_per_message=3))
+        context = InterpreterContext(enable_audit=False, budget_tracker=tracker)
+        invocations = [self._read(f"/f{i}") for i in range(5)]
+
+        executor = self._tracking_executor(events, active, peak)
+        with patch("app.tools.interpreter.tool_executor", executor):
+            results = await execute_invocations(invocations, context)
+
+        assert len(results) == 4
+        assert all(r.result.success for r in results[:3])
+        assert results[3].result.success is False
+        assert tracker.usage.tool_calls_message == 3
+        assert tracker.usage.total_output_bytes == len("/f0") * 3
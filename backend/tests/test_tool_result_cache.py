@@ -0,0 +1,143 @@
+"""Tests for the idempotent tool result cache."""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.tools.base import ToolResult
+from app.tools.executor import ToolExecutor
+from app.tools.result_cache import ToolResultCache
+
+
+@pytest.fixture
+def tmp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(os.path.realpath(tmpdir))
+
+
+@pytest.fixture
+def cache():
+    return ToolResultCache()
+
+
+def _ok(output: str = "content") -> ToolResult:
+    return ToolResult(success=True, output=output)
+
+
+class TestToolResultCache:
+    """Test cache keying, fingerprints and invalidation."""
+
+    def test_mutating_calls_not_cacheable(self, cache):
+        assert cache.probe("filesystem", {"action": "write", "path": "/x"}) is None
+        assert cache.probe("shell", {"command": "ls"}) is None
+
+    def test_hit_after_store(self, cache, tmp_dir):
+        path = tmp_dir / "a.txt"
+        path.write_text("hello")
+        args = {"action": "read", "path": str(path)}
+
+        probe = cache.probe("filesystem", args, str(tmp_dir))
+        assert probe.hit is None
+        cache.store(probe, _ok("hello"))
+
+        probe = cache.probe("filesystem", args, str(tmp_dir))
+        assert probe.hit.output == "hello"
+        assert probe.hit.data["cache_hit"] is True
+        assert cache.get_stats()["hits"] == 1
+
+    def test_relative_and_absolute_paths_share_entry(self, cache, tmp_dir):
+        (tmp_dir / "a.txt").write_text("hello")
+
+        probe = cache.probe("filesystem", {"action": "read", "path": "a.txt"}, str(tmp_dir))
+        cache.store(probe, _ok())
+
+        probe = cache.probe(
+            "filesystem", {"action": "read", "path": str(tmp_dir / "a.txt")}, str(tmp_dir)
+        )
+        assert probe.hit is not None
+
+    def test_fingerprint_change_is_a_miss(self, cache, tmp_dir):
+        path = tmp_dir / "a.txt"
+        path.write_text("one")
+        args = {"action": "read", "path": str(path)}
+        cache.store(cache.probe("filesystem", args, str(tmp_dir)), _ok("one"))
+
+        path.write_text("one two")
+
+        assert cache.probe("filesystem", args, str(tmp_dir)).hit is None
+
+    def test_child_edit_is_a_listing_miss(self, cache, tmp_dir):
+        child = tmp_dir / "a.txt"
+        child.write_text("one")
+        args = {"action": "list", "path": str(tmp_dir)}
+        cache.store(cache.probe("filesystem", args, str(tmp_dir)), _ok("a.txt (3 bytes)"))
+
+        child.write_text("one two")  # Directory mtime unchanged
+
+        assert cache.probe("filesystem", args, str(tmp_dir)).hit is None
+
+    def test_write_invalidates_parent_listing(self, cache, tmp_dir):
+        args = {"action": "list", "path": str(tmp_dir)}
+        cache.store(cache.probe("filesystem", args, str(tmp_dir)), _ok("(empty directory)"))
+
+        assert cache.invalidate_path(tmp_dir / "new.txt") == 1
+        assert cache.probe("filesystem", args, str(tmp_dir)).hit is None
+
+    def test_invalidate_local_keeps_network_entries(self, cache, tmp_dir):
+        cache.store(
+            cache.probe("filesystem", {"action": "exists", "path": str(tmp_dir)}, str(tmp_dir)),
+            _ok(),
+        )
+        cache.store(cache.probe("web_fetch", {"url": "https://example.com"}), _ok("page"))
+
+        cache.invalidate_local()
+
+        assert cache.probe("web_fetch", {"url": "https://example.com"}).hit is not None
+        assert cache.get_stats()["entries"] == 1
+
+    def test_store_skipped_after_concurrent_invalidation(self, cache, tmp_dir):
+        args = {"action": "list", "path": str(tmp_dir)}
+        probe = cache.probe("filesystem", args, str(tmp_dir))
+
+        cache.invalidate_local()
+        cache.store(probe, _ok())
+
+        assert cache.get_stats()["entries"] == 0
+
+    def test_ttl_expiry(self, cache):
+        args = {"url": "https://example.com"}
+        cache.store(cache.probe("web_fetch", args), _ok())
+
+        with patch("app.tools.result_cache.time.monotonic", return_value=1e12):
+            assert cache.probe("web_fetch", args).hit is None
+
+    def test_failed_results_not_cached(self, cache):
+        args = {"url": "https://example.com"}
+        cache.store(cache.probe("web_fetch", args), ToolResult(success=False, output="", error="x"))
+
+        assert cache.probe("web_fetch", args).hit is None
+
+
+class TestExecutorCaching:
+    """Test cache integration in ToolExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_fetch_served_from_cache(self):
+        executor = ToolExecutor()
+        cache = ToolResultCache()
+        tool = AsyncMock()
+        tool.execute = AsyncMock(return_value=_ok("page"))
+
+        with patch("app.tools.executor.tool_result_cache", cache), \
+             patch("app.tools.executor.registry.get", return_value=tool), \
+             patch("app.tools.executor.audit_logger") as mock_audit:
+            first = await executor.execute("web_fetch", skip_guardrails=True, url="https://a")
+            second = await executor.execute("web_fetch", skip_guardrails=True, url="https://a")
+
+        assert first.output == second.output == "page"
+        assert tool.execute.await_count == 1
+        assert executor.get_metrics("web_fetch")["cache_hits"] == 1
+        assert mock_audit.log.call_args[0][0].action == "tool_cache_hit"
@@ -0,0 +1,163 @@
+"""Tests for the concurrent, cached verification gate runner."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from app.skills.generators import verification
+from app.skills.generators.verification import (
+    GateType,
+    VerificationGate,
+    compute_inputs_digest,
+    gate_result_cache,
+    glob_to_regex,
+    run_verification_gates,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    gate_result_cache.clear()
+    yield
+    gate_result_cache.clear()
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    (tmp_path / "backend" / "app").mkdir(parents=True)
+    (tmp_path / "backend" / "app" / "main.py").write_text("app = 1\n")
+    (tmp_path / "frontend" / "src").mkdir(parents=True)
+    (tmp_path / "frontend" / "src" / "App.tsx").write_text("export {}\n")
+    (tmp_path / "frontend" / "node_modules").mkdir()
+    return tmp_path
+
+
+def _command_gate(name: str, command: str, scope: str = "project", required: bool = True):
+    return VerificationGate(
+        name=name,
+        gate_type=GateType.COMMAND_SUCCESS,
+        command=command,
+        scope=scope,
+        required=required,
+    )
+
+
+class TestInputsDigest:
+    def test_scoped_and_excluded_files(self, project):
+        before = compute_inputs_digest(project, ["backend/**/*"])
+
+        # Changes outside the scope or in excluded dirs don't matter
+        (project / "frontend" / "src" / "App.tsx").write_text("export const x = 1\n")
+        (project / "backend" / "__pycache__").mkdir()
+        (project / "backend" / "__pycache__" / "main.pyc").write_bytes(b"\x00")
+        assert compute_inputs_digest(project, ["backend/**/*"]) == before
+
+        (project / "backend" / "app" / "main.py").write_text("app = 2\n")
+        assert compute_inputs_digest(project, ["backend/**/*"]) != before
+
+    def test_glob_matching(self):
+        assert glob_to_regex("backend/**/*.py").match("backend/main.py")
+        assert glob_to_regex("backend/**/*.py").match("backend/app/api/x.py")
+        assert not glob_to_regex("*.py").match("backend/main.py")
+        assert not glob_to_regex("src/*.ts").match("src/deep/x.ts")
+        assert glob_to_regex("src/[ab]?.ts").match("src/a1.ts")
+
+
+class TestRunVerificationGates:
+    """Test concurrency, fail_fast and result caching."""
+
+    @pytest.mark.asyncio
+    async def test_gates_run_concurrently_in_order(self, project):
+        gates = [
+            _command_gate(f"g{i}", "sleep 0.3", scope=scope)
+            for i, scope in enumerate(("backend", "frontend", "project"))
+        ]
+
+        start = time.monotonic()
+        results = await run_verification_gates(gates, project, use_cache=False)
+
+        assert time.monotonic() - start < 0.8
+        assert [r.gate_name for r in results] == ["g0", "g1", "g2"]
+        assert all(r.passed and r.duration_ms >= 250 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_same_scope_runs_sequentially(self, project):
+        log = project / "order.log"
+        gates = [
+            _command_gate("first", f"sleep 0.2 && echo first >> {log}", scope="backend"),
+            _command_gate("second", f"echo second >> {log}", scope="backend"),
+        ]
+
+        await run_verification_gates(gates, project, use_cache=False)
+
+        assert log.read_text().split() == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_cancels_remaining(self, project):
+        gates = [
+            _command_gate("fails", "exit 1"),
+            _command_gate("slow", "sleep 5"),
+        ]
+
+        start = time.monotonic()
+        results = await run_verification_gates(gates, project, fail_fast=True, use_cache=False)
+
+        assert time.monotonic() - start < 2
+        assert [r.gate_name for r in results] == ["fails"]
+
+    @pytest.mark.asyncio
+    async def test_optional_failure_does_not_stop(self, project):
+        gates = [
+            _command_gate("optional", "exit 1", required=False),
+            _command_gate("after", "sleep 0.1"),
+        ]
+
+        results = await run_verification_gates(gates, project, fail_fast=True, use_cache=False)
+
+        assert [r.passed for r in results] == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_inputs_use_cache(self, project, monkeypatch):
+        calls = []
+        real_run_gate = verification.run_gate
+
+        async def counting_run_gate(gate, project_path):
+            calls.append(gate.name)
+            return await real_run_gate(gate, project_path)
+
+        monkeypatch.setattr(verification, "run_gate", counting_run_gate)
+        gates = [
+            _command_gate("backend_check", "true", scope="backend"),
+            _command_gate("frontend_check", "true", scope="frontend"),
+        ]
+
+        await run_verification_gates(gates, project)
+        # Unrelated frontend edit: only the frontend gate re-runs
+        (project / "frontend" / "src" / "App.tsx").write_text("export const y = 2\n")
+        results = await run_verification_gates(gates, project)
+
+        assert sorted(calls) == ["backend_check", "frontend_check", "frontend_check"]
+        assert [r.cached for r in results] == [True, False]
+        assert gate_result_cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failures_not_cached(self, project):
+        marker = project / "frontend" / "installed"
+        gate = _command_gate("needs_dep", f"test -f {marker}", scope="frontend")
+
+        assert not (await run_verification_gates([gate], project))[0].passed
+        marker.write_text("")  # Environment fixed; hashed inputs unchanged
+        result = (await run_verification_gates([gate], project))[0]
+
+        assert result.passed and not result.cached
+
+    @pytest.mark.asyncio
+    async def test_dependency_install_invalidates(self, project):
+        gate = _command_gate("lint", "true", scope="frontend")
+        await run_verification_gates([gate], project)
+
+        (project / "frontend" / "node_modules" / ".package-lock.json").write_text("{}")
+        result = (await run_verification_gates([gate], project))[0]
+
+        assert not result.cached
@@ -23,8 +23,14 @@ Usage:
     # JSON output for automation
     python scripts/purge_audit.py --json
 
+    # Spend at most 10 minutes; the next run resumes where this one stopped
+    python scripts/purge_audit.py --time-budget 600 --incremental-vacuum
+
+Records are deleted in small batches with pauses in between, so chat and
+agent writes keep going while the purge runs.
+
 Crontab example (daily at 3am):
-    0 3 * * * cd /path/to/maratos && python scripts/purge_audit.py --cron
+    0 3 * * * cd /path/to/maratos && python scripts/purge_audit.py --cron --time-budget 900
 """
 
 import argparse
@@ -32,22 +38,28 @@ import asyncio
 import json
 import logging
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
+from app.audit.purge import DEFAULT_BATCH_SIZE, DEFAULT_PAUSE_SECONDS, PurgeProgress
 from app.audit.retention import (
+    FullCleanupResult,
     RetentionConfig,
     TableRetentionPolicy,
-    purge_all_tables,
     get_table_stats,
+    purge_all_tables,
     set_retention_config,
-    FullCleanupResult,
 )
+from app.config import settings
 from app.database import init_db
 
+# Checkpoint used to resume a purge that ran out of time budget
+STATE_PATH = settings.data_dir / "audit_purge_state.json"
+
 
 def setup_logging(verbose: bool = False, cron: bool = False) -> None:
     """Configure logging based on mode."""
@@ -96,17 +108,42 @@ def print_stats(stats: dict, json_output: bool = False) -> None:
     print("\n" + "=" * 70)
 
 
+class ProgressPrinter:
+    """Print purge progress at most once per interval."""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, progress: PurgeProgress) -> None:
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return
+        self._last = now
+        print(
+            f"  {progress.table_name}: {progress.deleted:,} deleted "
+            f"in {progress.batches} batches ({progress.elapsed_seconds:.1f}s)",
+            flush=True,
+        )
+
+
 def print_purge_result(result: FullCleanupResult, json_output: bool = False) -> None:
     """Print purge results."""
     if json_output:
         output = {
             "total_deleted": result.total_deleted,
+            "completed": result.completed,
+            "elapsed_seconds": round(result.elapsed_seconds, 3),
             "vacuum_run": result.vacuum_run,
             "analyze_run": result.analyze_run,
+            "incremental_vacuum_pages": result.incremental_vacuum_pages,
             "tables": [
                 {
                     "name": r.table_name,
                     "deleted": r.deleted_count,
+                    "batches": r.batches,
+                    "blobs_freed": r.blobs_freed,
+                    "completed": r.completed,
                     "cutoff": r.cutoff_date.isoformat(),
                     "error": r.error,
                 }
@@ -121,28 +158,46 @@ def print_purge_result(result: FullCleanupResult, json_output: bool = False) ->
     print("=" * 70)
 
     for table_result in result.results:
-        status = "ERROR" if table_result.error else "OK"
+        if table_result.error:
+            status = "ERROR"
+        elif not table_result.completed:
+            status = "PAUSED"
+        else:
+            status = "OK"
         print(
             f"\n{table_result.table_name}:"
             f"\n  Status:  {status}"
-            f"\n  Deleted: {table_result.deleted_count:,} records"
+            f"\n  Deleted: {table_result.deleted_count:,} records in {table_result.batches} batches"
             f"\n  Cutoff:  {table_result.cutoff_date.strftime('%Y-%m-%d %H:%M:%S')}"
         )
+        if table_result.blobs_freed:
+            print(f"  Blobs:   {table_result.blobs_freed:,} unreferenced payloads freed")
         if table_result.error:
             print(f"  Error:   {table_result.error}")
 
     print(f"\n{'=' * 70}")
-    print(f"TOTAL DELETED: {result.total_deleted:,} records")
+    print(f"TOTAL DELETED: {result.total_deleted:,} records ({result.elapsed_seconds:.1f}s)")
+    if not result.completed:
+        print("STATUS:        Paused (time budget spent); run again to resume")
     print(f"VACUUM:        {'Yes' if result.vacuum_run else 'No'}")
+    if result.incremental_vacuum_pages is not None:
+        print(f"INCR. VACUUM:  {result.incremental_vacuum_pages:,} pages freed")
     print(f"ANALYZE:       {'Yes' if result.analyze_run else 'No'}")
     print("=" * 70 + "\n")
 
 
 async def dry_run(days: int) -> dict:
     """Show what would be deleted without actually deleting."""
-    from app.database import async_session_factory, AuditLog, ToolAuditLog
-    from app.database import LLMExchangeLog, FileChangeLog, BudgetLog
-    from sqlalchemy import select, func
+    from sqlalchemy import func, select
+
+    from app.database import (
+        AuditLog,
+        BudgetLog,
+        FileChangeLog,
+        LLMExchangeLog,
+        ToolAuditLog,
+        async_session_factory,
+    )
 
     cutoff = datetime.utcnow() - timedelta(days=days)
 
@@ -176,6 +231,11 @@ async def run_purge(
     json_output: bool = False,
     cron: bool = False,
     no_vacuum: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause_seconds: float = DEFAULT_PAUSE_SECONDS,
+    time_budget: float | None = None,
+    resume: bool = True,
+    incremental_vacuum: bool = False,
 ) -> int:
     """Run the purge operation.
 
@@ -225,10 +285,19 @@ async def run_purge(
         )
         set_retention_config(config)
 
+    if not resume:
+        STATE_PATH.unlink(missing_ok=True)
+
     # Run purge
     result = await purge_all_tables(
         run_vacuum=not no_vacuum,
         run_analyze=not no_vacuum,
+        batch_size=batch_size,
+        pause_seconds=pause_seconds,
+        time_budget_seconds=time_budget,
+        state_path=STATE_PATH,
+        on_progress=None if (cron or json_output) else ProgressPrinter(),
+        incremental_vacuum=incremental_vacuum,
     )
 
     # Check for errors
@@ -286,6 +355,34 @@ def main() -> int:
         action="store_true",
         help="Skip VACUUM and ANALYZE after purge (faster, but DB may grow).",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows deleted per transaction (default: {DEFAULT_BATCH_SIZE}).",
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=DEFAULT_PAUSE_SECONDS,
+        help=f"Seconds to pause between batches (default: {DEFAULT_PAUSE_SECONDS}).",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="Stop after this many seconds; the next run resumes from a checkpoint.",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore any checkpoint left by an earlier, unfinished purge.",
+    )
+    parser.add_argument(
+        "--incremental-vacuum",
+        action="store_true",
+        help="Run PRAGMA incremental_vacuum instead of a full VACUUM "
+             "(needs auto_vacuum=INCREMENTAL, see audit_admin audit_vacuum).",
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -307,6 +404,11 @@ def main() -> int:
                 json_output=args.json,
                 cron=args.cron,
                 no_vacuum=args.no_vacuum,
+                batch_size=args.batch_size,
+                pause_seconds=args.pause,
+                time_budget=args.time_budget,
+                resume=not args.no_resume,
+                incremental_vacuum=args.incremental_vacuum,
             )
         )
         return exit_code